@@ -0,0 +1,422 @@
+"""只读 HTTP/JSON 服务：赛程、球队名单和球员统计
+
+不需要登录 PyQt 客户端，供记分牌大屏和各院系网站使用。基于 asyncio 实现，只依赖
+标准库；数据库查询通过共享的 DatabaseConnection 连接池在线程池中执行，事件循环
+不会被阻塞。同一时刻相同的请求只查询一次，其余请求等待同一个结果。
+
+响应按 URL 缓存 CACHE_TTL 秒，并登记读取的表。服务本身不写数据库，管理员客户端
+的写入通过变更日志（changes.py）得知：每 CHANGE_POLL_INTERVAL 秒读取一次，相关表
+的缓存随即失效。数据库中没有 ChangeLog 表时缓存只按 TTL 过期。
+
+    GET /health
+    GET /teams
+    GET /teams/<team_id>/players
+    GET /teams/<team_id>/matches[?q=关键字]
+    GET /teams/<team_id>/tournaments
+    GET /teams/<team_id>/stats
+    GET /schedule[?tournament_id=1][&from=2024-03-01][&to=2024-03-08][&limit=200]
+
+    python api_server.py --port 8080
+"""
+import argparse
+import asyncio
+import datetime
+import decimal
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import mysql.connector
+
+import queries
+from changes import ChangeLogReader
+from database import DatabaseConnection, QueryTimeout
+from result_cache import read_tables
+
+
+DEFAULT_PORT = 8080
+CACHE_TTL = 10.0
+CHANGE_POLL_INTERVAL = 1.0
+CACHE_MAX_ENTRIES = 1024
+# 单条查询的最长执行时间，超时返回 503
+QUERY_TIMEOUT_MS = 5000
+SCHEDULE_DEFAULT_DAYS = 7
+SCHEDULE_MAX_LIMIT = 1000
+MAX_HEADER_BYTES = 16 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Response:
+    def __init__(self, body, tables=(), etag=None):
+        self.body = body
+        self.tables = set(tables)
+        self.etag = etag or '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+
+class ResponseCache:
+    """按 URL 缓存响应体
+
+    与 result_cache.QueryResultCache 相同，每张表维护版本号：请求开始前记录版本，
+    响应生成期间相关表被写过就不放进缓存，避免把旧数据缓存下来。
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (过期时间, Response)
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def versions(self):
+        with self._lock:
+            return dict(self._versions)
+
+    def put(self, key, response, versions):
+        with self._lock:
+            if any(self._versions.get(table, 0) != versions.get(table, 0) for table in response.tables):
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tables):
+        """写操作回调：丢弃读取了这些表的响应（可能在其他线程中调用）"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            stale = [key for key, (_expires, response) in self._entries.items() if response.tables & tables]
+            for key in stale:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': self.hits / total if total else 0.0}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"无法序列化 {type(value).__name__}")
+
+
+def encode_json(data):
+    return json.dumps(data, ensure_ascii=False, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def _int_param(params, name, default=None, minimum=None, maximum=None):
+    values = params.get(name)
+    if not values:
+        if default is None:
+            raise HttpError(400, f"缺少参数 {name}")
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise HttpError(400, f"参数 {name} 必须是整数")
+    if minimum is not None:
+        value = max(minimum, value)
+    if maximum is not None:
+        value = min(maximum, value)
+    return value
+
+
+def _date_param(params, name, default):
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        return datetime.datetime.strptime(values[0], '%Y-%m-%d')
+    except ValueError:
+        raise HttpError(400, f"参数 {name} 的格式应为 YYYY-MM-DD")
+
+
+class ApiServer:
+    """路由、响应缓存和请求合并"""
+
+    def __init__(self, db_conn, cache=None, workers=None, poll_interval=CHANGE_POLL_INTERVAL):
+        self.db_conn = db_conn
+        self.cache = cache if cache is not None else ResponseCache()
+        self.poll_interval = poll_interval
+        db_conn.add_write_listener(self.cache.invalidate)
+        # 线程数与连接池大小一致，多出的请求在线程池队列中等待，而不是等待连接超时
+        self.workers = ThreadPoolExecutor(max_workers=workers or db_conn.pool_size,
+                                          thread_name_prefix='api-db')
+        self._inflight = {}  # key -> Future，合并同时到达的相同请求
+        self.requests = 0
+        self.routes = [
+            (re.compile(r'^/health$'), self.health),
+            (re.compile(r'^/teams$'), self.teams),
+            (re.compile(r'^/teams/(\d+)/players$'), self.team_players),
+            (re.compile(r'^/teams/(\d+)/matches$'), self.team_matches),
+            (re.compile(r'^/teams/(\d+)/tournaments$'), self.team_tournaments),
+            (re.compile(r'^/teams/(\d+)/stats$'), self.team_stats),
+            (re.compile(r'^/schedule$'), self.schedule),
+        ]
+
+    async def query(self, sql, params=()):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.workers, self.db_conn.execute_cancellable, sql, params, None, QUERY_TIMEOUT_MS
+        )
+
+    async def rows_response(self, sql, params=(), wrap=None):
+        rows = await self.query(sql, params)
+        data = wrap(rows) if wrap else rows
+        return Response(encode_json(data), read_tables(sql))
+
+    # ---- 路由 ----
+
+    async def health(self, params):
+        data = {'status': 'ok', 'requests': self.requests, 'cache': self.cache.stats()}
+        # 健康检查不进缓存（没有读取任何表，但内容随时变化）
+        return Response(encode_json(data), tables={'*'})
+
+    async def teams(self, params):
+        return await self.rows_response(queries.TEAMS)
+
+    async def team_players(self, params, team_id):
+        return await self.rows_response(queries.PUBLIC_TEAM_PLAYERS, (int(team_id),))
+
+    async def team_matches(self, params, team_id):
+        """同队长页面 load_team_matches / search_matches"""
+        search = (params.get('q') or [''])[0].strip()
+        if search:
+            return await self.rows_response(
+                queries.SEARCH_TEAM_MATCHES, queries.team_matches_params(int(team_id), f"%{search}%")
+            )
+        return await self.rows_response(queries.TEAM_MATCHES, queries.team_matches_params(int(team_id)))
+
+    async def team_tournaments(self, params, team_id):
+        return await self.rows_response(queries.TEAM_TOURNAMENTS, queries.team_tournaments_params(int(team_id)))
+
+    async def team_stats(self, params, team_id):
+        return await self.rows_response(queries.PLAYER_STATS, (int(team_id),))
+
+    async def schedule(self, params):
+        today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        start = _date_param(params, 'from', today)
+        end = _date_param(params, 'to', start + datetime.timedelta(days=SCHEDULE_DEFAULT_DAYS))
+        limit = _int_param(params, 'limit', 200, minimum=1, maximum=SCHEDULE_MAX_LIMIT)
+        if 'tournament_id' in params:
+            tournament_id = _int_param(params, 'tournament_id')
+            return await self.rows_response(queries.SCHEDULE_BY_TOURNAMENT, (tournament_id, start, end, limit))
+        return await self.rows_response(queries.SCHEDULE_BY_TIME, (start, end, limit))
+
+    # ---- 请求处理 ----
+
+    async def respond(self, path, query_string):
+        """返回 Response；同一URL的并发请求共用一次查询"""
+        key = path + ('?' + query_string if query_string else '')
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            versions = self.cache.versions()
+            response = await self._route(path, parse_qs(query_string))
+            if '*' not in response.tables:
+                self.cache.put(key, response, versions)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有其他请求等待时避免 “Future exception was never retrieved” 警告
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _route(self, path, params):
+        for pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match:
+                return await handler(params, *match.groups())
+        raise HttpError(404, f"没有该资源：{path}")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._write(writer, 400, encode_json({'error': '请求头过大'}), keep_alive=False)
+                    return
+                keep_alive = await self._handle_request(head, writer)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_request(self, head, writer):
+        self.requests += 1
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            await self._write(writer, 400, encode_json({'error': '无法解析请求行'}), keep_alive=False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+        if method not in ('GET', 'HEAD'):
+            await self._write(writer, 405, encode_json({'error': '只支持 GET'}), keep_alive, {'Allow': 'GET, HEAD'})
+            return keep_alive
+
+        url = urlsplit(target)
+        try:
+            response = await self.respond(url.path.rstrip('/') or '/', url.query)
+        except HttpError as e:
+            await self._write(writer, e.status, encode_json({'error': e.message}), keep_alive)
+            return keep_alive
+        except Exception as e:
+            status = 503 if isinstance(e, QueryTimeout) else 500
+            print(f"请求失败 {target}: {e}")
+            await self._write(writer, status, encode_json({'error': str(e)}), keep_alive)
+            return keep_alive
+
+        extra = {'ETag': response.etag, 'Cache-Control': f"max-age={int(self.cache.ttl)}"}
+        if headers.get('if-none-match') == response.etag:
+            await self._write(writer, 304, b'', keep_alive, extra)
+        else:
+            await self._write(writer, 200, b'' if method == 'HEAD' else response.body, keep_alive, extra,
+                              content_length=len(response.body))
+        return keep_alive
+
+    async def _write(self, writer, status, body, keep_alive, extra=None, content_length=None):
+        headers = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body) if content_length is None else content_length}",
+            "Access-Control-Allow-Origin: *",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        headers.extend(f"{name}: {value}" for name, value in (extra or {}).items())
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def poll_changes(self):
+        """定期读取变更日志，使其他客户端写入的表的缓存失效"""
+        loop = asyncio.get_running_loop()
+        reader = ChangeLogReader(self.db_conn)
+        try:
+            await loop.run_in_executor(self.workers, reader.start)
+        except mysql.connector.Error as e:
+            print(f"变更日志不可用，响应缓存只按 TTL 过期: {e}")
+            return
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                changes = await loop.run_in_executor(self.workers, reader.read)
+            except mysql.connector.Error as e:
+                print(f"读取变更失败: {e}")
+                continue
+            if changes:
+                self.cache.invalidate(changes.cache_tables())
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES,
+                                            backlog=1024)
+        print(f"API 服务已启动: http://{host}:{port}/")
+        poller = asyncio.create_task(self.poll_changes())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            poller.cancel()
+
+    def close(self):
+        self.workers.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--listen', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--pool-size', type=int, default=16, help="数据库连接池大小")
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_db')
+    parser.add_argument('--sqlite', metavar='PATH', help="使用 SQLite 数据库文件，而不是 MySQL")
+    args = parser.parse_args()
+
+    db_conn = DatabaseConnection(pool_size=args.pool_size)
+    if args.sqlite:
+        connected = db_conn.connect_sqlite(args.sqlite)
+    else:
+        connected = db_conn.connect(args.host, args.user, args.password, args.database)
+    if not connected:
+        return 1
+    server = ApiServer(db_conn, ResponseCache(ttl=args.cache_ttl))
+    try:
+        asyncio.run(server.serve(args.listen, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        db_conn.close()
+        stats = server.cache.stats()
+        print(f"响应缓存: 命中 {stats['hits']} 次, 未命中 {stats['misses']} 次, 命中率 {stats['hit_rate']:.1%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""LIKE 全表扫描与 ngram 全文索引的搜索耗时对比
+
+在单独的数据库中生成指定数量的球员（默认50万），分别用 LIKE '%关键字%' 和
+MATCH ... AGAINST 搜索若干姓名片段，输出每种方式的平均耗时、命中行数以及
+EXPLAIN 给出的访问类型。数据由固定随机种子生成，多次运行结果可比较。
+
+    python benchmarks/bench_fulltext.py --user root --password password
+"""
+import argparse
+import random
+import statistics
+import time
+
+import mysql.connector
+
+
+# 与服务器的 ngram_token_size 一致
+NGRAM_TOKEN_SIZE = 2
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈"
+GIVEN_CHARS = "伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉兰萍红建文辉力鹏宇浩然子轩梓涵一诺欣怡博思雨泽"
+SEARCH_TERMS = ["张伟", "欣怡", "王子", "浩然", "李明轩", "梓涵"]
+BATCH_SIZE = 5000
+
+
+def random_name(rng):
+    given = ''.join(rng.choice(GIVEN_CHARS) for _ in range(rng.choice((1, 2))))
+    return rng.choice(SURNAMES) + given
+
+
+def create_schema(cursor, database):
+    cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+    cursor.execute(f"CREATE DATABASE `{database}` DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+    cursor.execute(f"USE `{database}`")
+    cursor.execute("""
+    CREATE TABLE Player (
+        student_id VARCHAR(20) PRIMARY KEY,
+        name VARCHAR(20) NOT NULL,
+        gender ENUM('男', '女') NOT NULL,
+        grade VARCHAR(10),
+        phone VARCHAR(15),
+        team_id INT NOT NULL,
+        role ENUM('队长', '队员') DEFAULT '队员'
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+
+def populate(connection, cursor, players, seed):
+    rng = random.Random(seed)
+    query = """
+    INSERT INTO Player (student_id, name, gender, grade, phone, team_id, role)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """
+    batch = []
+    for i in range(players):
+        batch.append((
+            f"{2020000000 + i}",
+            random_name(rng),
+            rng.choice(('男', '女')),
+            f"{rng.randint(2019, 2024)}级",
+            f"138{rng.randint(0, 99999999):08d}",
+            rng.randint(1, 2000),
+            '队员'
+        ))
+        if len(batch) == BATCH_SIZE:
+            cursor.executemany(query, batch)
+            connection.commit()
+            batch = []
+    if batch:
+        cursor.executemany(query, batch)
+        connection.commit()
+
+
+def time_query(cursor, query, params, repeat):
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(query, params)
+        rows = len(cursor.fetchall())
+        timings.append(time.perf_counter() - start)
+    return statistics.mean(timings), rows
+
+
+def access_type(cursor, query, params):
+    cursor.execute("EXPLAIN " + query, params)
+    plan = cursor.fetchall()
+    return ', '.join(f"{row['table']}:{row['type']}" for row in plan)
+
+
+def run(args):
+    connection = mysql.connector.connect(
+        host=args.host, user=args.user, password=args.password, charset='utf8mb4'
+    )
+    cursor = connection.cursor(dictionary=True)
+    try:
+        print(f"生成 {args.players} 名球员 ...")
+        create_schema(cursor, args.database)
+        start = time.perf_counter()
+        populate(connection, cursor, args.players, args.seed)
+        print(f"  写入耗时 {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        cursor.execute("ALTER TABLE Player ADD FULLTEXT INDEX ft_player_name (name) WITH PARSER ngram")
+        print(f"  建立全文索引耗时 {time.perf_counter() - start:.1f}s")
+        cursor.execute("ANALYZE TABLE Player")
+        cursor.fetchall()
+
+        like_query = "SELECT student_id, name FROM Player WHERE name LIKE %s"
+        match_query = """
+        SELECT student_id, name, MATCH(name) AGAINST (%s IN BOOLEAN MODE) AS relevance
+        FROM Player
+        WHERE MATCH(name) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY relevance DESC
+        """
+
+        print(f"\n{'关键字':<8}{'LIKE(ms)':>12}{'MATCH(ms)':>12}{'加速':>8}{'LIKE行数':>10}{'MATCH行数':>10}")
+        speedups = []
+        for term in SEARCH_TERMS:
+            if len(term) < NGRAM_TOKEN_SIZE:
+                continue
+            phrase = f'"{term}"'
+            like_time, like_rows = time_query(cursor, like_query, (f"%{term}%",), args.repeat)
+            match_time, match_rows = time_query(cursor, match_query, (phrase, phrase), args.repeat)
+            speedups.append(like_time / match_time)
+            print(f"{term:<8}{like_time * 1000:>12.1f}{match_time * 1000:>12.1f}"
+                  f"{like_time / match_time:>7.1f}x{like_rows:>10}{match_rows:>10}")
+
+        print(f"\n平均加速 {statistics.mean(speedups):.1f}x")
+        print("LIKE  访问类型:", access_type(cursor, like_query, ("%张伟%",)))
+        print("MATCH 访问类型:", access_type(cursor, match_query, ('"张伟"', '"张伟"')))
+    finally:
+        if not args.keep:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+        cursor.close()
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_bench')
+    parser.add_argument('--players', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--keep', action='store_true', help="保留生成的测试数据库")
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""uic.loadUi 与预编译窗体类的界面创建耗时对比
+
+对 ui_pages 下的每个 .ui 文件分别测量：
+  - loadUi：运行时解析 XML（改动前的做法）
+  - 冷启动：清空编译缓存后第一次 load_ui，包括编译和导入
+  - 热启动：窗体类已在内存中，只执行 setupUi
+统计卡片另外连续创建 --cards 张，对比每张卡片的平均耗时。
+
+    python benchmarks/bench_ui.py
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from PyQt6 import uic  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QDialog, QFrame, QMainWindow, QWidget  # noqa: E402
+
+import ui_cache  # noqa: E402
+
+
+# 与应用中加载各 .ui 文件的控件类型一致
+BASE_CLASSES = {
+    'main.ui': QMainWindow,
+    'captain_page.ui': QMainWindow,
+    'add_player_dialog.ui': QDialog,
+    'player_stat_card.ui': QFrame,
+}
+
+
+def time_once(load, path, base):
+    widget = base()
+    start = time.perf_counter()
+    load(path, widget)
+    elapsed = time.perf_counter() - start
+    widget.deleteLater()
+    return elapsed
+
+
+def time_repeated(load, path, base, repeat):
+    return statistics.median(time_once(load, path, base) for _ in range(repeat))
+
+
+def run(args):
+    app = QApplication.instance() or QApplication(sys.argv)
+    shutil.rmtree(ui_cache.CACHE_DIR, ignore_errors=True)
+    ui_cache._form_classes.clear()
+
+    paths = sorted(
+        os.path.join(ui_cache.UI_DIR, name) for name in os.listdir(ui_cache.UI_DIR) if name.endswith('.ui')
+    )
+    print(f"{'文件':<28}{'loadUi(ms)':>12}{'冷启动(ms)':>12}{'热启动(ms)':>12}{'加速':>8}")
+    total_load = total_cold = total_warm = 0.0
+    for path in paths:
+        name = os.path.basename(path)
+        base = BASE_CLASSES.get(name, QWidget)
+        load_time = time_repeated(uic.loadUi, path, base, args.repeat)
+        cold_time = time_once(ui_cache.load_ui, path, base)
+        warm_time = time_repeated(ui_cache.load_ui, path, base, args.repeat)
+        total_load += load_time
+        total_cold += cold_time
+        total_warm += warm_time
+        print(f"{name:<28}{load_time * 1000:>12.2f}{cold_time * 1000:>12.2f}"
+              f"{warm_time * 1000:>12.2f}{load_time / warm_time:>7.1f}x")
+        app.processEvents()
+    print(f"{'合计':<28}{total_load * 1000:>12.2f}{total_cold * 1000:>12.2f}"
+          f"{total_warm * 1000:>12.2f}{total_load / total_warm:>7.1f}x")
+
+    card = os.path.join(ui_cache.UI_DIR, 'player_stat_card.ui')
+    for label, load in (("loadUi", uic.loadUi), ("预编译", ui_cache.load_ui)):
+        start = time.perf_counter()
+        for _ in range(args.cards):
+            time_once(load, card, QFrame)
+        app.processEvents()
+        per_card = (time.perf_counter() - start) / args.cards
+        print(f"统计卡片 {label}: {per_card * 1000:.3f} ms/张（{args.cards} 张）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help="每个文件重复测量的次数")
+    parser.add_argument('--cards', type=int, default=200, help="连续创建的统计卡片数量")
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
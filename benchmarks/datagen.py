@@ -0,0 +1,332 @@
+"""按规模因子生成确定性的测试数据库
+
+用 sql_files 中的建表脚本在单独的数据库中建表，按规模参数批量写入院系、球队、
+球员、赛事、比赛、盘次和参赛球员，再依次执行 indexes.sql、fulltext_index.sql、
+player_stats.sql、standings.sql、ratings.sql、changes.sql 和 trigger.sql。数据在建
+触发器之前写入，比分、盘数、球员统计和积分榜直接算好或由脚本末尾的重建过程生成，
+不逐行触发，变更日志也从空表开始。等级分表为空，需要时执行 ratings.py --rebuild。
+相同的参数和随机种子总是生成相同的数据，不同时间的基准结果可以直接比较。指定
+--sqlite 时生成 SQLite 数据库文件（sqlite_backend.py），不需要 MySQL 服务器。
+
+    python benchmarks/datagen.py --scale 10 --user root --password password
+    python benchmarks/datagen.py --scale 10 --sqlite bench.db
+"""
+import argparse
+import datetime
+import os
+import random
+import re
+import sys
+import time
+
+import mysql.connector
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+SQL_DIR = os.path.join(ROOT, 'sql_files')
+# 建表后依次执行的脚本
+SCHEMA_SCRIPTS = ['indexes.sql', 'fulltext_index.sql', 'player_stats.sql', 'standings.sql', 'ratings.sql',
+                  'changes.sql', 'trigger.sql']
+BATCH_SIZE = 5000
+
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈"
+GIVEN_CHARS = "伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉兰萍红建文辉力鹏宇浩然子轩梓涵一诺欣怡博思雨泽"
+DEPARTMENTS = ["计算机", "电子工程", "自动化", "机械工程", "物理", "化学", "数学", "经济管理",
+               "建筑", "土木工程", "材料", "生命科学", "法学", "新闻传播", "医学", "环境"]
+VENUES = ["综合体育馆", "西体育馆", "气膜馆", "东区体育馆", "紫荆体育馆"]
+GAME_TYPES = ['男单', '女单', '男双', '女双', '混双']
+# 每盘双方出场人数
+PLAYERS_PER_SIDE = {'男单': 1, '女单': 1, '男双': 2, '女双': 2, '混双': 2}
+# 搜索基准使用的关键字，都会在生成的数据中出现
+SEARCH_TERMS = ['张', '欣怡', '计算机', '一队', '联赛', '2023']
+
+
+class Scale:
+    """数据规模；scale 同比放大院系、赛事数量和每个赛事的比赛场数"""
+
+    def __init__(self, scale=1, colleges=None, teams_per_college=3, players_per_team=12,
+                 tournaments=None, matches_per_tournament=None, games_per_match=5):
+        if players_per_team < 4:
+            raise ValueError("每队至少需要4名球员（男女各2名）才能排出双打")
+        self.scale = scale
+        self.colleges = colleges or 8 * scale
+        self.teams_per_college = teams_per_college
+        self.players_per_team = players_per_team
+        self.tournaments = tournaments or 4 * scale
+        self.matches_per_tournament = matches_per_tournament or 60 * scale
+        self.games_per_match = games_per_match
+
+    @property
+    def teams(self):
+        return self.colleges * self.teams_per_college
+
+    def as_dict(self):
+        return {
+            'scale': self.scale,
+            'colleges': self.colleges,
+            'teams': self.teams,
+            'players_per_team': self.players_per_team,
+            'tournaments': self.tournaments,
+            'matches_per_tournament': self.matches_per_tournament,
+            'games_per_match': self.games_per_match,
+        }
+
+
+def random_name(rng):
+    given = ''.join(rng.choice(GIVEN_CHARS) for _ in range(rng.choice((1, 2))))
+    return rng.choice(SURNAMES) + given
+
+
+def college_name(index):
+    base = DEPARTMENTS[index % len(DEPARTMENTS)]
+    suffix = '' if index < len(DEPARTMENTS) else str(index // len(DEPARTMENTS) + 1)
+    return f"{base}{suffix}系"
+
+
+def team_name(college, number):
+    ordinals = "一二三四五六七八九十"
+    ordinal = ordinals[number] if number < len(ordinals) else str(number + 1)
+    return f"{college[:-1]}{ordinal}队"
+
+
+def sql_statements(path, database):
+    """拆分 sql_files 中的脚本，支持 DELIMITER，并把库名换成 database"""
+    with open(path, encoding='utf-8') as f:
+        lines = [line for line in f if not line.lstrip().startswith('--')]
+    text = ''.join(lines).replace('table_tennis_db', database)
+
+    delimiter = ';'
+    statement = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        match = re.match(r'DELIMITER\s+(\S+)', stripped, re.IGNORECASE)
+        if match:
+            delimiter = match.group(1)
+            continue
+        statement.append(line)
+        if stripped.endswith(delimiter):
+            sql = '\n'.join(statement).strip()[:-len(delimiter)].strip()
+            statement = []
+            if sql and not re.match(r'(CREATE DATABASE|USE)\b', sql, re.IGNORECASE):
+                yield sql
+    tail = '\n'.join(statement).strip()
+    if tail:
+        yield tail
+
+
+def run_script(connection, name, database):
+    cursor = connection.cursor()
+    try:
+        for sql in sql_statements(os.path.join(SQL_DIR, name), database):
+            cursor.execute(sql)
+            if cursor.with_rows:
+                cursor.fetchall()
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def insert_rows(connection, cursor, query, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(query, rows[start:start + BATCH_SIZE])
+        connection.commit()
+
+
+def generate(scale, seed):
+    """按规模生成各表的数据，返回 表名 -> 行列表"""
+    rng = random.Random(seed)
+    data = {}
+
+    data['College'] = [
+        (dept_id, college_name(dept_id - 1), random_name(rng), f"010-6278{rng.randint(0, 9999):04d}")
+        for dept_id in range(1, scale.colleges + 1)
+    ]
+
+    teams = []
+    for dept_id, name, _contact, _phone in data['College']:
+        for number in range(scale.teams_per_college):
+            teams.append((len(teams) + 1, team_name(name, number), rng.randint(1990, 2023), dept_id))
+    data['Team'] = teams
+
+    players = []
+    roster = {}  # team_id -> {'男': [...], '女': [...]}
+    for team_id, _name, _year, _dept in teams:
+        roster[team_id] = {'男': [], '女': []}
+        for number in range(scale.players_per_team):
+            student_id = f"{2019000000 + len(players)}"
+            # 男女各半，保证各种盘次类型都能排出球员
+            gender = '男' if number % 2 == 0 else '女'
+            role = '队长' if number == 0 else '队员'
+            players.append((student_id, random_name(rng), gender, f"{rng.randint(2019, 2024)}级",
+                            f"138{rng.randint(0, 99999999):08d}", team_id, role))
+            roster[team_id][gender].append(student_id)
+    data['Player'] = players
+
+    tournaments = []
+    for tournament_id in range(1, scale.tournaments + 1):
+        year = 2019 + (tournament_id - 1) % 6
+        status = '已结束' if year < 2024 else rng.choice(['未开始', '进行中'])
+        tournaments.append((tournament_id, f"{year}年校际乒乓球联赛第{tournament_id}阶段", year, status))
+    data['Tournament'] = tournaments
+
+    matches, games, player_in_game = [], [], []
+    team_ids = [team[0] for team in teams]
+    for tournament_id, _name, year, _status in tournaments:
+        start = datetime.datetime(year, 3, 1, 9, 0)
+        for number in range(scale.matches_per_tournament):
+            match_id = len(matches) + 1
+            home, away = rng.sample(team_ids, 2)
+            scheduled = start + datetime.timedelta(days=number // 4, hours=2 * (number % 4))
+            home_wins = away_wins = 0
+            for game_id in range(1, scale.games_per_match + 1):
+                game_type = GAME_TYPES[(game_id - 1) % len(GAME_TYPES)]
+                home_score, away_score = 11, rng.randint(0, 9)
+                if rng.random() < 0.5:
+                    home_score, away_score = away_score, home_score
+                winner = '主队' if home_score > away_score else '客队'
+                if winner == '主队':
+                    home_wins += 1
+                else:
+                    away_wins += 1
+                games.append((match_id, game_id, game_type, home_score, away_score, winner))
+                for team_id in (home, away):
+                    for student_id in pick_players(rng, roster[team_id], game_type):
+                        player_in_game.append((match_id, game_id, student_id))
+            matches.append((match_id, scheduled, rng.choice(VENUES), tournament_id, home, away,
+                            random_name(rng), f"{home_wins}:{away_wins}", home_wins, away_wins))
+    data['Match'] = matches
+    data['Game'] = games
+    data['Player_In_Game'] = player_in_game
+    return data
+
+
+def pick_players(rng, roster, game_type):
+    if game_type == '混双':
+        return [rng.choice(roster['男']), rng.choice(roster['女'])]
+    pool = roster['男'] if game_type.startswith('男') else roster['女']
+    return rng.sample(pool, PLAYERS_PER_SIDE[game_type])
+
+
+INSERTS = {
+    'College': "INSERT INTO College (dept_id, dept_name, contact_person, phone) VALUES (%s, %s, %s, %s)",
+    'Team': "INSERT INTO Team (team_id, team_name, established_year, dept_id) VALUES (%s, %s, %s, %s)",
+    'Player': """
+        INSERT INTO Player (student_id, name, gender, grade, phone, team_id, role)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """,
+    'Tournament': "INSERT INTO Tournament (tournament_id, tournament_name, year, status) VALUES (%s, %s, %s, %s)",
+    'Match': """
+        INSERT INTO `Match` (match_id, scheduled_time, venue, tournament_id, home_team_id, away_team_id,
+                             referee, final_score, home_wins, away_wins)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    'Game': """
+        INSERT INTO Game (match_id, game_id, game_type, home_score, away_score, winner)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """,
+    'Player_In_Game': "INSERT INTO Player_In_Game (match_id, game_id, student_id) VALUES (%s, %s, %s)",
+}
+
+
+def build_database(connect_kwargs, database, scale, seed, log=print):
+    """删除并重建 database，写入生成的数据，返回各表行数"""
+    connection = mysql.connector.connect(**connect_kwargs)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+        cursor.execute(f"CREATE DATABASE `{database}` DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+        cursor.execute(f"USE `{database}`")
+        run_script(connection, 'create_tables.sql', database)
+
+        data = generate(scale, seed)
+        counts = {}
+        for table, query in INSERTS.items():
+            start = time.perf_counter()
+            insert_rows(connection, cursor, query, data[table])
+            counts[table] = len(data[table])
+            log(f"  {table:<16}{counts[table]:>10} 行  {time.perf_counter() - start:6.1f}s")
+
+        for name in SCHEMA_SCRIPTS:
+            start = time.perf_counter()
+            run_script(connection, name, database)
+            log(f"  {name:<24}{time.perf_counter() - start:6.1f}s")
+        cursor.execute("ANALYZE TABLE College, Team, Player, Tournament, `Match`, Game, Player_In_Game, PlayerStats, "
+                       "TournamentStanding")
+        cursor.fetchall()
+        return counts
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def build_sqlite_database(path, scale, seed, log=print):
+    """删除并重建 SQLite 数据库文件 path，写入与 build_database 相同的数据，返回各表行数"""
+    import sqlite_backend
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    database = sqlite_backend.SqliteDatabase(path)
+    connection = database.connect()
+    cursor = connection.cursor()
+    try:
+        sqlite_backend.create_tables(connection)
+        data = generate(scale, seed)
+        counts = {}
+        for table, query in INSERTS.items():
+            start = time.perf_counter()
+            insert_rows(connection, cursor, query, data[table])
+            counts[table] = len(data[table])
+            log(f"  {table:<16}{counts[table]:>10} 行  {time.perf_counter() - start:6.1f}s")
+
+        # 与 MySQL 相同，数据写入之后再建索引和触发器
+        start = time.perf_counter()
+        sqlite_backend.create_schema_objects(connection)
+        log(f"  {'sqlite_schema.sql':<24}{time.perf_counter() - start:6.1f}s")
+        connection.executescript("ANALYZE")
+        return counts
+    finally:
+        cursor.close()
+        connection.close()
+        database.close()
+
+
+def add_arguments(parser):
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_bench')
+    parser.add_argument('--sqlite', metavar='PATH', help="生成 SQLite 数据库文件，而不是 MySQL 数据库")
+    parser.add_argument('--scale', type=int, default=1, help="规模因子，同比放大院系、赛事和比赛数量")
+    parser.add_argument('--colleges', type=int, help="院系数量（默认 8×scale）")
+    parser.add_argument('--teams-per-college', type=int, default=3)
+    parser.add_argument('--players-per-team', type=int, default=12)
+    parser.add_argument('--tournaments', type=int, help="赛事数量（默认 4×scale）")
+    parser.add_argument('--matches-per-tournament', type=int, help="每个赛事的比赛场数（默认 60×scale）")
+    parser.add_argument('--games-per-match', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=2024)
+
+
+def scale_from_args(args):
+    return Scale(args.scale, args.colleges, args.teams_per_college, args.players_per_team,
+                 args.tournaments, args.matches_per_tournament, args.games_per_match)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    args = parser.parse_args()
+    scale = scale_from_args(args)
+    if args.sqlite:
+        print(f"生成测试数据库 {args.sqlite}: {scale.as_dict()}")
+        build_sqlite_database(args.sqlite, scale, args.seed)
+        return
+    print(f"生成测试数据库 {args.database}: {scale.as_dict()}")
+    build_database({'host': args.host, 'user': args.user, 'password': args.password, 'charset': 'utf8mb4'},
+                   args.database, scale, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""应用查询的延迟基准
+
+先用 datagen.py 按规模因子生成测试数据库，然后逐条计时应用发出的每一条读查询：
+  - 各管理页的加载查询（分页页面为键集分页的第一页和第二页）
+  - 各管理页 build_search_query 生成的搜索查询（LIKE 和全文检索两种模式）
+  - 队长登录、队长页面的所有查询（queries.CAPTAIN_QUERIES）和只读 API 的查询
+  - 参考数据（reference_store.DATASETS）和批量导入使用的名称查找
+每条查询先预热再重复执行，输出 p50/p95 延迟和每秒行数，结果写成 JSON。指定
+--baseline 时与之前的结果比较，p50 变慢超过阈值的查询视为回归，以非零状态退出。
+
+    python benchmarks/run_benchmarks.py --scale 10 --output bench.json
+    python benchmarks/run_benchmarks.py --skip-generate --baseline bench.json
+    python benchmarks/run_benchmarks.py --sqlite bench.db --output bench-sqlite.json
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import datagen  # noqa: E402
+import importer  # noqa: E402
+import main as app  # noqa: E402
+import queries  # noqa: E402
+from database import DatabaseConnection  # noqa: E402
+from reference_store import DATASETS  # noqa: E402
+from table_model import build_keyset_query  # noqa: E402
+
+
+MANAGERS = [
+    app.CollegeManager, app.TeamManager, app.PlayerManager, app.TournamentManager,
+    app.MatchManager, app.GameManager, app.PlayerInGameManager,
+]
+# p50 超过基线多少倍算回归；绝对差值小于 MIN_REGRESSION_MS 的忽略，避免噪声
+DEFAULT_THRESHOLD = 1.5
+MIN_REGRESSION_MS = 1.0
+
+
+class Case:
+    """一条被计时的查询；params 可以是函数，在计时前根据已有结果构造参数"""
+
+    def __init__(self, name, query, params=()):
+        self.name = name
+        self.query = query
+        self.params = params
+
+
+def percentile(values, fraction):
+    """最近秩法求分位数"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def wait_idle(qt_app, managers):
+    """等管理页构造时发出的后台加载完成，避免与计时的查询争用连接"""
+    while any(manager.executor.is_busy() for manager in managers):
+        qt_app.processEvents()
+        time.sleep(0.01)
+
+
+def manager_cases(manager):
+    cls = type(manager).__name__
+    cases = []
+    if manager.page_keys:
+        query, params = build_keyset_query(manager.get_base_query(), manager.page_keys)
+        cases.append(Case(f"{cls}.page1", query, params))
+
+        def second_page(db_conn, query=query, params=params, manager=manager):
+            rows = db_conn.execute_cancellable(query, params)
+            return build_keyset_query(manager.get_base_query(), manager.page_keys, rows[-1] if rows else None)
+        cases.append(Case(f"{cls}.page2", None, second_page))
+    else:
+        cases.append(Case(f"{cls}.load", manager.get_load_query()))
+
+    # build_search_query 按 main.SEARCH_MODE 选择 LIKE 或全文检索
+    modes = ['like'] + (['fulltext'] if manager.fulltext_columns else [])
+    original_mode = app.SEARCH_MODE
+    try:
+        for mode in modes:
+            app.SEARCH_MODE = mode
+            for term in datagen.SEARCH_TERMS:
+                query, params = manager.build_search_query(term)
+                cases.append(Case(f"{cls}.search.{mode}[{term}]", query, tuple(params)))
+    finally:
+        app.SEARCH_MODE = original_mode
+    return cases
+
+
+def captain_cases(db_conn):
+    rows = db_conn.execute_cancellable(
+        "SELECT student_id, team_id FROM Player WHERE role = '队长' ORDER BY student_id LIMIT 1"
+    )
+    team_id, student_id = (rows[0]['team_id'], rows[0]['student_id']) if rows else (1, '')
+    cases = [Case(f"captain.{name}", query, build_params(team_id, student_id))
+             for name, (query, build_params) in queries.CAPTAIN_QUERIES.items()]
+    cases.extend(Case(f"api.{name}", query, build_params(team_id, student_id))
+                 for name, (query, build_params) in queries.API_QUERIES.items())
+    return cases
+
+
+def reference_cases():
+    cases = [Case(f"reference.{name}", dataset.query) for name, dataset in DATASETS.items()]
+    cases.append(Case("importer.team_lookup", importer.TEAM_LOOKUP))
+    cases.append(Case("importer.tournament_lookup", importer.TOURNAMENT_LOOKUP))
+    return cases
+
+
+def time_case(db_conn, case, warmup, repeat):
+    query, params = case.query, case.params
+    if callable(params):
+        query, params = params(db_conn)
+    for _ in range(warmup):
+        db_conn.execute_cancellable(query, params)
+
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(db_conn.execute_cancellable(query, params))
+        timings.append(time.perf_counter() - start)
+
+    p50 = percentile(timings, 0.5)
+    return {
+        'name': case.name,
+        'rows': rows,
+        'repeat': repeat,
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'rows_per_sec': round(rows / p50, 1) if p50 > 0 else None,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """返回 p50 相比基线变慢超过 threshold 倍的查询"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {entry['name']: entry for entry in json.load(f)['results']}
+    regressions = []
+    for entry in results:
+        old = baseline.get(entry['name'])
+        if not old or not old['p50_ms']:
+            continue
+        if (entry['p50_ms'] > old['p50_ms'] * threshold
+                and entry['p50_ms'] - old['p50_ms'] >= MIN_REGRESSION_MS):
+            regressions.append((entry['name'], old['p50_ms'], entry['p50_ms']))
+    return regressions
+
+
+def run(args):
+    scale = datagen.scale_from_args(args)
+    connect_kwargs = {'host': args.host, 'user': args.user, 'password': args.password, 'charset': 'utf8mb4'}
+    counts = None
+    if not args.skip_generate:
+        print(f"生成测试数据库 {args.sqlite or args.database}: {scale.as_dict()}")
+        if args.sqlite:
+            counts = datagen.build_sqlite_database(args.sqlite, scale, args.seed)
+        else:
+            counts = datagen.build_database(connect_kwargs, args.database, scale, args.seed)
+
+    db_conn = DatabaseConnection()
+    if args.sqlite:
+        connected = db_conn.connect_sqlite(args.sqlite)
+    else:
+        connected = db_conn.connect(args.host, args.user, args.password, args.database)
+    if not connected:
+        return 2
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+    # 管理页按相对路径加载 ui_pages 下的界面文件
+    os.chdir(ROOT)
+    try:
+        managers = [cls(db_conn) for cls in MANAGERS]
+        wait_idle(qt_app, managers)
+
+        cases = []
+        for manager in managers:
+            cases.extend(manager_cases(manager))
+        cases.extend(captain_cases(db_conn))
+        cases.extend(reference_cases())
+        if args.filter:
+            cases = [case for case in cases if args.filter in case.name]
+
+        results = []
+        print(f"\n{'查询':<44}{'p50(ms)':>10}{'p95(ms)':>10}{'行数':>8}{'行/秒':>12}")
+        for case in cases:
+            entry = time_case(db_conn, case, args.warmup, args.repeat)
+            results.append(entry)
+            rate = f"{entry['rows_per_sec']:.0f}" if entry['rows_per_sec'] is not None else '-'
+            print(f"{entry['name']:<44}{entry['p50_ms']:>10.2f}{entry['p95_ms']:>10.2f}"
+                  f"{entry['rows']:>8}{rate:>12}")
+    finally:
+        db_conn.close()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'backend': 'sqlite' if args.sqlite else 'mysql',
+            'database': args.sqlite or args.database,
+            'seed': args.seed,
+            'scale': scale.as_dict(),
+            'row_counts': counts,
+            'warmup': args.warmup,
+            'repeat': args.repeat,
+            'statement_cache': db_conn.statement_cache_size > 0,
+        },
+        'results': results,
+    }
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {output}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new in regressions:
+            print(f"[回归] {name}: {old:.2f} ms -> {new:.2f} ms")
+        if regressions:
+            return 1
+        print(f"与 {args.baseline} 相比没有超过 {args.threshold}x 的回归")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    datagen.add_arguments(parser)
+    parser.add_argument('--skip-generate', action='store_true', help="使用已生成的测试数据库")
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--filter', help="只运行名称包含该字符串的查询")
+    parser.add_argument('--output', help="JSON 结果文件")
+    parser.add_argument('--baseline', help="用于比较的历史 JSON 结果")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
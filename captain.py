@@ -1,13 +1,41 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QDialog, QTableWidgetItem, QMessageBox,
-    QHeaderView, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QProgressBar, QFrame, QPushButton
+    QHeaderView, QWidget, QVBoxLayout, QHBoxLayout,
+    QProgressBar, QFrame, QPushButton, QFileDialog
 )
-from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
-from PyQt6 import uic
 import os
 
+import exporter
+import queries
+from card_list import VirtualCardList
+from change_poller import ChangePoller
+from live_search import SEARCH_TIMEOUT_MS, LiveSearch, PrefixResults
+from query_executor import QueryExecutor, BusyIndicator, run_export
+from standings_view import StandingsView
+import ui_cache
+
+
+def _merge_rows(rows, fresh, key, changed, sort_columns):
+    """Replace the rows whose key is in changed with the re-read rows (fresh)
+
+    Rows that were not re-read have been deleted or left the team. Returns None when
+    a re-read row is new or its sort_columns changed: its position depends on the
+    database's ORDER BY and collation, so the caller reloads the list instead.
+    """
+    fresh = {key(row): row for row in fresh}
+    merged = []
+    for row in rows:
+        row_key = key(row)
+        if row_key not in changed:
+            merged.append(row)
+        elif row_key in fresh:
+            new_row = fresh.pop(row_key)
+            if any(new_row[column] != row[column] for column in sort_columns):
+                return None
+            merged.append(new_row)
+    return None if fresh else merged
+
 
 class AddPlayerDialog(QDialog):
     """Add player dialog for team captains"""
@@ -16,7 +44,7 @@ class AddPlayerDialog(QDialog):
         super().__init__(parent)
         # Load UI file
         ui_path = os.path.join(os.path.dirname(__file__), 'ui_pages/add_player_dialog.ui')
-        uic.loadUi(ui_path, self)
+        ui_cache.load_ui(ui_path, self)
 
     def get_values(self):
         """Get input values from the dialog"""
@@ -32,15 +60,16 @@ class AddPlayerDialog(QDialog):
 class PlayerStatCard(QFrame):
     """Custom widget for displaying player statistics in a card format"""
 
-    def __init__(self, player_data, parent=None):
+    def __init__(self, player_data=None, parent=None):
         super().__init__(parent)
 
         # Load UI file
         ui_path = os.path.join(os.path.dirname(__file__), 'ui_pages/player_stat_card.ui')
-        uic.loadUi(ui_path, self)
+        ui_cache.load_ui(ui_path, self)
 
         # Populate with data
-        self.set_player_data(player_data)
+        if player_data is not None:
+            self.set_player_data(player_data)
 
     def set_player_data(self, data):
         """Set player data to the card"""
@@ -58,7 +87,20 @@ class PlayerStatCard(QFrame):
 
         self.winratePercentLabel.setText(f"{win_rate:.1f}%")
         self.winrateProgressBar.setValue(int(win_rate))
-        self.recordLabel.setText(f"{wins}胜 - {losses}负")
+        rating = data.get('rating')
+        rating_text = f"等级分 {rating:.0f}" if rating is not None else "未定级"
+        self.recordLabel.setText(f"{wins}胜 - {losses}负 | {rating_text}")
+        tooltip = [data.get('breakdown') or ''] + data.get('pairs', [])
+        self.setToolTip('\n'.join(line for line in tooltip if line))
+
+
+# In-memory sort keys for the statistics tab, indexed like statsSortCombo
+STATS_SORT_KEYS = [
+    lambda row: (-row['win_rate'], -row['total_games']),  # By win rate
+    lambda row: (-row['total_games'], -row['win_rate']),  # By match count
+    lambda row: row['name'],  # By name
+    lambda row: (row['rating'] is None, -(row['rating'] or 0), -row['total_games']),  # By singles rating
+]
 
 
 class CaptainPage(QMainWindow):
@@ -67,6 +109,7 @@ class CaptainPage(QMainWindow):
     def __init__(self, db_conn, student_id, on_logout_callback=None):
         super().__init__()
         self.db_conn = db_conn
+        self.executor = QueryExecutor(db_conn, self)
         self.student_id = student_id
         self.team_info = self.get_team_info()
         self.on_logout_callback = on_logout_callback
@@ -78,7 +121,19 @@ class CaptainPage(QMainWindow):
 
         # Load UI file
         ui_path = os.path.join(os.path.dirname(__file__), 'ui_pages/captain_page.ui')
-        uic.loadUi(ui_path, self)
+        ui_cache.load_ui(ui_path, self)
+
+        # Last search result per tab, reused while the search text keeps growing.
+        # Match searches also match the team's own name, which is not in the result
+        # rows, so they always go to the database
+        self.player_results = PrefixResults(('student_id', 'name', 'grade'))
+        self.tournament_results = PrefixResults(('tournament_name', 'year'))
+        # Unfiltered rows of the players and matches tabs, merged in place when
+        # the change log reports edits to individual rows
+        self.player_rows = []
+        self.match_rows = []
+        self.change_poller = ChangePoller.for_connection(db_conn)
+        self.change_poller.changed.connect(self.apply_changes)
 
         self.init_ui()
         self.connect_signals()
@@ -109,14 +164,7 @@ class CaptainPage(QMainWindow):
 
     def get_team_info(self):
         """Get team information for the logged-in captain"""
-        query = """
-        SELECT t.team_id, t.team_name, t.established_year, c.dept_name
-        FROM Player p
-        JOIN Team t ON p.team_id = t.team_id
-        JOIN College c ON t.dept_id = c.dept_id
-        WHERE p.student_id = %s AND p.role = '队长'
-        """
-        result = self.db_conn.execute_query(query, (self.student_id,))
+        result = self.db_conn.execute_query(queries.TEAM_INFO, (self.student_id,))
         return result[0] if result else None
 
     def init_ui(self):
@@ -136,33 +184,89 @@ class CaptainPage(QMainWindow):
         self.tournamentsTable.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.matchesTable.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
-        # Set scroll area background
-        self.statsScrollArea.setStyleSheet("background-color: #f5f5f5;")
+        # Replace the stats scroll area with a virtualized list that reuses a small pool of cards
+        self.statsCardList = VirtualCardList(
+            lambda parent: PlayerStatCard(parent=parent),
+            PlayerStatCard.set_player_data,
+            "暂无球员统计数据"
+        )
+        self.statsCardList.setStyleSheet("background-color: #f5f5f5;")
+        self.statsScrollArea.parentWidget().layout().replaceWidget(self.statsScrollArea, self.statsCardList)
+        self.statsScrollArea.deleteLater()
+
+        # Busy indicator shown while background queries are running
+        self.busyIndicator = BusyIndicator(self.executor, self)
+        self.headerTopLayout.insertWidget(self.headerTopLayout.count() - 1, self.busyIndicator)
+
+        # League table of the tournaments the team plays in, with the team's row in bold
+        team_id = self.team_info['team_id']
+        self.standingsTab = StandingsView(self.db_conn, queries.TEAM_TOURNAMENTS,
+                                          queries.team_tournaments_params(team_id), team_id=team_id)
+        self.tabWidget.addTab(self.standingsTab, "积分榜")
+
+        # Export the current tab (including its search filter) to CSV/Parquet
+        self.btnExport = QPushButton("导出")
+        self.btnExport.clicked.connect(self.export_current_tab)
+        self.headerTopLayout.insertWidget(self.headerTopLayout.count() - 1, self.btnExport)
 
     def connect_signals(self):
         """Connect button signals to slots"""
+        # Search as you type; Enter and the search buttons search immediately
+        self.player_search = self._live_search(self.searchPlayerInput, self.btnSearchPlayer,
+                                               self.search_players)
+        self.tournament_search = self._live_search(self.searchTournamentInput, self.btnSearchTournament,
+                                                   self.search_tournaments)
+        self.match_search = self._live_search(self.searchMatchInput, self.btnSearchMatch,
+                                              self.search_matches)
+
         # Players tab
-        self.btnSearchPlayer.clicked.connect(self.search_players)
         self.btnClearPlayerSearch.clicked.connect(self.clear_player_search)
         self.btnAddPlayer.clicked.connect(self.add_player)
         self.btnRemovePlayer.clicked.connect(self.remove_player)
         self.btnRefreshPlayers.clicked.connect(self.load_team_players)
-        self.searchPlayerInput.returnPressed.connect(self.search_players)
 
         # Player stats tab
         self.btnRefreshStats.clicked.connect(self.load_player_statistics)
-        self.statsSortCombo.currentIndexChanged.connect(self.load_player_statistics)
+        self.statsSortCombo.currentIndexChanged.connect(self.sort_player_statistics)
 
         # Tournaments tab
-        self.btnSearchTournament.clicked.connect(self.search_tournaments)
         self.btnClearTournamentSearch.clicked.connect(self.clear_tournament_search)
-        self.searchTournamentInput.returnPressed.connect(self.search_tournaments)
 
         # Matches tab
-        self.btnSearchMatch.clicked.connect(self.search_matches)
         self.btnClearMatchSearch.clicked.connect(self.clear_match_search)
         self.btnRefreshMatches.clicked.connect(self.load_team_matches)
-        self.searchMatchInput.returnPressed.connect(self.search_matches)
+
+    def _live_search(self, line_edit, button, search):
+        """Run search() while typing (debounced), and immediately on Enter or button click"""
+        live_search = LiveSearch(line_edit, parent=self)
+        live_search.search.connect(lambda _text: search())
+        line_edit.returnPressed.connect(lambda: live_search.flush(force=True))
+        button.clicked.connect(lambda: live_search.flush(force=True))
+        return live_search
+
+    def _run_search(self, key, search_text, query, params, results, fill):
+        """Run a search query that can be killed on the server
+
+        When the text extends the previous search, filter the previous result
+        (results, a PrefixResults or None) instead. A newer search or reload with the same key kills this query.
+        """
+        rows = results.lookup(search_text) if results is not None else None
+        if rows is not None:
+            self.executor.cancel(key)
+            fill(rows)
+            return
+
+        def on_result(rows):
+            if results is not None:
+                results.store(search_text, rows)
+            fill(rows)
+
+        self.executor.search(query, params, key=key, timeout_ms=SEARCH_TIMEOUT_MS,
+                             on_result=on_result, on_error=self._show_search_error)
+
+    def _show_search_error(self, message):
+        """Report search failures (e.g. timeouts) without interrupting typing"""
+        self.statusBar().showMessage(f"搜索失败: {message}", 5000)
 
     def load_all_data(self):
         """Load all data on initialization"""
@@ -173,13 +277,13 @@ class CaptainPage(QMainWindow):
 
     def load_team_players(self):
         """Load all team players"""
-        query = """
-        SELECT student_id, name, gender, grade, phone, role
-        FROM Player
-        WHERE team_id = %s
-        ORDER BY role DESC, name
-        """
-        self._populate_players_table(query, (self.team_info['team_id'],))
+        self.player_results.clear()
+        self.executor.query(queries.TEAM_PLAYERS, (self.team_info['team_id'],), key='players',
+                            on_result=self._show_team_players)
+
+    def _show_team_players(self, data):
+        self.player_rows = data
+        self._fill_players_table(data)
 
     def search_players(self):
         """Search players by student ID, name, or grade"""
@@ -189,28 +293,21 @@ class CaptainPage(QMainWindow):
             self.load_team_players()
             return
 
-        query = """
-        SELECT student_id, name, gender, grade, phone, role
-        FROM Player
-        WHERE team_id = %s
-        AND (student_id LIKE %s OR name LIKE %s OR grade LIKE %s)
-        ORDER BY role DESC, name
-        """
         search_pattern = f"%{search_text}%"
-        self._populate_players_table(
-            query,
-            (self.team_info['team_id'], search_pattern, search_pattern, search_pattern)
+        self._run_search(
+            'players', search_text, queries.SEARCH_TEAM_PLAYERS,
+            (self.team_info['team_id'], search_pattern, search_pattern, search_pattern),
+            self.player_results, self._fill_players_table
         )
 
     def clear_player_search(self):
         """Clear player search and reload all players"""
         self.searchPlayerInput.clear()
+        self.player_search.reset()
         self.load_team_players()
 
-    def _populate_players_table(self, query, params):
-        """Helper method to populate players table"""
-        data = self.db_conn.execute_query(query, params)
-
+    def _fill_players_table(self, data):
+        """Fill the players table once the query returns"""
         self.playersTable.setRowCount(len(data))
         for row_idx, row_data in enumerate(data):
             self.playersTable.setItem(row_idx, 0, QTableWidgetItem(row_data['student_id']))
@@ -221,87 +318,43 @@ class CaptainPage(QMainWindow):
             self.playersTable.setItem(row_idx, 5, QTableWidgetItem(row_data['role']))
 
     def load_player_statistics(self):
-        """Load player win rate statistics"""
-        # Determine sort order
+        """Load player win rate statistics and ratings"""
+        self.executor.submit(self._fetch_player_statistics, self.team_info['team_id'], key='stats',
+                             on_result=self._show_player_cards)
+
+    def _fetch_player_statistics(self, team_id):
+        """Runs in the background: statistics rows, each with its doubles pair ratings in 'pairs'"""
+        rows = self.db_conn.execute_query(queries.PLAYER_STATS, (team_id,))
+        partners = {}
+        for pair in self.db_conn.execute_query(queries.TEAM_PAIR_RATINGS, (team_id, team_id)):
+            for student_id, partner in ((pair['student_id_1'], pair['name_2']),
+                                        (pair['student_id_2'], pair['name_1'])):
+                partners.setdefault(student_id, []).append(
+                    f"搭档 {partner}: 等级分 {pair['rating']:.0f}（{pair['games']}盘）"
+                )
+        for row in rows:
+            row['pairs'] = partners.get(row['student_id'], [])
+        return rows
+
+    def _show_player_cards(self, data):
+        """Show the statistics once the query returns"""
+        for player_data in data:
+            # Rename 'total_games' to 'total_matches' for the card display
+            player_data['total_matches'] = player_data['total_games']
+        self.statsCardList.set_rows(data)
+        self.sort_player_statistics()
+
+    def sort_player_statistics(self):
+        """Re-sort the loaded statistics without querying the database again"""
         sort_index = self.statsSortCombo.currentIndex()
-        if sort_index == 0:  # By win rate
-            order_by = "win_rate DESC, total_games DESC"
-        elif sort_index == 1:  # By match count
-            order_by = "total_games DESC, win_rate DESC"
-        else:  # By name
-            order_by = "p.name"
-
-        query = f"""
-        SELECT 
-            p.student_id,
-            p.name,
-            p.gender,
-            p.role,
-            COUNT(DISTINCT CONCAT(pig.match_id, '-', pig.game_id)) as total_games,
-            SUM(CASE 
-                WHEN (g.winner = '主队' AND m.home_team_id = p.team_id) 
-                  OR (g.winner = '客队' AND m.away_team_id = p.team_id) 
-                THEN 1 
-                ELSE 0 
-            END) as wins,
-            SUM(CASE 
-                WHEN (g.winner = '客队' AND m.home_team_id = p.team_id) 
-                  OR (g.winner = '主队' AND m.away_team_id = p.team_id) 
-                THEN 1 
-                ELSE 0 
-            END) as losses,
-            CASE 
-                WHEN COUNT(DISTINCT CONCAT(pig.match_id, '-', pig.game_id)) = 0 THEN 0
-                ELSE (SUM(CASE 
-                    WHEN (g.winner = '主队' AND m.home_team_id = p.team_id) 
-                      OR (g.winner = '客队' AND m.away_team_id = p.team_id) 
-                    THEN 1 
-                    ELSE 0 
-                END) * 100.0 / COUNT(DISTINCT CONCAT(pig.match_id, '-', pig.game_id)))
-            END as win_rate
-        FROM Player p
-        LEFT JOIN Player_In_Game pig ON p.student_id = pig.student_id
-        LEFT JOIN Game g ON pig.match_id = g.match_id AND pig.game_id = g.game_id
-        LEFT JOIN `Match` m ON pig.match_id = m.match_id
-        WHERE p.team_id = %s
-        GROUP BY p.student_id, p.name, p.gender, p.role
-        ORDER BY {order_by}
-        """
-
-        data = self.db_conn.execute_query(query, (self.team_info['team_id'],))
-
-        # Clear existing cards
-        layout = self.statsCardsLayout
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # Add player stat cards
-        if not data:
-            no_data_label = QLabel("暂无球员统计数据")
-            no_data_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_data_label.setStyleSheet("color: #999; font-size: 14pt; padding: 50px;")
-            layout.addWidget(no_data_label)
-        else:
-            for player_data in data:
-                # Rename 'total_games' to 'total_matches' for the card display
-                player_data['total_matches'] = player_data['total_games']
-                card = PlayerStatCard(player_data)
-                layout.addWidget(card)
+        self.statsCardList.sort_rows(STATS_SORT_KEYS[max(0, sort_index)])
 
     def load_team_tournaments(self):
         """Load all tournaments that the team participates in"""
-        query = """
-        SELECT DISTINCT t.tournament_id, t.tournament_name, t.year, t.status
-        FROM Tournament t
-        JOIN `Match` m ON t.tournament_id = m.tournament_id
-        WHERE m.home_team_id = %s OR m.away_team_id = %s
-        ORDER BY t.year DESC, t.tournament_id DESC
-        """
+        self.tournament_results.clear()
         self._populate_tournaments_table(
-            query,
-            (self.team_info['team_id'], self.team_info['team_id'])
+            queries.TEAM_TOURNAMENTS,
+            queries.team_tournaments_params(self.team_info['team_id'])
         )
 
     def search_tournaments(self):
@@ -312,30 +365,25 @@ class CaptainPage(QMainWindow):
             self.load_team_tournaments()
             return
 
-        query = """
-        SELECT DISTINCT t.tournament_id, t.tournament_name, t.year, t.status
-        FROM Tournament t
-        JOIN `Match` m ON t.tournament_id = m.tournament_id
-        WHERE (m.home_team_id = %s OR m.away_team_id = %s)
-        AND (t.tournament_name LIKE %s OR t.year LIKE %s)
-        ORDER BY t.year DESC, t.tournament_id DESC
-        """
         search_pattern = f"%{search_text}%"
-        self._populate_tournaments_table(
-            query,
-            (self.team_info['team_id'], self.team_info['team_id'],
-             search_pattern, search_pattern)
+        self._run_search(
+            'tournaments', search_text, queries.SEARCH_TEAM_TOURNAMENTS,
+            queries.team_tournaments_params(self.team_info['team_id'], search_pattern),
+            self.tournament_results, self._fill_tournaments_table
         )
 
     def clear_tournament_search(self):
         """Clear tournament search and reload all tournaments"""
         self.searchTournamentInput.clear()
+        self.tournament_search.reset()
         self.load_team_tournaments()
 
     def _populate_tournaments_table(self, query, params):
         """Helper method to populate tournaments table"""
-        data = self.db_conn.execute_query(query, params)
+        self.executor.query(query, params, key='tournaments', on_result=self._fill_tournaments_table)
 
+    def _fill_tournaments_table(self, data):
+        """Fill the tournaments table once the query returns"""
         self.tournamentsTable.setRowCount(len(data))
         for row_idx, row_data in enumerate(data):
             self.tournamentsTable.setItem(row_idx, 0, QTableWidgetItem(str(row_data['tournament_id'])))
@@ -345,29 +393,86 @@ class CaptainPage(QMainWindow):
 
     def load_team_matches(self):
         """Load all team matches"""
-        query = """
-        SELECT 
-            m.match_id,
-            m.scheduled_time,
-            m.venue,
-            t.tournament_name,
-            CASE 
-                WHEN m.home_team_id = %s THEN away_t.team_name
-                ELSE home_t.team_name
-            END as opponent,
-            m.final_score,
-            m.referee
-        FROM `Match` m
-        JOIN Tournament t ON m.tournament_id = t.tournament_id
-        JOIN Team home_t ON m.home_team_id = home_t.team_id
-        JOIN Team away_t ON m.away_team_id = away_t.team_id
-        WHERE m.home_team_id = %s OR m.away_team_id = %s
-        ORDER BY m.scheduled_time DESC
-        """
-        self._populate_matches_table(
-            query,
-            (self.team_info['team_id'], self.team_info['team_id'], self.team_info['team_id'])
-        )
+        self.executor.query(queries.TEAM_MATCHES, queries.team_matches_params(self.team_info['team_id']),
+                            key='matches', on_result=self._show_team_matches)
+
+    def _show_team_matches(self, data):
+        self.match_rows = data
+        self._fill_matches_table(data)
+
+    def apply_changes(self, changes):
+        """Update the tabs affected by a write from this page or another session (ChangePoller)"""
+        if changes.reload or 'Team' in changes or 'College' in changes:
+            # Opponent names and team membership may have changed
+            self.refresh_players()
+            self.refresh_matches()
+            self.refresh_tournaments()
+            self.load_player_statistics()
+            return
+
+        student_ids = {key[0] for key in changes.keys('Player', 1)}
+        match_ids = {key[0] for key in changes.keys('Match', 1)}
+        if student_ids:
+            if self.searchPlayerInput.text().strip():
+                self.refresh_players()
+            else:
+                query, params = queries.team_players_by_id(self.team_info['team_id'], sorted(student_ids))
+                self.executor.query(query, params, key='player_changes',
+                                    on_result=lambda rows: self._merge_players(student_ids, rows))
+        if 'Tournament' in changes:
+            self.refresh_matches()
+        elif match_ids:
+            if self.searchMatchInput.text().strip():
+                self.refresh_matches()
+            else:
+                query, params = queries.team_matches_by_id(self.team_info['team_id'], sorted(match_ids))
+                self.executor.query(query, params, key='match_changes',
+                                    on_result=lambda rows: self._merge_matches(match_ids, rows))
+        if 'Tournament' in changes or match_ids:
+            self.refresh_tournaments()
+
+        # Statistics only depend on games played by this team's players
+        team_players = {row['student_id'] for row in self.player_rows}
+        team_matches = {str(row['match_id']) for row in self.match_rows}
+        game_matches = {key[0] for key in changes.keys('Game', 1)} | match_ids
+        if (student_ids
+                or any(key[2] in team_players for key in changes.keys('Player_In_Game'))
+                or game_matches & team_matches):
+            self.load_player_statistics()
+
+    def refresh_players(self):
+        """Reload the players tab, keeping the search filter"""
+        self.player_results.clear()
+        self.search_players()
+
+    def refresh_matches(self):
+        """Reload the matches tab, keeping the search filter"""
+        self.search_matches()
+
+    def refresh_tournaments(self):
+        """Reload the tournaments tab, keeping the search filter"""
+        self.tournament_results.clear()
+        self.search_tournaments()
+
+    def _merge_players(self, student_ids, rows):
+        if self.searchPlayerInput.text().strip():
+            return
+        merged = _merge_rows(self.player_rows, rows, lambda row: row['student_id'], student_ids,
+                             ('role', 'name'))
+        if merged is None:
+            self.load_team_players()
+        else:
+            self._show_team_players(merged)
+
+    def _merge_matches(self, match_ids, rows):
+        if self.searchMatchInput.text().strip():
+            return
+        merged = _merge_rows(self.match_rows, rows, lambda row: str(row['match_id']), match_ids,
+                             ('scheduled_time',))
+        if merged is None:
+            self.load_team_matches()
+        else:
+            self._show_team_matches(merged)
 
     def search_matches(self):
         """Search matches by opponent name or venue"""
@@ -377,42 +482,21 @@ class CaptainPage(QMainWindow):
             self.load_team_matches()
             return
 
-        query = """
-        SELECT 
-            m.match_id,
-            m.scheduled_time,
-            m.venue,
-            t.tournament_name,
-            CASE 
-                WHEN m.home_team_id = %s THEN away_t.team_name
-                ELSE home_t.team_name
-            END as opponent,
-            m.final_score,
-            m.referee
-        FROM `Match` m
-        JOIN Tournament t ON m.tournament_id = t.tournament_id
-        JOIN Team home_t ON m.home_team_id = home_t.team_id
-        JOIN Team away_t ON m.away_team_id = away_t.team_id
-        WHERE (m.home_team_id = %s OR m.away_team_id = %s)
-        AND (home_t.team_name LIKE %s OR away_t.team_name LIKE %s OR m.venue LIKE %s)
-        ORDER BY m.scheduled_time DESC
-        """
         search_pattern = f"%{search_text}%"
-        self._populate_matches_table(
-            query,
-            (self.team_info['team_id'], self.team_info['team_id'], self.team_info['team_id'],
-             search_pattern, search_pattern, search_pattern)
+        self._run_search(
+            'matches', search_text, queries.SEARCH_TEAM_MATCHES,
+            queries.team_matches_params(self.team_info['team_id'], search_pattern),
+            None, self._fill_matches_table
         )
 
     def clear_match_search(self):
         """Clear match search and reload all matches"""
         self.searchMatchInput.clear()
+        self.match_search.reset()
         self.load_team_matches()
 
-    def _populate_matches_table(self, query, params):
-        """Helper method to populate matches table"""
-        data = self.db_conn.execute_query(query, params)
-
+    def _fill_matches_table(self, data):
+        """Fill the matches table once the query returns"""
         self.matchesTable.setRowCount(len(data))
         for row_idx, row_data in enumerate(data):
             self.matchesTable.setItem(row_idx, 0, QTableWidgetItem(str(row_data['match_id'])))
@@ -423,6 +507,52 @@ class CaptainPage(QMainWindow):
             self.matchesTable.setItem(row_idx, 5, QTableWidgetItem(row_data['final_score'] or ''))
             self.matchesTable.setItem(row_idx, 6, QTableWidgetItem(row_data['referee'] or ''))
 
+    def current_tab_query(self):
+        """Return (file name, query, params, labels) for the tab being shown; None if not exportable"""
+        team_id = self.team_info['team_id']
+        tab = self.tabWidget.currentWidget()
+        if tab is self.standingsTab:
+            # Ranked in Python (standings.rank), not a single query
+            return None
+        if tab is self.teamPlayersTab:
+            search_text = self.searchPlayerInput.text().strip()
+            if search_text:
+                pattern = f"%{search_text}%"
+                query, params = queries.SEARCH_TEAM_PLAYERS, (team_id, pattern, pattern, pattern)
+            else:
+                query, params = queries.TEAM_PLAYERS, (team_id,)
+            return 'players', query, params, queries.EXPORT_LABELS['players']
+        if tab is self.playerStatsTab:
+            return 'player_stats', queries.PLAYER_STATS, (team_id,), queries.EXPORT_LABELS['player_stats']
+        if tab is self.tournamentsTab:
+            search_text = self.searchTournamentInput.text().strip()
+            if search_text:
+                query = queries.SEARCH_TEAM_TOURNAMENTS
+                params = queries.team_tournaments_params(team_id, f"%{search_text}%")
+            else:
+                query, params = queries.TEAM_TOURNAMENTS, queries.team_tournaments_params(team_id)
+            return 'tournaments', query, params, queries.EXPORT_LABELS['tournaments']
+        search_text = self.searchMatchInput.text().strip()
+        if search_text:
+            query = queries.SEARCH_TEAM_MATCHES
+            params = queries.team_matches_params(team_id, f"%{search_text}%")
+        else:
+            query, params = queries.TEAM_MATCHES, queries.team_matches_params(team_id)
+        return 'matches', query, params, queries.EXPORT_LABELS['matches']
+
+    def export_current_tab(self):
+        """Stream the current tab's full result to a CSV or Parquet file"""
+        tab_query = self.current_tab_query()
+        if tab_query is None:
+            self.statusBar().showMessage("当前页面不支持导出", 5000)
+            return
+        name, query, params, labels = tab_query
+        path, _ = QFileDialog.getSaveFileName(
+            self, "导出数据", f"{self.team_info['team_name']}_{name}.csv", exporter.FILE_FILTER
+        )
+        if path:
+            run_export(self, self.executor, self.db_conn, query, params, path, labels)
+
     def add_player(self):
         """Add a new player to the team"""
         dialog = AddPlayerDialog(self)
@@ -439,17 +569,13 @@ class CaptainPage(QMainWindow):
             INSERT INTO Player (student_id, name, gender, grade, phone, team_id, role)
             VALUES (%s, %s, %s, %s, %s, %s, '队员')
             """
-            if self.db_conn.execute_update(
-                    query,
-                    (values['student_id'], values['name'], values['gender'],
-                     values['grade'], values['phone'], self.team_info['team_id'])
-            ):
-                QMessageBox.information(self, "成功", "球员添加成功！")
-                self.load_team_players()
-                self.load_player_statistics()
-                self.searchPlayerInput.clear()
-            else:
-                QMessageBox.warning(self, "错误", "添加失败！该学号可能已存在。")
+            self._run_roster_update(
+                query,
+                (values['student_id'], values['name'], values['gender'],
+                 values['grade'], values['phone'], self.team_info['team_id']),
+                "球员添加成功！",
+                "添加失败！该学号可能已存在。"
+            )
 
     def remove_player(self):
         """Remove a player from the team"""
@@ -475,10 +601,21 @@ class CaptainPage(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             query = "DELETE FROM Player WHERE student_id = %s"
-            if self.db_conn.execute_update(query, (student_id,)):
-                QMessageBox.information(self, "成功", "球员移除成功！")
-                self.load_team_players()
-                self.load_player_statistics()
+            self._run_roster_update(query, (student_id,), "球员移除成功！", "移除失败！")
+
+    def _run_roster_update(self, query, params, success_message, failure_message):
+        """Run a roster change in the background and refresh the affected tabs"""
+        def on_result(ok):
+            if ok:
+                QMessageBox.information(self, "成功", success_message)
                 self.searchPlayerInput.clear()
+                if not self.change_poller.poll_now():
+                    self.load_team_players()
+                    self.load_player_statistics()
             else:
-                QMessageBox.warning(self, "错误", "移除失败！")
\ No newline at end of file
+                QMessageBox.warning(self, "错误", failure_message)
+
+        self.executor.update(
+            query, params, on_result=on_result,
+            on_error=lambda message: QMessageBox.critical(self, "数据库错误", f"操作失败！错误信息：{message}")
+        )
\ No newline at end of file
@@ -0,0 +1,115 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QAbstractScrollArea, QLabel
+
+
+CARD_SPACING = 8
+
+
+class VirtualCardList(QAbstractScrollArea):
+    """只为可见区域创建卡片的滚动列表
+
+    所有卡片高度相同（取第一张卡片的 sizeHint），滚动时按偏移量算出可见的行，
+    把卡片池中的卡片重新绑定到这些行上并移动到对应位置。卡片只在池不够用时创建，
+    之后一直复用，刷新数据、重新排序都不会销毁或新建卡片。
+
+    create_card(parent) 创建一张卡片，bind_card(card, row) 把一行数据显示到卡片上。
+    """
+
+    def __init__(self, create_card, bind_card, empty_text='', parent=None):
+        super().__init__(parent)
+        self.create_card = create_card
+        self.bind_card = bind_card
+        self._rows = []
+        self._pool = []
+        self._bound = {}  # 卡片 -> 当前绑定的行
+        self._card_height = None
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFrameShape(QAbstractScrollArea.Shape.NoFrame)
+
+        self.empty_label = QLabel(empty_text, self.viewport())
+        self.empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.empty_label.setStyleSheet("color: #999; font-size: 14pt; padding: 50px;")
+        self.empty_label.hide()
+
+    def set_rows(self, rows):
+        """显示新的一组数据并滚动到顶部"""
+        self._rows = list(rows)
+        self._bound.clear()
+        self.verticalScrollBar().setValue(0)
+        self._update_scroll_range()
+        self._layout_cards()
+
+    def sort_rows(self, key, reverse=False):
+        """在内存中重新排序，不重新查询"""
+        self._rows.sort(key=key, reverse=reverse)
+        self._bound.clear()
+        self.verticalScrollBar().setValue(0)
+        self._layout_cards()
+
+    def rows(self):
+        return self._rows
+
+    def card_count(self):
+        """已创建的卡片数量"""
+        return len(self._pool)
+
+    def _card(self, slot):
+        while len(self._pool) <= slot:
+            card = self.create_card(self.viewport())
+            card.hide()
+            self._pool.append(card)
+        return self._pool[slot]
+
+    def _row_step(self):
+        if self._card_height is None:
+            card = self._card(0)
+            self.bind_card(card, self._rows[0])
+            self._bound[card] = self._rows[0]
+            self._card_height = card.sizeHint().height()
+        return self._card_height + CARD_SPACING
+
+    def _update_scroll_range(self):
+        scroll_bar = self.verticalScrollBar()
+        viewport_height = self.viewport().height()
+        if not self._rows:
+            scroll_bar.setRange(0, 0)
+            return
+        step = self._row_step()
+        scroll_bar.setRange(0, max(0, len(self._rows) * step - viewport_height))
+        scroll_bar.setPageStep(viewport_height)
+        scroll_bar.setSingleStep(max(1, step // 4))
+
+    def _layout_cards(self):
+        self.empty_label.setVisible(not self._rows)
+        if not self._rows:
+            for card in self._pool:
+                card.hide()
+            return
+
+        step = self._row_step()
+        offset = self.verticalScrollBar().value()
+        first = offset // step
+        last = min(len(self._rows), (offset + self.viewport().height()) // step + 1)
+        width = self.viewport().width()
+
+        used = 0
+        for index in range(first, last):
+            card = self._card(used)
+            row = self._rows[index]
+            if self._bound.get(card) is not row:
+                self.bind_card(card, row)
+                self._bound[card] = row
+            card.setGeometry(0, index * step - offset, width, self._card_height)
+            card.show()
+            used += 1
+        for card in self._pool[used:]:
+            card.hide()
+
+    def scrollContentsBy(self, dx, dy):
+        self._layout_cards()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.empty_label.setGeometry(self.viewport().rect())
+        self._update_scroll_range()
+        self._layout_cards()
@@ -0,0 +1,92 @@
+import weakref
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from changes import ChangeLogReader
+from query_executor import QueryExecutor
+from reference_store import ReferenceStore
+
+
+POLL_INTERVAL_MS = 3000
+
+
+class ChangePoller(QObject):
+    """定期在后台读取 ChangeLog，有变更时发出 changed(ChangeSet)
+
+    同一个 DatabaseConnection 的所有页面共用一个实例（for_connection），每次轮询
+    只有一个后台查询。页面写入后调用 poll_now 立即读取自己的修改，不必等下一次
+    定时轮询。发出 changed 之前先让结果缓存和 ReferenceStore 中读取了变化的表的
+    数据失效，其他管理员的修改也会反映到下拉选项中。数据库中没有 ChangeLog 表
+    （未执行 sql_files/changes.sql）时 available 为 False，页面仍按原来的方式整页
+    重新加载。
+    """
+
+    changed = pyqtSignal(object)
+
+    _instances = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def for_connection(cls, db_conn):
+        """只在界面线程中调用"""
+        poller = cls._instances.get(db_conn)
+        if poller is None:
+            poller = cls(db_conn)
+            cls._instances[db_conn] = poller
+        return poller
+
+    def __init__(self, db_conn, interval_ms=POLL_INTERVAL_MS):
+        super().__init__()
+        self.db_conn = db_conn
+        self.reader = ChangeLogReader(db_conn)
+        self.executor = QueryExecutor(db_conn, self)
+        # 读到起始版本之前为 None
+        self.available = None
+        self._polling = False
+        self._poll_again = False
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+        self.executor.submit(self.reader.start, on_result=self._on_started, on_error=self._on_start_failed)
+
+    def _on_started(self, _version):
+        self.available = True
+        self.timer.start()
+
+    def _on_start_failed(self, message):
+        self.available = False
+        print(f"变更日志不可用，页面将整页刷新: {message}")
+
+    def poll_now(self):
+        """立即轮询一次；变更日志不可用（或尚未就绪）时返回 False"""
+        if not self.available:
+            return False
+        self.poll()
+        return True
+
+    def poll(self):
+        if self.db_conn.pool is None:
+            # 连接已关闭（如退出登录）
+            self.timer.stop()
+            return
+        if self._polling:
+            # 正在进行的轮询可能已经错过刚刚提交的修改，结束后再读一次
+            self._poll_again = True
+            return
+        self._polling = True
+        self.executor.submit(self.reader.read, on_result=self._on_changes, on_error=self._on_poll_failed)
+
+    def _on_changes(self, changes):
+        self._polling = False
+        if changes:
+            tables = changes.cache_tables()
+            self.db_conn.result_cache.invalidate(tables)
+            ReferenceStore.for_connection(self.db_conn).invalidate_tables(tables)
+            self.changed.emit(changes)
+        if self._poll_again:
+            self._poll_again = False
+            self.poll()
+
+    def _on_poll_failed(self, message):
+        self._polling = False
+        self._poll_again = False
+        print(f"读取变更失败: {message}")
@@ -0,0 +1,182 @@
+"""表变更版本
+
+sql_files/changes.sql（SQLite 见 sqlite_schema.sql）的触发器把每次写入的表名和主键
+追加到 ChangeLog，change_id 是全局递增的版本号。ChangeLogReader 记住已经读到的
+版本，每次只读取之后的记录，汇总成 ChangeSet 交给打开的页面（change_poller.py），
+页面按主键重新查询变化的行并合并，不必重新加载整页。
+
+  - 没有新记录时每次轮询只执行一条读取主键索引两端的查询
+  - MySQL 的自增值在插入时分配、提交时才可见，并发事务可能让较小的 change_id
+    晚于较大的出现。读到的版本之间缺少的编号先记为空缺，之后的轮询会重新读取
+    这一段，超过 GAP_TIMEOUT 秒仍未出现（事务回滚）才放弃
+  - 新记录超过 MAX_CHANGES 条，或者日志已被清理到读到的版本之后时，ChangeSet
+    的 reload 为 True，页面改为整页重新加载
+  - 日志超过 KEEP_CHANGES 的两倍时删除较早的记录，只保留最近 KEEP_CHANGES 条
+
+    python changes.py --since 0
+    python changes.py --prune
+"""
+import argparse
+import sys
+import time
+
+import queries
+from result_cache import DEPENDENT_TABLES, dependent_closure
+
+
+MAX_CHANGES = 5000
+KEEP_CHANGES = 100000
+GAP_TIMEOUT = 30.0
+
+
+class ChangeSet:
+    """一次轮询读到的变更：表名 -> {主键元组}，主键各部分为字符串"""
+
+    def __init__(self, reload=False):
+        self.reload = reload
+        self.tables = {}
+
+    def __bool__(self):
+        return self.reload or bool(self.tables)
+
+    def __contains__(self, table):
+        return table in self.tables
+
+    def add(self, table, key):
+        self.tables.setdefault(table, set()).add(key)
+
+    def cache_tables(self):
+        """结果缓存和 ReferenceStore 使用的小写表名，包括级联和触发器修改的表；
+        reload 时为全部表"""
+        if self.reload:
+            return dependent_closure(DEPENDENT_TABLES)
+        return dependent_closure(self.tables)
+
+    def keys(self, table, length=None):
+        """表 table 变化的主键；指定 length 时只取前 length 部分（如盘次主键中的比赛ID）"""
+        keys = self.tables.get(table, set())
+        if length is None:
+            return set(keys)
+        return {key[:length] for key in keys}
+
+
+def bounds(db_conn):
+    """(最早, 最新) 的 change_id，日志为空时都为 None"""
+    row = db_conn.execute_cancellable(queries.CHANGE_VERSION)[0]
+    return row['first_id'], row['last_id']
+
+
+def row_key(row):
+    """ChangeLog 一行中的主键元组"""
+    return tuple(value for value in (row['key1'], row['key2'], row['key3']) if value is not None)
+
+
+class ChangeLogReader:
+    """从上次读到的版本开始读取 ChangeLog
+
+    start 和 read 在后台线程中调用，同一时间只能有一个调用。出错时抛出
+    mysql.connector.Error，例如还没有执行 changes.sql 时 start 失败。
+    """
+
+    def __init__(self, db_conn, max_changes=MAX_CHANGES, keep_changes=KEEP_CHANGES,
+                 gap_timeout=GAP_TIMEOUT):
+        self.db_conn = db_conn
+        self.max_changes = max_changes
+        self.keep_changes = keep_changes
+        self.gap_timeout = gap_timeout
+        self.version = None
+        self.gaps = {}  # 尚未出现的 change_id -> 发现空缺的时间
+
+    def start(self):
+        """从当前的最新版本开始，之前的记录不再读取，返回版本号"""
+        _first_id, last_id = bounds(self.db_conn)
+        self.version = last_id or 0
+        self.gaps = {}
+        return self.version
+
+    def read(self):
+        """读取上次之后的变更，返回 ChangeSet（没有变更时为空）"""
+        first_id, last_id = bounds(self.db_conn)
+        now = time.monotonic()
+        for change_id, found in list(self.gaps.items()):
+            if now - found > self.gap_timeout:
+                del self.gaps[change_id]
+
+        changes = ChangeSet()
+        if last_id is None or (last_id <= self.version and not self.gaps):
+            return changes
+        low = min(self.gaps, default=self.version + 1) - 1
+        if first_id > low + 1 or last_id - low > self.max_changes:
+            self.version = last_id
+            self.gaps = {}
+            changes.reload = True
+            self._prune(first_id, last_id)
+            return changes
+
+        seen = set()
+        for row in self.db_conn.execute_cancellable(queries.CHANGES_SINCE, (low, last_id)):
+            change_id = row['change_id']
+            seen.add(change_id)
+            if change_id > self.version or change_id in self.gaps:
+                changes.add(row['table_name'], row_key(row))
+                self.gaps.pop(change_id, None)
+        for change_id in range(self.version + 1, last_id + 1):
+            if change_id not in seen:
+                self.gaps[change_id] = now
+        self.version = max(self.version, last_id)
+        self._prune(first_id, last_id)
+        return changes
+
+    def _prune(self, first_id, last_id):
+        if last_id - first_id >= 2 * self.keep_changes:
+            prune(self.db_conn, last_id - self.keep_changes)
+
+
+def prune(db_conn, up_to=None):
+    """删除 change_id 不超过 up_to 的记录，默认只保留最近 KEEP_CHANGES 条，返回删除的行数"""
+    if up_to is None:
+        _first_id, last_id = bounds(db_conn)
+        if last_id is None:
+            return 0
+        up_to = last_id - KEEP_CHANGES
+    return db_conn.execute_transaction([(queries.PRUNE_CHANGES, (up_to,))])[0]
+
+
+def main():
+    from database import DatabaseConnection
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--since', type=int, help="显示该版本之后的变更")
+    parser.add_argument('--prune', action='store_true', help=f"只保留最近 {KEEP_CHANGES} 条记录")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_db')
+    parser.add_argument('--sqlite', metavar='PATH', help="使用 SQLite 数据库文件，而不是 MySQL")
+    args = parser.parse_args()
+
+    db_conn = DatabaseConnection(pool_size=1)
+    if args.sqlite:
+        connected = db_conn.connect_sqlite(args.sqlite)
+    else:
+        connected = db_conn.connect(args.host, args.user, args.password, args.database)
+    if not connected:
+        return 1
+    try:
+        if args.prune:
+            print(f"已删除 {prune(db_conn)} 条变更记录")
+        if args.since is not None:
+            reader = ChangeLogReader(db_conn, max_changes=sys.maxsize)
+            reader.version = args.since
+            changes = reader.read()
+            for table, keys in sorted(changes.tables.items()):
+                print(f"{table}: {len(keys)} 行")
+        first_id, last_id = bounds(db_conn)
+        print(f"当前版本 {last_id or 0}，日志从 {first_id or 0} 开始")
+    finally:
+        db_conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
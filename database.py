@@ -0,0 +1,594 @@
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import errors
+
+from instrumentation import result_size
+from result_cache import QueryResultCache, read_tables, written_tables
+
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_TIMEOUT = 10.0
+DEFAULT_PING_INTERVAL = 5.0
+# 每个连接缓存的预处理语句数量上限；服务器端总数受 max_prepared_stmt_count 限制
+DEFAULT_STATEMENT_CACHE_SIZE = 64
+# stream_query 每批读取的行数
+DEFAULT_STREAM_CHUNK_SIZE = 2000
+
+# 服务器端错误码：查询超过 MAX_EXECUTION_TIME、查询被 KILL QUERY 中止
+ER_QUERY_TIMEOUT = 3024
+ER_QUERY_INTERRUPTED = 1317
+
+_FIRST_SELECT = re.compile(r'^(\s*\(?\s*SELECT)\b', re.IGNORECASE)
+
+
+class PoolTimeoutError(errors.PoolError):
+    """在超时时间内没有可用连接"""
+
+
+class QueryCancelled(errors.Error):
+    """查询在完成前被 QueryToken.cancel 中止"""
+
+
+class QueryTimeout(errors.Error):
+    """查询超过了最长执行时间"""
+
+
+def with_max_execution_time(query, timeout_ms):
+    """给 SELECT 语句加上 MAX_EXECUTION_TIME 提示，超时后由服务器中止查询"""
+    return _FIRST_SELECT.sub(rf'\1 /*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */', query, count=1)
+
+
+class QueryToken:
+    """可中止的查询
+
+    查询执行期间记录所在连接的ID；cancel 在另一个连接上执行 KILL QUERY，让服务器
+    立即停止扫描，而不只是丢弃结果。查询开始前就被取消时不会执行。
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._connection_id = None
+        self._lock = threading.Lock()
+
+    def attach(self, connection_id):
+        with self._lock:
+            if self.cancelled:
+                raise QueryCancelled("查询已取消")
+            self._connection_id = connection_id
+
+    def detach(self):
+        # 与 cancel 互斥：连接归还连接池之前不会再对它执行 KILL QUERY
+        with self._lock:
+            self._connection_id = None
+
+    def cancel(self, db_conn):
+        """标记为已取消；查询正在执行时在后台线程中中止它"""
+        with self._lock:
+            self.cancelled = True
+            running = self._connection_id is not None
+        if running:
+            threading.Thread(target=self._kill, args=(db_conn,), daemon=True).start()
+
+    def _kill(self, db_conn):
+        with self._lock:
+            if self._connection_id is None:
+                return
+            try:
+                db_conn.kill_query(self._connection_id)
+            except mysql.connector.Error as err:
+                print(f"中止查询失败: {err}")
+
+
+class StatementCache:
+    """单个连接上的预处理语句缓存
+
+    以SQL文本为键保存已经 PREPARE 过的游标，同一条SQL再次执行时直接复用，服务器
+    不必重新解析和生成执行计划。超过容量时关闭最久未使用的游标，释放服务器端的
+    语句。只由持有该连接的线程访问，不需要加锁。
+
+    mysql.connector 的预处理游标按字符串对象是否相同（is）判断是否需要重新
+    PREPARE，动态拼接的SQL每次都是新的对象，所以缓存同时保存第一次执行时的
+    字符串，命中时必须用它执行。
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._cursors = OrderedDict()  # SQL -> (第一次执行的SQL字符串, 游标)
+
+    def cursor(self, raw, query):
+        """返回 (游标, 执行用的SQL字符串, 是否命中缓存)"""
+        entry = self._cursors.get(query)
+        if entry is not None:
+            self._cursors.move_to_end(query)
+            return entry[1], entry[0], True
+
+        cursor = raw.cursor(prepared=True)
+        self._cursors[query] = (query, cursor)
+        if len(self._cursors) > self.capacity:
+            _query, (_text, evicted) = self._cursors.popitem(last=False)
+            evicted.close()
+        return cursor, query, False
+
+    def discard(self, query):
+        """执行出错后丢弃该语句，下次重新 PREPARE"""
+        _text, cursor = self._cursors.pop(query, (None, None))
+        if cursor is not None:
+            try:
+                cursor.close()
+            except errors.Error:
+                pass
+
+    def clear(self):
+        for _text, cursor in self._cursors.values():
+            try:
+                cursor.close()
+            except errors.Error:
+                pass
+        self._cursors.clear()
+
+
+class PooledConnection:
+    """连接池中的单个连接，记录最近一次归还的时间"""
+
+    def __init__(self, raw, statement_cache_size=0):
+        self.raw = raw
+        self.last_used = time.monotonic()
+        self.statements = StatementCache(statement_cache_size) if statement_cache_size > 0 else None
+
+    def close(self):
+        if self.statements:
+            self.statements.clear()
+        try:
+            self.raw.close()
+        except errors.Error:
+            pass
+
+
+class ConnectionPool:
+    """有界连接池
+
+    最多同时借出 ``size`` 个连接，连接在首次需要时才创建；池满时借用方最多等待
+    ``timeout`` 秒。空闲超过 ``ping_interval`` 秒的连接在借出前会先做一次健康
+    检查，失效的连接直接丢弃并重新建立。``connector(**connect_kwargs)`` 用于建立
+    新连接，默认为 mysql.connector.connect。
+    """
+
+    def __init__(self, connect_kwargs, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT,
+                 ping_interval=DEFAULT_PING_INTERVAL, statement_cache_size=0, connector=None):
+        if size < 1:
+            raise ValueError("连接池大小必须大于0")
+        self.connect_kwargs = dict(connect_kwargs)
+        self.connector = connector or mysql.connector.connect
+        self.size = size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.statement_cache_size = statement_cache_size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all = set()
+        self._closed = False
+
+    def _create(self):
+        conn = PooledConnection(self.connector(**self.connect_kwargs), self.statement_cache_size)
+        with self._lock:
+            self._all.add(conn)
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._all.discard(conn)
+        conn.close()
+
+    def _is_healthy(self, conn):
+        if time.monotonic() - conn.last_used < self.ping_interval:
+            return True
+        try:
+            return conn.raw.is_connected()
+        except errors.Error:
+            return False
+
+    def acquire(self, timeout=None):
+        """借出一个连接，超时抛出 PoolTimeoutError"""
+        if self._closed:
+            raise errors.PoolError("连接池已关闭")
+        wait = self.timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=wait):
+            raise PoolTimeoutError(f"等待数据库连接超时（{wait}秒）")
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if self._is_healthy(conn):
+                    return conn
+                self._discard(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard=False):
+        """归还连接；discard 为 True 时关闭该连接而不放回池中"""
+        if discard or self._closed:
+            self._discard(conn)
+        else:
+            conn.last_used = time.monotonic()
+            self._idle.put(conn)
+        self._slots.release()
+
+    @contextmanager
+    def session(self, timeout=None):
+        """借用 PooledConnection 的上下文管理器，出现连接级错误时丢弃该连接"""
+        conn = self.acquire(timeout)
+        discard = False
+        try:
+            yield conn
+        except (errors.InterfaceError, errors.OperationalError):
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """借用底层连接的上下文管理器"""
+        with self.session(timeout) as conn:
+            yield conn.raw
+
+    def close(self):
+        """关闭所有连接"""
+        self._closed = True
+        with self._lock:
+            conns = list(self._all)
+            self._all.clear()
+        for conn in conns:
+            conn.close()
+
+
+class DatabaseConnection:
+    """数据库连接管理类
+
+    所有窗口共享同一个实例，查询通过连接池执行，可以在多个线程中并发调用。
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, pool_timeout=DEFAULT_POOL_TIMEOUT,
+                 ping_interval=DEFAULT_PING_INTERVAL, statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE,
+                 result_cache=None, instrumentation=None):
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.ping_interval = ping_interval
+        # 为 0 时不使用预处理语句，每次执行都新建普通游标
+        self.statement_cache_size = statement_cache_size
+        # execute_query(cached=True) 使用的结果缓存
+        self.result_cache = result_cache if result_cache is not None else QueryResultCache()
+        # 可选的 instrumentation.QueryInstrumentation，为 None 时不记录调用统计
+        self.instrumentation = instrumentation
+        # 写操作提交后的回调，参数为被修改的表（含级联和触发器修改的表）
+        self._write_listeners = []
+        self.pool = None
+        # connect_sqlite 打开的 sqlite_backend.SqliteDatabase，使用 MySQL 时为 None
+        self.sqlite = None
+        self._stats_lock = threading.Lock()
+        self._statement_hits = 0
+        self._statement_misses = 0
+
+    def connect(self, host='localhost', user='root', password='password', database='table_tennis_db'):
+        pool = ConnectionPool(
+            {
+                'host': host,
+                'user': user,
+                'password': password,
+                'database': database,
+                'charset': 'utf8mb4',
+                # 只读查询不开启事务，每次都读到最新提交的数据；否则连接池中只读不写的
+                # 连接会一直停留在第一次 SELECT 时的 REPEATABLE READ 快照中。写操作
+                # 显式调用 start_transaction
+                'autocommit': True
+            },
+            size=self.pool_size,
+            timeout=self.pool_timeout,
+            ping_interval=self.ping_interval,
+            statement_cache_size=self.statement_cache_size
+        )
+        try:
+            # 预先建立一个连接，用于尽早发现配置错误
+            conn = pool.acquire()
+            pool.release(conn)
+        except mysql.connector.Error as err:
+            print(f"数据库连接错误: {err}")
+            pool.close()
+            return False
+        self.pool = pool
+        return True
+
+    def connect_sqlite(self, path=':memory:', sample_data=False):
+        """改用嵌入式 SQLite 数据库（sqlite_backend.py），不需要 MySQL 服务器
+
+        数据库中还没有表时按 create_tables.sql 建表，sample_data 为 True 时同时导入
+        setup.sql 中的示例数据。内存数据库只能由一个连接读写，连接池大小按 1 处理。
+        """
+        import sqlite_backend
+
+        try:
+            database = sqlite_backend.SqliteDatabase(path)
+        except mysql.connector.Error as err:
+            print(f"数据库连接错误: {err}")
+            return False
+        try:
+            database.initialize(sample_data)
+        except (mysql.connector.Error, OSError) as err:
+            print(f"数据库初始化错误: {err}")
+            database.close()
+            return False
+        # sqlite3 模块自带语句缓存，不使用 StatementCache
+        self.statement_cache_size = 0
+        self.pool = ConnectionPool(
+            {},
+            size=1 if database.memory else self.pool_size,
+            timeout=self.pool_timeout,
+            ping_interval=self.ping_interval,
+            connector=database.connect
+        )
+        self.sqlite = database
+        return True
+
+    def close(self):
+        """关闭连接池"""
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+        if self.sqlite:
+            self.sqlite.close()
+            self.sqlite = None
+
+    def add_write_listener(self, callback):
+        """注册写操作回调，callback(tables) 在执行写操作的线程中调用"""
+        self._write_listeners.append(callback)
+
+    def _after_write(self, query):
+        tables = written_tables(query)
+        self.result_cache.invalidate(tables)
+        for callback in list(self._write_listeners):
+            callback(tables)
+
+    def _record(self, kind, query, start, rows=(), row_count=None, error=False, cached=False):
+        """把一次调用记入埋点统计；rows 为返回的结果，row_count 为影响的行数"""
+        if self.instrumentation is None:
+            return
+        if row_count is None:
+            row_count = len(rows)
+        self.instrumentation.record(kind, query, time.perf_counter() - start, row_count,
+                                    result_size(rows), error, cached)
+
+    def statement_cache_stats(self):
+        """预处理语句缓存的命中情况"""
+        with self._stats_lock:
+            hits, misses = self._statement_hits, self._statement_misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0
+        }
+
+    def _count_statement(self, hit):
+        with self._stats_lock:
+            if hit:
+                self._statement_hits += 1
+            else:
+                self._statement_misses += 1
+
+    @contextmanager
+    def _cursor(self, conn, query, dictionary=False):
+        """取得执行 query 用的 (游标, SQL)：有语句缓存时复用预处理游标，否则新建普通游标
+
+        必须用返回的 SQL 字符串执行，命中缓存时它就是 PREPARE 过的同一个对象。
+        """
+        if conn.statements is None:
+            cursor = conn.raw.cursor(dictionary=dictionary)
+            try:
+                yield cursor, query
+            finally:
+                cursor.close()
+            return
+
+        cursor, text, hit = conn.statements.cursor(conn.raw, query)
+        self._count_statement(hit)
+        try:
+            yield cursor, text
+        except mysql.connector.Error:
+            conn.statements.discard(query)
+            raise
+
+    def execute_query(self, query, params=None, cached=False):
+        """执行查询
+
+        cached 为 True 时优先返回结果缓存，适合下拉选项这类频繁读取、很少修改的
+        查询；通过本连接执行的写操作会使相关缓存失效。
+        """
+        start = time.perf_counter()
+        tables = read_tables(query) if cached else None
+        if tables:
+            key = self.result_cache.make_key(query, params)
+            rows = self.result_cache.get(key)
+            if rows is not None:
+                self._record('query', query, start, rows, cached=True)
+                return rows
+            versions = self.result_cache.versions(tables)
+
+        try:
+            rows = self._fetch_all(query, params)
+        except mysql.connector.Error as err:
+            print(f"查询错误: {err}")
+            self._record('query', query, start, error=True)
+            return []
+
+        self._record('query', query, start, rows)
+        if tables:
+            self.result_cache.put(key, tables, rows, versions)
+        return rows
+
+    def execute_cancellable(self, query, params=None, token=None, timeout_ms=None):
+        """执行可以在服务器端中止的查询，用于边输入边搜索
+
+        timeout_ms 为最长执行时间，超时抛出 QueryTimeout；token 被取消时抛出
+        QueryCancelled。其他错误原样抛出。结果不经过结果缓存。
+        """
+        start = time.perf_counter()
+        if timeout_ms:
+            query = with_max_execution_time(query, timeout_ms)
+        try:
+            rows = self._fetch_all(query, params, token)
+        except QueryCancelled:
+            raise
+        except mysql.connector.Error as err:
+            if token is not None and token.cancelled:
+                raise QueryCancelled("查询已取消") from err
+            self._record('search', query, start, error=True)
+            if err.errno == ER_QUERY_TIMEOUT:
+                raise QueryTimeout(f"查询超过 {timeout_ms} ms 未完成") from err
+            raise
+        self._record('search', query, start, rows)
+        return rows
+
+    def stream_query(self, query, params=None, chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+        """流式读取查询结果，用于导出
+
+        生成器：先产出列名列表，之后每次产出不超过 chunk_size 行（元组）。使用非缓冲
+        游标，结果由服务器逐批发送，客户端只保留当前一批，内存占用不随行数增长。
+        读取期间独占一个连接；调用方提前停止迭代时该连接直接丢弃，不再读完剩余结果。
+        """
+        start = time.perf_counter()
+        conn = self.pool.acquire()
+        finished = False
+        total = 0
+        try:
+            cursor = conn.raw.cursor(buffered=False)
+            cursor.execute(query, params or ())
+            yield list(cursor.column_names)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                total += len(rows)
+                yield rows
+            cursor.close()
+            finished = True
+        finally:
+            # 没有读完的非缓冲结果会让连接无法继续使用
+            self.pool.release(conn, discard=not finished)
+            self._record('export', query, start, row_count=total, error=not finished)
+
+    def kill_query(self, connection_id):
+        """中止 connection_id 连接上正在执行的语句
+
+        使用单独建立的连接，连接池全部被慢查询占用时也能立即执行。
+        """
+        connection = self.pool.connector(**self.pool.connect_kwargs)
+        try:
+            cursor = connection.cursor()
+            # KILL 不支持占位符，connection_id 是服务器返回的整数
+            cursor.execute(f"KILL QUERY {int(connection_id)}")
+            cursor.close()
+        finally:
+            connection.close()
+
+    def _fetch_all(self, query, params, token=None):
+        with self.pool.session() as conn:
+            if token is not None:
+                token.attach(conn.raw.connection_id)
+            try:
+                with self._cursor(conn, query, dictionary=True) as (cursor, text):
+                    cursor.execute(text, params or ())
+                    rows = cursor.fetchall()
+                    if conn.statements is None:
+                        return rows
+                    # 预处理游标返回元组，转换成与普通查询一致的字典
+                    columns = cursor.column_names
+                    return [dict(zip(columns, row)) for row in rows]
+            finally:
+                if token is not None:
+                    token.detach()
+
+    def execute_update(self, query, params=None):
+        """执行更新/插入/删除"""
+        start = time.perf_counter()
+        try:
+            with self.pool.session() as conn:
+                with self._cursor(conn, query) as (cursor, text):
+                    try:
+                        conn.raw.start_transaction()
+                        cursor.execute(text, params or ())
+                        conn.raw.commit()
+                        affected = cursor.rowcount
+                    except mysql.connector.Error:
+                        conn.raw.rollback()
+                        raise
+            self._after_write(query)
+            self._record('update', query, start, row_count=affected)
+            return True
+        except mysql.connector.Error as err:
+            print(f"更新错误: {err}")
+            self._record('update', query, start, error=True)
+            return False
+
+    def execute_batch(self, query, rows):
+        """在一个事务中用 executemany 批量写入，返回影响的行数
+
+        与 execute_update 不同，出错时回滚并抛出异常，由调用方决定如何报告。
+        """
+        start = time.perf_counter()
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                connection.start_transaction()
+                cursor.executemany(query, rows)
+                connection.commit()
+                count = cursor.rowcount
+            except mysql.connector.Error:
+                connection.rollback()
+                self._record('batch', query, start, error=True)
+                raise
+            finally:
+                cursor.close()
+        self._after_write(query)
+        self._record('batch', query, start, row_count=count)
+        return count
+
+    def execute_transaction(self, statements):
+        """在一个事务中依次执行 [(SQL, 参数), ...]，返回每条语句影响的行数
+
+        参数为列表时按多行数据用 executemany 执行。与 execute_batch 一样，出错时
+        回滚整个事务并抛出异常。
+        """
+        start = time.perf_counter()
+        script = ';\n'.join(query.strip() for query, _params in statements)
+        counts = []
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                connection.start_transaction()
+                for query, params in statements:
+                    if isinstance(params, list):
+                        cursor.executemany(query, params)
+                    else:
+                        cursor.execute(query, params or ())
+                    counts.append(cursor.rowcount)
+                connection.commit()
+            except mysql.connector.Error:
+                connection.rollback()
+                self._record('transaction', script, start, error=True)
+                raise
+            finally:
+                cursor.close()
+        for query, _params in statements:
+            self._after_write(query)
+        self._record('transaction', script, start, row_count=sum(counts))
+        return counts
@@ -0,0 +1,200 @@
+"""把表格视图的查询结果流式导出为 CSV 或 Parquet
+
+查询在非缓冲游标上执行（DatabaseConnection.stream_query），每次读取 chunk_size
+行写入文件后即丢弃，导出多少行内存占用都基本不变。CSV 使用带 BOM 的 UTF-8，
+Excel 可以直接打开；Parquet 需要安装 pyarrow，每批数据写成一个 row group。
+
+    python exporter.py "SELECT * FROM Player" players.parquet
+"""
+import argparse
+import csv
+import datetime
+import decimal
+import os
+import sys
+
+from database import DEFAULT_STREAM_CHUNK_SIZE
+
+
+FORMATS = {'.csv': 'csv', '.parquet': 'parquet'}
+FILE_FILTER = "CSV 文件 (*.csv);;Parquet 文件 (*.parquet)"
+
+
+def format_for(path):
+    """按扩展名判断导出格式"""
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"不支持的导出格式：{path}（支持 .csv、.parquet）")
+    return fmt
+
+
+class CsvSink:
+    def __init__(self, path, columns, labels=None):
+        self.file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(self.file)
+        labels = labels or {}
+        self.writer.writerow([labels.get(column, column) for column in columns])
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """列类型由数据推断，后续批次出现更宽的类型时提升
+
+    某列在前面的批次中全为空，或者先是整数后来出现小数时，先按提升后的类型把已写入
+    的 row group 逐个重写到新文件，再继续写入，内存中同样只保留一个 row group。
+    没有导出任何行时各列按字符串处理。
+    """
+
+    def __init__(self, path, columns, labels=None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("导出 Parquet 文件需要安装 pyarrow：pip install pyarrow")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        # Parquet 保留数据库列名，便于后续分析脚本直接引用
+        self.columns = columns
+        self.schema = None
+        self.writer = None
+
+    def _common_type(self, current, new):
+        """同一列两批数据的类型合并后的类型"""
+        types = self.pa.types
+        if current == new or types.is_null(new):
+            return current
+        if types.is_null(current):
+            return new
+        if (types.is_integer(current) or types.is_floating(current)) and \
+                (types.is_integer(new) or types.is_floating(new)):
+            return self.pa.float64()
+        return self.pa.string()
+
+    def _promote(self, schema):
+        """按新的 schema 重写已写入的 row group"""
+        self.writer.close()
+        previous = self.path + '.part'
+        os.replace(self.path, previous)
+        try:
+            with self.pq.ParquetFile(previous) as source:
+                self.writer = self.pq.ParquetWriter(self.path, schema)
+                for index in range(source.num_row_groups):
+                    self.writer.write_table(source.read_row_group(index).cast(schema))
+        finally:
+            os.remove(previous)
+        self.schema = schema
+
+    def write(self, rows):
+        table = self.pa.Table.from_arrays(
+            [self.pa.array([_plain(row[index]) for row in rows]) for index in range(len(self.columns))],
+            names=list(self.columns)
+        )
+        if self.schema is None:
+            self.schema = table.schema
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+        else:
+            schema = self.pa.schema([field.with_type(self._common_type(field.type, new_type))
+                                     for field, new_type in zip(self.schema, table.schema.types)])
+            if schema != self.schema:
+                self._promote(schema)
+        self.writer.write_table(table.cast(self.schema))
+
+    def close(self):
+        if self.writer is None:
+            # 没有数据时也写出只有表头的文件
+            self.schema = self.pa.schema([self.pa.field(column, self.pa.string()) for column in self.columns])
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+        self.writer.close()
+
+
+SINKS = {'csv': CsvSink, 'parquet': ParquetSink}
+
+
+def _plain(value):
+    """把 MySQL 驱动返回的值转换成 pyarrow 能识别的类型"""
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if isinstance(value, set):
+        return ','.join(sorted(value))
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return value
+
+
+def export_query(db_conn, query, params, path, labels=None, chunk_size=DEFAULT_STREAM_CHUNK_SIZE,
+                 progress=None, hidden=()):
+    """把查询结果写入 path，返回导出的行数
+
+    labels 为 列名 -> 表头文字（只用于 CSV）；progress(已导出行数) 在每批写入后调用；
+    hidden 为只用于排序、不导出的列（如全文检索的 relevance）。导出失败时删除写了
+    一半的文件。
+    """
+    sink_class = SINKS[format_for(path)]
+    stream = db_conn.stream_query(query, params, chunk_size)
+    sink = None
+    total = 0
+    try:
+        columns = next(stream)
+        keep = [index for index, column in enumerate(columns) if column not in hidden]
+        if len(keep) == len(columns):
+            keep = None
+        else:
+            columns = [columns[index] for index in keep]
+        sink = sink_class(path, columns, labels)
+        for rows in stream:
+            if keep is not None:
+                rows = [tuple(row[index] for index in keep) for row in rows]
+            sink.write(rows)
+            total += len(rows)
+            if progress:
+                progress(total)
+        sink.close()
+        sink = None
+    except BaseException:
+        if sink is not None:
+            try:
+                sink.close()
+            except Exception:
+                pass
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    finally:
+        stream.close()
+    return total
+
+
+def main():
+    from database import DatabaseConnection
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('query', help="要导出的 SELECT 语句")
+    parser.add_argument('path', help="输出文件，扩展名为 .csv 或 .parquet")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_STREAM_CHUNK_SIZE)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_db')
+    args = parser.parse_args()
+
+    db_conn = DatabaseConnection(pool_size=1)
+    if not db_conn.connect(args.host, args.user, args.password, args.database):
+        return 1
+    try:
+        total = export_query(db_conn, args.query, (), args.path, chunk_size=args.chunk_size)
+    finally:
+        db_conn.close()
+    print(f"已导出 {total} 行到 {args.path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""批量导入球员名单、赛程和比赛结果
+
+支持 CSV（UTF-8，可带 BOM）和 XLSX 文件，XLSX 需要安装 openpyxl。文件逐行读取，
+每行先按表结构校验（必填列、枚举值、数字范围），通过校验的行按 chunk_size 分批用
+executemany 写入，每批一个事务。校验失败的行跳过并记录行号和原因；某一批写入失败
+时该批回滚并停止导入，之前已提交的批次保留。
+
+表头既可以用数据库列名，也可以用管理页面上的中文列名。球队、赛事可以填写 ID，
+也可以填写名称（如“球队”“主队”“赛事名称”），名称在导入前统一解析为 ID。
+
+    python importer.py players roster.csv
+    python importer.py matches schedule.xlsx --upsert
+"""
+import argparse
+import csv
+import os
+import re
+from datetime import datetime
+
+import mysql.connector
+
+
+DEFAULT_CHUNK_SIZE = 500
+# 校验失败时最多保留的错误条数
+MAX_REPORTED_ERRORS = 200
+
+GENDERS = ('男', '女')
+ROLES = ('队长', '队员')
+GAME_TYPES = ('男单', '女单', '男双', '女双', '混双')
+WINNERS = ('主队', '客队')
+
+# 文本形式的整数，允许 Excel 导出的“3.0”，不接受“3.7”“1e3”
+INTEGER_TEXT = re.compile(r'[+-]?\d+(\.0*)?')
+
+
+class ImportRowError(ValueError):
+    """某一行数据不符合表结构"""
+
+
+class Field:
+    """导入文件中的一列
+
+    kind 为 'text'、'int'、'datetime' 或 'enum'；lookup 为名称列到 ID 的解析方式，
+    即 (名称列名, 查询名称与ID的SQL)，文件中没有 ID 列时使用名称列。
+    """
+
+    def __init__(self, name, label, kind='text', required=False, choices=None, default=None,
+                 min_value=None, max_value=None, aliases=(), lookup=None):
+        self.name = name
+        self.label = label
+        self.kind = kind
+        self.required = required
+        self.choices = choices
+        self.default = default
+        self.min_value = min_value
+        self.max_value = max_value
+        self.aliases = aliases
+        self.lookup = lookup
+
+    def parse(self, value):
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == '':
+            if self.required:
+                raise ImportRowError(f"缺少{self.label}")
+            return self.default
+
+        if self.kind == 'int':
+            if isinstance(value, float):
+                integral = value.is_integer()
+            else:
+                integral = isinstance(value, int) or INTEGER_TEXT.fullmatch(str(value))
+            if not integral:
+                raise ImportRowError(f"{self.label}不是整数: {value}")
+            number = int(float(value))
+            if self.min_value is not None and number < self.min_value:
+                raise ImportRowError(f"{self.label}不能小于{self.min_value}: {number}")
+            if self.max_value is not None and number > self.max_value:
+                raise ImportRowError(f"{self.label}不能大于{self.max_value}: {number}")
+            return number
+
+        if self.kind == 'datetime':
+            if isinstance(value, datetime):
+                return value
+            for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M"):
+                try:
+                    return datetime.strptime(str(value), fmt)
+                except ValueError:
+                    continue
+            raise ImportRowError(f"{self.label}不是有效的时间: {value}")
+
+        # Excel 会把学号、电话这类纯数字读成浮点数
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        value = str(value)
+        if self.kind == 'enum' and value not in self.choices:
+            raise ImportRowError(f"{self.label}必须是 {'/'.join(self.choices)} 之一: {value}")
+        return value
+
+
+TEAM_LOOKUP = "SELECT team_name AS name, team_id AS id FROM Team"
+TOURNAMENT_LOOKUP = "SELECT tournament_name AS name, tournament_id AS id FROM Tournament"
+
+
+class ImportSpec:
+    """一种导入类型：目标表及其各列
+
+    key_columns 为判断重复行的主键或唯一索引列，upsert 时不更新这些列。defaults 为
+    文件中没有、新插入的行使用的固定值（列名 -> SQL 字面量），与界面上添加记录时的
+    默认值一致；upsert 更新已有的行时同样不覆盖这些列。
+    """
+
+    def __init__(self, label, table, fields, key_columns, validate=None, defaults=None):
+        self.label = label
+        self.table = table
+        self.fields = fields
+        self.key_columns = key_columns
+        self.validate = validate
+        self.defaults = defaults or {}
+
+    def insert_query(self, upsert=False):
+        columns = [field.name for field in self.fields]
+        column_list = ', '.join(columns + list(self.defaults))
+        placeholders = ', '.join(['%s'] * len(columns) + list(self.defaults.values()))
+        query = f"INSERT INTO {self.table} ({column_list}) VALUES ({placeholders})"
+        if upsert:
+            updates = ', '.join(f"{column}=VALUES({column})"
+                                for column in columns if column not in self.key_columns)
+            query += f" ON DUPLICATE KEY UPDATE {updates}"
+        return query
+
+
+def _check_match_teams(values):
+    if values['home_team_id'] == values['away_team_id']:
+        raise ImportRowError("主队和客队不能相同")
+
+
+SPECS = {
+    'players': ImportSpec('球员', 'Player', [
+        Field('student_id', '学号', required=True),
+        Field('name', '姓名', required=True),
+        Field('gender', '性别', 'enum', required=True, choices=GENDERS),
+        Field('grade', '年级'),
+        Field('phone', '电话'),
+        Field('team_id', '球队ID', 'int', required=True, lookup=('team_name', TEAM_LOOKUP),
+              aliases=('球队ID',)),
+        Field('role', '角色', 'enum', choices=ROLES, default='队员'),
+    ], key_columns=('student_id',)),
+    'matches': ImportSpec('比赛', '`Match`', [
+        Field('scheduled_time', '比赛时间', 'datetime', required=True),
+        Field('venue', '场地'),
+        Field('tournament_id', '赛事ID', 'int', required=True,
+              lookup=('tournament_name', TOURNAMENT_LOOKUP)),
+        Field('home_team_id', '主队ID', 'int', required=True, lookup=('home_team', TEAM_LOOKUP)),
+        Field('away_team_id', '客队ID', 'int', required=True, lookup=('away_team', TEAM_LOOKUP)),
+        Field('referee', '裁判'),
+    ], key_columns=('tournament_id', 'home_team_id', 'away_team_id', 'scheduled_time'),
+        validate=_check_match_teams, defaults={'final_score': "'0:0'"}),
+    'games': ImportSpec('盘次对决', 'Game', [
+        Field('match_id', '比赛ID', 'int', required=True),
+        Field('game_id', '盘次ID', 'int', required=True, min_value=1, max_value=10),
+        Field('game_type', '比赛类型', 'enum', required=True, choices=GAME_TYPES),
+        Field('home_score', '主队得分', 'int', min_value=0, max_value=255),
+        Field('away_score', '客队得分', 'int', min_value=0, max_value=255),
+        Field('winner', '获胜方', 'enum', choices=WINNERS),
+    ], key_columns=('match_id', 'game_id')),
+    'player_in_game': ImportSpec('参赛球员', 'Player_In_Game', [
+        Field('match_id', '比赛ID', 'int', required=True),
+        Field('game_id', '盘次ID', 'int', required=True, min_value=1, max_value=10),
+        Field('student_id', '学号', required=True),
+    ], key_columns=('match_id', 'game_id', 'student_id')),
+}
+
+# 名称列的中文表头
+LOOKUP_LABELS = {
+    'team_name': ('球队', '球队名称'),
+    'tournament_name': ('赛事', '赛事名称'),
+    'home_team': ('主队',),
+    'away_team': ('客队',),
+}
+
+
+def read_rows(path):
+    """逐行读取 CSV/XLSX 文件，产生 (行号, {表头: 值})"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        yield from _read_xlsx(path)
+    else:
+        yield from _read_csv(path)
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def _read_xlsx(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("导入 Excel 文件需要安装 openpyxl：pip install openpyxl")
+
+    # 只读模式按行流式读取，不会把整个工作簿载入内存
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = ['' if cell is None else str(cell) for cell in header]
+        for line, values in enumerate(rows, start=2):
+            if all(value is None for value in values):
+                continue
+            yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+class ImportReport:
+    """导入结果"""
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors = []  # [(行号, 原因)]
+        self.failure = None  # 写入失败时的数据库错误
+
+    def add_error(self, line, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def summary(self):
+        text = f"成功导入 {self.imported} 行，跳过 {self.skipped} 行"
+        if self.failure:
+            text += f"\n导入中止：{self.failure}"
+        return text
+
+
+class Importer:
+    """把一个文件导入到指定的表"""
+
+    def __init__(self, db_conn, kind, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+        if kind not in SPECS:
+            raise ValueError(f"不支持的导入类型: {kind}")
+        self.db_conn = db_conn
+        self.spec = SPECS[kind]
+        self.chunk_size = chunk_size
+        self.upsert = upsert
+        self._lookups = {}
+
+    def _column_map(self, header):
+        """把文件表头映射到字段名"""
+        names = {}
+        for field in self.spec.fields:
+            for alias in (field.name, field.label) + tuple(field.aliases):
+                names[alias.strip().lower()] = field.name
+            if field.lookup:
+                lookup_column = field.lookup[0]
+                for alias in (lookup_column,) + LOOKUP_LABELS.get(lookup_column, ()):
+                    names[alias.strip().lower()] = lookup_column
+        return {column: names[column.strip().lower()]
+                for column in header if column and column.strip().lower() in names}
+
+    def _resolve(self, field, name):
+        """按名称查找ID，名称不存在或不唯一时报错；查询出错时抛出 mysql.connector.Error"""
+        lookup_column, query = field.lookup
+        if lookup_column not in self._lookups:
+            ids = {}
+            for row in self.db_conn.execute_cancellable(query):
+                ids.setdefault(row['name'], []).append(row['id'])
+            self._lookups[lookup_column] = ids
+        matches = self._lookups[lookup_column].get(str(name).strip(), [])
+        subject = field.label.replace('ID', '')
+        if not matches:
+            raise ImportRowError(f"找不到{subject}: {name}")
+        if len(matches) > 1:
+            raise ImportRowError(f"{subject}名称不唯一，请改用ID: {name}")
+        return matches[0]
+
+    def parse_row(self, row):
+        """校验一行并返回写入参数"""
+        values = {}
+        for field in self.spec.fields:
+            value = row.get(field.name)
+            if (value is None or value == '') and field.lookup and row.get(field.lookup[0]):
+                value = self._resolve(field, row[field.lookup[0]])
+            values[field.name] = field.parse(value)
+        if self.spec.validate:
+            self.spec.validate(values)
+        return tuple(values[field.name] for field in self.spec.fields)
+
+    def run(self, path, progress=None):
+        """导入文件；progress(已导入行数, 已跳过行数) 在每批提交后调用"""
+        report = ImportReport()
+        query = self.spec.insert_query(self.upsert)
+        column_map = None
+        batch = []
+
+        def flush():
+            self.db_conn.execute_batch(query, batch)
+            report.imported += len(batch)
+            batch.clear()
+            if progress:
+                progress(report.imported, report.skipped)
+
+        try:
+            for line, raw in read_rows(path):
+                if column_map is None:
+                    column_map = self._column_map(raw.keys())
+                row = {column_map[column]: value for column, value in raw.items() if column in column_map}
+                try:
+                    batch.append(self.parse_row(row))
+                except ImportRowError as e:
+                    report.add_error(line, str(e))
+                    continue
+                if len(batch) >= self.chunk_size:
+                    flush()
+            if batch:
+                flush()
+        except mysql.connector.Error as err:
+            report.failure = str(err)
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量导入球员名单、赛程和比赛结果")
+    parser.add_argument('kind', choices=sorted(SPECS), help="导入类型")
+    parser.add_argument('path', help="CSV 或 XLSX 文件")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="每个事务写入的行数")
+    parser.add_argument('--upsert', action='store_true',
+                        help="主键已存在（比赛按赛事、主客队和时间判断）时更新该行，而不是报错")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_db')
+    args = parser.parse_args()
+
+    from database import DatabaseConnection
+
+    db_conn = DatabaseConnection(pool_size=1)
+    if not db_conn.connect(args.host, args.user, args.password, args.database):
+        raise SystemExit("无法连接到数据库")
+    try:
+        importer = Importer(db_conn, args.kind, chunk_size=args.chunk_size, upsert=args.upsert)
+        report = importer.run(
+            args.path,
+            progress=lambda imported, skipped: print(f"\r已导入 {imported} 行，跳过 {skipped} 行",
+                                                     end='', flush=True)
+        )
+    finally:
+        db_conn.close()
+
+    print()
+    for line, message in report.errors:
+        print(f"第{line}行: {message}")
+    print(report.summary())
+    if report.failure:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""数据库调用埋点
+
+记录每次 execute_query / execute_update 等调用的耗时、返回（或影响）的行数、
+取回的字节数以及调用位置（如 ``PlayerManager.search_data``），按调用位置和操作
+类型累计直方图。超过阈值的调用追加到慢查询日志（每行一个 JSON），统计结果连同
+add_cache 登记的缓存命中次数可以导出为 JSON 或 Prometheus 文本格式，供看板采集。
+
+查询大多在后台线程中执行，调用栈上已经看不到发起查询的界面方法。QueryExecutor
+在提交任务时记录调用位置，后台线程执行前用 call_site_context 设置，这里优先使用
+该位置，没有时再从当前调用栈中查找。
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+# 直方图桶上界（毫秒）
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+DEFAULT_SLOW_QUERY_MS = 200.0
+METRIC_PREFIX = 'table_tennis_db'
+
+# 查找调用位置时跳过的模块：数据访问层本身
+_INTERNAL_MODULES = {'database', 'query_executor', 'instrumentation', 'result_cache', 'reference_store'}
+_WHITESPACE = re.compile(r'\s+')
+_local = threading.local()
+
+
+def find_call_site(skip_modules=_INTERNAL_MODULES):
+    """调用栈上第一个数据访问层之外的方法，格式为“类名.方法名”或“模块.函数名”"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        name = frame.f_code.co_name
+        if module not in skip_modules and not name.startswith('<'):
+            owner = frame.f_locals.get('self')
+            if owner is not None:
+                return f"{type(owner).__name__}.{name}"
+            return f"{module}.{name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+@contextmanager
+def call_site_context(call_site):
+    """在当前线程中把后续数据库调用归到 call_site"""
+    previous = getattr(_local, 'call_site', None)
+    _local.call_site = call_site
+    try:
+        yield
+    finally:
+        _local.call_site = previous
+
+
+def current_call_site():
+    return getattr(_local, 'call_site', None) or find_call_site()
+
+
+def result_size(rows):
+    """估算结果集的字节数：字符串按 UTF-8 编码长度，其余值按 8 字节计"""
+    total = 0
+    for row in rows:
+        for value in (row.values() if isinstance(row, dict) else row):
+            if isinstance(value, str):
+                total += len(value.encode('utf-8'))
+            elif isinstance(value, (bytes, bytearray)):
+                total += len(value)
+            elif value is not None:
+                total += 8
+    return total
+
+
+class _Series:
+    """某个调用位置、某种操作的累计值"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.cached = 0
+        self.slow = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # 最后一个桶为 +Inf
+
+    def add(self, elapsed_ms, rows, nbytes, error, cached, slow):
+        self.count += 1
+        self.errors += error
+        self.cached += cached
+        self.slow += slow
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        self.bytes += nbytes
+        for index, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def as_dict(self):
+        cumulative = []
+        running = 0
+        for count in self.buckets:
+            running += count
+            cumulative.append(running)
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'cached': self.cached,
+            'slow': self.slow,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'buckets': dict(zip([str(bound) for bound in BUCKETS_MS] + ['+Inf'], cumulative)),
+        }
+
+
+class QueryInstrumentation:
+    """数据库调用的统计与慢查询日志，可在多个线程中并发记录"""
+
+    def __init__(self, slow_query_ms=DEFAULT_SLOW_QUERY_MS, slow_log_path=None):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.started_at = time.time()
+        self._series = {}  # (调用位置, 操作) -> _Series
+        self._caches = {}  # 缓存名称 -> 返回命中统计的函数
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    def record(self, kind, query, elapsed, rows=0, nbytes=0, error=False, cached=False):
+        """记录一次调用；elapsed 为秒，rows 为返回或影响的行数"""
+        call_site = current_call_site()
+        elapsed_ms = elapsed * 1000
+        slow = elapsed_ms >= self.slow_query_ms and not cached
+        with self._lock:
+            series = self._series.get((call_site, kind))
+            if series is None:
+                series = self._series[(call_site, kind)] = _Series()
+            series.add(elapsed_ms, rows, nbytes, error, cached, slow)
+        if slow and self.slow_log_path:
+            self._log_slow(call_site, kind, query, elapsed_ms, rows, nbytes, error)
+
+    def _log_slow(self, call_site, kind, query, elapsed_ms, rows, nbytes, error):
+        # 只记录SQL文本，不记录参数，避免把电话等个人信息写进日志
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'elapsed_ms': round(elapsed_ms, 3),
+            'call_site': call_site,
+            'kind': kind,
+            'rows': rows,
+            'bytes': nbytes,
+            'error': error,
+            'query': _WHITESPACE.sub(' ', query).strip(),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._log_lock:
+            try:
+                directory = os.path.dirname(self.slow_log_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.slow_log_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+            except OSError as e:
+                print(f"写入慢查询日志失败: {e}")
+
+    def add_cache(self, name, stats):
+        """导出统计时附带一个缓存的命中情况；stats() 返回含 hits、misses 的字典"""
+        with self._lock:
+            self._caches[name] = stats
+
+    def snapshot(self):
+        """当前统计：{'started_at', 'slow_query_ms', 'series': [{call_site, kind, ...}], 'caches': {...}}"""
+        with self._lock:
+            series = [dict(call_site=call_site, kind=kind, **data.as_dict())
+                      for (call_site, kind), data in sorted(self._series.items())]
+            caches = dict(self._caches)
+        return {
+            'started_at': self.started_at,
+            'slow_query_ms': self.slow_query_ms,
+            'series': series,
+            'caches': {name: stats() for name, stats in sorted(caches.items())},
+        }
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def to_prometheus(self):
+        """Prometheus 文本格式"""
+        snapshot = self.snapshot()
+        prefix = METRIC_PREFIX
+        lines = [
+            f"# HELP {prefix}_query_duration_seconds Database call latency by call site and kind.",
+            f"# TYPE {prefix}_query_duration_seconds histogram",
+        ]
+        counters = [
+            ('rows', 'rows', "Rows returned or affected."),
+            ('bytes', 'bytes', "Estimated bytes fetched."),
+            ('errors', 'errors', "Failed database calls."),
+            ('cached', 'cache_hits', "Calls answered from the result cache."),
+            ('slow', 'slow_queries', "Calls slower than the slow query threshold."),
+        ]
+        for series in snapshot['series']:
+            labels = f'call_site="{_escape(series["call_site"])}",kind="{_escape(series["kind"])}"'
+            for bound, count in series['buckets'].items():
+                le = bound if bound == '+Inf' else repr(int(bound) / 1000)
+                lines.append(f'{prefix}_query_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{prefix}_query_duration_seconds_sum{{{labels}}} {series['total_ms'] / 1000}")
+            lines.append(f"{prefix}_query_duration_seconds_count{{{labels}}} {series['count']}")
+        for key, name, help_text in counters:
+            lines.append(f"# HELP {prefix}_query_{name}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_query_{name}_total counter")
+            for series in snapshot['series']:
+                labels = f'call_site="{_escape(series["call_site"])}",kind="{_escape(series["kind"])}"'
+                lines.append(f"{prefix}_query_{name}_total{{{labels}}} {series[key]}")
+        for key, help_text in (('hits', "Lookups answered from the cache."), ('misses', "Lookups not in the cache.")):
+            lines.append(f"# HELP {prefix}_cache_{key}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_cache_{key}_total counter")
+            for name, stats in snapshot['caches'].items():
+                lines.append(f'{prefix}_cache_{key}_total{{cache="{_escape(name)}"}} {stats[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path):
+        """写入统计文件，扩展名为 .json 时写 JSON，否则写 Prometheus 文本格式"""
+        if path.endswith('.json'):
+            content = json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+        else:
+            content = self.to_prometheus()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 先写临时文件再改名，采集端不会读到写了一半的文件
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp, path)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
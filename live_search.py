@@ -0,0 +1,75 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from search_index import NgramIndex
+
+
+# 停止输入多久后开始搜索
+SEARCH_DEBOUNCE_MS = 300
+# 边输入边搜索时单条SQL的最长执行时间，超时由服务器中止
+SEARCH_TIMEOUT_MS = 3000
+
+
+class LiveSearch(QObject):
+    """输入框的边输入边搜索
+
+    文本变化后重新计时，delay_ms 内没有新的输入才发出 search(text)，连续输入只
+    触发一次查询。回车或点击搜索按钮时调用 flush 立即搜索。与上一次发出的搜索词
+    相同时不重复搜索。
+    """
+
+    search = pyqtSignal(str)
+
+    def __init__(self, line_edit, delay_ms=SEARCH_DEBOUNCE_MS, parent=None):
+        super().__init__(parent or line_edit)
+        self.line_edit = line_edit
+        self._last_text = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+        line_edit.textChanged.connect(lambda _text: self.timer.start())
+
+    def flush(self, force=False):
+        """立即搜索当前文本；force 为 True 时即使文本没变也重新搜索"""
+        self.timer.stop()
+        text = self.line_edit.text().strip()
+        if force or text != self._last_text:
+            self._last_text = text
+            self.search.emit(text)
+
+    def reset(self, text=''):
+        """外部已经按 text 刷新了结果（如清空搜索后重新加载），取消待发出的搜索"""
+        self.timer.stop()
+        self._last_text = text
+
+
+class PrefixResults:
+    """上一次SQL搜索的完整结果
+
+    新的搜索词包含上一次的搜索词时（通常是在后面继续输入），LIKE '%新词%' 的结果
+    一定是上一次结果的子集，直接在这些行中过滤，不再查询数据库。只适用于按 fields
+    做子串匹配、结果没有截断的查询。
+    """
+
+    def __init__(self, fields=()):
+        self.text = None
+        self.index = NgramIndex()
+        self.index.clear(fields)
+
+    def store(self, text, rows, fields=None):
+        self.text = NgramIndex.normalize(text)
+        self.index.clear(fields)
+        self.index.add_rows(rows)
+
+    def lookup(self, text):
+        """能由上一次结果得到时返回过滤后的行，否则返回 None"""
+        if self.text is None:
+            return None
+        normalized = NgramIndex.normalize(text)
+        if not normalized or self.text not in normalized:
+            return None
+        return self.index.search(text)
+
+    def clear(self):
+        self.text = None
+        self.index.clear()
@@ -3,6 +3,8 @@ from PyQt6.QtGui import QPixmap, QFont
 from PyQt6.QtCore import Qt
 import time
 
+import queries
+
 
 class LoginPage(QWidget):
     def __init__(self, db_conn, on_admin_login, on_captain_login):
@@ -222,13 +224,7 @@ class LoginPage(QWidget):
     def verify_captain_login(self, student_id, password):
         """Verify captain login credentials"""
         # For simplicity, we are using student_id as password
-        query = """
-        SELECT p.student_id, p.name, t.team_name
-        FROM Player p
-        JOIN Team t ON p.team_id = t.team_id
-        WHERE p.student_id = %s AND p.role = '队长'
-        """
-        result = self.db_conn.execute_query(query, (student_id,))
+        result = self.db_conn.execute_query(queries.CAPTAIN_LOGIN, (student_id,))
         if result and password == student_id:  # Simple password check
             return result[0]
         return None
@@ -1,63 +1,57 @@
 import os
+import re
 import sys
-import mysql.connector
+import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
-    QHBoxLayout, QTabWidget, QTableWidget, QTableWidgetItem,
+    QHBoxLayout, QTabWidget, QTableView,
     QPushButton, QLabel, QLineEdit, QComboBox, QMessageBox,
-    QDialog, QFormLayout, QDateTimeEdit, QSpinBox, QAbstractItemView, QHeaderView
+    QDialog, QFormLayout, QDateTimeEdit, QSpinBox, QAbstractItemView, QHeaderView,
+    QFileDialog, QProgressDialog, QListWidget, QListWidgetItem
 )
-from PyQt6.QtCore import Qt, QDateTime
-from PyQt6 import uic
+from PyQt6.QtCore import Qt, QDateTime, QObject, QSettings, QTimer, pyqtSignal
 
 from captain import CaptainPage
+from change_poller import ChangePoller
+from database import DatabaseConnection
+import exporter
+from importer import Importer
+from instrumentation import QueryInstrumentation
+from live_search import SEARCH_TIMEOUT_MS, LiveSearch, PrefixResults
 from login import LoginPage
-
-
-class DatabaseConnection:
-    """数据库连接管理类"""
-
-    def __init__(self):
-        self.connection = None
-
-    def connect(self, host='localhost', user='root', password='password', database='table_tennis_db'):
-        try:
-            self.connection = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database,
-                charset='utf8mb4'
-            )
-            return True
-        except mysql.connector.Error as err:
-            print(f"数据库连接错误: {err}")
-            return False
-
-    def execute_query(self, query, params=None):
-        """执行查询"""
-        try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(query, params or ())
-            results = cursor.fetchall()
-            cursor.close()
-            return results
-        except mysql.connector.Error as err:
-            print(f"查询错误: {err}")
-            return []
-
-    def execute_update(self, query, params=None):
-        """执行更新/插入/删除"""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            self.connection.commit()
-            cursor.close()
-            return True
-        except mysql.connector.Error as err:
-            print(f"更新错误: {err}")
-            self.connection.rollback()
-            return False
+from query_executor import QueryExecutor, BusyIndicator, run_export
+from reference_store import ReferenceStore
+import scheduler
+from table_model import PagedTableModel, build_key_query, build_keyset_query
+import ui_cache
+from search_index import NgramIndex
+from standings_view import StandingsView
+
+
+# 搜索方式：'like' 或 'fulltext'。执行 sql_files/fulltext_index.sql 建立 ngram 全文索引后
+# 可改为 'fulltext'，球员、球队、赛事名称的搜索将改用 MATCH ... AGAINST 并按相关度排序
+SEARCH_MODE = 'like'
+# 与 MySQL 的 ngram_token_size 一致，更短的搜索词无法使用全文索引
+NGRAM_TOKEN_SIZE = 2
+# 全文检索每个分支最多返回的行数
+FULLTEXT_LIMIT = 1000
+# 增量刷新时每条查询最多按多少个主键取行
+CHANGE_BATCH = 500
+
+# 数据库调用埋点：按调用位置统计耗时、行数和字节数，慢查询写入日志，
+# 统计结果定期导出（扩展名 .json 为 JSON，否则为 Prometheus 文本格式）
+INSTRUMENT_QUERIES = False
+SLOW_QUERY_MS = 200
+SLOW_QUERY_LOG = os.path.join('logs', 'slow_queries.log')
+METRICS_FILE = os.path.join('logs', 'db_metrics.prom')
+METRICS_EXPORT_INTERVAL_MS = 15000
+# 输出管理页面创建和管理窗口首次绘制的耗时（调试用）
+LOG_UI_TIMINGS = False
+
+# 数据库后端：'mysql' 或 'sqlite'。'sqlite' 使用本地文件 SQLITE_PATH，不需要 MySQL
+# 服务器，首次运行时自动建表并导入 setup.sql 中的示例数据
+DATABASE_BACKEND = 'mysql'
+SQLITE_PATH = 'table_tennis.db'
 
 
 class AddDialog(QDialog):
@@ -144,9 +138,142 @@ class AddDialog(QDialog):
                         pass
 
 
+class ScheduleDialog(QDialog):
+    """生成循环赛赛程：选择赛事、参赛球队和场地、时间等条件"""
+
+    def __init__(self, tournament_options, team_options, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("生成赛程")
+        self.init_ui(tournament_options, team_options)
+
+    def init_ui(self, tournament_options, team_options):
+        layout = QFormLayout()
+
+        self.cmbTournament = QComboBox()
+        self.cmbTournament.addItems(tournament_options)
+        layout.addRow("赛事", self.cmbTournament)
+
+        # 列表中的顺序即种子顺序，分组时按此顺序蛇形分组
+        self.lstTeams = QListWidget()
+        for option in team_options:
+            item = QListWidgetItem(option)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.lstTeams.addItem(item)
+        btn_all = QPushButton("全选")
+        btn_all.clicked.connect(lambda: self.check_all_teams(Qt.CheckState.Checked))
+        btn_none = QPushButton("全不选")
+        btn_none.clicked.connect(lambda: self.check_all_teams(Qt.CheckState.Unchecked))
+        team_buttons = QHBoxLayout()
+        team_buttons.addWidget(btn_all)
+        team_buttons.addWidget(btn_none)
+        team_buttons.addStretch()
+        team_layout = QVBoxLayout()
+        team_layout.addWidget(self.lstTeams)
+        team_layout.addLayout(team_buttons)
+        layout.addRow("参赛球队", team_layout)
+
+        self.cmbFormat = QComboBox()
+        self.cmbFormat.addItems(["单循环", "双循环"])
+        layout.addRow("赛制", self.cmbFormat)
+        self.spnGroups = QSpinBox()
+        self.spnGroups.setRange(1, 64)
+        layout.addRow("分组数", self.spnGroups)
+
+        self.dteStart = QDateTimeEdit()
+        self.dteStart.setDateTime(QDateTime.currentDateTime().addDays(1))
+        self.dteStart.setCalendarPopup(True)
+        layout.addRow("开始时间", self.dteStart)
+        self.txtTimes = QLineEdit(", ".join(scheduler.DEFAULT_TIMES))
+        layout.addRow("每天开赛时间", self.txtTimes)
+        self.spnMinutes = QSpinBox()
+        self.spnMinutes.setRange(10, 24 * 60)
+        self.spnMinutes.setValue(scheduler.MATCH_MINUTES)
+        layout.addRow("每场时长(分钟)", self.spnMinutes)
+        self.spnPerDay = QSpinBox()
+        self.spnPerDay.setRange(1, 10)
+        self.spnPerDay.setValue(scheduler.MAX_PER_DAY)
+        layout.addRow("每队每天最多场数", self.spnPerDay)
+        self.txtVenues = QLineEdit()
+        self.txtVenues.setPlaceholderText("多个场地用逗号分隔")
+        layout.addRow("场地", self.txtVenues)
+        self.txtReferees = QLineEdit()
+        self.txtReferees.setPlaceholderText("多名裁判用逗号分隔，可以不填")
+        layout.addRow("裁判", self.txtReferees)
+
+        btn_layout = QHBoxLayout()
+        btn_ok = QPushButton("生成")
+        btn_cancel = QPushButton("取消")
+        btn_ok.clicked.connect(self.accept)
+        btn_cancel.clicked.connect(self.reject)
+        btn_layout.addWidget(btn_ok)
+        btn_layout.addWidget(btn_cancel)
+        layout.addRow(btn_layout)
+        self.setLayout(layout)
+
+    def check_all_teams(self, state):
+        for row in range(self.lstTeams.count()):
+            self.lstTeams.item(row).setCheckState(state)
+
+    @staticmethod
+    def split_names(text):
+        return [name for name in re.split(r'[,，、\s]+', text) if name]
+
+    def get_values(self):
+        """读取输入；开赛时间格式不对时抛出 scheduler.ScheduleError"""
+        team_ids = [
+            int(self.lstTeams.item(row).text().split(':')[0])
+            for row in range(self.lstTeams.count())
+            if self.lstTeams.item(row).checkState() == Qt.CheckState.Checked
+        ]
+        return {
+            'tournament_id': self.cmbTournament.currentText().split(':')[0],
+            'team_ids': team_ids,
+            'double': self.cmbFormat.currentIndex() == 1,
+            'groups': self.spnGroups.value(),
+            'start': self.dteStart.dateTime().toPyDateTime().replace(second=0, microsecond=0),
+            'times': scheduler.parse_times(self.split_names(self.txtTimes.text())),
+            'match_minutes': self.spnMinutes.value(),
+            'max_per_day': self.spnPerDay.value(),
+            'venues': self.split_names(self.txtVenues.text()),
+            'referees': self.split_names(self.txtReferees.text()),
+        }
+
+    def accept(self):
+        """在关闭对话框前检查条件，生成本身在后台进行"""
+        try:
+            values = self.get_values()
+            scheduler.grouped_rounds(values['team_ids'], values['groups'])
+            scheduler.SlotPlanner(values['start'], values['times'], values['venues'],
+                                  values['referees'], values['match_minutes'], values['max_per_day'])
+        except scheduler.ScheduleError as e:
+            QMessageBox.warning(self, "错误", str(e))
+            return
+        super().accept()
+
+
+class ImportProgress(QObject):
+    """把后台导入线程的进度转发到界面线程"""
+
+    progress = pyqtSignal(int, int)
+
+
 class TableManager(QWidget):
     """表格管理基类"""
 
+    # 键集分页使用的排序键：(SQL表达式, 结果列名, 是否降序)。为 None 时一次性加载全部数据
+    page_keys = None
+    # 建有 ngram FULLTEXT 索引的搜索列：列索引 -> SQL列
+    fulltext_columns = {}
+    # 批量导入类型（见 importer.SPECS），为 None 时不显示导入按钮
+    import_kind = None
+    # 变更日志（changes.py）中的表 -> 本页面的行里与该表主键（或主键前缀）对应的
+    # (SQL表达式, 结果列名)。这些表变化时只重新读取对应的行并合并
+    change_keys = {}
+    # 这些表变化时整页重新加载：页面显示了它们的名称，或者删除时会级联删除本页的行
+    # （外键级联删除不经过触发器，不会记入变更日志）
+    reload_tables = set()
+
     def __init__(self, db_conn, table_name, columns, ui_file=None, parent=None):
         super().__init__(parent)
         self.db_conn = db_conn
@@ -155,19 +282,60 @@ class TableManager(QWidget):
         self.search_columns = [0]  # Default search column (first column)
         self.current_data = []  # Store current displayed data
         self.all_data = []  # Store all data
+        self.search_index = NgramIndex()  # In-memory index over all_data
+        self.index_complete = False  # Whether the index covers the whole table
+        self.prefix_results = PrefixResults()  # Last complete SQL search result
+        self.live_search = None
+        self.executor = QueryExecutor(db_conn, self)
+        self.references = ReferenceStore.for_connection(db_conn)
+        self.model = PagedTableModel(columns, parent=self)
+        self.model.page_loaded.connect(self.on_page_loaded)
+        self.change_poller = ChangePoller.for_connection(db_conn)
+        self.change_poller.changed.connect(self.apply_changes)
+        self._pending_changes = {}  # 表名 -> 待重新读取的主键
+        self._merging = False
         self.load_ui(ui_file)
+        self.setup_busy_indicator()
+        self.setup_import_button()
+        self.setup_export_button()
         self.init_connections()
         self.load_data()
 
     def load_ui(self, ui_file):
         """加载UI文件"""
         ui_path = os.path.join('ui_pages', ui_file)
-        uic.loadUi(ui_path, self)
+        ui_cache.load_ui(ui_path, self)
+        self.get_table_widget().setModel(self.model)
         self.get_table_widget().horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.get_table_widget().verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        # 固定行高，避免每次追加分页时按内容重新计算所有行
+        self.get_table_widget().verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.get_table_widget().setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.get_table_widget().setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
 
+    def setup_busy_indicator(self):
+        """在按钮栏末尾放置忙碌指示器，后台查询期间显示"""
+        self.busyIndicator = BusyIndicator(self.executor, self)
+        if hasattr(self, 'buttonLayout'):
+            self.buttonLayout.addWidget(self.busyIndicator)
+        elif self.layout():
+            self.layout().insertWidget(0, self.busyIndicator)
+
+    def setup_import_button(self):
+        """支持批量导入的页面在按钮栏增加导入按钮"""
+        if not self.import_kind or not hasattr(self, 'buttonLayout'):
+            return
+        self.btnImport = QPushButton("批量导入")
+        self.btnImport.clicked.connect(self.import_records)
+        self.buttonLayout.insertWidget(self.buttonLayout.indexOf(self.busyIndicator), self.btnImport)
+
+    def setup_export_button(self):
+        """在按钮栏增加导出按钮，导出当前视图（含搜索条件）的全部数据"""
+        if not hasattr(self, 'buttonLayout'):
+            return
+        self.btnExport = QPushButton("导出")
+        self.btnExport.clicked.connect(self.export_records)
+        self.buttonLayout.insertWidget(self.buttonLayout.indexOf(self.busyIndicator), self.btnExport)
+
     def init_connections(self):
         """初始化信号连接"""
         try:
@@ -180,8 +348,16 @@ class TableManager(QWidget):
                 self.btnDelete.clicked.connect(self.delete_record)
             if hasattr(self, 'btnRefresh'):
                 self.btnRefresh.clicked.connect(self.load_data)
+            if hasattr(self, 'txtSearch'):
+                # 边输入边搜索；回车和搜索按钮立即搜索
+                self.live_search = LiveSearch(self.txtSearch, parent=self)
+                self.live_search.search.connect(lambda _text: self.search_data())
+                self.txtSearch.returnPressed.connect(lambda: self.live_search.flush(force=True))
             if hasattr(self, 'btnSearch'):
-                self.btnSearch.clicked.connect(self.search_data)
+                if self.live_search:
+                    self.btnSearch.clicked.connect(lambda: self.live_search.flush(force=True))
+                else:
+                    self.btnSearch.clicked.connect(self.search_data)
             if hasattr(self, 'btnClearSearch'):
                 self.btnClearSearch.clicked.connect(self.clear_search)
 
@@ -196,7 +372,7 @@ class TableManager(QWidget):
             return self.table
         else:
             # 如果都没有，创建默认表格
-            self.table = QTableWidget()
+            self.table = QTableView()
             layout = self.layout()
             if layout:
                 layout.addWidget(self.table)
@@ -211,6 +387,15 @@ class TableManager(QWidget):
     def set_search_columns(self, column_index):
         """设置搜索列索引"""
         self.search_columns = column_index
+        self.prefix_results.clear()
+        # 已加载的数据按新的搜索列重建索引
+        self.search_index.clear(self.get_search_fields())
+        self.search_index.add_rows(self.all_data)
+
+    def get_search_fields(self):
+        """搜索列对应的结果列名"""
+        return [self.columns[index]['name'] for index in self.search_columns
+                if 0 <= index < len(self.columns)]
 
     def get_base_query(self):
         """获取基础查询 - 子类可以重写此方法以提供JOIN查询"""
@@ -218,25 +403,72 @@ class TableManager(QWidget):
 
     def populate_table(self, data):
         """填充表格数据 - 处理字典数据"""
-        table = self.get_table_widget()
-        table.setRowCount(0)
-
-        # Set column headers if not set
-        if table.columnCount() == 0:
-            table.setColumnCount(len(self.columns))
-            headers = [col['label'] for col in self.columns]
-            table.setHorizontalHeaderLabels(headers)
-
-        for row_num, row_data in enumerate(data):
-            table.insertRow(row_num)
-            for col_num, column_info in enumerate(self.columns):
-                column_name = column_info['name']
-                value = row_data.get(column_name, '')
-                item = QTableWidgetItem(str(value))
-                table.setItem(row_num, col_num, item)
-
+        self.model.set_rows(data)
         self.current_data = data
 
+    def current_row(self):
+        """当前选中的行号，未选中时返回 -1"""
+        index = self.get_table_widget().currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def cell_text(self, row, column):
+        """获取指定单元格显示的文本"""
+        return self.model.data(self.model.index(row, column))
+
+    def use_fulltext(self, search_text):
+        """本次搜索是否走全文索引"""
+        return (SEARCH_MODE == 'fulltext'
+                and len(search_text) >= NGRAM_TOKEN_SIZE
+                and any(index in self.fulltext_columns for index in self.search_columns))
+
+    def build_fulltext_query(self, search_text, like_conditions=()):
+        """构建全文检索查询
+
+        每个带 FULLTEXT 索引的搜索列生成一个 UNION ALL 分支，各自走自己的索引，
+        避免 OR 条件导致全表扫描；like_conditions 中没有全文索引的条件各成一个
+        分支（相关度为0）。结果按相关度降序排列，同一行可能出现多次，由
+        on_search_result 去重。
+        """
+        # 短语检索：ngram 分词后要求各个片段相邻出现，效果等同于子串匹配
+        phrase = '"' + search_text.replace('"', ' ') + '"'
+        pattern = f"%{search_text}%"
+        base_query = self.get_base_query().strip()
+        select_end = base_query.index('FROM')
+        select_part = base_query[:select_end].rstrip()
+        from_part = base_query[select_end:]
+
+        branches = []
+        params = []
+        for column_index in self.search_columns:
+            column = self.fulltext_columns.get(column_index)
+            if not column:
+                continue
+            match = f"MATCH({column}) AGAINST (%s IN BOOLEAN MODE)"
+            branches.append(f"({select_part}, {match} AS relevance {from_part} "
+                            f"WHERE {match} ORDER BY relevance DESC LIMIT {FULLTEXT_LIMIT})")
+            params.extend([phrase, phrase])
+
+        for condition in like_conditions:
+            branches.append(f"({select_part}, 0 AS relevance {from_part} "
+                            f"WHERE {condition} LIMIT {FULLTEXT_LIMIT})")
+            params.append(pattern)
+
+        query = " UNION ALL ".join(branches) + " ORDER BY relevance DESC"
+        return query, params
+
+    def unique_rows(self, rows):
+        """按分页键去掉全文检索各分支重复返回的行，保留相关度最高的一条"""
+        if not self.page_keys:
+            return rows
+        seen = set()
+        unique = []
+        for row in rows:
+            key = tuple(row.get(name) for _expr, name, _desc in self.page_keys)
+            if key not in seen:
+                seen.add(key)
+                unique.append(row)
+        return unique
+
     def build_search_query(self, search_text):
         """构建搜索查询SQL"""
         if not self.search_columns:
@@ -268,7 +500,12 @@ class TableManager(QWidget):
         return query, params
 
     def search_data(self):
-        """使用SQL查询进行搜索"""
+        """搜索数据
+
+        全部数据都已加载时直接查内存索引；搜索词是上一次SQL搜索词的延伸时在上一次
+        的结果中过滤；否则才执行SQL查询。SQL搜索可在服务器端中止，新的搜索或重新
+        加载会 KILL 仍在执行的旧查询。
+        """
         search_text = self.get_search_text().strip()
 
         try:
@@ -277,34 +514,283 @@ class TableManager(QWidget):
                 self.load_data()
                 return
 
+            if self.index_complete:
+                self.on_search_result(search_text, self.search_index.search(search_text))
+                return
+
+            rows = self.prefix_results.lookup(search_text)
+            if rows is not None:
+                # 丢弃（并中止）仍在执行的旧搜索，避免其结果覆盖本次结果
+                self.executor.cancel('load')
+                self.on_search_result(search_text, rows)
+                return
+
             # Build and execute search query
             query, params = self.build_search_query(search_text)
 
             params_tuple = tuple(params) if params else ()
-
-            rows = self.db_conn.execute_query(query, params_tuple)
-            print(f"Found {len(rows)} matches")
-            # Convert results to list of dictionaries
-            self.populate_table(rows)
-
-
-            if not rows:
-                QMessageBox.information(self, "搜索结果", f"未找到包含 '{search_text}' 的记录")
+            # 全文检索每个分支有 LIMIT，结果可能不完整，不能用于前缀复用
+            reusable = not self.use_fulltext(search_text)
+
+            def on_result(rows):
+                if reusable:
+                    self.prefix_results.store(search_text, rows, self.get_search_fields())
+                self.on_search_result(search_text, rows)
+
+            # 与 load_data 共用 key，新的搜索会中止尚未返回的旧查询
+            self.executor.search(
+                query, params_tuple, key='load', timeout_ms=SEARCH_TIMEOUT_MS,
+                on_result=on_result,
+                on_error=lambda message: self.show_search_status(f"搜索失败: {message}")
+            )
 
         except Exception as e:
             QMessageBox.critical(self, "搜索错误", f"搜索失败: {e}")
             print(f"Search error: {e}")
 
+    def on_search_result(self, search_text, rows):
+        """搜索结果返回后填充表格"""
+        if rows and 'relevance' in rows[0]:
+            rows = self.unique_rows(rows)
+        self.populate_table(rows)
+
+        # 边输入边搜索时不弹出对话框，结果数量显示在状态栏
+        if rows:
+            self.show_search_status(f"找到 {len(rows)} 条包含 '{search_text}' 的记录")
+        else:
+            self.show_search_status(f"未找到包含 '{search_text}' 的记录")
+
+    def show_search_status(self, message):
+        """在主窗口状态栏显示搜索状态"""
+        window = self.window()
+        if isinstance(window, QMainWindow):
+            window.statusBar().showMessage(message, 5000)
+        else:
+            print(message)
+
     def clear_search(self):
         """清除搜索"""
         if hasattr(self, 'txtSearch'):
             self.txtSearch.clear()
-        self.populate_table(self.all_data)
+        if self.live_search:
+            self.live_search.reset()
+        if self.page_keys:
+            # 恢复分页浏览
+            self.load_data()
+        else:
+            self.populate_table(self.all_data)
+
 
+    def get_load_query(self):
+        """获取加载全部数据的查询 - 子类可以重写此方法以添加排序"""
+        return self.get_base_query()
 
     def load_data(self):
-        """加载数据 - 子类需要实现"""
-        pass
+        """在后台加载数据，完成后填充表格
+
+        定义了 page_keys 的页面按键集分页，视图需要更多行时再取下一页。
+        """
+        self.index_complete = False
+        self.search_index.clear(self.get_search_fields())
+        self.prefix_results.clear()
+        if self.page_keys:
+            self.model.set_source(self.fetch_page)
+            self.all_data = self.model.rows()
+            self.current_data = self.all_data
+        else:
+            self.executor.query(self.get_load_query(), key='load', on_result=self.on_data_loaded)
+
+    def fetch_page(self, after_row, limit, on_page, on_error):
+        """获取 after_row 之后的一页数据"""
+        query, params = build_keyset_query(self.get_base_query(), self.page_keys, after_row, limit)
+        self.executor.query(query, params, key='load', on_result=on_page, on_error=on_error)
+
+    def on_page_loaded(self, rows):
+        """分页数据到达，增量加入搜索索引"""
+        self.search_index.add_rows(rows)
+        if self.model.is_complete():
+            self.index_complete = True
+        self._merge_pending()
+
+    def reload_view(self):
+        """重新加载当前视图：有搜索词时重新搜索，否则从第一页重新加载"""
+        self.index_complete = False
+        self.prefix_results.clear()
+        self.search_data()
+
+    def refresh_changes(self):
+        """写入成功后刷新：立即读取变更日志，只合并变化的行；变更日志不可用时整页重新加载"""
+        if not self.change_poller.poll_now():
+            self.load_data()
+
+    def apply_changes(self, changes):
+        """本页面或其他管理员写入后（ChangePoller.changed）更新已加载的数据"""
+        if (changes.reload or not self.page_keys
+                or any(table in changes for table in self.reload_tables)
+                or (not self.change_keys and self.table_name in changes)):
+            self.reload_view()
+            return
+        tables = [table for table in self.change_keys if table in changes]
+        if not tables:
+            return
+        if self.get_search_text():
+            # 搜索结果不分页，变化的行是否还符合搜索条件由数据库判断
+            self.reload_view()
+            return
+        self.prefix_results.clear()
+        for table in tables:
+            keys = changes.keys(table, len(self.change_keys[table]))
+            self._pending_changes.setdefault(table, set()).update(keys)
+        self._merge_pending()
+
+    def _merge_pending(self):
+        """在后台重新读取待合并的行；同一时间只有一次，正在翻页时等这一页到达"""
+        if self._merging or not self._pending_changes or self.model.is_fetching():
+            return
+        pending, self._pending_changes = self._pending_changes, {}
+        generation = self.model.generation()
+        self._merging = True
+        self.executor.submit(
+            self.fetch_changed_rows, pending,
+            on_result=lambda rows: self.on_changed_rows(generation, pending, rows),
+            on_error=self.on_merge_failed
+        )
+
+    def fetch_changed_rows(self, pending):
+        """后台线程：按变化的主键重新读取本页面的行，已删除的行不会返回"""
+        base_query = self.get_base_query()
+        rows = []
+        for table, keys in pending.items():
+            key_exprs = [expr for expr, _name in self.change_keys[table]]
+            keys = sorted(keys)
+            for start in range(0, len(keys), CHANGE_BATCH):
+                query, params = build_key_query(base_query, key_exprs, keys[start:start + CHANGE_BATCH])
+                rows.extend(self.db_conn.execute_cancellable(query, params))
+        return rows
+
+    def on_changed_rows(self, generation, pending, rows):
+        """用重新读取的行替换已加载的旧行"""
+        self._merging = False
+
+        def is_stale(row):
+            return any(
+                tuple(str(row[name]) for _expr, name in self.change_keys[table]) in keys
+                for table, keys in pending.items()
+            )
+
+        if self.model.merge_rows(generation, is_stale, rows, self.page_keys):
+            self.search_index.clear(self.get_search_fields())
+            self.search_index.add_rows(self.model.rows())
+            self.index_complete = self.model.is_complete()
+        self._merge_pending()
+
+    def on_merge_failed(self, message):
+        print(f"增量刷新失败，重新加载: {message}")
+        self._merging = False
+        self._pending_changes = {}
+        self.reload_view()
+
+    def on_data_loaded(self, data):
+        """数据加载完成"""
+        self.all_data = data
+        self.search_index.clear(self.get_search_fields())
+        self.search_index.add_rows(data)
+        self.index_complete = True
+        self.populate_table(data)
+
+    def run_query(self, query, params=None, on_result=None, cached=True):
+        """在后台执行查询（如对话框需要的下拉选项），结果交给 on_result
+
+        下拉选项默认走结果缓存，连续添加、编辑记录时不必每次重新查询。
+        """
+        self.executor.query(query, params, on_result=on_result, on_error=self.on_db_error,
+                            cached=cached)
+
+    def with_references(self, names, on_result):
+        """在后台取出参考数据中的下拉选项，按 names 的顺序作为参数交给 on_result
+
+        选项来自共享的 ReferenceStore，只在第一次使用或相关表被修改后查询数据库。
+        """
+        self.executor.submit(self.references.options_many, tuple(names),
+                             on_result=lambda options: on_result(*options),
+                             on_error=self.on_db_error)
+
+    def run_update(self, query, params, success_message, failure_message):
+        """在后台执行写操作，成功后提示并重新加载数据"""
+        def on_result(ok):
+            if ok:
+                QMessageBox.information(self, "成功", success_message)
+                self.refresh_changes()
+            else:
+                QMessageBox.warning(self, "错误", failure_message)
+
+        self.executor.update(query, params, on_result=on_result, on_error=self.on_db_error)
+
+    def on_db_error(self, message):
+        """后台任务出现未预期的异常"""
+        QMessageBox.critical(self, "数据库错误", f"操作失败！错误信息：{message}")
+
+    def import_records(self):
+        """从 CSV/XLSX 文件批量导入，导入在后台执行"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "选择导入文件", "", "数据文件 (*.csv *.xlsx);;所有文件 (*)"
+        )
+        if not path:
+            return
+
+        dialog = QProgressDialog("正在导入...", None, 0, 0, self)
+        dialog.setWindowTitle("批量导入")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.show()
+
+        bridge = ImportProgress(dialog)
+        bridge.progress.connect(
+            lambda imported, skipped: dialog.setLabelText(f"已导入 {imported} 行，跳过 {skipped} 行")
+        )
+
+        def on_error(message):
+            dialog.close()
+            self.on_db_error(message)
+
+        importer = Importer(self.db_conn, self.import_kind)
+        self.executor.submit(importer.run, path, bridge.progress.emit,
+                             on_result=lambda report: self.on_import_finished(report, dialog),
+                             on_error=on_error)
+
+    def on_import_finished(self, report, dialog):
+        dialog.close()
+        message = report.summary()
+        if report.errors:
+            lines = [f"第{line}行: {error}" for line, error in report.errors[:20]]
+            if report.skipped > len(lines):
+                lines.append(f"……共 {report.skipped} 行未导入")
+            message += "\n\n" + "\n".join(lines)
+        if report.failure:
+            QMessageBox.critical(self, "导入失败", message)
+        else:
+            QMessageBox.information(self, "导入完成", message)
+        self.refresh_changes()
+
+    def current_query(self):
+        """当前视图对应的完整查询（不分页）：有搜索词时为搜索查询，否则为加载查询"""
+        search_text = self.get_search_text()
+        if search_text:
+            query, params = self.build_search_query(search_text)
+            return query, tuple(params)
+        if self.page_keys:
+            return build_keyset_query(self.get_base_query(), self.page_keys, limit=None)
+        return self.get_load_query(), ()
+
+    def export_records(self):
+        """把当前视图流式导出为 CSV 或 Parquet，导出在后台执行"""
+        path, _ = QFileDialog.getSaveFileName(self, "导出数据", f"{self.table_name}.csv", exporter.FILE_FILTER)
+        if not path:
+            return
+        query, params = self.current_query()
+        labels = {column['name']: column['label'] for column in self.columns}
+        # 全文检索查询附带的 relevance 列只用于排序
+        run_export(self, self.executor, self.db_conn, query, params, path, labels, hidden=('relevance',))
 
     def add_record(self):
         """添加记录 - 子类需要实现"""
@@ -322,6 +808,9 @@ class TableManager(QWidget):
 class CollegeManager(TableManager):
     """院系管理"""
 
+    page_keys = [('dept_id', 'dept_id', False)]
+    change_keys = {'College': [('dept_id', 'dept_id')]}
+
     def __init__(self, db_conn, parent=None):
         columns = [
             {'name': 'dept_id', 'label': '院系编号'},
@@ -334,12 +823,6 @@ class CollegeManager(TableManager):
 
 
 
-    def load_data(self):
-        query = self.get_base_query()
-        data = self.db_conn.execute_query(query)
-        self.all_data = data
-        self.populate_table(data)
-
     def add_record(self):
         fields = {
             'dept_name': {'label': '院系名称', 'type': 'text'},
@@ -350,20 +833,16 @@ class CollegeManager(TableManager):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             values = dialog.get_values()
             query = "INSERT INTO College (dept_name, contact_person, phone) VALUES (%s, %s, %s)"
-            if self.db_conn.execute_update(query, (values['dept_name'], values['contact_person'], values['phone'])):
-                QMessageBox.information(self, "成功", "添加成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "添加失败！")
+            self.run_update(query, (values['dept_name'], values['contact_person'], values['phone']),
+                            "添加成功！", "添加失败！")
 
     def edit_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要编辑的记录！")
             return
 
-        dept_id = table.item(current_row, 0).text()
+        dept_id = self.cell_text(current_row, 0)
         fields = {
             'dept_name': {'label': '院系名称', 'type': 'text'},
             'contact_person': {'label': '联系人', 'type': 'text'},
@@ -372,26 +851,21 @@ class CollegeManager(TableManager):
         dialog = AddDialog("编辑院系", fields, self)
 
         current_values = {
-            'dept_name': table.item(current_row, 1).text(),
-            'contact_person': table.item(current_row, 2).text(),
-            'phone': table.item(current_row, 3).text()
+            'dept_name': self.cell_text(current_row, 1),
+            'contact_person': self.cell_text(current_row, 2),
+            'phone': self.cell_text(current_row, 3)
         }
         dialog.set_values(current_values)
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             values = dialog.get_values()
             query = "UPDATE College SET dept_name=%s, contact_person=%s, phone=%s WHERE dept_id=%s"
-            if self.db_conn.execute_update(query,
-                                           (values['dept_name'], values['contact_person'], values['phone'], dept_id)):
-                QMessageBox.information(self, "成功", "更新成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "更新失败！")
+            self.run_update(query, (values['dept_name'], values['contact_person'], values['phone'], dept_id),
+                            "更新成功！", "更新失败！")
 
 
     def delete_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要删除的记录！")
             return
@@ -404,22 +878,21 @@ class CollegeManager(TableManager):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            dept_id = table.item(current_row, 0).text()
+            dept_id = self.cell_text(current_row, 0)
             query = "DELETE FROM College WHERE dept_id=%s"
 
-            try:
-                if self.db_conn.execute_update(query, (dept_id,)):
-                    QMessageBox.information(self, "成功", "删除成功！")
-                    self.load_data()
-                else:
-                    QMessageBox.warning(self, "错误", "删除失败！可能存在关联数据。")
-            except Exception as e:
-                QMessageBox.critical(self, "数据库错误", f"删除失败！错误信息：{e}")
+            self.run_update(query, (dept_id,),
+                            "删除成功！", "删除失败！可能存在关联数据。")
 
 
 class TeamManager(TableManager):
     """球队管理"""
 
+    page_keys = [('t.team_id', 'team_id', False)]
+    fulltext_columns = {1: 't.team_name'}
+    change_keys = {'Team': [('t.team_id', 'team_id')]}
+    reload_tables = {'College'}
+
     def __init__(self, db_conn, parent=None):
         columns = [
             {'name': 'team_id', 'label': '球队ID'},
@@ -437,16 +910,10 @@ class TeamManager(TableManager):
         LEFT JOIN College c ON t.dept_id = c.dept_id
         """
 
-    def load_data(self):
-        query = self.get_base_query()
-        data = self.db_conn.execute_query(query)
-        self.all_data = data
-        self.populate_table(data)
-
     def add_record(self):
-        colleges = self.db_conn.execute_query("SELECT dept_id, dept_name FROM College")
-        college_options = [f"{c['dept_id']}: {c['dept_name']}" for c in colleges]
+        self.with_references(['colleges'], self.show_add_dialog)
 
+    def show_add_dialog(self, college_options):
         fields = {
             'team_name': {'label': '球队名称', 'type': 'text'},
             'established_year': {'label': '成立年份', 'type': 'number', 'min': 1900, 'max': 2100},
@@ -457,21 +924,16 @@ class TeamManager(TableManager):
             values = dialog.get_values()
             dept_id = values['dept'].split(':')[0]
             query = "INSERT INTO Team (team_name, established_year, dept_id) VALUES (%s, %s, %s)"
-            if self.db_conn.execute_update(query, (values['team_name'], values['established_year'], dept_id)):
-                QMessageBox.information(self, "成功", "添加成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "添加失败！")
+            self.run_update(query, (values['team_name'], values['established_year'], dept_id),
+                            "添加成功！", "添加失败！")
 
     def edit_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要编辑的记录！")
             return
 
-        team_id = table.item(current_row, 0).text()
-        colleges = self.db_conn.execute_query("SELECT dept_id, dept_name FROM College")
+        team_id = self.cell_text(current_row, 0)
 
         fields = {
             'team_name': {'label': '球队名称', 'type': 'text'},
@@ -480,23 +942,19 @@ class TeamManager(TableManager):
         dialog = AddDialog("编辑球队", fields, self)
 
         current_values = {
-            'team_name': table.item(current_row, 1).text(),
-            'established_year': int(table.item(current_row, 2).text())
+            'team_name': self.cell_text(current_row, 1),
+            'established_year': int(self.cell_text(current_row, 2))
         }
         dialog.set_values(current_values)
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             values = dialog.get_values()
             query = "UPDATE Team SET team_name=%s, established_year=%s WHERE team_id=%s"
-            if self.db_conn.execute_update(query, (values['team_name'], values['established_year'], team_id)):
-                QMessageBox.information(self, "成功", "更新成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "更新失败！")
+            self.run_update(query, (values['team_name'], values['established_year'], team_id),
+                            "更新成功！", "更新失败！")
 
     def delete_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要删除的记录！")
             return
@@ -509,23 +967,21 @@ class TeamManager(TableManager):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            team_id = table.item(current_row, 0).text()
+            team_id = self.cell_text(current_row, 0)
             query = "DELETE FROM Team WHERE team_id=%s"
 
-            try:
-                if self.db_conn.execute_update(query, (team_id,)):
-                    QMessageBox.information(self, "成功", "删除成功！")
-                    self.load_data()
-                else:
-                    QMessageBox.warning(self, "错误", "删除失败！可能存在关联数据。")
-            except Exception as e:
-                QMessageBox.critical(self, "数据库错误", f"删除失败！错误信息：{e}")
+            self.run_update(query, (team_id,),
+                            "删除成功！", "删除失败！可能存在关联数据。")
 
     def build_search_query(self, search_text):
         """Team表专用搜索查询"""
         if not self.search_columns:
             return self.get_base_query(), []
 
+        if self.use_fulltext(search_text):
+            like_conditions = ["c.dept_name LIKE %s"] if 3 in self.search_columns else []
+            return self.build_fulltext_query(search_text, like_conditions)
+
         where_conditions = []
         params = []
 
@@ -551,6 +1007,12 @@ class TeamManager(TableManager):
 class PlayerManager(TableManager):
     """球员管理"""
 
+    page_keys = [('p.student_id', 'student_id', False)]
+    import_kind = 'players'
+    fulltext_columns = {1: 'p.name', 5: 't.team_name'}
+    change_keys = {'Player': [('p.student_id', 'student_id')]}
+    reload_tables = {'Team', 'College'}
+
     def __init__(self, db_conn, parent=None):
         columns = [
             {'name': 'student_id', 'label': '学号'},
@@ -577,6 +1039,9 @@ class PlayerManager(TableManager):
         if not self.search_columns:
             return self.get_base_query(), []
 
+        if self.use_fulltext(search_text):
+            return self.build_fulltext_query(search_text)
+
         where_conditions = []
         params = []
 
@@ -597,16 +1062,10 @@ class PlayerManager(TableManager):
 
         return query, params
 
-    def load_data(self):
-        query = self.get_base_query()
-        data = self.db_conn.execute_query(query)
-        self.all_data = data
-        self.populate_table(data)
-
     def add_record(self):
-        teams = self.db_conn.execute_query("SELECT team_id, team_name FROM Team")
-        team_options = [f"{t['team_id']}: {t['team_name']}" for t in teams]
+        self.with_references(['teams'], self.show_add_dialog)
 
+    def show_add_dialog(self, team_options):
         fields = {
             'student_id': {'label': '学号', 'type': 'text'},
             'name': {'label': '姓名', 'type': 'text'},
@@ -621,24 +1080,28 @@ class PlayerManager(TableManager):
             values = dialog.get_values()
             team_id = values['team'].split(':')[0]
             query = "INSERT INTO Player (student_id, name, gender, grade, phone, team_id, role) VALUES (%s, %s, %s, %s, %s, %s, %s)"
-            if self.db_conn.execute_update(query, (values['student_id'], values['name'], values['gender'],
-                                                   values['grade'], values['phone'], team_id, values['role'])):
-                QMessageBox.information(self, "成功", "添加成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "添加失败！")
+            self.run_update(query, (values['student_id'], values['name'], values['gender'],
+                                    values['grade'], values['phone'], team_id, values['role']),
+                            "添加成功！", "添加失败！")
 
     def edit_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要编辑的记录！")
             return
 
-        student_id = table.item(current_row, 0).text()
-        teams = self.db_conn.execute_query("SELECT team_id, team_name FROM Team")
-        team_options = [f"{t['team_id']}: {t['team_name']}" for t in teams]
+        student_id = self.cell_text(current_row, 0)
+        current_values = {
+            'name': self.cell_text(current_row, 1),
+            'gender': self.cell_text(current_row, 2),
+            'grade': self.cell_text(current_row, 3),
+            'phone': self.cell_text(current_row, 4),
+            'role': self.cell_text(current_row, 6)
+        }
+        self.with_references(['teams'],
+                             lambda team_options: self.show_edit_dialog(student_id, current_values, team_options))
 
+    def show_edit_dialog(self, student_id, current_values, team_options):
         fields = {
             'name': {'label': '姓名', 'type': 'text'},
             'gender': {'label': '性别', 'type': 'combo', 'options': ['男', '女']},
@@ -648,30 +1111,18 @@ class PlayerManager(TableManager):
             'role': {'label': '角色', 'type': 'combo', 'options': ['队员', '队长']}
         }
         dialog = AddDialog("编辑球员", fields, self)
-
-        current_values = {
-            'name': table.item(current_row, 1).text(),
-            'gender': table.item(current_row, 2).text(),
-            'grade': table.item(current_row, 3).text(),
-            'phone': table.item(current_row, 4).text(),
-            'role': table.item(current_row, 6).text()
-        }
         dialog.set_values(current_values)
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             values = dialog.get_values()
             team_id = values['team'].split(':')[0]
             query = "UPDATE Player SET name=%s, gender=%s, grade=%s, phone=%s, team_id=%s, role=%s WHERE student_id=%s"
-            if self.db_conn.execute_update(query, (values['name'], values['gender'], values['grade'],
-                                                   values['phone'], team_id, values['role'], student_id)):
-                QMessageBox.information(self, "成功", "更新成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "更新失败！")
+            self.run_update(query, (values['name'], values['gender'], values['grade'],
+                                    values['phone'], team_id, values['role'], student_id),
+                            "更新成功！", "更新失败！")
 
     def delete_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要删除的记录！")
             return
@@ -684,22 +1135,20 @@ class PlayerManager(TableManager):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            student_id = table.item(current_row, 0).text()
+            student_id = self.cell_text(current_row, 0)
             query = "DELETE FROM Player WHERE student_id=%s"
 
-            try:
-                if self.db_conn.execute_update(query, (student_id,)):
-                    QMessageBox.information(self, "成功", "删除成功！")
-                    self.load_data()
-                else:
-                    QMessageBox.warning(self, "错误", "删除失败！可能存在关联数据。")
-            except Exception as e:
-                QMessageBox.critical(self, "数据库错误", f"删除失败！错误信息：{e}")
+            self.run_update(query, (student_id,),
+                            "删除成功！", "删除失败！可能存在关联数据。")
 
 
 class TournamentManager(TableManager):
     """赛事管理"""
 
+    page_keys = [('year', 'year', True), ('tournament_id', 'tournament_id', True)]
+    fulltext_columns = {1: 'tournament_name'}
+    change_keys = {'Tournament': [('tournament_id', 'tournament_id')]}
+
     def __init__(self, db_conn, parent=None):
         columns = [
             {'name': 'tournament_id', 'label': '赛事ID'},
@@ -710,14 +1159,8 @@ class TournamentManager(TableManager):
         super().__init__(db_conn, 'Tournament', columns, 'tournament_manager.ui', parent)
         self.set_search_columns([1,2])
 
-    def load_data(self):
-        query = self.get_base_query()
-        data = self.db_conn.execute_query(query)
-        self.all_data = data
-        self.populate_table(data)
-
     def get_base_query(self):
-        return "SELECT * FROM Tournament ORDER BY year DESC, tournament_id DESC"
+        return "SELECT * FROM Tournament"
 
     def add_record(self):
         fields = {
@@ -729,20 +1172,16 @@ class TournamentManager(TableManager):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             values = dialog.get_values()
             query = "INSERT INTO Tournament (tournament_name, year, status) VALUES (%s, %s, %s)"
-            if self.db_conn.execute_update(query, (values['tournament_name'], values['year'], values['status'])):
-                QMessageBox.information(self, "成功", "添加成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "添加失败！")
+            self.run_update(query, (values['tournament_name'], values['year'], values['status']),
+                            "添加成功！", "添加失败！")
 
     def edit_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要编辑的记录！")
             return
 
-        tournament_id = table.item(current_row, 0).text()
+        tournament_id = self.cell_text(current_row, 0)
         fields = {
             'tournament_name': {'label': '赛事名称', 'type': 'text'},
             'year': {'label': '年份', 'type': 'number', 'min': 2000, 'max': 2100},
@@ -751,24 +1190,20 @@ class TournamentManager(TableManager):
         dialog = AddDialog("编辑赛事", fields, self)
 
         current_values = {
-            'tournament_name': table.item(current_row, 1).text(),
-            'year': int(table.item(current_row, 2).text()),
-            'status': table.item(current_row, 3).text()
+            'tournament_name': self.cell_text(current_row, 1),
+            'year': int(self.cell_text(current_row, 2)),
+            'status': self.cell_text(current_row, 3)
         }
         dialog.set_values(current_values)
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             values = dialog.get_values()
             query = "UPDATE Tournament SET tournament_name=%s, year=%s, status=%s WHERE tournament_id=%s"
-            if self.db_conn.execute_update(query, (values['tournament_name'], values['year'], values['status'], tournament_id)):
-                QMessageBox.information(self, "成功", "更新成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "更新失败！")
+            self.run_update(query, (values['tournament_name'], values['year'], values['status'], tournament_id),
+                            "更新成功！", "更新失败！")
 
     def delete_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要删除的记录！")
             return
@@ -781,23 +1216,21 @@ class TournamentManager(TableManager):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            tournament_id = table.item(current_row, 0).text()
+            tournament_id = self.cell_text(current_row, 0)
             query = "DELETE FROM Tournament WHERE tournament_id=%s"
 
-            try:
-                if self.db_conn.execute_update(query, (tournament_id,)):
-                    QMessageBox.information(self, "成功", "删除成功！")
-                    self.load_data()
-                else:
-                    QMessageBox.warning(self, "错误", "删除失败！可能存在关联数据。")
-            except Exception as e:
-                QMessageBox.critical(self, "数据库错误", f"删除失败！错误信息：{e}")
+            self.run_update(query, (tournament_id,),
+                            "删除成功！", "删除失败！可能存在关联数据。")
 
     def build_search_query(self, search_text):
         """Tournament表专用搜索查询"""
         if not self.search_columns:
             return self.get_base_query(), []
 
+        if self.use_fulltext(search_text):
+            like_conditions = ["year LIKE %s"] if 2 in self.search_columns else []
+            return self.build_fulltext_query(search_text, like_conditions)
+
         where_conditions = []
         params = []
 
@@ -824,6 +1257,11 @@ class TournamentManager(TableManager):
 class MatchManager(TableManager):
     """比赛管理"""
 
+    page_keys = [('m.scheduled_time', 'scheduled_time', True), ('m.match_id', 'match_id', True)]
+    import_kind = 'matches'
+    change_keys = {'Match': [('m.match_id', 'match_id')]}
+    reload_tables = {'Team', 'Tournament', 'College'}
+
     def __init__(self, db_conn, parent=None):
         columns = [
             {'name': 'match_id', 'label': '比赛ID'},
@@ -837,6 +1275,14 @@ class MatchManager(TableManager):
         ]
         super().__init__(db_conn, 'Match', columns, 'match_manager.ui', parent)
         self.set_search_columns([3])
+        self.setup_schedule_button()
+
+    def setup_schedule_button(self):
+        if not hasattr(self, 'buttonLayout'):
+            return
+        self.btnSchedule = QPushButton("生成赛程")
+        self.btnSchedule.clicked.connect(self.generate_schedule)
+        self.buttonLayout.insertWidget(self.buttonLayout.indexOf(self.busyIndicator), self.btnSchedule)
 
     def get_base_query(self):
         return """
@@ -850,18 +1296,11 @@ class MatchManager(TableManager):
         LEFT JOIN Team ht ON m.home_team_id = ht.team_id
         LEFT JOIN Team at ON m.away_team_id = at.team_id
         """
-    def load_data(self):
-        query = self.get_base_query() + " ORDER BY m.scheduled_time DESC"
-        data = self.db_conn.execute_query(query)
-        self.all_data = data
-        self.populate_table(data)
-    def add_record(self):
-        tournaments = self.db_conn.execute_query("SELECT tournament_id, tournament_name FROM Tournament")
-        tournament_options = [f"{t['tournament_id']}: {t['tournament_name']}" for t in tournaments]
 
-        teams = self.db_conn.execute_query("SELECT team_id, team_name FROM Team")
-        team_options = [f"{team['team_id']}: {team['team_name']}" for team in teams]
+    def add_record(self):
+        self.with_references(['tournaments', 'teams'], self.show_add_dialog)
 
+    def show_add_dialog(self, tournament_options, team_options):
         fields = {
             'scheduled_time': {'label': '比赛时间', 'type': 'datetime'},
             'venue': {'label': '场地', 'type': 'text'},
@@ -885,28 +1324,70 @@ class MatchManager(TableManager):
             INSERT INTO `Match` (scheduled_time, venue, tournament_id, home_team_id, away_team_id, referee, final_score)
             VALUES (%s, %s, %s, %s, %s, %s, '0:0')
             """
-            if self.db_conn.execute_update(query, (values['scheduled_time'], values['venue'], tournament_id,
-                                                   home_team_id, away_team_id, values['referee'])):
-                QMessageBox.information(self, "成功", "添加成功！总比分将根据盘次对决自动更新。")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "添加失败！")
+            self.run_update(query, (values['scheduled_time'], values['venue'], tournament_id,
+                                    home_team_id, away_team_id, values['referee']),
+                            "添加成功！总比分将根据盘次对决自动更新。", "添加失败！")
+
+    def generate_schedule(self):
+        self.with_references(['tournaments', 'teams'], self.show_schedule_dialog)
+
+    def show_schedule_dialog(self, tournament_options, team_options):
+        dialog = ScheduleDialog(tournament_options, team_options, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        values = dialog.get_values()
+        self.executor.submit(
+            lambda: scheduler.generate(
+                self.db_conn, values['team_ids'], values['start'], values['groups'], values['double'],
+                times=values['times'], venues=values['venues'], referees=values['referees'],
+                match_minutes=values['match_minutes'], max_per_day=values['max_per_day']),
+            on_result=lambda fixtures: self.confirm_schedule(values['tournament_id'], fixtures),
+            on_error=self.on_db_error
+        )
+
+    def confirm_schedule(self, tournament_id, fixtures):
+        """显示赛程概要，确认后在一个事务中写入全部比赛"""
+        if not fixtures:
+            QMessageBox.information(self, "生成赛程", scheduler.summary(fixtures))
+            return
+        reply = QMessageBox.question(
+            self,
+            "确认赛程",
+            f"{scheduler.summary(fixtures)}\n\n确定写入这些比赛吗？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        def on_result(count):
+            QMessageBox.information(self, "成功", f"已添加 {count} 场比赛！")
+            self.refresh_changes()
+
+        self.executor.submit(scheduler.insert, self.db_conn, tournament_id, fixtures,
+                             on_result=on_result, on_error=self.on_db_error)
 
     def edit_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要编辑的记录！")
             return
 
-        match_id = table.item(current_row, 0).text()
-
-        tournaments = self.db_conn.execute_query("SELECT tournament_id, tournament_name FROM Tournament")
-        tournament_options = [f"{t['tournament_id']}: {t['tournament_name']}" for t in tournaments]
-
-        teams = self.db_conn.execute_query("SELECT team_id, team_name FROM Team")
-        team_options = [f"{team['team_id']}: {team['team_name']}" for team in teams]
+        match_id = self.cell_text(current_row, 0)
+        current_values = {
+            'scheduled_time': self.cell_text(current_row, 1),
+            'venue': self.cell_text(current_row, 2),
+            'tournament': self.cell_text(current_row, 3),
+            'home_team': self.cell_text(current_row, 4),
+            'away_team': self.cell_text(current_row, 5),
+            'referee': self.cell_text(current_row, 6)
+        }
+        self.with_references(
+            ['tournaments', 'teams'],
+            lambda tournament_options, team_options: self.show_edit_dialog(
+                match_id, current_values, tournament_options, team_options)
+        )
 
+    def show_edit_dialog(self, match_id, current_values, tournament_options, team_options):
         fields = {
             'scheduled_time': {'label': '比赛时间', 'type': 'datetime'},
             'venue': {'label': '场地', 'type': 'text'},
@@ -916,15 +1397,6 @@ class MatchManager(TableManager):
             'referee': {'label': '裁判', 'type': 'text'}
         }
         dialog = AddDialog("编辑比赛", fields, self)
-
-        current_values = {
-            'scheduled_time': table.item(current_row, 1).text(),
-            'venue': table.item(current_row, 2).text(),
-            'tournament': table.item(current_row, 3).text(),
-            'home_team': table.item(current_row, 4).text(),
-            'away_team': table.item(current_row, 5).text(),
-            'referee': table.item(current_row, 6).text()
-        }
         dialog.set_values(current_values)
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
@@ -939,16 +1411,12 @@ class MatchManager(TableManager):
                                home_team_id=%s, away_team_id=%s, referee=%s
             WHERE match_id=%s
             """
-            if self.db_conn.execute_update(query, (values['scheduled_time'], values['venue'], tournament_id,
-                                                   home_team_id, away_team_id, values['referee'], match_id)):
-                QMessageBox.information(self, "成功", "更新成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "更新失败！")
+            self.run_update(query, (values['scheduled_time'], values['venue'], tournament_id,
+                                    home_team_id, away_team_id, values['referee'], match_id),
+                            "更新成功！", "更新失败！")
 
     def delete_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要删除的记录！")
             return
@@ -961,17 +1429,11 @@ class MatchManager(TableManager):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            match_id = table.item(current_row, 0).text()
+            match_id = self.cell_text(current_row, 0)
             query = "DELETE FROM `Match` WHERE match_id=%s"
 
-            try:
-                if self.db_conn.execute_update(query, (match_id,)):
-                    QMessageBox.information(self, "成功", "删除成功！")
-                    self.load_data()
-                else:
-                    QMessageBox.warning(self, "错误", "删除失败！可能存在关联数据。")
-            except Exception as e:
-                QMessageBox.critical(self, "数据库错误", f"删除失败！错误信息：{e}")
+            self.run_update(query, (match_id,),
+                            "删除成功！", "删除失败！可能存在关联数据。")
 
     def build_search_query(self, search_text):
         """Tournament表专用搜索查询"""
@@ -1001,6 +1463,16 @@ class MatchManager(TableManager):
 class GameManager(TableManager):
     """盘次对决管理"""
 
+    # 与主键 (match_id, game_id) 同向排序，分页可以直接倒序扫描主键索引
+    page_keys = [('g.match_id', 'match_id', True), ('g.game_id', 'game_id', True)]
+    import_kind = 'games'
+    # 比赛变化（含删除比赛时级联删除的盘次）时重新读取该场比赛的全部盘次
+    change_keys = {
+        'Game': [('g.match_id', 'match_id'), ('g.game_id', 'game_id')],
+        'Match': [('g.match_id', 'match_id')],
+    }
+    reload_tables = {'Team', 'Tournament', 'College'}
+
     def __init__(self, db_conn, parent=None):
         columns = [
             {'name': 'match_id', 'label': '比赛ID'},
@@ -1023,24 +1495,35 @@ class GameManager(TableManager):
         LEFT JOIN Team ht ON m.home_team_id = ht.team_id
         LEFT JOIN Team at ON m.away_team_id = at.team_id
         LEFT JOIN Tournament t ON m.tournament_id = t.tournament_id
-        ORDER BY g.match_id DESC, g.game_id ASC
         """
-    def load_data(self):
-        query = self.get_base_query()
-        data = self.db_conn.execute_query(query)
-        self.all_data = data
-        self.populate_table(data)
+
+    def update_and_fetch_score(self, query, params, match_id):
+        """在后台线程中执行写操作并读取触发器更新后的总比分"""
+        if not self.db_conn.execute_update(query, params):
+            return False, None
+        # Get updated score
+        score_query = "SELECT final_score FROM `Match` WHERE match_id = %s"
+        score_result = self.db_conn.execute_query(score_query, (match_id,))
+        new_score = score_result[0]['final_score'] if score_result else '未知'
+        return True, new_score
+
+    def run_score_update(self, query, params, match_id, success_message, failure_message):
+        """执行盘次写操作，成功后提示新的总比分"""
+        def on_result(result):
+            ok, new_score = result
+            if ok:
+                QMessageBox.information(self, "成功", f"{success_message}\n总比分已自动更新为: {new_score}")
+                self.refresh_changes()
+            else:
+                QMessageBox.warning(self, "错误", failure_message)
+
+        self.executor.submit(self.update_and_fetch_score, query, params, match_id,
+                             on_result=on_result, on_error=self.on_db_error)
 
     def add_record(self):
-        matches = self.db_conn.execute_query("""
-            SELECT m.match_id, 
-                   CONCAT(ht.team_name, ' vs ', at.team_name, ' (', DATE_FORMAT(m.scheduled_time, '%Y-%m-%d'), ')') as match_info
-            FROM `Match` m
-            LEFT JOIN Team ht ON m.home_team_id = ht.team_id
-            LEFT JOIN Team at ON m.away_team_id = at.team_id
-        """)
-        match_options = [f"{m['match_id']}: {m['match_info']}" for m in matches]
+        self.with_references(['matches'], self.show_add_dialog)
 
+    def show_add_dialog(self, match_options):
         fields = {
             'match': {'label': '比赛', 'type': 'combo', 'options': match_options},
             'game_id': {'label': '盘次ID', 'type': 'number', 'min': 1, 'max': 10},
@@ -1055,27 +1538,18 @@ class GameManager(TableManager):
             match_id = values['match'].split(':')[0]
 
             query = "INSERT INTO Game (match_id, game_id, game_type, home_score, away_score, winner) VALUES (%s, %s, %s, %s, %s, %s)"
-            if self.db_conn.execute_update(query, (match_id, values['game_id'], values['game_type'],
-                                                   values['home_score'], values['away_score'], values['winner'])):
-                # Get updated score
-                score_query = "SELECT final_score FROM `Match` WHERE match_id = %s"
-                score_result = self.db_conn.execute_query(score_query, (match_id,))
-                new_score = score_result[0]['final_score'] if score_result else '未知'
-
-                QMessageBox.information(self, "成功", f"添加成功！\n总比分已自动更新为: {new_score}")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "添加失败！可能盘次ID重复。")
+            self.run_score_update(query, (match_id, values['game_id'], values['game_type'],
+                                          values['home_score'], values['away_score'], values['winner']),
+                                  match_id, "添加成功！", "添加失败！可能盘次ID重复。")
 
     def edit_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要编辑的记录！")
             return
 
-        match_id = table.item(current_row, 0).text()
-        game_id = table.item(current_row, 1).text()
+        match_id = self.cell_text(current_row, 0)
+        game_id = self.cell_text(current_row, 1)
 
         fields = {
             'game_type': {'label': '比赛类型', 'type': 'combo', 'options': ['男单', '女单', '男双', '女双', '混双']},
@@ -1086,31 +1560,22 @@ class GameManager(TableManager):
         dialog = AddDialog("编辑盘次对决", fields, self)
 
         current_values = {
-            'game_type': table.item(current_row, 2).text(),
-            'home_score': int(table.item(current_row, 3).text()) if table.item(current_row, 3).text() else 0,
-            'away_score': int(table.item(current_row, 4).text()) if table.item(current_row, 4).text() else 0,
-            'winner': table.item(current_row, 5).text()
+            'game_type': self.cell_text(current_row, 2),
+            'home_score': int(self.cell_text(current_row, 3)) if self.cell_text(current_row, 3) else 0,
+            'away_score': int(self.cell_text(current_row, 4)) if self.cell_text(current_row, 4) else 0,
+            'winner': self.cell_text(current_row, 5)
         }
         dialog.set_values(current_values)
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             values = dialog.get_values()
             query = "UPDATE Game SET game_type=%s, home_score=%s, away_score=%s, winner=%s WHERE match_id=%s AND game_id=%s"
-            if self.db_conn.execute_update(query, (values['game_type'], values['home_score'], values['away_score'],
-                                                   values['winner'], match_id, game_id)):
-                # Get updated score
-                score_query = "SELECT final_score FROM `Match` WHERE match_id = %s"
-                score_result = self.db_conn.execute_query(score_query, (match_id,))
-                new_score = score_result[0]['final_score'] if score_result else '未知'
-
-                QMessageBox.information(self, "成功", f"更新成功！\n总比分已自动更新为: {new_score}")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "更新失败！")
+            self.run_score_update(query, (values['game_type'], values['home_score'], values['away_score'],
+                                          values['winner'], match_id, game_id),
+                                  match_id, "更新成功！", "更新失败！")
 
     def delete_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要删除的记录！")
             return
@@ -1123,27 +1588,28 @@ class GameManager(TableManager):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            match_id = table.item(current_row, 0).text()
-            game_id = table.item(current_row, 1).text()
+            match_id = self.cell_text(current_row, 0)
+            game_id = self.cell_text(current_row, 1)
             query = "DELETE FROM Game WHERE match_id=%s AND game_id=%s"
 
-            try:
-                if self.db_conn.execute_update(query, (match_id, game_id)):
-                    # Get updated score
-                    score_query = "SELECT final_score FROM `Match` WHERE match_id = %s"
-                    score_result = self.db_conn.execute_query(score_query, (match_id,))
-                    new_score = score_result[0]['final_score'] if score_result else '未知'
-
-                    QMessageBox.information(self, "成功", f"删除成功！\n总比分已自动更新为: {new_score}")
-                    self.load_data()
-                else:
-                    QMessageBox.warning(self, "错误", "删除失败！可能存在关联数据。")
-            except Exception as e:
-                QMessageBox.critical(self, "数据库错误", f"删除失败！错误信息：{e}")
+            self.run_score_update(query, (match_id, game_id), match_id,
+                                  "删除成功！", "删除失败！可能存在关联数据。")
 
 class PlayerInGameManager(TableManager):
     """参赛球员管理"""
 
+    page_keys = [('pig.match_id', 'match_id', True), ('pig.game_id', 'game_id', True),
+                 ('pig.student_id', 'student_id', True)]
+    import_kind = 'player_in_game'
+    change_keys = {
+        'Player_In_Game': [('pig.match_id', 'match_id'), ('pig.game_id', 'game_id'),
+                           ('pig.student_id', 'student_id')],
+        'Game': [('pig.match_id', 'match_id'), ('pig.game_id', 'game_id')],
+        'Match': [('pig.match_id', 'match_id')],
+        'Player': [('pig.student_id', 'student_id')],
+    }
+    reload_tables = {'Team', 'Tournament', 'College'}
+
     def __init__(self, db_conn, parent=None):
         columns = [
             {'name': 'match_id', 'label': '比赛ID'},
@@ -1165,27 +1631,11 @@ class PlayerInGameManager(TableManager):
         LEFT JOIN Team t ON p.team_id = t.team_id
         LEFT JOIN Game g ON pig.match_id = g.match_id AND pig.game_id = g.game_id
         """
-    def load_data(self):
-        query = self.get_base_query()
-        data = self.db_conn.execute_query(query)
-        self.all_data = data
-        self.populate_table(data)
 
     def add_record(self):
-        games = self.db_conn.execute_query("""
-            SELECT g.match_id, g.game_id, g.game_type,
-                   CONCAT('比赛', g.match_id, '-盘', g.game_id, ' (', g.game_type, ')') as game_info
-            FROM Game g
-        """)
-        game_options = [f"{g['match_id']}-{g['game_id']}: {g['game_info']}" for g in games]
-
-        players = self.db_conn.execute_query("""
-            SELECT p.student_id, p.name, t.team_name
-            FROM Player p
-            LEFT JOIN Team t ON p.team_id = t.team_id
-        """)
-        player_options = [f"{p['student_id']}: {p['name']} ({p['team_name']})" for p in players]
+        self.with_references(['games', 'players'], self.show_add_dialog)
 
+    def show_add_dialog(self, game_options, player_options):
         fields = {
             'game': {'label': '盘次对决', 'type': 'combo', 'options': game_options},
             'player': {'label': '球员', 'type': 'combo', 'options': player_options}
@@ -1199,18 +1649,14 @@ class PlayerInGameManager(TableManager):
             student_id = values['player'].split(':')[0]
 
             query = "INSERT INTO Player_In_Game (match_id, game_id, student_id) VALUES (%s, %s, %s)"
-            if self.db_conn.execute_update(query, (match_id, game_id, student_id)):
-                QMessageBox.information(self, "成功", "添加成功！")
-                self.load_data()
-            else:
-                QMessageBox.warning(self, "错误", "添加失败！可能已存在该记录。")
+            self.run_update(query, (match_id, game_id, student_id),
+                            "添加成功！", "添加失败！可能已存在该记录。")
 
     def edit_record(self):
         QMessageBox.information(self, "提示", "参赛球员记录不支持编辑，请删除后重新添加。")
 
     def delete_record(self):
-        table = self.get_table_widget()
-        current_row = table.currentRow()
+        current_row = self.current_row()
         if current_row < 0:
             QMessageBox.warning(self, "警告", "请选择要删除的记录！")
             return
@@ -1223,19 +1669,13 @@ class PlayerInGameManager(TableManager):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            match_id = table.item(current_row, 0).text()
-            game_id = table.item(current_row, 1).text()
-            student_id = table.item(current_row, 2).text()
+            match_id = self.cell_text(current_row, 0)
+            game_id = self.cell_text(current_row, 1)
+            student_id = self.cell_text(current_row, 2)
             query = "DELETE FROM Player_In_Game WHERE match_id=%s AND game_id=%s AND student_id=%s"
 
-            try:
-                if self.db_conn.execute_update(query, (match_id, game_id, student_id)):
-                    QMessageBox.information(self, "成功", "删除成功！")
-                    self.load_data()
-                else:
-                    QMessageBox.warning(self, "错误", "删除失败！")
-            except Exception as e:
-                QMessageBox.critical(self, "数据库错误", f"删除失败！错误信息：{e}")
+            self.run_update(query, (match_id, game_id, student_id),
+                            "删除成功！", "删除失败！")
 
     def build_search_query(self, search_text):
         """Player_In_Game表专用搜索查询"""
@@ -1265,17 +1705,37 @@ class PlayerInGameManager(TableManager):
 
 
 class MainWindow(QMainWindow):
-    """主窗口 - 使用UI文件"""
-
-    def __init__(self, on_logout_callback=None):
+    """主窗口 - 使用UI文件
+
+    管理页面在第一次显示时才创建（加载 .ui 文件并查询数据）。窗口首次绘制后，
+    其余页面按历史使用次数从多到少在空闲时依次预先创建。
+    """
+
+    # (管理页面类, 标签标题)
+    TABS = [
+        (CollegeManager, "院系管理"),
+        (TeamManager, "球队管理"),
+        (PlayerManager, "球员管理"),
+        (TournamentManager, "赛事管理"),
+        (MatchManager, "比赛管理"),
+        (GameManager, "盘次对决管理"),
+        (PlayerInGameManager, "参赛球员管理"),
+        (StandingsView, "积分榜"),
+    ]
+    # 预先创建相邻两个页面之间的间隔，让界面事件有机会先处理
+    PREFETCH_INTERVAL_MS = 50
+
+    def __init__(self, db_conn, on_logout_callback=None):
         super().__init__()
-        self.db_conn = DatabaseConnection()
+        self.created_at = time.perf_counter()
+        self.first_paint_ms = None
+        # 与登录页、队长页共享同一个连接池
+        self.db_conn = db_conn
         self.on_logout_callback = on_logout_callback
-
-        # 连接数据库
-        if not self.connect_database():
-            QMessageBox.critical(self, "错误", "无法连接到数据库！请检查配置。")
-            sys.exit(1)
+        self.settings = QSettings('table_tennis_db', 'admin')
+        self.tab_widget = None
+        self.managers = {}  # 标签索引 -> 已创建的管理页面
+        self.prefetch_queue = []
 
         # 加载UI文件
         self.load_ui()
@@ -1304,19 +1764,10 @@ class MainWindow(QMainWindow):
             if self.on_logout_callback:
                 self.on_logout_callback()
 
-    def connect_database(self):
-        """连接数据库"""
-        return self.db_conn.connect(
-            host='localhost',
-            user='root',
-            password='password',
-            database='table_tennis_db'
-        )
-
     def load_ui(self):
         """加载UI文件"""
         try:
-            uic.loadUi('ui_pages/main.ui', self)
+            ui_cache.load_ui('ui_pages/main.ui', self)
         except FileNotFoundError:
             QMessageBox.critical(self, "错误", "找不到main.ui文件！")
             sys.exit(1)
@@ -1332,28 +1783,98 @@ class MainWindow(QMainWindow):
 
         # 清空现有标签页
         tab_widget.clear()
-
-        # 重新添加所有管理页面
-        tab_widget.addTab(CollegeManager(self.db_conn), "院系管理")
-        tab_widget.addTab(TeamManager(self.db_conn), "球队管理")
-        tab_widget.addTab(PlayerManager(self.db_conn), "球员管理")
-        tab_widget.addTab(TournamentManager(self.db_conn), "赛事管理")
-        tab_widget.addTab(MatchManager(self.db_conn), "比赛管理")
-        tab_widget.addTab(GameManager(self.db_conn), "盘次对决管理")
-        tab_widget.addTab(PlayerInGameManager(self.db_conn), "参赛球员管理")
+        self.tab_widget = tab_widget
+
+        # 先放入空的占位页，管理页面在显示时再创建
+        for _manager_class, title in self.TABS:
+            placeholder = QWidget()
+            layout = QVBoxLayout(placeholder)
+            layout.setContentsMargins(0, 0, 0, 0)
+            tab_widget.addTab(placeholder, title)
+
+        # 恢复上次停留的标签页
+        last_index = int(self.settings.value('tabs/last_index', 0))
+        if 0 <= last_index < len(self.TABS):
+            tab_widget.setCurrentIndex(last_index)
+        self.ensure_tab(tab_widget.currentIndex())
+        tab_widget.currentChanged.connect(self.on_tab_changed)
+
+    def ensure_tab(self, index):
+        """创建指定标签的管理页面（已创建则直接返回）"""
+        if index < 0 or index in self.managers:
+            return self.managers.get(index)
+        manager_class, title = self.TABS[index]
+        start = time.perf_counter()
+        manager = manager_class(self.db_conn)
+        self.tab_widget.widget(index).layout().addWidget(manager)
+        self.managers[index] = manager
+        if LOG_UI_TIMINGS:
+            print(f"创建{title}页面耗时 {(time.perf_counter() - start) * 1000:.1f} ms")
+        return manager
+
+    def on_tab_changed(self, index):
+        self.ensure_tab(index)
+        self.record_tab_usage(index)
+
+    def record_tab_usage(self, index):
+        """记录标签页的使用次数和最后停留的位置，用于决定预先创建的顺序"""
+        key = f'tabs/usage/{self.TABS[index][0].__name__}'
+        self.settings.setValue(key, int(self.settings.value(key, 0)) + 1)
+        self.settings.setValue('tabs/last_index', index)
+
+    def prefetch_order(self):
+        """尚未创建的标签按使用次数从多到少排列，次数相同时保持原顺序"""
+        usage = {
+            index: int(self.settings.value(f'tabs/usage/{manager_class.__name__}', 0))
+            for index, (manager_class, _title) in enumerate(self.TABS)
+        }
+        pending = [index for index in range(len(self.TABS)) if index not in self.managers]
+        return sorted(pending, key=lambda index: -usage[index])
+
+    def start_prefetch(self):
+        self.prefetch_queue = self.prefetch_order()
+        QTimer.singleShot(self.PREFETCH_INTERVAL_MS, self.prefetch_next)
+
+    def prefetch_next(self):
+        """每次只创建一个页面，避免长时间阻塞界面"""
+        while self.prefetch_queue:
+            index = self.prefetch_queue.pop(0)
+            if index not in self.managers:
+                self.ensure_tab(index)
+                break
+        if self.prefetch_queue:
+            QTimer.singleShot(self.PREFETCH_INTERVAL_MS, self.prefetch_next)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter() - self.created_at) * 1000
+            if LOG_UI_TIMINGS:
+                print(f"管理窗口首次绘制耗时 {self.first_paint_ms:.1f} ms")
+            if self.tab_widget is not None:
+                self.record_tab_usage(self.tab_widget.currentIndex())
+                self.start_prefetch()
 
 
 def main():
     app = QApplication(sys.argv)
 
-    # Create database connection
-    db_conn = DatabaseConnection()
-    if not db_conn.connect(
+    instrumentation = None
+    if INSTRUMENT_QUERIES:
+        instrumentation = QueryInstrumentation(SLOW_QUERY_MS, SLOW_QUERY_LOG)
+
+    # Create the shared connection pool used by every window
+    db_conn = DatabaseConnection(pool_size=8, pool_timeout=10.0, instrumentation=instrumentation)
+    if DATABASE_BACKEND == 'sqlite':
+        connected = db_conn.connect_sqlite(SQLITE_PATH, sample_data=True)
+    else:
+        connected = db_conn.connect(
             host='localhost',
             user='root',
             password='password',
             database='table_tennis_db'
-    ):
+        )
+    if not connected:
         QMessageBox.critical(None, "错误", "无法连接到数据库！请检查配置。")
         sys.exit(1)
 
@@ -1378,7 +1899,7 @@ def main():
         nonlocal admin_window, login_window
         if login_window:
             login_window.close()
-        admin_window = MainWindow(on_logout_callback=show_login_window)
+        admin_window = MainWindow(db_conn, on_logout_callback=show_login_window)
         admin_window.show()
 
     def show_captain_window(student_id):
@@ -1393,10 +1914,28 @@ def main():
         )
         captain_window.show()
 
+    def export_metrics():
+        try:
+            instrumentation.export(METRICS_FILE)
+        except OSError as e:
+            print(f"导出查询统计失败: {e}")
+
+    if instrumentation:
+        instrumentation.add_cache('statement', db_conn.statement_cache_stats)
+        instrumentation.add_cache('result', db_conn.result_cache.stats)
+        metrics_timer = QTimer()
+        metrics_timer.timeout.connect(export_metrics)
+        metrics_timer.start(METRICS_EXPORT_INTERVAL_MS)
+
     # MODIFY: Use the new function instead of direct instantiation
     show_login_window()
 
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    if instrumentation:
+        export_metrics()
+        print(f"查询统计已导出到 {METRICS_FILE}")
+    db_conn.close()
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,400 @@
+"""队长页面使用的SQL
+
+``m.home_team_id = %s OR m.away_team_id = %s`` 这样的条件横跨两个索引，MySQL
+往往只能扫描整个 Match 表。这里把它拆成主场、客场两个 UNION ALL 分支，每个分支
+只用一个等值条件，分别走 sql_files/indexes.sql 中的
+idx_match_home(home_team_id, scheduled_time, tournament_id) 和
+idx_match_away(away_team_id, scheduled_time, tournament_id)。客场分支排除主客队
+相同的记录，保证与原来的 OR 写法结果一致。
+
+scripts/explain_check.py 会对这里的每条查询执行 EXPLAIN，确认没有全表扫描。
+"""
+
+# 队长登录（login.py）
+CAPTAIN_LOGIN = """
+SELECT p.student_id, p.name, t.team_name
+FROM Player p
+JOIN Team t ON p.team_id = t.team_id
+WHERE p.student_id = %s AND p.role = '队长'
+"""
+
+TEAM_INFO = """
+SELECT t.team_id, t.team_name, t.established_year, c.dept_name
+FROM Player p
+JOIN Team t ON p.team_id = t.team_id
+JOIN College c ON t.dept_id = c.dept_id
+WHERE p.student_id = %s AND p.role = '队长'
+"""
+
+TEAM_PLAYERS = """
+SELECT student_id, name, gender, grade, phone, role
+FROM Player
+WHERE team_id = %s
+ORDER BY role DESC, name
+"""
+
+SEARCH_TEAM_PLAYERS = """
+SELECT student_id, name, gender, grade, phone, role
+FROM Player
+WHERE team_id = %s
+AND (student_id LIKE %s OR name LIKE %s OR grade LIKE %s)
+ORDER BY role DESC, name
+"""
+
+# 球员统计读取 PlayerStats 汇总表（sql_files/player_stats.sql），每名球员按盘次类型
+# 各一行；breakdown 为各类型的战绩，供统计卡片的提示信息使用。rating 为单打
+# 等级分（PlayerRating，没有单打记录时为 NULL）。排序在界面中完成
+PLAYER_STATS = """
+SELECT
+    p.student_id,
+    p.name,
+    p.gender,
+    p.role,
+    COALESCE(SUM(ps.games), 0) AS total_games,
+    COALESCE(SUM(ps.wins), 0) AS wins,
+    COALESCE(SUM(ps.losses), 0) AS losses,
+    CASE
+        WHEN COALESCE(SUM(ps.games), 0) = 0 THEN 0
+        ELSE SUM(ps.wins) * 100.0 / SUM(ps.games)
+    END AS win_rate,
+    pr.rating,
+    GROUP_CONCAT(
+        CASE WHEN ps.games > 0
+        THEN CONCAT(ps.game_type, ' ', ps.wins, '胜', ps.losses, '负') END
+        ORDER BY ps.game_type SEPARATOR ' | '
+    ) AS breakdown
+FROM Player p
+LEFT JOIN PlayerStats ps ON ps.student_id = p.student_id
+LEFT JOIN PlayerRating pr ON pr.student_id = p.student_id
+WHERE p.team_id = %s
+GROUP BY p.student_id, p.name, p.gender, p.role, pr.rating
+"""
+
+# 本队球员组成的双打组合的等级分（ratings.py）
+TEAM_PAIR_RATINGS = """
+SELECT pr.student_id_1, p1.name AS name_1, pr.student_id_2, p2.name AS name_2, pr.rating, pr.games
+FROM Player p1
+JOIN PairRating pr ON pr.student_id_1 = p1.student_id
+JOIN Player p2 ON p2.student_id = pr.student_id_2
+WHERE p1.team_id = %s AND p2.team_id = %s
+ORDER BY pr.rating DESC
+"""
+
+# 本队参加过的赛事ID，两个分支都只读索引（覆盖索引）
+_TEAM_TOURNAMENT_IDS = """
+    SELECT m.tournament_id FROM `Match` m WHERE m.home_team_id = %s
+    UNION ALL
+    SELECT m.tournament_id FROM `Match` m WHERE m.away_team_id = %s AND m.home_team_id <> %s
+"""
+
+TEAM_TOURNAMENTS = f"""
+SELECT DISTINCT t.tournament_id, t.tournament_name, t.year, t.status
+FROM ({_TEAM_TOURNAMENT_IDS}) tm
+JOIN Tournament t ON t.tournament_id = tm.tournament_id
+ORDER BY t.year DESC, t.tournament_id DESC
+"""
+
+SEARCH_TEAM_TOURNAMENTS = f"""
+SELECT DISTINCT t.tournament_id, t.tournament_name, t.year, t.status
+FROM ({_TEAM_TOURNAMENT_IDS}) tm
+JOIN Tournament t ON t.tournament_id = tm.tournament_id
+WHERE t.tournament_name LIKE %s OR t.year LIKE %s
+ORDER BY t.year DESC, t.tournament_id DESC
+"""
+
+_TEAM_MATCH_BRANCH = """
+    SELECT
+        m.match_id,
+        m.scheduled_time,
+        m.venue,
+        t.tournament_name,
+        {opponent}.team_name AS opponent,
+        m.final_score,
+        m.referee
+    FROM `Match` m
+    JOIN Tournament t ON m.tournament_id = t.tournament_id
+    JOIN Team home_t ON m.home_team_id = home_t.team_id
+    JOIN Team away_t ON m.away_team_id = away_t.team_id
+    WHERE {condition}
+"""
+
+_HOME = "m.home_team_id = %s"
+_AWAY = "m.away_team_id = %s AND m.home_team_id <> %s"
+_MATCH_SEARCH = " AND (home_t.team_name LIKE %s OR away_t.team_name LIKE %s OR m.venue LIKE %s)"
+
+TEAM_MATCHES = (
+    "(" + _TEAM_MATCH_BRANCH.format(opponent='away_t', condition=_HOME) + ")"
+    " UNION ALL "
+    "(" + _TEAM_MATCH_BRANCH.format(opponent='home_t', condition=_AWAY) + ")"
+    " ORDER BY scheduled_time DESC"
+)
+
+SEARCH_TEAM_MATCHES = (
+    "(" + _TEAM_MATCH_BRANCH.format(opponent='away_t', condition=_HOME + _MATCH_SEARCH) + ")"
+    " UNION ALL "
+    "(" + _TEAM_MATCH_BRANCH.format(opponent='home_t', condition=_AWAY + _MATCH_SEARCH) + ")"
+    " ORDER BY scheduled_time DESC"
+)
+
+
+def team_tournaments_params(team_id, search_pattern=None):
+    params = (team_id, team_id, team_id)
+    if search_pattern is not None:
+        params += (search_pattern, search_pattern)
+    return params
+
+
+def team_matches_params(team_id, search_pattern=None):
+    if search_pattern is None:
+        return (team_id, team_id, team_id)
+    search = (search_pattern, search_pattern, search_pattern)
+    return (team_id,) + search + (team_id, team_id) + search
+
+
+def team_players_by_id(team_id, student_ids):
+    """本队球员中学号属于 student_ids 的行，返回 (SQL, 参数)"""
+    student_ids = tuple(student_ids)
+    query = f"""
+    SELECT student_id, name, gender, grade, phone, role
+    FROM Player
+    WHERE team_id = %s AND student_id IN ({', '.join(['%s'] * len(student_ids))})
+    """
+    return query, (team_id,) + student_ids
+
+
+def team_matches_by_id(team_id, match_ids):
+    """本队比赛中 match_id 属于 match_ids 的行，返回 (SQL, 参数)；变更后只重新读取这些比赛"""
+    match_ids = tuple(match_ids)
+    condition = f" AND m.match_id IN ({', '.join(['%s'] * len(match_ids))})"
+    query = (
+        "(" + _TEAM_MATCH_BRANCH.format(opponent='away_t', condition=_HOME + condition) + ")"
+        " UNION ALL "
+        "(" + _TEAM_MATCH_BRANCH.format(opponent='home_t', condition=_AWAY + condition) + ")"
+    )
+    return query, (team_id,) + match_ids + (team_id, team_id) + match_ids
+
+
+# ---- 赛事积分榜（standings.py） ----
+
+# 管理窗口积分榜页面的赛事列表
+TOURNAMENTS = """
+SELECT tournament_id, tournament_name, year, status
+FROM Tournament
+ORDER BY year DESC, tournament_id DESC
+"""
+
+# 读取触发器维护的 TournamentStanding（sql_files/standings.sql），按主键前缀查找
+TOURNAMENT_STANDINGS = """
+SELECT s.team_id, t.team_name, s.matches, s.wins, s.losses, s.games_won, s.games_lost
+FROM TournamentStanding s
+JOIN Team t ON t.team_id = s.team_id
+WHERE s.tournament_id = %s
+"""
+
+# 已分出胜负的比赛，只在积分相同需要比较相互间胜负时读取
+TOURNAMENT_RESULTS = """
+SELECT m.home_team_id, m.away_team_id, m.home_wins, m.away_wins
+FROM `Match` m
+WHERE m.tournament_id = %s AND m.home_wins <> m.away_wins
+"""
+
+# 直接从 Match 统计的积分榜，口径与触发器相同，用于核对和重建。
+# 两个参数都是赛事ID，传 NULL 表示全部赛事
+_COMPUTED_STANDINGS = """
+SELECT s.tournament_id, s.team_id, COUNT(*) AS matches, SUM(s.win) AS wins, SUM(s.loss) AS losses,
+       SUM(s.won) AS games_won, SUM(s.lost) AS games_lost
+FROM (
+    SELECT m.tournament_id, m.home_team_id AS team_id,
+           CASE WHEN m.home_wins > m.away_wins THEN 1 ELSE 0 END AS win,
+           CASE WHEN m.home_wins < m.away_wins THEN 1 ELSE 0 END AS loss,
+           m.home_wins AS won, m.away_wins AS lost
+    FROM `Match` m
+    WHERE %s IS NULL OR m.tournament_id = %s
+    UNION ALL
+    SELECT m.tournament_id, m.away_team_id,
+           CASE WHEN m.away_wins > m.home_wins THEN 1 ELSE 0 END,
+           CASE WHEN m.away_wins < m.home_wins THEN 1 ELSE 0 END,
+           m.away_wins, m.home_wins
+    FROM `Match` m
+    WHERE %s IS NULL OR m.tournament_id = %s
+) s
+GROUP BY s.tournament_id, s.team_id
+"""
+
+COMPUTED_STANDINGS = _COMPUTED_STANDINGS + "ORDER BY s.tournament_id, s.team_id\n"
+
+STORED_STANDINGS = """
+SELECT tournament_id, team_id, matches, wins, losses, games_won, games_lost
+FROM TournamentStanding
+WHERE %s IS NULL OR tournament_id = %s
+ORDER BY tournament_id, team_id
+"""
+
+CLEAR_STANDINGS = """
+DELETE FROM TournamentStanding
+WHERE %s IS NULL OR tournament_id = %s
+"""
+
+REBUILD_STANDINGS = (
+    "INSERT INTO TournamentStanding (tournament_id, team_id, matches, wins, losses, games_won, games_lost)"
+    + _COMPUTED_STANDINGS
+)
+
+
+# ---- 球员等级分（ratings.py） ----
+
+# 已分出胜负的盘次及其参赛球员，按时间顺序，每名参赛球员一行。
+# 球员所属球队与主队相同时为主队一方
+_RATING_GAMES = """
+SELECT m.scheduled_time, g.match_id, g.game_id, g.game_type, g.winner,
+       m.home_team_id, m.away_team_id, p.team_id, pig.student_id
+FROM `Match` m
+JOIN Game g ON g.match_id = m.match_id
+JOIN Player_In_Game pig ON pig.match_id = g.match_id AND pig.game_id = g.game_id
+JOIN Player p ON p.student_id = pig.student_id
+WHERE g.winner IS NOT NULL{condition}
+ORDER BY m.scheduled_time, g.match_id, g.game_id
+"""
+
+RATING_GAMES = _RATING_GAMES.format(condition="")
+# 增量计算：比赛时间不早于上次计入的最后一盘，走 idx_match_time
+RATING_GAMES_SINCE = _RATING_GAMES.format(condition=" AND m.scheduled_time >= %s")
+
+PLAYER_RATINGS = "SELECT student_id, rating, games FROM PlayerRating"
+PAIR_RATINGS = "SELECT student_id_1, student_id_2, rating, games FROM PairRating"
+RATING_STATE = "SELECT scheduled_time, match_id, game_id FROM RatingState WHERE id = 1"
+
+CLEAR_PLAYER_RATINGS = "DELETE FROM PlayerRating"
+CLEAR_PAIR_RATINGS = "DELETE FROM PairRating"
+
+SAVE_PLAYER_RATING = """
+INSERT INTO PlayerRating (student_id, rating, games) VALUES (%s, %s, %s)
+ON DUPLICATE KEY UPDATE rating = VALUES(rating), games = VALUES(games)
+"""
+
+SAVE_PAIR_RATING = """
+INSERT INTO PairRating (student_id_1, student_id_2, rating, games) VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE rating = VALUES(rating), games = VALUES(games)
+"""
+
+SAVE_RATING_STATE = """
+INSERT INTO RatingState (id, scheduled_time, match_id, game_id) VALUES (1, %s, %s, %s)
+ON DUPLICATE KEY UPDATE scheduled_time = VALUES(scheduled_time), match_id = VALUES(match_id),
+                        game_id = VALUES(game_id)
+"""
+
+# ---- 只读 API（api_server.py） ----
+
+TEAMS = """
+SELECT t.team_id, t.team_name, t.established_year, c.dept_id, c.dept_name
+FROM Team t
+JOIN College c ON t.dept_id = c.dept_id
+ORDER BY t.team_id
+"""
+
+# 对外公开的名单不含电话
+PUBLIC_TEAM_PLAYERS = """
+SELECT student_id, name, gender, grade, role
+FROM Player
+WHERE team_id = %s
+ORDER BY role DESC, name
+"""
+
+_SCHEDULE = """
+SELECT m.match_id, m.scheduled_time, m.venue, m.tournament_id, t.tournament_name,
+       m.home_team_id, home_t.team_name AS home_team,
+       m.away_team_id, away_t.team_name AS away_team,
+       m.final_score, m.referee
+FROM `Match` m
+JOIN Tournament t ON m.tournament_id = t.tournament_id
+JOIN Team home_t ON m.home_team_id = home_t.team_id
+JOIN Team away_t ON m.away_team_id = away_t.team_id
+WHERE {condition}
+ORDER BY m.scheduled_time, m.match_id
+LIMIT %s
+"""
+
+# 时间段内的赛程，走 idx_match_time
+SCHEDULE_BY_TIME = _SCHEDULE.format(condition="m.scheduled_time >= %s AND m.scheduled_time < %s")
+# 某个赛事的赛程，走 tournament_id 外键索引
+SCHEDULE_BY_TOURNAMENT = _SCHEDULE.format(
+    condition="m.tournament_id = %s AND m.scheduled_time >= %s AND m.scheduled_time < %s"
+)
+
+
+# ---- 赛程生成（scheduler.py） ----
+
+# 生成赛程时需要避开的已有比赛，走 idx_match_time
+SCHEDULE_BUSY = """
+SELECT m.scheduled_time, m.venue, m.referee, m.home_team_id, m.away_team_id
+FROM `Match` m
+WHERE m.scheduled_time >= %s
+"""
+
+INSERT_MATCH = """
+INSERT INTO `Match` (scheduled_time, venue, tournament_id, home_team_id, away_team_id, referee, final_score)
+VALUES (%s, %s, %s, %s, %s, %s, '0:0')
+"""
+
+
+# ---- 变更日志（changes.py） ----
+
+# 两个子查询各自只读主键索引的一端；SQLite 的 SELECT MIN(..), MAX(..) 会扫描全表
+CHANGE_VERSION = """
+SELECT (SELECT MIN(change_id) FROM ChangeLog) AS first_id,
+       (SELECT MAX(change_id) FROM ChangeLog) AS last_id
+"""
+
+CHANGES_SINCE = """
+SELECT change_id, table_name, key1, key2, key3
+FROM ChangeLog
+WHERE change_id > %s AND change_id <= %s
+ORDER BY change_id
+"""
+
+PRUNE_CHANGES = "DELETE FROM ChangeLog WHERE change_id <= %s"
+
+# 队长页面导出时的表头：列名 -> 表头文字
+EXPORT_LABELS = {
+    'players': {'student_id': '学号', 'name': '姓名', 'gender': '性别', 'grade': '年级',
+                'phone': '电话', 'role': '角色'},
+    'player_stats': {'student_id': '学号', 'name': '姓名', 'gender': '性别', 'role': '角色',
+                     'total_games': '比赛数', 'wins': '胜', 'losses': '负', 'win_rate': '胜率(%)',
+                     'rating': '等级分', 'breakdown': '分项战绩'},
+    'tournaments': {'tournament_id': '赛事ID', 'tournament_name': '赛事名称', 'year': '年份',
+                    'status': '状态'},
+    'matches': {'match_id': '比赛ID', 'scheduled_time': '比赛时间', 'venue': '场地',
+                'tournament_name': '赛事', 'opponent': '对手', 'final_score': '比分', 'referee': '裁判'},
+}
+
+
+# scripts/explain_check.py 检查的查询：名称 -> (SQL, 参数构造函数)
+CAPTAIN_QUERIES = {
+    'captain_login': (CAPTAIN_LOGIN, lambda team_id, student_id: (student_id,)),
+    'team_info': (TEAM_INFO, lambda team_id, student_id: (student_id,)),
+    'team_players': (TEAM_PLAYERS, lambda team_id, student_id: (team_id,)),
+    'search_team_players': (SEARCH_TEAM_PLAYERS,
+                            lambda team_id, student_id: (team_id, '%1%', '%1%', '%1%')),
+    'player_stats': (PLAYER_STATS, lambda team_id, student_id: (team_id,)),
+    'team_pair_ratings': (TEAM_PAIR_RATINGS, lambda team_id, student_id: (team_id, team_id)),
+    'team_tournaments': (TEAM_TOURNAMENTS,
+                         lambda team_id, student_id: team_tournaments_params(team_id)),
+    'search_team_tournaments': (SEARCH_TEAM_TOURNAMENTS,
+                                lambda team_id, student_id: team_tournaments_params(team_id, '%1%')),
+    'team_matches': (TEAM_MATCHES,
+                     lambda team_id, student_id: team_matches_params(team_id)),
+    'search_team_matches': (SEARCH_TEAM_MATCHES,
+                            lambda team_id, student_id: team_matches_params(team_id, '%1%')),
+    'tournament_standings': (TOURNAMENT_STANDINGS, lambda team_id, student_id: (1,)),
+    'tournament_results': (TOURNAMENT_RESULTS, lambda team_id, student_id: (1,)),
+}
+
+# api_server.py 的查询，同样由 scripts/explain_check.py 检查
+API_QUERIES = {
+    'teams': (TEAMS, lambda team_id, student_id: ()),
+    'public_team_players': (PUBLIC_TEAM_PLAYERS, lambda team_id, student_id: (team_id,)),
+    'schedule_by_time': (SCHEDULE_BY_TIME,
+                         lambda team_id, student_id: ('2024-01-01', '2024-01-08', 200)),
+    'schedule_by_tournament': (SCHEDULE_BY_TOURNAMENT,
+                               lambda team_id, student_id: (1, '2024-01-01', '2024-01-08', 200)),
+}
@@ -0,0 +1,190 @@
+import traceback
+
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import QMessageBox, QProgressBar, QProgressDialog
+
+import exporter
+
+from database import QueryToken
+from instrumentation import call_site_context, find_call_site
+
+
+_thread_pool = None
+
+
+def shared_thread_pool(max_threads):
+    """所有执行器共用的线程池，线程数不超过数据库连接池大小"""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(max_threads)
+    return _thread_pool
+
+
+class _JobSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    done = pyqtSignal()
+
+
+class QueryJob(QRunnable):
+    """在后台线程中执行的一次数据库调用"""
+
+    def __init__(self, func, args, key=None, call_site=None):
+        super().__init__()
+        # 由执行器持有引用，避免 Qt 提前释放
+        self.setAutoDelete(False)
+        self.func = func
+        self.args = args
+        self.key = key
+        self.cancelled = False
+        # 可在服务器端中止的查询（见 QueryExecutor.search）
+        self.token = None
+        # 提交任务的界面方法，后台线程中的数据库调用按它归类统计
+        self.call_site = call_site
+        self.signals = _JobSignals()
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            try:
+                with call_site_context(self.call_site):
+                    result = self.func(*self.args)
+            except Exception as e:
+                traceback.print_exc()
+                if not self.cancelled:
+                    self.signals.failed.emit(str(e))
+                return
+            if not self.cancelled:
+                self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+class QueryExecutor(QObject):
+    """异步查询执行器
+
+    查询在共享线程池中运行，结果通过 Qt 信号回到界面线程。每个标签页持有
+    自己的执行器，busy_changed 用于驱动该页的忙碌指示器。同一个 key 的新任务
+    会取消尚未返回的旧任务，旧任务的结果直接丢弃。
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, db_conn, parent=None):
+        super().__init__(parent)
+        self.db_conn = db_conn
+        self.thread_pool = shared_thread_pool(getattr(db_conn, 'pool_size', 4))
+        self._jobs = set()
+
+    def is_busy(self):
+        return any(not job.cancelled for job in self._jobs)
+
+    def submit(self, func, *args, on_result=None, on_error=None, key=None):
+        """提交任意函数到后台执行"""
+        if key is not None:
+            self.cancel(key)
+
+        call_site = find_call_site() if getattr(self.db_conn, 'instrumentation', None) else None
+        job = QueryJob(func, args, key, call_site)
+        if on_result:
+            job.signals.finished.connect(on_result)
+        if on_error:
+            job.signals.failed.connect(on_error)
+        job.signals.done.connect(lambda job=job: self._job_done(job))
+
+        was_busy = self.is_busy()
+        self._jobs.add(job)
+        self.thread_pool.start(job)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        return job
+
+    def query(self, query, params=None, on_result=None, on_error=None, key=None, cached=False):
+        """后台执行 execute_query；cached 为 True 时使用结果缓存"""
+        return self.submit(self.db_conn.execute_query, query, params, cached,
+                           on_result=on_result, on_error=on_error, key=key)
+
+    def search(self, query, params=None, on_result=None, on_error=None, key=None, timeout_ms=None):
+        """后台执行可中止的查询，用于边输入边搜索
+
+        同一个 key 的新搜索开始时，旧搜索如果还在服务器上执行会被 KILL QUERY 中止；
+        timeout_ms 限制最长执行时间。结果不经过结果缓存。
+        """
+        token = QueryToken()
+        job = self.submit(self.db_conn.execute_cancellable, query, params, token, timeout_ms,
+                          on_result=on_result, on_error=on_error, key=key)
+        job.token = token
+        return job
+
+    def update(self, query, params=None, on_result=None, on_error=None, key=None):
+        """后台执行 execute_update"""
+        return self.submit(self.db_conn.execute_update, query, params,
+                           on_result=on_result, on_error=on_error, key=key)
+
+    def cancel(self, key=None):
+        """取消任务；key 为 None 时取消全部任务"""
+        was_busy = self.is_busy()
+        for job in list(self._jobs):
+            if key is None or job.key == key:
+                job.cancelled = True
+                # 还没开始运行的任务直接从队列中移除
+                if self.thread_pool.tryTake(job):
+                    self._jobs.discard(job)
+                elif job.token is not None:
+                    job.token.cancel(self.db_conn)
+        if was_busy and not self.is_busy():
+            self.busy_changed.emit(False)
+
+    def _job_done(self, job):
+        was_busy = self.is_busy()
+        self._jobs.discard(job)
+        if was_busy and not self.is_busy():
+            self.busy_changed.emit(False)
+
+
+class BusyIndicator(QProgressBar):
+    """不确定进度的忙碌指示条，执行器空闲时自动隐藏"""
+
+    def __init__(self, executor, parent=None):
+        super().__init__(parent)
+        self.setRange(0, 0)
+        self.setTextVisible(False)
+        self.setMaximumWidth(120)
+        self.setMaximumHeight(12)
+        self.hide()
+        executor.busy_changed.connect(self.setVisible)
+
+
+class ExportProgress(QObject):
+    """把后台导出线程的进度（已导出行数）转发到界面线程"""
+
+    progress = pyqtSignal(int)
+
+
+def run_export(parent, executor, db_conn, query, params, path, labels=None, hidden=()):
+    """在后台把查询结果流式导出到 path，显示进度并在完成后提示
+
+    管理页和队长页面共用；hidden 为不导出的列，见 exporter.export_query。
+    """
+    dialog = QProgressDialog("正在导出...", None, 0, 0, parent)
+    dialog.setWindowTitle("导出数据")
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(0)
+    dialog.show()
+
+    bridge = ExportProgress(dialog)
+    bridge.progress.connect(lambda total: dialog.setLabelText(f"已导出 {total} 行"))
+
+    def on_result(total):
+        dialog.close()
+        QMessageBox.information(parent, "导出完成", f"已导出 {total} 行到 {path}")
+
+    def on_error(message):
+        dialog.close()
+        QMessageBox.critical(parent, "导出失败", f"导出失败！错误信息：{message}")
+
+    executor.submit(exporter.export_query, db_conn, query, params, path, labels,
+                    exporter.DEFAULT_STREAM_CHUNK_SIZE, bridge.progress.emit, hidden,
+                    on_result=on_result, on_error=on_error)
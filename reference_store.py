@@ -0,0 +1,148 @@
+import threading
+import weakref
+
+
+class Dataset:
+    """一组下拉选项数据：查询、主键列、显示名称以及依赖的表（小写）"""
+
+    def __init__(self, query, key, label, tables):
+        self.query = query
+        self.key = key
+        self.label = label
+        self.tables = tables
+
+    def key_of(self, row):
+        if isinstance(self.key, tuple):
+            return tuple(row[column] for column in self.key)
+        return row[self.key]
+
+    def option(self, row):
+        """对话框下拉框中的选项文本，格式为“主键: 名称”"""
+        key = self.key_of(row)
+        key_text = '-'.join(str(part) for part in key) if isinstance(key, tuple) else str(key)
+        return f"{key_text}: {self.label(row)}"
+
+
+DATASETS = {
+    'colleges': Dataset(
+        "SELECT dept_id, dept_name FROM College ORDER BY dept_id",
+        'dept_id', lambda row: row['dept_name'], {'college'}
+    ),
+    'teams': Dataset(
+        "SELECT team_id, team_name, established_year, dept_id FROM Team ORDER BY team_id",
+        'team_id', lambda row: row['team_name'], {'team'}
+    ),
+    'tournaments': Dataset(
+        "SELECT tournament_id, tournament_name, year FROM Tournament ORDER BY tournament_id",
+        'tournament_id', lambda row: row['tournament_name'], {'tournament'}
+    ),
+    'matches': Dataset(
+        """
+        SELECT m.match_id,
+               CONCAT(ht.team_name, ' vs ', at.team_name, ' (', DATE_FORMAT(m.scheduled_time, '%Y-%m-%d'), ')') as match_info
+        FROM `Match` m
+        LEFT JOIN Team ht ON m.home_team_id = ht.team_id
+        LEFT JOIN Team at ON m.away_team_id = at.team_id
+        ORDER BY m.match_id
+        """,
+        'match_id', lambda row: row['match_info'], {'match', 'team'}
+    ),
+    'games': Dataset(
+        """
+        SELECT g.match_id, g.game_id, g.game_type,
+               CONCAT('比赛', g.match_id, '-盘', g.game_id, ' (', g.game_type, ')') as game_info
+        FROM Game g
+        ORDER BY g.match_id, g.game_id
+        """,
+        ('match_id', 'game_id'), lambda row: row['game_info'], {'game'}
+    ),
+    'players': Dataset(
+        """
+        SELECT p.student_id, p.name, p.team_id, p.role, t.team_name
+        FROM Player p
+        LEFT JOIN Team t ON p.team_id = t.team_id
+        ORDER BY p.student_id
+        """,
+        'student_id', lambda row: f"{row['name']} ({row['team_name']})", {'player', 'team'}
+    ),
+}
+
+
+class ReferenceStore:
+    """进程内共享的参考数据（院系、球队、赛事、比赛、盘次、球员列表）
+
+    每组数据在第一次使用时查询一次，之后直接返回内存中的结果，并建好主键到行、
+    主键到选项文本的映射。通过 DatabaseConnection 写入相关表，或者变更日志报告
+    其他会话修改了相关表（change_poller.py）后，对应的数据组被丢弃，下次使用时
+    重新查询。查询出错时抛出 mysql.connector.Error；空结果和出错都不缓存。
+
+    查询在锁外执行，加载一组数据时不会挡住其他数据组的读取和写操作后的失效。每组
+    数据记录失效次数，查询期间该组被置为失效时，查到的结果只返回给本次调用，不缓存。
+
+    同一个 DatabaseConnection 共用一个实例，用 for_connection 获取。
+    """
+
+    _instances = weakref.WeakKeyDictionary()
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_connection(cls, db_conn):
+        with cls._instances_lock:
+            store = cls._instances.get(db_conn)
+            if store is None:
+                store = cls(db_conn)
+                cls._instances[db_conn] = store
+            return store
+
+    def __init__(self, db_conn):
+        self.db_conn = db_conn
+        self._lock = threading.Lock()
+        self._loaded = {}  # 名称 -> (行列表, 主键->行, 选项文本列表)
+        self._generations = {}  # 名称 -> 失效次数
+        db_conn.add_write_listener(self.invalidate_tables)
+
+    def _load(self, name):
+        with self._lock:
+            loaded = self._loaded.get(name)
+            if loaded is not None:
+                return loaded
+            generation = self._generations.get(name, 0)
+
+        dataset = DATASETS[name]
+        rows = self.db_conn.execute_cancellable(dataset.query)
+        by_key = {dataset.key_of(row): row for row in rows}
+        options = [dataset.option(row) for row in rows]
+        loaded = (rows, by_key, options)
+        with self._lock:
+            if rows and self._generations.get(name, 0) == generation:
+                # 同时有其他线程加载了同一组数据时沿用先写入的那份
+                loaded = self._loaded.setdefault(name, loaded)
+        return loaded
+
+    def rows(self, name):
+        """整组数据（不要修改返回的行）"""
+        return self._load(name)[0]
+
+    def row(self, name, key):
+        """按主键取一行，不存在时返回 None"""
+        return self._load(name)[1].get(key)
+
+    def label(self, name, key):
+        row = self.row(name, key)
+        return DATASETS[name].label(row) if row else None
+
+    def options(self, name):
+        """对话框下拉框使用的选项文本列表"""
+        return list(self._load(name)[2])
+
+    def options_many(self, names):
+        """一次取多组选项，适合在后台线程中为对话框准备数据"""
+        return tuple(self.options(name) for name in names)
+
+    def invalidate_tables(self, tables):
+        """写入 tables 后丢弃依赖这些表的数据组"""
+        with self._lock:
+            for name, dataset in DATASETS.items():
+                if dataset.tables & tables:
+                    self._loaded.pop(name, None)
+                    self._generations[name] = self._generations.get(name, 0) + 1
@@ -0,0 +1,146 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 256
+
+# 读查询中出现的表
+_READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+`?(\w+)`?', re.IGNORECASE)
+# 写语句修改的表
+_WRITE_TABLES = re.compile(
+    r'^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE\s+(?:TABLE\s+)?)\s*`?(\w+)`?',
+    re.IGNORECASE
+)
+
+# 写一张表时会被连带修改的表：外键级联删除，以及 trigger.sql、player_stats.sql、
+# standings.sql 中触发器写入的表。失效时按传递闭包处理
+DEPENDENT_TABLES = {
+    'college': {'team'},
+    'team': {'player', 'match'},
+    'tournament': {'match', 'tournamentstanding'},
+    'player': {'player_in_game', 'playerstats', 'playerrating', 'pairrating'},
+    'match': {'game', 'playerstats', 'tournamentstanding'},
+    'game': {'match', 'player_in_game', 'playerstats'},
+    'player_in_game': {'playerstats'},
+}
+
+
+def read_tables(query):
+    """查询读取的表（小写）"""
+    return {name.lower() for name in _READ_TABLES.findall(query)}
+
+
+def written_tables(query):
+    """写语句直接或间接修改的表（小写）"""
+    match = _WRITE_TABLES.match(query)
+    if not match:
+        return set()
+    return dependent_closure([match.group(1)])
+
+
+def dependent_closure(names):
+    """names 中的表及其 DEPENDENT_TABLES 传递闭包（小写）"""
+    tables = set()
+    pending = [name.lower() for name in names]
+    while pending:
+        table = pending.pop()
+        if table not in tables:
+            tables.add(table)
+            pending.extend(DEPENDENT_TABLES.get(table, ()))
+    return tables
+
+
+class QueryResultCache:
+    """查询结果缓存
+
+    以 (SQL, 参数) 为键缓存查询结果，条目在 ttl 秒后过期，超过 max_entries 时淘汰
+    最久未使用的条目。写语句执行后调用 invalidate，读取了相关表的缓存随即失效。
+
+    每张表有一个版本号，写入时递增。查询开始前记录版本号，结果返回时如果相关表
+    已被写过就不再缓存，避免与写操作并发的查询把旧数据放进缓存。
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (过期时间, 表, 结果)
+        self._by_table = {}  # 表 -> {key}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query, params):
+        return query, tuple(params or ())
+
+    def get(self, key):
+        """返回缓存的结果，不存在或已过期时返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, _tables, rows = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # 复制一份，调用方修改结果不会影响缓存
+        return [dict(row) for row in rows]
+
+    def versions(self, tables):
+        """查询开始前调用，记录相关表的版本号"""
+        with self._lock:
+            return {table: self._versions.get(table, 0) for table in tables}
+
+    def put(self, key, tables, rows, versions):
+        with self._lock:
+            if any(self._versions.get(table, 0) != version for table, version in versions.items()):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tables, [dict(row) for row in rows])
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tables):
+        """使读取了这些表的缓存失效"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                for key in self._by_table.pop(table, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for table in entry[1]:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
@@ -0,0 +1,333 @@
+"""赛程生成
+
+为一个赛事的若干球队生成循环赛赛程，分配场地、裁判和开赛时间后一次写入 Match。
+
+  - 对阵：单循环或双循环（--double，第二循环主客互换），用轮转法排出各轮，
+    每轮每队最多一场，球队数为奇数时每轮轮空一队；分组时（--groups）按给定顺序
+    蛇形分组，各组的同一轮合并为一轮
+  - 时间：从开始时间起，每天按给定的开赛时间（如 09:00 14:00 19:00）排成时段，
+    每个时段每块场地、每名裁判最多一场；一支球队同一天最多 --max-per-day 场，
+    并且按轮次先后出场
+  - 已有比赛：开始时间之后已排定的比赛（任何赛事）占用的场地、裁判和球队时段
+    不再使用，与之时间重叠（相差不到一场比赛的时长）的时段都算占用
+
+分配是逐场的贪心：每场比赛放在两队都可以出场的最早时段，场地按给定顺序取第一块
+空闲的，裁判取已分配场次最少的空闲裁判。全部比赛在一个事务中用 executemany 写入，
+200 支球队的单循环（19900 场）生成和写入都在几秒内完成。
+
+    python scheduler.py --tournament 1 --teams 1 2 3 4 5 6 --start "2024-09-01 09:00" \\
+        --times 09:00 14:00 --venues 体育馆1号台 体育馆2号台 --referees 张三 李四 --dry-run
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+import queries
+
+
+DEFAULT_TIMES = ('09:00', '14:00', '19:00')
+MATCH_MINUTES = 120
+MAX_PER_DAY = 1
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class ScheduleError(ValueError):
+    """无法按给定条件生成赛程"""
+
+
+def round_robin(team_ids, double=False):
+    """轮转法排出循环赛的各轮，返回 [[(主队, 客队), ...], ...]
+
+    第一支球队固定，其余球队每轮顺时针转一格，主客场大致交替，连续主场或客场
+    不超过三场。双循环的第二循环重复第一循环的各轮并交换主客队。
+    """
+    teams = list(team_ids)
+    if len(teams) < 2:
+        return []
+    if len(teams) % 2:
+        teams.append(None)  # 轮空
+    count = len(teams)
+    rounds = []
+    for round_index in range(count - 1):
+        pairs = []
+        for i in range(count // 2):
+            first, second = teams[i], teams[count - 1 - i]
+            if first is None or second is None:
+                continue
+            # 固定的球队每轮交换主客；其余位置按奇偶安排，每队主客场数最多相差 2
+            home_first = i % 2 == 1 if i else round_index % 2 == 0
+            if home_first:
+                pairs.append((first, second))
+            else:
+                pairs.append((second, first))
+        rounds.append(pairs)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    if double:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def split_groups(team_ids, groups):
+    """按给定顺序蛇形分成 groups 组（1、2、…、n、n、…、2、1），种子球队分散到各组"""
+    result = [[] for _ in range(groups)]
+    for position, team_id in enumerate(team_ids):
+        index = position % groups
+        if (position // groups) % 2:
+            index = groups - 1 - index
+        result[index].append(team_id)
+    return result
+
+
+def grouped_rounds(team_ids, groups=1, double=False):
+    """分组循环的各轮：每组各自循环，各组的第 n 轮合并为第 n 轮"""
+    team_ids = list(dict.fromkeys(team_ids))
+    if groups < 1:
+        raise ScheduleError("分组数至少为 1")
+    if len(team_ids) < groups * 2:
+        raise ScheduleError(f"{len(team_ids)} 支球队不够分成 {groups} 组，每组至少需要 2 支")
+    rounds = []
+    for group_rounds in (round_robin(group, double) for group in split_groups(team_ids, groups)):
+        for round_index, pairs in enumerate(group_rounds):
+            if round_index == len(rounds):
+                rounds.append([])
+            rounds[round_index].extend(pairs)
+    return rounds
+
+
+def parse_times(texts):
+    """'09:00' 形式的开赛时间，排序并去重"""
+    times = set()
+    for text in texts:
+        try:
+            times.add(datetime.strptime(text.strip(), '%H:%M').time())
+        except ValueError:
+            raise ScheduleError(f"开赛时间格式应为 HH:MM：{text}")
+    if not times:
+        raise ScheduleError("至少需要一个开赛时间")
+    return sorted(times)
+
+
+class SlotPlanner:
+    """把比赛逐场放入时段，记录每个时段已占用的场地、裁判和球队
+
+    时段用从 0 开始的序号表示：从开始时间所在的那一天起，每天 len(times) 个时段，
+    早于开始时间的时段不使用。
+    """
+
+    def __init__(self, start, times, venues, referees=(), match_minutes=MATCH_MINUTES,
+                 max_per_day=MAX_PER_DAY):
+        venues = list(dict.fromkeys(venue for venue in venues if venue))
+        if not venues:
+            raise ScheduleError("至少需要一块场地")
+        if max_per_day < 1:
+            raise ScheduleError("每队每天至少可以比赛一场")
+        self.start = start
+        self.times = list(times)
+        self.duration = timedelta(minutes=match_minutes)
+        gaps = [datetime.combine(start.date(), b) - datetime.combine(start.date(), a)
+                for a, b in zip(self.times, self.times[1:])]
+        gaps.append(timedelta(days=1) - (datetime.combine(start.date(), self.times[-1])
+                                         - datetime.combine(start.date(), self.times[0])))
+        if min(gaps) < self.duration:
+            raise ScheduleError("相邻开赛时间的间隔不能短于一场比赛的时长")
+        self.venues = venues
+        self.referees = list(dict.fromkeys(referee for referee in referees if referee))
+        self.max_per_day = max_per_day
+        # 开始时间当天已过去的时段数
+        self.offset = sum(1 for t in self.times if t < start.time())
+
+        self.used_venues = {}    # 时段 -> 已占用的场地集合
+        self.used_referees = {}  # 时段 -> 已占用的裁判集合
+        self.used_teams = {}     # 时段 -> 已出场的球队集合
+        self.team_day = {}       # (球队, 天) -> 场数
+        self.referee_load = dict.fromkeys(self.referees, 0)
+        self.ready = {}          # 球队 -> 下一场最早可用的时段
+        self.first_open = 0      # 此前的时段场地或裁判已经用完
+
+    def slot_time(self, slot):
+        day, index = divmod(slot + self.offset, len(self.times))
+        return datetime.combine(self.start.date() + timedelta(days=day), self.times[index])
+
+    def slot_day(self, slot):
+        return (slot + self.offset) // len(self.times)
+
+    def _slot_full(self, slot):
+        if len(self.used_venues.get(slot, ())) >= len(self.venues):
+            return True
+        return bool(self.referees) and len(self.used_referees.get(slot, ())) >= len(self.referees)
+
+    def reserve(self, rows):
+        """登记已有的比赛：rows 为 SCHEDULE_BUSY 的结果"""
+        per_day = len(self.times)
+        for row in rows:
+            scheduled = row['scheduled_time']
+            if isinstance(scheduled, str):
+                scheduled = datetime.strptime(scheduled[:19], TIME_FORMAT)
+            first_day = (scheduled - self.duration).date() - self.start.date()
+            last_day = (scheduled + self.duration).date() - self.start.date()
+            for day in range(first_day.days, last_day.days + 1):
+                for index in range(per_day):
+                    slot = day * per_day + index - self.offset
+                    if slot < 0 or abs(self.slot_time(slot) - scheduled) >= self.duration:
+                        continue
+                    if row['venue'] in self.venues:
+                        self.used_venues.setdefault(slot, set()).add(row['venue'])
+                    if row['referee'] in self.referees:
+                        self.used_referees.setdefault(slot, set()).add(row['referee'])
+                    self.used_teams.setdefault(slot, set()).update(
+                        (row['home_team_id'], row['away_team_id']))
+            day = (scheduled.date() - self.start.date()).days
+            for team_id in (row['home_team_id'], row['away_team_id']):
+                self.team_day[team_id, day] = self.team_day.get((team_id, day), 0) + 1
+        while self._slot_full(self.first_open):
+            self.first_open += 1
+
+    def place(self, home, away):
+        """把一场比赛放入最早可用的时段，返回 (时段, 场地, 裁判)"""
+        slot = max(self.ready.get(home, 0), self.ready.get(away, 0), self.first_open)
+        while True:
+            teams = self.used_teams.get(slot, ())
+            day = self.slot_day(slot)
+            if (home not in teams and away not in teams
+                    and self.team_day.get((home, day), 0) < self.max_per_day
+                    and self.team_day.get((away, day), 0) < self.max_per_day
+                    and not self._slot_full(slot)):
+                break
+            slot += 1
+
+        used_venues = self.used_venues.setdefault(slot, set())
+        venue = next(venue for venue in self.venues if venue not in used_venues)
+        used_venues.add(venue)
+        referee = None
+        if self.referees:
+            used_referees = self.used_referees.setdefault(slot, set())
+            referee = min((name for name in self.referees if name not in used_referees),
+                          key=self.referee_load.__getitem__)
+            used_referees.add(referee)
+            self.referee_load[referee] += 1
+        self.used_teams.setdefault(slot, set()).update((home, away))
+        for team_id in (home, away):
+            self.team_day[team_id, day] = self.team_day.get((team_id, day), 0) + 1
+            self.ready[team_id] = slot + 1
+        while self._slot_full(self.first_open):
+            self.first_open += 1
+        return slot, venue, referee
+
+
+def plan(rounds, start, times=DEFAULT_TIMES, venues=(), referees=(), match_minutes=MATCH_MINUTES,
+         max_per_day=MAX_PER_DAY, busy=()):
+    """为各轮比赛分配时间、场地和裁判
+
+    times 为 'HH:MM' 字符串或 datetime.time，busy 为需要避开的已有比赛
+    （SCHEDULE_BUSY 的结果）。返回按时间排序的字典列表，键为 round、scheduled_time、
+    venue、home_team_id、away_team_id、referee。
+    """
+    if times and isinstance(next(iter(times)), str):
+        times = parse_times(times)
+    planner = SlotPlanner(start, sorted(times), venues, referees, match_minutes, max_per_day)
+    planner.reserve(busy)
+    fixtures = []
+    for round_index, pairs in enumerate(rounds, 1):
+        for home, away in pairs:
+            slot, venue, referee = planner.place(home, away)
+            fixtures.append({
+                'round': round_index, 'slot': slot, 'scheduled_time': planner.slot_time(slot),
+                'venue': venue, 'home_team_id': home, 'away_team_id': away, 'referee': referee,
+            })
+    fixtures.sort(key=lambda fixture: (fixture['slot'], fixture['venue']))
+    return fixtures
+
+
+def generate(db_conn, team_ids, start, groups=1, double=False, **options):
+    """读取开始时间之后的已有比赛并生成赛程，options 见 plan()
+
+    出错时抛出 ScheduleError 或 mysql.connector.Error。
+    """
+    rounds = grouped_rounds(team_ids, groups, double)
+    busy_from = start - timedelta(minutes=options.get('match_minutes', MATCH_MINUTES))
+    busy = db_conn.execute_cancellable(queries.SCHEDULE_BUSY, (busy_from.strftime(TIME_FORMAT),))
+    return plan(rounds, start, busy=busy, **options)
+
+
+def insert(db_conn, tournament_id, fixtures):
+    """在一个事务中写入全部比赛，返回写入的场数"""
+    rows = [
+        (fixture['scheduled_time'].strftime(TIME_FORMAT), fixture['venue'], tournament_id,
+         fixture['home_team_id'], fixture['away_team_id'], fixture['referee'])
+        for fixture in fixtures
+    ]
+    if not rows:
+        return 0
+    db_conn.execute_batch(queries.INSERT_MATCH, rows)
+    return len(rows)
+
+
+def summary(fixtures):
+    """赛程概要，用于写入前确认"""
+    if not fixtures:
+        return "没有需要安排的比赛"
+    first = fixtures[0]['scheduled_time']
+    last = fixtures[-1]['scheduled_time']
+    rounds = max(fixture['round'] for fixture in fixtures)
+    return (f"共 {len(fixtures)} 场比赛，{rounds} 轮，"
+            f"{first:%Y-%m-%d %H:%M} 至 {last:%Y-%m-%d %H:%M}")
+
+
+def main():
+    from database import DatabaseConnection
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tournament', type=int, required=True, help="赛事ID")
+    parser.add_argument('--teams', type=int, nargs='*', help="参赛球队ID，按种子顺序；默认为全部球队")
+    parser.add_argument('--groups', type=int, default=1, help="分组数，默认不分组")
+    parser.add_argument('--double', action='store_true', help="双循环")
+    parser.add_argument('--start', required=True, help="开始时间，如 '2024-09-01 09:00'")
+    parser.add_argument('--times', nargs='+', default=list(DEFAULT_TIMES), help="每天的开赛时间")
+    parser.add_argument('--venues', nargs='+', required=True, help="可用场地")
+    parser.add_argument('--referees', nargs='*', default=[], help="可用裁判，不指定时不分配裁判")
+    parser.add_argument('--minutes', type=int, default=MATCH_MINUTES, help="每场比赛占用的分钟数")
+    parser.add_argument('--max-per-day', type=int, default=MAX_PER_DAY, help="每队每天最多比赛场数")
+    parser.add_argument('--dry-run', action='store_true', help="只显示赛程，不写入数据库")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_db')
+    parser.add_argument('--sqlite', metavar='PATH', help="使用 SQLite 数据库文件，而不是 MySQL")
+    args = parser.parse_args()
+
+    try:
+        start = datetime.strptime(args.start, '%Y-%m-%d %H:%M')
+    except ValueError:
+        parser.error("开始时间格式应为 YYYY-MM-DD HH:MM")
+
+    db_conn = DatabaseConnection(pool_size=1)
+    if args.sqlite:
+        connected = db_conn.connect_sqlite(args.sqlite)
+    else:
+        connected = db_conn.connect(args.host, args.user, args.password, args.database)
+    if not connected:
+        return 1
+    try:
+        team_ids = args.teams or [row['team_id'] for row in db_conn.execute_query(queries.TEAMS)]
+        try:
+            fixtures = generate(db_conn, team_ids, start, args.groups, args.double,
+                                times=args.times, venues=args.venues, referees=args.referees,
+                                match_minutes=args.minutes, max_per_day=args.max_per_day)
+        except ScheduleError as e:
+            print(e, file=sys.stderr)
+            return 1
+        if args.dry_run:
+            for fixture in fixtures:
+                print(f"第{fixture['round']}轮\t{fixture['scheduled_time']:%Y-%m-%d %H:%M}\t"
+                      f"{fixture['venue']}\t{fixture['home_team_id']} - {fixture['away_team_id']}\t"
+                      f"{fixture['referee'] or ''}")
+        else:
+            insert(db_conn, args.tournament, fixtures)
+        print(summary(fixtures))
+    finally:
+        db_conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
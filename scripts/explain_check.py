@@ -0,0 +1,93 @@
+"""检查队长页面和只读 API 查询的执行计划
+
+对 queries.py 中的每条查询执行 EXPLAIN，任一查询出现对大表的全表扫描
+（type=ALL）或在 Match 上没有使用索引时以非零状态退出。需要先执行
+sql_files/indexes.sql。
+
+    python scripts/explain_check.py --user root --password password
+"""
+import argparse
+import os
+import sys
+
+import mysql.connector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import queries  # noqa: E402
+
+
+# 这些表的行数随比赛场次、球员数量增长，不允许全表扫描。
+# College、Tournament 等小表以及 UNION 结果的派生表不在检查范围内
+LARGE_TABLES = {'m', 'Match', 'p', 'Player', 'Player_In_Game', 'pig', 'Game', 'g',
+                'ps', 'PlayerStats', 's', 'TournamentStanding', 'pr', 'PlayerRating', 'PairRating'}
+
+
+def sample_ids(cursor):
+    """取一个真实存在的队长，保证 EXPLAIN 的代价估算贴近实际"""
+    cursor.execute("SELECT student_id, team_id FROM Player WHERE role = '队长' LIMIT 1")
+    row = cursor.fetchone()
+    if not row:
+        return 1, ''
+    return row['team_id'], row['student_id']
+
+
+def check_plan(plan):
+    problems = []
+    for row in plan:
+        table = row['table'] or ''
+        if table in LARGE_TABLES and row['type'] == 'ALL':
+            problems.append(f"{table}: 全表扫描")
+        if table == 'm' and not row['key']:
+            problems.append(f"{table}: 未使用索引")
+    return problems
+
+
+def format_plan(plan):
+    lines = []
+    for row in plan:
+        lines.append(
+            f"    {row['id']!s:>3} {row['select_type']:<14} {str(row['table']):<22}"
+            f"{str(row['type']):<8}{str(row['key']):<24}{str(row['rows']):>8}  {row['Extra'] or ''}"
+        )
+    return '\n'.join(lines)
+
+
+def run(args):
+    connection = mysql.connector.connect(
+        host=args.host, user=args.user, password=args.password,
+        database=args.database, charset='utf8mb4'
+    )
+    cursor = connection.cursor(dictionary=True)
+    failed = False
+    try:
+        team_id, student_id = sample_ids(cursor)
+        for name, (query, build_params) in {**queries.CAPTAIN_QUERIES, **queries.API_QUERIES}.items():
+            cursor.execute("EXPLAIN " + query, build_params(team_id, student_id))
+            plan = cursor.fetchall()
+            problems = check_plan(plan)
+            status = "FAIL" if problems else "OK"
+            print(f"[{status}] {name}")
+            if args.verbose or problems:
+                print(format_plan(plan))
+            for problem in problems:
+                print(f"    - {problem}")
+            failed = failed or bool(problems)
+    finally:
+        cursor.close()
+        connection.close()
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_db')
+    parser.add_argument('-v', '--verbose', action='store_true', help="输出每条查询的完整执行计划")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""api_server.py 的并发压测
+
+启动 --clients 个并发客户端，每个客户端使用一个 keep-alive 连接，在 --duration
+秒内循环请求 --paths 中的接口，统计每秒请求数、延迟分位数和错误数。只依赖标准库。
+
+    python api_server.py --pool-size 16 &
+    python scripts/load_test.py --clients 300 --duration 30 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+
+
+DEFAULT_PATHS = [
+    '/teams',
+    '/teams/1/players',
+    '/teams/1/matches',
+    '/teams/1/stats',
+    '/teams/1/tournaments',
+    '/schedule',
+]
+
+
+def percentile(values, fraction):
+    """最近秩法求分位数，与 benchmarks/run_benchmarks.py 相同"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def read_response(reader):
+    """读取一个响应，返回状态码"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value.strip())
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, paths, deadline, stats, rng):
+    reader = writer = None
+    while time.monotonic() < deadline:
+        if writer is None:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                stats['connect_errors'] += 1
+                await asyncio.sleep(0.1)
+                continue
+        path = rng.choice(paths)
+        request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n"
+        start = time.perf_counter()
+        try:
+            writer.write(request.encode('latin-1'))
+            await writer.drain()
+            status = await read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            stats['errors'] += 1
+            writer.close()
+            reader = writer = None
+            continue
+        stats['latencies'].append(time.perf_counter() - start)
+        stats['status'][status] = stats['status'].get(status, 0) + 1
+        if status >= 400:
+            stats['errors'] += 1
+    if writer is not None:
+        writer.close()
+
+
+async def run(args):
+    stats = {'latencies': [], 'status': {}, 'errors': 0, 'connect_errors': 0}
+    paths = args.paths or DEFAULT_PATHS
+    started = time.monotonic()
+    deadline = started + args.duration
+    rng = random.Random(args.seed)
+    await asyncio.gather(*[
+        client(args.host, args.port, paths, deadline, stats, random.Random(rng.random()))
+        for _ in range(args.clients)
+    ])
+    elapsed = time.monotonic() - started
+
+    latencies = stats['latencies']
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        'clients': args.clients,
+        'duration_s': round(elapsed, 3),
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': ms(percentile(latencies, 0.5)),
+        'p95_ms': ms(percentile(latencies, 0.95)),
+        'p99_ms': ms(percentile(latencies, 0.99)),
+        'max_ms': ms(max(latencies) if latencies else None),
+        'errors': stats['errors'],
+        'connect_errors': stats['connect_errors'],
+        'status': {str(code): count for code, count in sorted(stats['status'].items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=20.0, help="秒")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--paths', nargs='*', help="请求的接口，默认为队伍 1 的各接口和赛程")
+    parser.add_argument('--output', help="JSON 结果文件")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report['errors'] or report['connect_errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
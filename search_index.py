@@ -0,0 +1,82 @@
+from collections import defaultdict
+
+
+class NgramIndex:
+    """内存中的 n-gram 倒排索引
+
+    按字符切分，因此“张三”这类中文姓名不需要分词也能检索。每个被索引的字段
+    都登记长度为 1 和 n 的子串；查询时先用查询串的各个 n-gram 求交集得到候选
+    行，再逐个确认确实包含查询串，结果与 SQL 的 LIKE '%text%' 一致（不区分
+    大小写）。
+    """
+
+    def __init__(self, n=2):
+        self.n = n
+        self.fields = []
+        self._rows = []
+        self._texts = []
+        self._postings = defaultdict(set)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def clear(self, fields=None):
+        """清空索引，可同时指定新的索引字段"""
+        if fields is not None:
+            self.fields = list(fields)
+        self._rows = []
+        self._texts = []
+        self._postings = defaultdict(set)
+
+    @staticmethod
+    def normalize(value):
+        return '' if value is None else str(value).casefold()
+
+    def _grams(self, text):
+        grams = set(text)
+        n = self.n
+        grams.update(text[i:i + n] for i in range(len(text) - n + 1))
+        return grams
+
+    def add_rows(self, rows):
+        """追加一批行（如刚加载的一页数据）"""
+        postings = self._postings
+        for row in rows:
+            position = len(self._rows)
+            texts = tuple(self.normalize(row.get(field)) for field in self.fields)
+            self._rows.append(row)
+            self._texts.append(texts)
+            for text in texts:
+                for gram in self._grams(text):
+                    postings[gram].add(position)
+
+    def search(self, text):
+        """返回包含 text 的所有行，保持加入索引时的顺序"""
+        query = self.normalize(text).strip()
+        if not query:
+            return list(self._rows)
+
+        if len(query) < self.n:
+            grams = [query]
+        else:
+            grams = {query[i:i + self.n] for i in range(len(query) - self.n + 1)}
+
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+
+        texts = self._texts
+        matches = [position for position in candidates
+                   if any(query in field for field in texts[position])]
+        matches.sort()
+        return [self._rows[position] for position in matches]
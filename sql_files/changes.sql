@@ -0,0 +1,176 @@
+-- ============================================
+-- 变更日志 (ChangeLog)
+-- ============================================
+-- 管理窗口和队长页面显示的表每写入一行，触发器就在 ChangeLog 中追加一条记录
+-- （表名和主键，复合主键依次放在 key1..key3）。change_id 是全局递增的版本号，
+-- 每张表的版本就是它最后一条记录的 change_id。打开的页面定期读取自己看到的版本
+-- 之后的记录（changes.py），只重新查询这些主键对应的行并合并到已加载的数据中，
+-- 其他管理员的修改也随之显示。
+--
+-- 修改主键的 UPDATE 同时记录新旧两个主键。外键级联删除不会触发触发器，被级联
+-- 删除的子表行不会出现在日志中：页面在父表（院系、球队、赛事）变化时整页重新
+-- 加载，比赛、盘次、球员的删除则按主键前缀删除已加载的子表行。
+--
+-- 日志只保留最近的记录，changes.py 在超过 KEEP_CHANGES 的两倍时删除较早的一半；
+-- 落后太多的页面改为整页重新加载。
+--
+-- 执行顺序：create_tables.sql 之后任意时候执行，可以重复执行。
+
+USE table_tennis_db;
+
+CREATE TABLE IF NOT EXISTS ChangeLog (
+    change_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(32) NOT NULL,
+    key1 VARCHAR(20) NOT NULL,
+    key2 VARCHAR(20),
+    key3 VARCHAR(20)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+DROP TRIGGER IF EXISTS changelog_college_insert;
+DROP TRIGGER IF EXISTS changelog_college_update;
+DROP TRIGGER IF EXISTS changelog_college_delete;
+DROP TRIGGER IF EXISTS changelog_team_insert;
+DROP TRIGGER IF EXISTS changelog_team_update;
+DROP TRIGGER IF EXISTS changelog_team_delete;
+DROP TRIGGER IF EXISTS changelog_player_insert;
+DROP TRIGGER IF EXISTS changelog_player_update;
+DROP TRIGGER IF EXISTS changelog_player_delete;
+DROP TRIGGER IF EXISTS changelog_tournament_insert;
+DROP TRIGGER IF EXISTS changelog_tournament_update;
+DROP TRIGGER IF EXISTS changelog_tournament_delete;
+DROP TRIGGER IF EXISTS changelog_match_insert;
+DROP TRIGGER IF EXISTS changelog_match_update;
+DROP TRIGGER IF EXISTS changelog_match_delete;
+DROP TRIGGER IF EXISTS changelog_game_insert;
+DROP TRIGGER IF EXISTS changelog_game_update;
+DROP TRIGGER IF EXISTS changelog_game_delete;
+DROP TRIGGER IF EXISTS changelog_player_in_game_insert;
+DROP TRIGGER IF EXISTS changelog_player_in_game_update;
+DROP TRIGGER IF EXISTS changelog_player_in_game_delete;
+
+-- 每张表的 INSERT、UPDATE、DELETE 各一个触发器，只记录主键
+CREATE TRIGGER changelog_college_insert
+AFTER INSERT ON College
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('College', NEW.dept_id);
+
+CREATE TRIGGER changelog_college_update
+AFTER UPDATE ON College
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1)
+SELECT 'College', NEW.dept_id
+UNION ALL
+SELECT 'College', OLD.dept_id FROM DUAL WHERE OLD.dept_id <> NEW.dept_id;
+
+CREATE TRIGGER changelog_college_delete
+AFTER DELETE ON College
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('College', OLD.dept_id);
+
+CREATE TRIGGER changelog_team_insert
+AFTER INSERT ON Team
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('Team', NEW.team_id);
+
+CREATE TRIGGER changelog_team_update
+AFTER UPDATE ON Team
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1)
+SELECT 'Team', NEW.team_id
+UNION ALL
+SELECT 'Team', OLD.team_id FROM DUAL WHERE OLD.team_id <> NEW.team_id;
+
+CREATE TRIGGER changelog_team_delete
+AFTER DELETE ON Team
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('Team', OLD.team_id);
+
+CREATE TRIGGER changelog_player_insert
+AFTER INSERT ON Player
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('Player', NEW.student_id);
+
+CREATE TRIGGER changelog_player_update
+AFTER UPDATE ON Player
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1)
+SELECT 'Player', NEW.student_id
+UNION ALL
+SELECT 'Player', OLD.student_id FROM DUAL WHERE OLD.student_id <> NEW.student_id;
+
+CREATE TRIGGER changelog_player_delete
+AFTER DELETE ON Player
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('Player', OLD.student_id);
+
+CREATE TRIGGER changelog_tournament_insert
+AFTER INSERT ON Tournament
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('Tournament', NEW.tournament_id);
+
+CREATE TRIGGER changelog_tournament_update
+AFTER UPDATE ON Tournament
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1)
+SELECT 'Tournament', NEW.tournament_id
+UNION ALL
+SELECT 'Tournament', OLD.tournament_id FROM DUAL WHERE OLD.tournament_id <> NEW.tournament_id;
+
+CREATE TRIGGER changelog_tournament_delete
+AFTER DELETE ON Tournament
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('Tournament', OLD.tournament_id);
+
+CREATE TRIGGER changelog_match_insert
+AFTER INSERT ON `Match`
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('Match', NEW.match_id);
+
+CREATE TRIGGER changelog_match_update
+AFTER UPDATE ON `Match`
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1)
+SELECT 'Match', NEW.match_id
+UNION ALL
+SELECT 'Match', OLD.match_id FROM DUAL WHERE OLD.match_id <> NEW.match_id;
+
+CREATE TRIGGER changelog_match_delete
+AFTER DELETE ON `Match`
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1) VALUES ('Match', OLD.match_id);
+
+CREATE TRIGGER changelog_game_insert
+AFTER INSERT ON Game
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1, key2) VALUES ('Game', NEW.match_id, NEW.game_id);
+
+CREATE TRIGGER changelog_game_update
+AFTER UPDATE ON Game
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1, key2)
+SELECT 'Game', NEW.match_id, NEW.game_id
+UNION ALL
+SELECT 'Game', OLD.match_id, OLD.game_id FROM DUAL WHERE OLD.match_id <> NEW.match_id OR OLD.game_id <> NEW.game_id;
+
+CREATE TRIGGER changelog_game_delete
+AFTER DELETE ON Game
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1, key2) VALUES ('Game', OLD.match_id, OLD.game_id);
+
+CREATE TRIGGER changelog_player_in_game_insert
+AFTER INSERT ON Player_In_Game
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1, key2, key3) VALUES ('Player_In_Game', NEW.match_id, NEW.game_id, NEW.student_id);
+
+CREATE TRIGGER changelog_player_in_game_update
+AFTER UPDATE ON Player_In_Game
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1, key2, key3)
+SELECT 'Player_In_Game', NEW.match_id, NEW.game_id, NEW.student_id
+UNION ALL
+SELECT 'Player_In_Game', OLD.match_id, OLD.game_id, OLD.student_id FROM DUAL WHERE OLD.match_id <> NEW.match_id OR OLD.game_id <> NEW.game_id OR OLD.student_id <> NEW.student_id;
+
+CREATE TRIGGER changelog_player_in_game_delete
+AFTER DELETE ON Player_In_Game
+FOR EACH ROW
+INSERT INTO ChangeLog (table_name, key1, key2, key3) VALUES ('Player_In_Game', OLD.match_id, OLD.game_id, OLD.student_id);
@@ -50,6 +50,9 @@ CREATE TABLE `Match` (
     away_team_id INT NOT NULL,
     referee VARCHAR(20),
     final_score VARCHAR(10),
+    -- 主客队已赢盘数，由 trigger.sql 中的触发器增量维护，final_score 由二者拼接而成
+    home_wins TINYINT UNSIGNED NOT NULL DEFAULT 0,
+    away_wins TINYINT UNSIGNED NOT NULL DEFAULT 0,
     FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id) ON DELETE CASCADE,
     FOREIGN KEY (home_team_id) REFERENCES Team(team_id) ON DELETE CASCADE,
     FOREIGN KEY (away_team_id) REFERENCES Team(team_id) ON DELETE CASCADE
@@ -0,0 +1,23 @@
+-- ============================================
+-- 全文索引迁移：为名称搜索建立 ngram FULLTEXT 索引
+-- ============================================
+-- LIKE '%关键字%' 以通配符开头，无法使用 B-Tree 索引，每次搜索都会全表扫描。
+-- ngram 分词器按字符切分，中文姓名、队名不需要分词词典也能检索。
+-- 分词长度由服务器参数 ngram_token_size 决定（默认2），需与 main.py 中的
+-- NGRAM_TOKEN_SIZE 一致。执行本脚本后将 main.py 中的 SEARCH_MODE 改为 'fulltext'。
+
+USE table_tennis_db;
+
+ALTER TABLE Player
+    ADD FULLTEXT INDEX ft_player_name (name) WITH PARSER ngram;
+
+ALTER TABLE Team
+    ADD FULLTEXT INDEX ft_team_name (team_name) WITH PARSER ngram;
+
+ALTER TABLE Tournament
+    ADD FULLTEXT INDEX ft_tournament_name (tournament_name) WITH PARSER ngram;
+
+-- 回滚：
+-- ALTER TABLE Player DROP INDEX ft_player_name;
+-- ALTER TABLE Team DROP INDEX ft_team_name;
+-- ALTER TABLE Tournament DROP INDEX ft_tournament_name;
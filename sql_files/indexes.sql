@@ -0,0 +1,35 @@
+-- ============================================
+-- 二级索引：队长页面与比赛列表的常用查询
+-- ============================================
+-- create_tables.sql 只有主键和外键自动生成的索引。以下索引配合 queries.py 中
+-- 改写后的 UNION ALL 查询使用，可用 scripts/explain_check.py 验证执行计划。
+
+USE table_tennis_db;
+
+-- 本队主场/客场比赛：按球队等值查找，按时间排序；带上 tournament_id 后
+-- “本队参加的赛事”查询只读索引即可完成
+ALTER TABLE `Match`
+    ADD INDEX idx_match_home (home_team_id, scheduled_time, tournament_id),
+    ADD INDEX idx_match_away (away_team_id, scheduled_time, tournament_id),
+    -- 比赛管理页按时间倒序分页（InnoDB 二级索引隐含主键 match_id）
+    ADD INDEX idx_match_time (scheduled_time),
+    -- 同一赛事中两队在同一时间只有一场比赛；importer.py 导入赛程时按它判断重复
+    -- （--upsert）。已有重复的比赛时需要先删除重复行，否则这条语句会失败
+    ADD UNIQUE INDEX uq_match_fixture (tournament_id, home_team_id, away_team_id, scheduled_time);
+
+-- 本队球员列表：WHERE team_id = ? ORDER BY role DESC, name 直接按索引顺序读取
+ALTER TABLE Player
+    ADD INDEX idx_player_team_role (team_id, role DESC, name);
+
+-- 球员统计从球员出发关联参赛记录，主键 (match_id, game_id, student_id) 无法按学号查找
+ALTER TABLE Player_In_Game
+    ADD INDEX idx_pig_student (student_id);
+
+-- 以上索引覆盖了外键约束所需的前缀，外键自动生成的单列索引会被 MySQL 自动复用，
+-- 无需手动删除。
+
+-- 回滚：
+-- ALTER TABLE `Match` DROP INDEX idx_match_home, DROP INDEX idx_match_away, DROP INDEX idx_match_time,
+--     DROP INDEX uq_match_fixture;
+-- ALTER TABLE Player DROP INDEX idx_player_team_role;
+-- ALTER TABLE Player_In_Game DROP INDEX idx_pig_student;
@@ -0,0 +1,26 @@
+-- ============================================
+-- 迁移：比赛总比分改为整数计数列
+-- ============================================
+-- 为已有数据库的 Match 表增加 home_wins / away_wins，并根据现有盘次回填。
+-- 执行完本脚本后重新执行 trigger.sql，改用增量维护计数的触发器。
+-- 新建的数据库直接使用 create_tables.sql 即可，无需执行本脚本。
+
+USE table_tennis_db;
+
+ALTER TABLE `Match`
+    ADD COLUMN home_wins TINYINT UNSIGNED NOT NULL DEFAULT 0 AFTER final_score,
+    ADD COLUMN away_wins TINYINT UNSIGNED NOT NULL DEFAULT 0 AFTER home_wins;
+
+-- 回填计数；有盘次记录的比赛同时校正 final_score
+UPDATE `Match` m
+JOIN (
+    SELECT
+        match_id,
+        SUM(CASE WHEN winner = '主队' THEN 1 ELSE 0 END) AS home_wins,
+        SUM(CASE WHEN winner = '客队' THEN 1 ELSE 0 END) AS away_wins
+    FROM Game
+    GROUP BY match_id
+) g ON g.match_id = m.match_id
+SET m.home_wins = g.home_wins,
+    m.away_wins = g.away_wins,
+    m.final_score = CONCAT(g.home_wins, ':', g.away_wins);
@@ -0,0 +1,360 @@
+-- ============================================
+-- 球员统计汇总表 (PlayerStats)
+-- ============================================
+-- 每名球员每种盘次类型一行，记录出场盘数和胜负盘数，由下面的触发器增量维护，
+-- 队长页面的球员统计直接读取本表，不再每次关联 Player_In_Game、Game、Match 重新计算。
+-- 胜负以球员当前所属球队判断，与原来的实时统计口径一致；球员转队时重新计算该球员。
+--
+-- 注意：外键级联删除不会触发触发器，所以删除比赛、赛事、球队、院系时需要在
+-- BEFORE DELETE 触发器中先扣除将被级联删除的参赛记录。
+--
+-- 执行顺序：create_tables.sql -> trigger.sql -> 本脚本。脚本末尾会根据现有数据回填。
+
+USE table_tennis_db;
+
+CREATE TABLE IF NOT EXISTS PlayerStats (
+    student_id VARCHAR(20),
+    game_type ENUM('男单', '女单', '男双', '女双', '混双'),
+    games INT NOT NULL DEFAULT 0,
+    wins INT NOT NULL DEFAULT 0,
+    losses INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, game_type),
+    FOREIGN KEY (student_id) REFERENCES Player(student_id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+DROP PROCEDURE IF EXISTS rebuild_player_stats;
+DROP PROCEDURE IF EXISTS apply_player_game_stats;
+DROP PROCEDURE IF EXISTS apply_player_match_stats;
+DROP PROCEDURE IF EXISTS remove_player_match_stats;
+DROP TRIGGER IF EXISTS player_stats_after_pig_insert;
+DROP TRIGGER IF EXISTS player_stats_after_pig_update;
+DROP TRIGGER IF EXISTS player_stats_after_pig_delete;
+DROP TRIGGER IF EXISTS player_stats_after_game_update;
+DROP TRIGGER IF EXISTS player_stats_before_game_delete;
+DROP TRIGGER IF EXISTS player_stats_after_match_update;
+DROP TRIGGER IF EXISTS player_stats_before_match_delete;
+DROP TRIGGER IF EXISTS player_stats_before_tournament_delete;
+DROP TRIGGER IF EXISTS player_stats_before_team_delete;
+DROP TRIGGER IF EXISTS player_stats_before_college_delete;
+DROP TRIGGER IF EXISTS player_stats_after_player_update;
+
+-- 重新计算统计；p_student_id 为 NULL 时重建整张表
+DELIMITER $$
+CREATE PROCEDURE rebuild_player_stats(IN p_student_id VARCHAR(20))
+BEGIN
+    DELETE FROM PlayerStats
+    WHERE p_student_id IS NULL OR student_id = p_student_id;
+
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        COUNT(*),
+        SUM(CASE
+            WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        SUM(CASE
+            WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+    JOIN `Match` m ON m.match_id = pig.match_id
+    WHERE p_student_id IS NULL OR pig.student_id = p_student_id
+    GROUP BY pig.student_id, g.game_type;
+END$$
+DELIMITER ;
+
+-- 按给定的盘次类型和胜方，把一盘的出场记录计入（p_sign = 1）或扣除（p_sign = -1）。
+-- p_student_id 为 NULL 时处理这一盘的所有参赛球员
+DELIMITER $$
+CREATE PROCEDURE apply_player_game_stats(
+    IN p_match_id INT,
+    IN p_game_id TINYINT,
+    IN p_game_type VARCHAR(10),
+    IN p_winner VARCHAR(10),
+    IN p_student_id VARCHAR(20),
+    IN p_sign INT
+)
+BEGIN
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        p_game_type,
+        p_sign * COUNT(*),
+        p_sign * SUM(CASE
+            WHEN (p_winner = '主队' AND m.home_team_id = p.team_id)
+              OR (p_winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        p_sign * SUM(CASE
+            WHEN (p_winner = '客队' AND m.home_team_id = p.team_id)
+              OR (p_winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN `Match` m ON m.match_id = pig.match_id
+    WHERE pig.match_id = p_match_id AND pig.game_id = p_game_id
+      AND (p_student_id IS NULL OR pig.student_id = p_student_id)
+    GROUP BY pig.student_id
+    ON DUPLICATE KEY UPDATE
+        games = games + VALUES(games),
+        wins = wins + VALUES(wins),
+        losses = losses + VALUES(losses);
+END$$
+DELIMITER ;
+
+-- 按给定的主客队，把一场比赛所有盘次的出场记录计入或扣除
+DELIMITER $$
+CREATE PROCEDURE apply_player_match_stats(
+    IN p_match_id INT,
+    IN p_home_team_id INT,
+    IN p_away_team_id INT,
+    IN p_sign INT
+)
+BEGIN
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        p_sign * COUNT(*),
+        p_sign * SUM(CASE
+            WHEN (g.winner = '主队' AND p_home_team_id = p.team_id)
+              OR (g.winner = '客队' AND p_away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        p_sign * SUM(CASE
+            WHEN (g.winner = '客队' AND p_home_team_id = p.team_id)
+              OR (g.winner = '主队' AND p_away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+    WHERE pig.match_id = p_match_id
+    GROUP BY pig.student_id, g.game_type
+    ON DUPLICATE KEY UPDATE
+        games = games + VALUES(games),
+        wins = wins + VALUES(wins),
+        losses = losses + VALUES(losses);
+END$$
+DELIMITER ;
+
+-- 扣除即将被级联删除的比赛：按赛事、球队或院系筛选（其余参数传 NULL）
+DELIMITER $$
+CREATE PROCEDURE remove_player_match_stats(
+    IN p_tournament_id INT,
+    IN p_team_id INT,
+    IN p_dept_id INT
+)
+BEGIN
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        -COUNT(*),
+        -SUM(CASE
+            WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        -SUM(CASE
+            WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM `Match` m
+    JOIN Game g ON g.match_id = m.match_id
+    JOIN Player_In_Game pig ON pig.match_id = g.match_id AND pig.game_id = g.game_id
+    JOIN Player p ON p.student_id = pig.student_id
+    WHERE (p_tournament_id IS NULL OR m.tournament_id = p_tournament_id)
+      AND (p_team_id IS NULL OR m.home_team_id = p_team_id OR m.away_team_id = p_team_id)
+      AND (p_dept_id IS NULL
+           OR m.home_team_id IN (SELECT team_id FROM Team WHERE dept_id = p_dept_id)
+           OR m.away_team_id IN (SELECT team_id FROM Team WHERE dept_id = p_dept_id))
+    GROUP BY pig.student_id, g.game_type
+    ON DUPLICATE KEY UPDATE
+        games = games + VALUES(games),
+        wins = wins + VALUES(wins),
+        losses = losses + VALUES(losses);
+END$$
+DELIMITER ;
+
+-- 新增参赛记录
+DELIMITER $$
+CREATE TRIGGER player_stats_after_pig_insert
+AFTER INSERT ON Player_In_Game
+FOR EACH ROW
+BEGIN
+    DECLARE v_game_type VARCHAR(10);
+    DECLARE v_winner VARCHAR(10);
+
+    SELECT game_type, winner INTO v_game_type, v_winner
+    FROM Game
+    WHERE match_id = NEW.match_id AND game_id = NEW.game_id;
+
+    CALL apply_player_game_stats(NEW.match_id, NEW.game_id, v_game_type, v_winner, NEW.student_id, 1);
+END$$
+DELIMITER ;
+
+-- 修改参赛记录：扣除旧记录，计入新记录
+DELIMITER $$
+CREATE TRIGGER player_stats_after_pig_update
+AFTER UPDATE ON Player_In_Game
+FOR EACH ROW
+BEGIN
+    DECLARE v_game_type VARCHAR(10);
+    DECLARE v_winner VARCHAR(10);
+
+    SELECT game_type, winner INTO v_game_type, v_winner
+    FROM Game
+    WHERE match_id = OLD.match_id AND game_id = OLD.game_id;
+
+    -- 旧记录已不在 Player_In_Game 中，直接按旧值扣除
+    UPDATE PlayerStats ps
+    JOIN Player p ON p.student_id = ps.student_id
+    JOIN `Match` m ON m.match_id = OLD.match_id
+    SET ps.games = ps.games - 1,
+        ps.wins = ps.wins - (CASE
+            WHEN (v_winner = '主队' AND m.home_team_id = p.team_id)
+              OR (v_winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        ps.losses = ps.losses - (CASE
+            WHEN (v_winner = '客队' AND m.home_team_id = p.team_id)
+              OR (v_winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    WHERE ps.student_id = OLD.student_id AND ps.game_type = v_game_type;
+
+    SELECT game_type, winner INTO v_game_type, v_winner
+    FROM Game
+    WHERE match_id = NEW.match_id AND game_id = NEW.game_id;
+
+    CALL apply_player_game_stats(NEW.match_id, NEW.game_id, v_game_type, v_winner, NEW.student_id, 1);
+END$$
+DELIMITER ;
+
+-- 删除参赛记录
+DELIMITER $$
+CREATE TRIGGER player_stats_after_pig_delete
+AFTER DELETE ON Player_In_Game
+FOR EACH ROW
+BEGIN
+    DECLARE v_game_type VARCHAR(10);
+    DECLARE v_winner VARCHAR(10);
+
+    SELECT game_type, winner INTO v_game_type, v_winner
+    FROM Game
+    WHERE match_id = OLD.match_id AND game_id = OLD.game_id;
+
+    UPDATE PlayerStats ps
+    JOIN Player p ON p.student_id = ps.student_id
+    JOIN `Match` m ON m.match_id = OLD.match_id
+    SET ps.games = ps.games - 1,
+        ps.wins = ps.wins - (CASE
+            WHEN (v_winner = '主队' AND m.home_team_id = p.team_id)
+              OR (v_winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        ps.losses = ps.losses - (CASE
+            WHEN (v_winner = '客队' AND m.home_team_id = p.team_id)
+              OR (v_winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    WHERE ps.student_id = OLD.student_id AND ps.game_type = v_game_type;
+END$$
+DELIMITER ;
+
+-- 修改盘次类型或胜方：按旧值扣除，按新值计入
+DELIMITER $$
+CREATE TRIGGER player_stats_after_game_update
+AFTER UPDATE ON Game
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.game_type <=> NEW.game_type AND OLD.winner <=> NEW.winner) THEN
+        CALL apply_player_game_stats(OLD.match_id, OLD.game_id, OLD.game_type, OLD.winner, NULL, -1);
+        CALL apply_player_game_stats(NEW.match_id, NEW.game_id, NEW.game_type, NEW.winner, NULL, 1);
+    END IF;
+END$$
+DELIMITER ;
+
+-- 删除盘次：参赛记录随后被级联删除，不会触发 player_stats_after_pig_delete
+DELIMITER $$
+CREATE TRIGGER player_stats_before_game_delete
+BEFORE DELETE ON Game
+FOR EACH ROW
+BEGIN
+    CALL apply_player_game_stats(OLD.match_id, OLD.game_id, OLD.game_type, OLD.winner, NULL, -1);
+END$$
+DELIMITER ;
+
+-- 修改比赛的主客队：胜负归属随之改变
+DELIMITER $$
+CREATE TRIGGER player_stats_after_match_update
+AFTER UPDATE ON `Match`
+FOR EACH ROW
+BEGIN
+    IF OLD.home_team_id <> NEW.home_team_id OR OLD.away_team_id <> NEW.away_team_id THEN
+        CALL apply_player_match_stats(NEW.match_id, OLD.home_team_id, OLD.away_team_id, -1);
+        CALL apply_player_match_stats(NEW.match_id, NEW.home_team_id, NEW.away_team_id, 1);
+    END IF;
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE TRIGGER player_stats_before_match_delete
+BEFORE DELETE ON `Match`
+FOR EACH ROW
+BEGIN
+    CALL apply_player_match_stats(OLD.match_id, OLD.home_team_id, OLD.away_team_id, -1);
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE TRIGGER player_stats_before_tournament_delete
+BEFORE DELETE ON Tournament
+FOR EACH ROW
+BEGIN
+    CALL remove_player_match_stats(OLD.tournament_id, NULL, NULL);
+END$$
+DELIMITER ;
+
+-- 删除球队时，对手球员在这些比赛中的记录也会被级联删除
+DELIMITER $$
+CREATE TRIGGER player_stats_before_team_delete
+BEFORE DELETE ON Team
+FOR EACH ROW
+BEGIN
+    CALL remove_player_match_stats(NULL, OLD.team_id, NULL);
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE TRIGGER player_stats_before_college_delete
+BEFORE DELETE ON College
+FOR EACH ROW
+BEGIN
+    CALL remove_player_match_stats(NULL, NULL, OLD.dept_id);
+END$$
+DELIMITER ;
+
+-- 球员转队：胜负按当前球队判断，需要重新计算该球员
+DELIMITER $$
+CREATE TRIGGER player_stats_after_player_update
+AFTER UPDATE ON Player
+FOR EACH ROW
+BEGIN
+    IF OLD.team_id <> NEW.team_id THEN
+        CALL rebuild_player_stats(NEW.student_id);
+    END IF;
+END$$
+DELIMITER ;
+
+-- 根据现有数据回填
+CALL rebuild_player_stats(NULL);
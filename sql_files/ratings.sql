@@ -0,0 +1,37 @@
+-- ============================================
+-- 球员等级分 (PlayerRating / PairRating)
+-- ============================================
+-- 等级分由 ratings.py 按比赛时间顺序用 Elo 公式计算后写入：单打为球员个人的
+-- 等级分，双打按固定搭档（两名球员）计算组合等级分。RatingState 记录已计入的
+-- 最后一盘，python ratings.py --update 只计入此后的新盘次；修改或补录更早的
+-- 盘次后需要 python ratings.py --rebuild 重新计算全部历史。
+--
+-- 执行顺序：create_tables.sql 之后执行本脚本，再执行 python ratings.py --rebuild。
+
+USE table_tennis_db;
+
+CREATE TABLE IF NOT EXISTS PlayerRating (
+    student_id VARCHAR(20) PRIMARY KEY,
+    rating DOUBLE NOT NULL,
+    games INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (student_id) REFERENCES Player(student_id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- student_id_1 < student_id_2
+CREATE TABLE IF NOT EXISTS PairRating (
+    student_id_1 VARCHAR(20),
+    student_id_2 VARCHAR(20),
+    rating DOUBLE NOT NULL,
+    games INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id_1, student_id_2),
+    FOREIGN KEY (student_id_1) REFERENCES Player(student_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (student_id_2) REFERENCES Player(student_id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- 只有一行（id = 1）：已计入的最后一盘，按 (scheduled_time, match_id, game_id) 排序
+CREATE TABLE IF NOT EXISTS RatingState (
+    id TINYINT PRIMARY KEY,
+    scheduled_time DATETIME,
+    match_id INT,
+    game_id TINYINT
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
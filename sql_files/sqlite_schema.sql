@@ -0,0 +1,572 @@
+-- ============================================
+-- SQLite 后端：索引、比分触发器、球员统计、积分榜汇总表、等级分表和变更日志
+-- ============================================
+-- 表由 sqlite_backend.py 根据 create_tables.sql 翻译生成，建表后执行本脚本。
+-- 对应 MySQL 的 indexes.sql、trigger.sql、player_stats.sql、standings.sql、
+-- ratings.sql 和 changes.sql。可以重复执行，PlayerStats 和 TournamentStanding 每次
+-- 都按现有数据重建，等级分由 ratings.py 计算。
+
+-- 与 indexes.sql 相同的二级索引；SQLite 不会为外键自动建索引，级联删除时按
+-- tournament_id、dept_id 查找子表，另外补上这两个索引
+CREATE INDEX IF NOT EXISTS idx_match_home ON `Match` (home_team_id, scheduled_time, tournament_id);
+CREATE INDEX IF NOT EXISTS idx_match_away ON `Match` (away_team_id, scheduled_time, tournament_id);
+CREATE INDEX IF NOT EXISTS idx_match_time ON `Match` (scheduled_time);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_match_fixture ON `Match` (tournament_id, home_team_id, away_team_id, scheduled_time);
+CREATE INDEX IF NOT EXISTS idx_match_tournament ON `Match` (tournament_id);
+CREATE INDEX IF NOT EXISTS idx_player_team_role ON Player (team_id, role DESC, name);
+CREATE INDEX IF NOT EXISTS idx_pig_student ON Player_In_Game (student_id);
+CREATE INDEX IF NOT EXISTS idx_team_dept ON Team (dept_id);
+
+-- 比分触发器，与 trigger.sql 一样按单盘的变化增减 home_wins / away_wins。
+-- SQLite 的 SET 右侧读取的都是更新前的值，final_score 直接用新值拼接；
+-- 比较结果为 0 或 1，相当于 MySQL 的 IF(..., 1, 0)
+
+CREATE TRIGGER IF NOT EXISTS after_game_insert
+AFTER INSERT ON Game
+FOR EACH ROW WHEN NEW.winner IS NOT NULL
+BEGIN
+    UPDATE `Match`
+    SET home_wins = home_wins + (NEW.winner = '主队'),
+        away_wins = away_wins + (NEW.winner = '客队'),
+        final_score = (home_wins + (NEW.winner = '主队')) || ':' || (away_wins + (NEW.winner = '客队'))
+    WHERE match_id = NEW.match_id;
+END;
+
+-- 只有胜方改变时比分才会变化
+CREATE TRIGGER IF NOT EXISTS after_game_update
+AFTER UPDATE ON Game
+FOR EACH ROW WHEN OLD.match_id = NEW.match_id AND OLD.winner IS NOT NEW.winner
+BEGIN
+    UPDATE `Match`
+    SET home_wins = home_wins + IFNULL(NEW.winner = '主队', 0) - IFNULL(OLD.winner = '主队', 0),
+        away_wins = away_wins + IFNULL(NEW.winner = '客队', 0) - IFNULL(OLD.winner = '客队', 0),
+        final_score = (home_wins + IFNULL(NEW.winner = '主队', 0) - IFNULL(OLD.winner = '主队', 0))
+                      || ':' ||
+                      (away_wins + IFNULL(NEW.winner = '客队', 0) - IFNULL(OLD.winner = '客队', 0))
+    WHERE match_id = NEW.match_id;
+END;
+
+-- 盘次被移到了另一场比赛
+CREATE TRIGGER IF NOT EXISTS after_game_move
+AFTER UPDATE ON Game
+FOR EACH ROW WHEN OLD.match_id <> NEW.match_id
+BEGIN
+    UPDATE `Match`
+    SET home_wins = home_wins - IFNULL(OLD.winner = '主队', 0),
+        away_wins = away_wins - IFNULL(OLD.winner = '客队', 0),
+        final_score = (home_wins - IFNULL(OLD.winner = '主队', 0)) || ':' || (away_wins - IFNULL(OLD.winner = '客队', 0))
+    WHERE match_id = OLD.match_id;
+
+    UPDATE `Match`
+    SET home_wins = home_wins + IFNULL(NEW.winner = '主队', 0),
+        away_wins = away_wins + IFNULL(NEW.winner = '客队', 0),
+        final_score = (home_wins + IFNULL(NEW.winner = '主队', 0)) || ':' || (away_wins + IFNULL(NEW.winner = '客队', 0))
+    WHERE match_id = NEW.match_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS after_game_delete
+AFTER DELETE ON Game
+FOR EACH ROW WHEN OLD.winner IS NOT NULL
+BEGIN
+    UPDATE `Match`
+    SET home_wins = home_wins - (OLD.winner = '主队'),
+        away_wins = away_wins - (OLD.winner = '客队'),
+        final_score = (home_wins - (OLD.winner = '主队')) || ':' || (away_wins - (OLD.winner = '客队'))
+    WHERE match_id = OLD.match_id;
+END;
+
+-- 球员统计汇总表，口径与 player_stats.sql 相同。SQLite 没有存储过程，触发器直接
+-- 重新计算受影响球员的统计（每名球员只涉及自己的参赛记录，代价很小）。
+-- 与 MySQL 不同，SQLite 的外键级联删除会触发子表的触发器，且此时父表中的行已经
+-- 删除，所以删除比赛、赛事、球队、院系时由参赛记录的删除触发器完成扣除，
+-- 不需要 player_stats.sql 中的 BEFORE DELETE 触发器
+CREATE TABLE IF NOT EXISTS PlayerStats (
+    student_id VARCHAR(20),
+    game_type TEXT COLLATE enum_game_game_type,
+    games INT NOT NULL DEFAULT 0,
+    wins INT NOT NULL DEFAULT 0,
+    losses INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, game_type),
+    FOREIGN KEY (student_id) REFERENCES Player(student_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS player_stats_after_pig_insert
+AFTER INSERT ON Player_In_Game
+FOR EACH ROW
+BEGIN
+    DELETE FROM PlayerStats WHERE student_id IN (NEW.student_id);
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        COUNT(*),
+        SUM(CASE
+            WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        SUM(CASE
+            WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+    JOIN `Match` m ON m.match_id = pig.match_id
+    WHERE pig.student_id IN (NEW.student_id)
+    GROUP BY pig.student_id, g.game_type;
+END;
+
+CREATE TRIGGER IF NOT EXISTS player_stats_after_pig_update
+AFTER UPDATE ON Player_In_Game
+FOR EACH ROW
+BEGIN
+    DELETE FROM PlayerStats WHERE student_id IN (OLD.student_id, NEW.student_id);
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        COUNT(*),
+        SUM(CASE
+            WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        SUM(CASE
+            WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+    JOIN `Match` m ON m.match_id = pig.match_id
+    WHERE pig.student_id IN (OLD.student_id, NEW.student_id)
+    GROUP BY pig.student_id, g.game_type;
+END;
+
+CREATE TRIGGER IF NOT EXISTS player_stats_after_pig_delete
+AFTER DELETE ON Player_In_Game
+FOR EACH ROW
+BEGIN
+    DELETE FROM PlayerStats WHERE student_id IN (OLD.student_id);
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        COUNT(*),
+        SUM(CASE
+            WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        SUM(CASE
+            WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+    JOIN `Match` m ON m.match_id = pig.match_id
+    WHERE pig.student_id IN (OLD.student_id)
+    GROUP BY pig.student_id, g.game_type;
+END;
+
+-- 盘次类型或胜方改变（有参赛记录的盘次不能修改主键，外键没有 ON UPDATE CASCADE）
+CREATE TRIGGER IF NOT EXISTS player_stats_after_game_update
+AFTER UPDATE ON Game
+FOR EACH ROW WHEN OLD.game_type IS NOT NEW.game_type OR OLD.winner IS NOT NEW.winner
+BEGIN
+    DELETE FROM PlayerStats WHERE student_id IN (
+        SELECT student_id FROM Player_In_Game WHERE match_id = NEW.match_id AND game_id = NEW.game_id
+    );
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        COUNT(*),
+        SUM(CASE
+            WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        SUM(CASE
+            WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+    JOIN `Match` m ON m.match_id = pig.match_id
+    WHERE pig.student_id IN (
+        SELECT student_id FROM Player_In_Game WHERE match_id = NEW.match_id AND game_id = NEW.game_id
+    )
+    GROUP BY pig.student_id, g.game_type;
+END;
+
+-- 更换主客队后胜负归属改变
+CREATE TRIGGER IF NOT EXISTS player_stats_after_match_update
+AFTER UPDATE ON `Match`
+FOR EACH ROW WHEN OLD.home_team_id <> NEW.home_team_id OR OLD.away_team_id <> NEW.away_team_id
+BEGIN
+    DELETE FROM PlayerStats WHERE student_id IN (SELECT student_id FROM Player_In_Game WHERE match_id = NEW.match_id);
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        COUNT(*),
+        SUM(CASE
+            WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        SUM(CASE
+            WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+    JOIN `Match` m ON m.match_id = pig.match_id
+    WHERE pig.student_id IN (SELECT student_id FROM Player_In_Game WHERE match_id = NEW.match_id)
+    GROUP BY pig.student_id, g.game_type;
+END;
+
+-- 球员转队：按新球队重新计算该球员
+CREATE TRIGGER IF NOT EXISTS player_stats_after_player_update
+AFTER UPDATE ON Player
+FOR EACH ROW WHEN OLD.team_id <> NEW.team_id
+BEGIN
+    DELETE FROM PlayerStats WHERE student_id IN (NEW.student_id);
+    INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+    SELECT
+        pig.student_id,
+        g.game_type,
+        COUNT(*),
+        SUM(CASE
+            WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END),
+        SUM(CASE
+            WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+              OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+            THEN 1 ELSE 0
+        END)
+    FROM Player_In_Game pig
+    JOIN Player p ON p.student_id = pig.student_id
+    JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+    JOIN `Match` m ON m.match_id = pig.match_id
+    WHERE pig.student_id IN (NEW.student_id)
+    GROUP BY pig.student_id, g.game_type;
+END;
+
+-- 赛事积分榜汇总表，口径与 standings.sql 相同：Match 的盘数每变化一次，扣除这场
+-- 比赛的旧结果、计入新结果。SQLite 的级联删除会触发 Match 的删除触发器，此时被删除
+-- 的球队、赛事在本表中的行可能已经级联删除，所以扣除用 UPDATE（找不到行时什么也
+-- 不做），不能像 MySQL 那样用插入冲突时累加的写法
+CREATE TABLE IF NOT EXISTS TournamentStanding (
+    tournament_id INT,
+    team_id INT,
+    matches INT NOT NULL DEFAULT 0,
+    wins INT NOT NULL DEFAULT 0,
+    losses INT NOT NULL DEFAULT 0,
+    games_won INT NOT NULL DEFAULT 0,
+    games_lost INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (tournament_id, team_id),
+    FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id) ON DELETE CASCADE,
+    FOREIGN KEY (team_id) REFERENCES Team(team_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_standing_team ON TournamentStanding (team_id);
+
+CREATE TRIGGER IF NOT EXISTS standing_after_match_insert
+AFTER INSERT ON `Match`
+FOR EACH ROW
+BEGIN
+    INSERT INTO TournamentStanding (tournament_id, team_id, matches, wins, losses, games_won, games_lost)
+    VALUES
+        (NEW.tournament_id, NEW.home_team_id, 1, NEW.home_wins > NEW.away_wins,
+         NEW.home_wins < NEW.away_wins, NEW.home_wins, NEW.away_wins),
+        (NEW.tournament_id, NEW.away_team_id, 1, NEW.away_wins > NEW.home_wins,
+         NEW.away_wins < NEW.home_wins, NEW.away_wins, NEW.home_wins)
+    ON CONFLICT (tournament_id, team_id) DO UPDATE SET
+        matches = matches + excluded.matches,
+        wins = wins + excluded.wins,
+        losses = losses + excluded.losses,
+        games_won = games_won + excluded.games_won,
+        games_lost = games_lost + excluded.games_lost;
+END;
+
+-- 盘数变化、更换赛事或主客队：扣除旧结果，计入新结果
+CREATE TRIGGER IF NOT EXISTS standing_after_match_update
+AFTER UPDATE ON `Match`
+FOR EACH ROW WHEN OLD.tournament_id <> NEW.tournament_id
+    OR OLD.home_team_id <> NEW.home_team_id OR OLD.away_team_id <> NEW.away_team_id
+    OR OLD.home_wins <> NEW.home_wins OR OLD.away_wins <> NEW.away_wins
+BEGIN
+    UPDATE TournamentStanding
+    SET matches = matches - 1,
+        wins = wins - CASE WHEN team_id = OLD.home_team_id
+                           THEN OLD.home_wins > OLD.away_wins ELSE OLD.away_wins > OLD.home_wins END,
+        losses = losses - CASE WHEN team_id = OLD.home_team_id
+                               THEN OLD.home_wins < OLD.away_wins ELSE OLD.away_wins < OLD.home_wins END,
+        games_won = games_won - CASE WHEN team_id = OLD.home_team_id THEN OLD.home_wins ELSE OLD.away_wins END,
+        games_lost = games_lost - CASE WHEN team_id = OLD.home_team_id THEN OLD.away_wins ELSE OLD.home_wins END
+    WHERE tournament_id = OLD.tournament_id AND team_id IN (OLD.home_team_id, OLD.away_team_id);
+
+    DELETE FROM TournamentStanding
+    WHERE tournament_id = OLD.tournament_id AND team_id IN (OLD.home_team_id, OLD.away_team_id)
+      AND matches = 0;
+
+    INSERT INTO TournamentStanding (tournament_id, team_id, matches, wins, losses, games_won, games_lost)
+    VALUES
+        (NEW.tournament_id, NEW.home_team_id, 1, NEW.home_wins > NEW.away_wins,
+         NEW.home_wins < NEW.away_wins, NEW.home_wins, NEW.away_wins),
+        (NEW.tournament_id, NEW.away_team_id, 1, NEW.away_wins > NEW.home_wins,
+         NEW.away_wins < NEW.home_wins, NEW.away_wins, NEW.home_wins)
+    ON CONFLICT (tournament_id, team_id) DO UPDATE SET
+        matches = matches + excluded.matches,
+        wins = wins + excluded.wins,
+        losses = losses + excluded.losses,
+        games_won = games_won + excluded.games_won,
+        games_lost = games_lost + excluded.games_lost;
+END;
+
+-- 删除比赛，包括删除赛事、球队、院系时级联删除的比赛
+CREATE TRIGGER IF NOT EXISTS standing_after_match_delete
+AFTER DELETE ON `Match`
+FOR EACH ROW
+BEGIN
+    UPDATE TournamentStanding
+    SET matches = matches - 1,
+        wins = wins - CASE WHEN team_id = OLD.home_team_id
+                           THEN OLD.home_wins > OLD.away_wins ELSE OLD.away_wins > OLD.home_wins END,
+        losses = losses - CASE WHEN team_id = OLD.home_team_id
+                               THEN OLD.home_wins < OLD.away_wins ELSE OLD.away_wins < OLD.home_wins END,
+        games_won = games_won - CASE WHEN team_id = OLD.home_team_id THEN OLD.home_wins ELSE OLD.away_wins END,
+        games_lost = games_lost - CASE WHEN team_id = OLD.home_team_id THEN OLD.away_wins ELSE OLD.home_wins END
+    WHERE tournament_id = OLD.tournament_id AND team_id IN (OLD.home_team_id, OLD.away_team_id);
+
+    DELETE FROM TournamentStanding
+    WHERE tournament_id = OLD.tournament_id AND team_id IN (OLD.home_team_id, OLD.away_team_id)
+      AND matches = 0;
+END;
+
+-- 等级分表，与 ratings.sql 相同，由 ratings.py 计算后写入
+CREATE TABLE IF NOT EXISTS PlayerRating (
+    student_id VARCHAR(20) PRIMARY KEY,
+    rating DOUBLE NOT NULL,
+    games INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (student_id) REFERENCES Player(student_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS PairRating (
+    student_id_1 VARCHAR(20),
+    student_id_2 VARCHAR(20),
+    rating DOUBLE NOT NULL,
+    games INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id_1, student_id_2),
+    FOREIGN KEY (student_id_1) REFERENCES Player(student_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (student_id_2) REFERENCES Player(student_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_pair_rating_2 ON PairRating (student_id_2);
+
+CREATE TABLE IF NOT EXISTS RatingState (
+    id TINYINT PRIMARY KEY,
+    scheduled_time DATETIME,
+    match_id INT,
+    game_id TINYINT
+);
+
+-- 变更日志，对应 MySQL 的 changes.sql。AUTOINCREMENT 保证删除较早的记录后
+-- change_id 也不会重复使用；整数主键写入 VARCHAR 列后按文本保存
+CREATE TABLE IF NOT EXISTS ChangeLog (
+    change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name VARCHAR(32) NOT NULL,
+    key1 VARCHAR(20) NOT NULL,
+    key2 VARCHAR(20),
+    key3 VARCHAR(20)
+);
+
+CREATE TRIGGER IF NOT EXISTS changelog_college_insert
+AFTER INSERT ON College
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('College', NEW.dept_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_college_update
+AFTER UPDATE ON College
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('College', NEW.dept_id);
+    INSERT INTO ChangeLog (table_name, key1)
+    SELECT 'College', OLD.dept_id WHERE OLD.dept_id <> NEW.dept_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_college_delete
+AFTER DELETE ON College
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('College', OLD.dept_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_team_insert
+AFTER INSERT ON Team
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Team', NEW.team_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_team_update
+AFTER UPDATE ON Team
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Team', NEW.team_id);
+    INSERT INTO ChangeLog (table_name, key1)
+    SELECT 'Team', OLD.team_id WHERE OLD.team_id <> NEW.team_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_team_delete
+AFTER DELETE ON Team
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Team', OLD.team_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_player_insert
+AFTER INSERT ON Player
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Player', NEW.student_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_player_update
+AFTER UPDATE ON Player
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Player', NEW.student_id);
+    INSERT INTO ChangeLog (table_name, key1)
+    SELECT 'Player', OLD.student_id WHERE OLD.student_id <> NEW.student_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_player_delete
+AFTER DELETE ON Player
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Player', OLD.student_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_tournament_insert
+AFTER INSERT ON Tournament
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Tournament', NEW.tournament_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_tournament_update
+AFTER UPDATE ON Tournament
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Tournament', NEW.tournament_id);
+    INSERT INTO ChangeLog (table_name, key1)
+    SELECT 'Tournament', OLD.tournament_id WHERE OLD.tournament_id <> NEW.tournament_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_tournament_delete
+AFTER DELETE ON Tournament
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Tournament', OLD.tournament_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_match_insert
+AFTER INSERT ON `Match`
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Match', NEW.match_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_match_update
+AFTER UPDATE ON `Match`
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Match', NEW.match_id);
+    INSERT INTO ChangeLog (table_name, key1)
+    SELECT 'Match', OLD.match_id WHERE OLD.match_id <> NEW.match_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_match_delete
+AFTER DELETE ON `Match`
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1) VALUES ('Match', OLD.match_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_game_insert
+AFTER INSERT ON Game
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1, key2) VALUES ('Game', NEW.match_id, NEW.game_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_game_update
+AFTER UPDATE ON Game
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1, key2) VALUES ('Game', NEW.match_id, NEW.game_id);
+    INSERT INTO ChangeLog (table_name, key1, key2)
+    SELECT 'Game', OLD.match_id, OLD.game_id WHERE OLD.match_id <> NEW.match_id OR OLD.game_id <> NEW.game_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_game_delete
+AFTER DELETE ON Game
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1, key2) VALUES ('Game', OLD.match_id, OLD.game_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_player_in_game_insert
+AFTER INSERT ON Player_In_Game
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1, key2, key3) VALUES ('Player_In_Game', NEW.match_id, NEW.game_id, NEW.student_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_player_in_game_update
+AFTER UPDATE ON Player_In_Game
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1, key2, key3) VALUES ('Player_In_Game', NEW.match_id, NEW.game_id, NEW.student_id);
+    INSERT INTO ChangeLog (table_name, key1, key2, key3)
+    SELECT 'Player_In_Game', OLD.match_id, OLD.game_id, OLD.student_id WHERE OLD.match_id <> NEW.match_id OR OLD.game_id <> NEW.game_id OR OLD.student_id <> NEW.student_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS changelog_player_in_game_delete
+AFTER DELETE ON Player_In_Game
+BEGIN
+    INSERT INTO ChangeLog (table_name, key1, key2, key3) VALUES ('Player_In_Game', OLD.match_id, OLD.game_id, OLD.student_id);
+END;
+
+-- 根据已有数据回填（benchmarks/datagen.py 先写数据再执行本脚本）
+DELETE FROM PlayerStats;
+INSERT INTO PlayerStats (student_id, game_type, games, wins, losses)
+SELECT
+    pig.student_id,
+    g.game_type,
+    COUNT(*),
+    SUM(CASE
+        WHEN (g.winner = '主队' AND m.home_team_id = p.team_id)
+          OR (g.winner = '客队' AND m.away_team_id = p.team_id)
+        THEN 1 ELSE 0
+    END),
+    SUM(CASE
+        WHEN (g.winner = '客队' AND m.home_team_id = p.team_id)
+          OR (g.winner = '主队' AND m.away_team_id = p.team_id)
+        THEN 1 ELSE 0
+    END)
+FROM Player_In_Game pig
+JOIN Player p ON p.student_id = pig.student_id
+JOIN Game g ON g.match_id = pig.match_id AND g.game_id = pig.game_id
+JOIN `Match` m ON m.match_id = pig.match_id
+GROUP BY pig.student_id, g.game_type;
+
+DELETE FROM TournamentStanding;
+INSERT INTO TournamentStanding (tournament_id, team_id, matches, wins, losses, games_won, games_lost)
+SELECT s.tournament_id, s.team_id, COUNT(*), SUM(s.win), SUM(s.loss), SUM(s.won), SUM(s.lost)
+FROM (
+    SELECT m.tournament_id, m.home_team_id AS team_id,
+           m.home_wins > m.away_wins AS win, m.home_wins < m.away_wins AS loss,
+           m.home_wins AS won, m.away_wins AS lost
+    FROM `Match` m
+    UNION ALL
+    SELECT m.tournament_id, m.away_team_id,
+           m.away_wins > m.home_wins, m.away_wins < m.home_wins,
+           m.away_wins, m.home_wins
+    FROM `Match` m
+) s
+GROUP BY s.tournament_id, s.team_id;
@@ -0,0 +1,201 @@
+-- ============================================
+-- 赛事积分榜汇总表 (TournamentStanding)
+-- ============================================
+-- 每个赛事中每支球队一行，记录比赛场数、胜负场数和赢输盘数。Match 的
+-- home_wins / away_wins 由 trigger.sql 的触发器随每盘结果增减，本脚本的 Match
+-- 触发器再把这场比赛的旧结果扣除、新结果计入，每盘变化只改两行，不重新扫描赛事
+-- 的全部比赛。积分和同分时的胜负关系排序在 standings.py 中计算。
+--
+-- 胜负按当前的盘数判断：赢盘多的一方胜，盘数相同（包括未开赛的 0:0）不计胜负。
+-- matches 包括尚未分出胜负的比赛，为 0 的行会被删除。
+--
+-- 注意：外键级联删除不会触发触发器。删除赛事时本表的行随之级联删除；删除球队、
+-- 院系时需要在 BEFORE DELETE 触发器中先从对手的行里扣除将被级联删除的比赛。
+--
+-- 执行顺序：create_tables.sql -> trigger.sql -> 本脚本。脚本末尾会根据现有数据回填，
+-- 也可以用 python standings.py --check / --rebuild 核对和重建。
+
+USE table_tennis_db;
+
+CREATE TABLE IF NOT EXISTS TournamentStanding (
+    tournament_id INT,
+    team_id INT,
+    matches INT NOT NULL DEFAULT 0,
+    wins INT NOT NULL DEFAULT 0,
+    losses INT NOT NULL DEFAULT 0,
+    games_won INT NOT NULL DEFAULT 0,
+    games_lost INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (tournament_id, team_id),
+    FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id) ON DELETE CASCADE,
+    FOREIGN KEY (team_id) REFERENCES Team(team_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+DROP PROCEDURE IF EXISTS rebuild_standings;
+DROP PROCEDURE IF EXISTS apply_match_standing;
+DROP PROCEDURE IF EXISTS remove_team_standings;
+DROP TRIGGER IF EXISTS standing_after_match_insert;
+DROP TRIGGER IF EXISTS standing_after_match_update;
+DROP TRIGGER IF EXISTS standing_before_match_delete;
+DROP TRIGGER IF EXISTS standing_before_team_delete;
+DROP TRIGGER IF EXISTS standing_before_college_delete;
+
+-- 重新计算积分榜；p_tournament_id 为 NULL 时重建整张表
+DELIMITER $$
+CREATE PROCEDURE rebuild_standings(IN p_tournament_id INT)
+BEGIN
+    DELETE FROM TournamentStanding
+    WHERE p_tournament_id IS NULL OR tournament_id = p_tournament_id;
+
+    INSERT INTO TournamentStanding (tournament_id, team_id, matches, wins, losses, games_won, games_lost)
+    SELECT s.tournament_id, s.team_id, COUNT(*), SUM(s.win), SUM(s.loss), SUM(s.won), SUM(s.lost)
+    FROM (
+        SELECT m.tournament_id, m.home_team_id AS team_id,
+               IF(m.home_wins > m.away_wins, 1, 0) AS win,
+               IF(m.home_wins < m.away_wins, 1, 0) AS loss,
+               m.home_wins AS won, m.away_wins AS lost
+        FROM `Match` m
+        WHERE p_tournament_id IS NULL OR m.tournament_id = p_tournament_id
+        UNION ALL
+        SELECT m.tournament_id, m.away_team_id,
+               IF(m.away_wins > m.home_wins, 1, 0),
+               IF(m.away_wins < m.home_wins, 1, 0),
+               m.away_wins, m.home_wins
+        FROM `Match` m
+        WHERE p_tournament_id IS NULL OR m.tournament_id = p_tournament_id
+    ) s
+    GROUP BY s.tournament_id, s.team_id;
+END$$
+DELIMITER ;
+
+-- 按给定的赛事、主客队和盘数，把一场比赛计入（p_sign = 1）或扣除（p_sign = -1）
+DELIMITER $$
+CREATE PROCEDURE apply_match_standing(
+    IN p_tournament_id INT,
+    IN p_home_team_id INT,
+    IN p_away_team_id INT,
+    IN p_home_wins INT,
+    IN p_away_wins INT,
+    IN p_sign INT
+)
+BEGIN
+    INSERT INTO TournamentStanding (tournament_id, team_id, matches, wins, losses, games_won, games_lost)
+    VALUES
+        (p_tournament_id, p_home_team_id, p_sign,
+         p_sign * IF(p_home_wins > p_away_wins, 1, 0), p_sign * IF(p_home_wins < p_away_wins, 1, 0),
+         p_sign * p_home_wins, p_sign * p_away_wins),
+        (p_tournament_id, p_away_team_id, p_sign,
+         p_sign * IF(p_away_wins > p_home_wins, 1, 0), p_sign * IF(p_away_wins < p_home_wins, 1, 0),
+         p_sign * p_away_wins, p_sign * p_home_wins)
+    ON DUPLICATE KEY UPDATE
+        matches = matches + VALUES(matches),
+        wins = wins + VALUES(wins),
+        losses = losses + VALUES(losses),
+        games_won = games_won + VALUES(games_won),
+        games_lost = games_lost + VALUES(games_lost);
+
+    IF p_sign < 0 THEN
+        DELETE FROM TournamentStanding
+        WHERE tournament_id = p_tournament_id
+          AND team_id IN (p_home_team_id, p_away_team_id)
+          AND matches = 0;
+    END IF;
+END$$
+DELIMITER ;
+
+-- 扣除即将被级联删除的比赛：按球队或院系筛选（另一个参数传 NULL）
+DELIMITER $$
+CREATE PROCEDURE remove_team_standings(
+    IN p_team_id INT,
+    IN p_dept_id INT
+)
+BEGIN
+    INSERT INTO TournamentStanding (tournament_id, team_id, matches, wins, losses, games_won, games_lost)
+    SELECT s.tournament_id, s.team_id, -COUNT(*), -SUM(s.win), -SUM(s.loss), -SUM(s.won), -SUM(s.lost)
+    FROM (
+        SELECT m.tournament_id, m.home_team_id AS team_id,
+               IF(m.home_wins > m.away_wins, 1, 0) AS win,
+               IF(m.home_wins < m.away_wins, 1, 0) AS loss,
+               m.home_wins AS won, m.away_wins AS lost,
+               m.away_team_id AS opponent_id
+        FROM `Match` m
+        UNION ALL
+        SELECT m.tournament_id, m.away_team_id,
+               IF(m.away_wins > m.home_wins, 1, 0),
+               IF(m.away_wins < m.home_wins, 1, 0),
+               m.away_wins, m.home_wins,
+               m.home_team_id
+        FROM `Match` m
+    ) s
+    WHERE s.team_id = p_team_id OR s.opponent_id = p_team_id
+       OR s.team_id IN (SELECT team_id FROM Team WHERE dept_id = p_dept_id)
+       OR s.opponent_id IN (SELECT team_id FROM Team WHERE dept_id = p_dept_id)
+    GROUP BY s.tournament_id, s.team_id
+    ON DUPLICATE KEY UPDATE
+        matches = matches + VALUES(matches),
+        wins = wins + VALUES(wins),
+        losses = losses + VALUES(losses),
+        games_won = games_won + VALUES(games_won),
+        games_lost = games_lost + VALUES(games_lost);
+
+    DELETE FROM TournamentStanding WHERE matches = 0;
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE TRIGGER standing_after_match_insert
+AFTER INSERT ON `Match`
+FOR EACH ROW
+BEGIN
+    CALL apply_match_standing(NEW.tournament_id, NEW.home_team_id, NEW.away_team_id,
+                              NEW.home_wins, NEW.away_wins, 1);
+END$$
+DELIMITER ;
+
+-- 盘数变化（由 Game 的触发器引起）、更换赛事或主客队：扣除旧结果，计入新结果
+DELIMITER $$
+CREATE TRIGGER standing_after_match_update
+AFTER UPDATE ON `Match`
+FOR EACH ROW
+BEGIN
+    IF OLD.tournament_id <> NEW.tournament_id
+       OR OLD.home_team_id <> NEW.home_team_id OR OLD.away_team_id <> NEW.away_team_id
+       OR OLD.home_wins <> NEW.home_wins OR OLD.away_wins <> NEW.away_wins THEN
+        CALL apply_match_standing(OLD.tournament_id, OLD.home_team_id, OLD.away_team_id,
+                                  OLD.home_wins, OLD.away_wins, -1);
+        CALL apply_match_standing(NEW.tournament_id, NEW.home_team_id, NEW.away_team_id,
+                                  NEW.home_wins, NEW.away_wins, 1);
+    END IF;
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE TRIGGER standing_before_match_delete
+BEFORE DELETE ON `Match`
+FOR EACH ROW
+BEGIN
+    CALL apply_match_standing(OLD.tournament_id, OLD.home_team_id, OLD.away_team_id,
+                              OLD.home_wins, OLD.away_wins, -1);
+END$$
+DELIMITER ;
+
+-- 删除球队时，它参加的比赛会被级联删除，对手的积分随之扣除
+DELIMITER $$
+CREATE TRIGGER standing_before_team_delete
+BEFORE DELETE ON Team
+FOR EACH ROW
+BEGIN
+    CALL remove_team_standings(OLD.team_id, NULL);
+END$$
+DELIMITER ;
+
+DELIMITER $$
+CREATE TRIGGER standing_before_college_delete
+BEFORE DELETE ON College
+FOR EACH ROW
+BEGIN
+    CALL remove_team_standings(NULL, OLD.dept_id);
+END$$
+DELIMITER ;
+
+-- 根据现有数据回填
+CALL rebuild_standings(NULL);
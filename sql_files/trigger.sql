@@ -3,27 +3,25 @@ DROP TRIGGER IF EXISTS after_game_insert;
 DROP TRIGGER IF EXISTS after_game_update;
 DROP TRIGGER IF EXISTS after_game_delete;
 
+-- Match.home_wins / away_wins are kept up to date by adding the change made by
+-- a single Game row, so each trigger touches one Match row without re-reading
+-- the other games of the match. final_score is rebuilt from the counters in the
+-- same UPDATE (MySQL applies SET assignments left to right, so CONCAT sees the
+-- new values).
+
 -- Trigger after inserting a new game
 DELIMITER $$
 CREATE TRIGGER after_game_insert
 AFTER INSERT ON Game
 FOR EACH ROW
 BEGIN
-    DECLARE home_wins INT DEFAULT 0;
-    DECLARE away_wins INT DEFAULT 0;
-
-    -- Count wins for home and away teams
-    SELECT
-        SUM(CASE WHEN winner = '主队' THEN 1 ELSE 0 END),
-        SUM(CASE WHEN winner = '客队' THEN 1 ELSE 0 END)
-    INTO home_wins, away_wins
-    FROM Game
-    WHERE match_id = NEW.match_id;
-
-    -- Update the Match table with the new score
-    UPDATE `Match`
-    SET final_score = CONCAT(home_wins, ':', away_wins)
-    WHERE match_id = NEW.match_id;
+    IF NEW.winner IS NOT NULL THEN
+        UPDATE `Match`
+        SET home_wins = home_wins + IF(NEW.winner = '主队', 1, 0),
+            away_wins = away_wins + IF(NEW.winner = '客队', 1, 0),
+            final_score = CONCAT(home_wins, ':', away_wins)
+        WHERE match_id = NEW.match_id;
+    END IF;
 END$$
 DELIMITER ;
 
@@ -33,21 +31,29 @@ CREATE TRIGGER after_game_update
 AFTER UPDATE ON Game
 FOR EACH ROW
 BEGIN
-    DECLARE home_wins INT DEFAULT 0;
-    DECLARE away_wins INT DEFAULT 0;
-
-    -- Count wins for home and away teams
-    SELECT
-        SUM(CASE WHEN winner = '主队' THEN 1 ELSE 0 END),
-        SUM(CASE WHEN winner = '客队' THEN 1 ELSE 0 END)
-    INTO home_wins, away_wins
-    FROM Game
-    WHERE match_id = NEW.match_id;
+    IF OLD.match_id = NEW.match_id THEN
+        -- Only a changed winner moves the score
+        IF NOT (OLD.winner <=> NEW.winner) THEN
+            UPDATE `Match`
+            SET home_wins = home_wins + IF(NEW.winner = '主队', 1, 0) - IF(OLD.winner = '主队', 1, 0),
+                away_wins = away_wins + IF(NEW.winner = '客队', 1, 0) - IF(OLD.winner = '客队', 1, 0),
+                final_score = CONCAT(home_wins, ':', away_wins)
+            WHERE match_id = NEW.match_id;
+        END IF;
+    ELSE
+        -- The game was moved to another match
+        UPDATE `Match`
+        SET home_wins = home_wins - IF(OLD.winner = '主队', 1, 0),
+            away_wins = away_wins - IF(OLD.winner = '客队', 1, 0),
+            final_score = CONCAT(home_wins, ':', away_wins)
+        WHERE match_id = OLD.match_id;
 
-    -- Update the Match table with the new score
-    UPDATE `Match`
-    SET final_score = CONCAT(home_wins, ':', away_wins)
-    WHERE match_id = NEW.match_id;
+        UPDATE `Match`
+        SET home_wins = home_wins + IF(NEW.winner = '主队', 1, 0),
+            away_wins = away_wins + IF(NEW.winner = '客队', 1, 0),
+            final_score = CONCAT(home_wins, ':', away_wins)
+        WHERE match_id = NEW.match_id;
+    END IF;
 END$$
 DELIMITER ;
 
@@ -57,20 +63,12 @@ CREATE TRIGGER after_game_delete
 AFTER DELETE ON Game
 FOR EACH ROW
 BEGIN
-    DECLARE home_wins INT DEFAULT 0;
-    DECLARE away_wins INT DEFAULT 0;
-
-    -- Count wins for home and away teams
-    SELECT
-        SUM(CASE WHEN winner = '主队' THEN 1 ELSE 0 END),
-        SUM(CASE WHEN winner = '客队' THEN 1 ELSE 0 END)
-    INTO home_wins, away_wins
-    FROM Game
-    WHERE match_id = OLD.match_id;
-
-    -- Update the Match table with the new score
-    UPDATE `Match`
-    SET final_score = CONCAT(IFNULL(home_wins, 0), ':', IFNULL(away_wins, 0))
-    WHERE match_id = OLD.match_id;
+    IF OLD.winner IS NOT NULL THEN
+        UPDATE `Match`
+        SET home_wins = home_wins - IF(OLD.winner = '主队', 1, 0),
+            away_wins = away_wins - IF(OLD.winner = '客队', 1, 0),
+            final_score = CONCAT(home_wins, ':', away_wins)
+        WHERE match_id = OLD.match_id;
+    END IF;
 END$$
-DELIMITER ;
\ No newline at end of file
+DELIMITER ;
@@ -0,0 +1,650 @@
+"""嵌入式 SQLite 后端
+
+DatabaseConnection.connect_sqlite 使用这里的 SqliteConnection 代替 mysql.connector
+的连接，提供连接池、DatabaseConnection 和导出、导入代码用到的那部分接口：
+``cursor(dictionary=..., prepared=..., buffered=...)``、``commit``、``rollback``、
+``connection_id`` 等，界面和查询代码不需要区分后端。
+
+  - SQL 在执行前由 translate 改写成 SQLite 语法：``%s`` 占位符、带括号的
+    UNION 分支、GROUP_CONCAT ... SEPARATOR、ON DUPLICATE KEY UPDATE、
+    MATCH ... AGAINST 等；CONCAT、DATE_FORMAT 注册为自定义函数
+  - 表结构由 create_tables.sql 翻译而来，ENUM 列改为 TEXT 加 CHECK 约束，并注册
+    按枚举顺序比较的排序规则，ORDER BY role DESC 与 MySQL 的顺序一致
+  - 索引、比分触发器、PlayerStats、TournamentStanding 汇总表和 ChangeLog 变更日志
+    见 sql_files/sqlite_schema.sql，SQLite 没有存储过程，汇总表直接由触发器维护
+  - 错误转换成 mysql.connector.errors 中对应的异常和错误码，调用方的异常处理不变；
+    MAX_EXECUTION_TIME 提示和 KILL QUERY 分别用进度回调和 interrupt 实现
+
+内存数据库（``:memory:``）只能由一个连接读写，DatabaseConnection 会把连接池大小
+按 1 处理；文件数据库使用 WAL 模式，读写可以并发。tests 目录中的测试使用带示例
+数据的内存数据库，不需要 MySQL 服务器：python -m pytest tests
+"""
+import datetime
+import decimal
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from functools import lru_cache
+from urllib.request import pathname2url
+
+from mysql.connector import errors
+
+from database import ER_QUERY_INTERRUPTED, ER_QUERY_TIMEOUT
+
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sql_files')
+SCHEMA_FILE = os.path.join(SQL_DIR, 'create_tables.sql')
+SQLITE_SCHEMA_FILE = os.path.join(SQL_DIR, 'sqlite_schema.sql')
+SAMPLE_DATA_FILE = os.path.join(SQL_DIR, 'setup.sql')
+
+BUSY_TIMEOUT = 5.0
+# 每执行多少条虚拟机指令检查一次是否超过 MAX_EXECUTION_TIME
+PROGRESS_STEPS = 10000
+# SQLite 3.44 起聚合函数支持 ORDER BY，更早的版本 GROUP_CONCAT 不保证顺序
+ORDERED_AGGREGATES = sqlite3.sqlite_version_info >= (3, 44, 0)
+
+# MySQL 错误码
+ER_DUP_ENTRY = 1062
+ER_BAD_NULL_ERROR = 1048
+ER_NO_REFERENCED_ROW = 1452
+ER_DATA_TRUNCATED = 1265
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_NO_SUCH_TABLE = 1146
+ER_PARSE_ERROR = 1064
+
+_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|/\*.*?\*/|--[^\n]*", re.DOTALL)
+_MASK = re.compile(r'\x00(\d+)\x00')
+_MAX_EXECUTION_TIME = re.compile(r'/\*\+\s*MAX_EXECUTION_TIME\((\d+)\)\s*\*/', re.IGNORECASE)
+_KILL_QUERY = re.compile(r'^\s*KILL\s+QUERY\s+(\d+)\s*$', re.IGNORECASE)
+_FULLTEXT = re.compile(r'MATCH\s*\(([^()]*)\)\s*AGAINST\s*\(\s*%s\s+IN\s+BOOLEAN\s+MODE\s*\)', re.IGNORECASE)
+_GROUP_CONCAT = re.compile(r'\bGROUP_CONCAT\s*\(', re.IGNORECASE)
+_ON_DUPLICATE = re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b(.*)$', re.IGNORECASE | re.DOTALL)
+_INSERT_IGNORE = re.compile(r'\bINSERT\s+IGNORE\s+INTO\b', re.IGNORECASE)
+_UNION_BEFORE = re.compile(r'\bUNION(?:\s+ALL|\s+DISTINCT)?\s*$', re.IGNORECASE)
+_UNION_AFTER = re.compile(r'^\s*UNION\b', re.IGNORECASE)
+
+_connection_ids = itertools.count(1)
+_memory_ids = itertools.count(1)
+# connection_id -> SqliteConnection，供 KILL QUERY 查找
+_live_connections = weakref.WeakValueDictionary()
+
+
+def _convert_datetime(value):
+    text = value.decode('utf-8')
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+# DATETIME 列与 mysql.connector 一样返回 datetime
+sqlite3.register_converter('DATETIME', _convert_datetime)
+
+
+# ---- SQL 改写 ----
+
+def _mask_literals(sql):
+    """把字符串常量和注释替换成占位标记，改写时不会误改其中的内容"""
+    literals = []
+
+    def replace(match):
+        literals.append(match.group(0))
+        return f"\x00{len(literals) - 1}\x00"
+    return _LITERAL.sub(replace, sql), literals
+
+
+def _unmask(sql, literals):
+    return _MASK.sub(lambda match: literals[int(match.group(1))], sql)
+
+
+def _matching_paren(text, start):
+    """text[start] 为 '(' 时返回与之匹配的 ')' 的位置"""
+    depth = 0
+    for index in range(start, len(text)):
+        if text[index] == '(':
+            depth += 1
+        elif text[index] == ')':
+            depth -= 1
+            if depth == 0:
+                return index
+    raise errors.ProgrammingError(msg="括号不匹配", errno=ER_PARSE_ERROR)
+
+
+def _find_top_level(text, pattern):
+    """pattern 在括号外第一次出现的位置，没有时返回 None"""
+    depth = 0
+    for index, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0:
+            match = pattern.match(text, index)
+            if match and (index == 0 or not text[index - 1].isalnum()):
+                return match
+    return None
+
+
+_SEPARATOR = re.compile(r'SEPARATOR\s+', re.IGNORECASE)
+_ORDER_BY = re.compile(r'ORDER\s+BY\s+', re.IGNORECASE)
+
+
+def _rewrite_group_concat(sql):
+    """GROUP_CONCAT(expr ORDER BY ... SEPARATOR 's') -> group_concat(expr, 's' [ORDER BY ...])"""
+    for match in reversed(list(_GROUP_CONCAT.finditer(sql))):
+        open_index = match.end() - 1
+        close_index = _matching_paren(sql, open_index)
+        inner = sql[open_index + 1:close_index]
+
+        # 未指定 SEPARATOR 时两边默认都是逗号
+        separator = None
+        found = _find_top_level(inner, _SEPARATOR)
+        if found:
+            separator = inner[found.end():].strip()
+            inner = inner[:found.start()]
+        order = None
+        found = _find_top_level(inner, _ORDER_BY)
+        if found:
+            order = inner[found.end():].strip()
+            inner = inner[:found.start()]
+
+        arguments = inner.strip()
+        if separator:
+            arguments += f", {separator}"
+        if order and ORDERED_AGGREGATES:
+            arguments += f" ORDER BY {order}"
+        sql = f"{sql[:match.start()]}group_concat({arguments}){sql[close_index + 1:]}"
+    return sql
+
+
+def _rewrite_union_branches(sql):
+    """SQLite 不接受 (SELECT ...) UNION ALL (SELECT ...)，把带括号的分支改成子查询"""
+    groups = []
+    depth = 0
+    for index, char in enumerate(sql):
+        if char == '(':
+            if depth == 0:
+                start = index
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                groups.append((start, index))
+
+    for start, end in reversed(groups):
+        if not re.match(r'\s*SELECT\b', sql[start + 1:end], re.IGNORECASE):
+            continue
+        if _UNION_BEFORE.search(sql[:start]) or _UNION_AFTER.match(sql[end + 1:]):
+            sql = f"{sql[:start]}SELECT * FROM {sql[start:]}"
+    return sql
+
+
+def _rewrite_upsert(match):
+    assignments = re.sub(r'\bVALUES\s*\(\s*(\w+)\s*\)', r'excluded.\1', match.group(1), flags=re.IGNORECASE)
+    return f"ON CONFLICT DO UPDATE SET{assignments}"
+
+
+@lru_cache(maxsize=1024)
+def translate(query):
+    """把应用使用的 MySQL 语句改写成 SQLite 语法"""
+    sql, literals = _mask_literals(query)
+    sql = _FULLTEXT.sub(lambda match: f"fulltext_match(%s, {match.group(1)})", sql)
+    sql = _rewrite_group_concat(sql)
+    sql = _rewrite_union_branches(sql)
+    sql = _ON_DUPLICATE.sub(_rewrite_upsert, sql)
+    sql = _INSERT_IGNORE.sub('INSERT OR IGNORE INTO', sql)
+    sql = re.sub(r'\bTRUNCATE\s+(?:TABLE\s+)?', 'DELETE FROM ', sql, flags=re.IGNORECASE)
+    sql = re.sub(r'\bSET\s+FOREIGN_KEY_CHECKS\s*=\s*(\d)', r'PRAGMA foreign_keys = \1', sql, flags=re.IGNORECASE)
+    sql = sql.replace('%s', '?').replace('%%', '%')
+    return _unmask(sql, literals)
+
+
+def split_statements(script):
+    """按分号拆分SQL脚本（不支持 DELIMITER），去掉注释和空语句"""
+    masked, literals = _mask_literals(script)
+    statements = []
+    for part in masked.split(';'):
+        statement = _unmask(part, literals)
+        statement = _LITERAL.sub(lambda match: '' if match.group(0).startswith(('--', '/*')) else match.group(0),
+                                 statement).strip()
+        if statement:
+            statements.append(statement)
+    return statements
+
+
+# ---- 表结构 ----
+
+_CREATE_TABLE = re.compile(r'CREATE\s+TABLE\s+`?(\w+)`?\s*\((.*?)\)\s*ENGINE\s*=[^;]*;',
+                           re.IGNORECASE | re.DOTALL)
+_ENUM_COLUMN = re.compile(r'(\w+)\s+ENUM\s*\(([^)]*)\)', re.IGNORECASE)
+
+
+def _enum_values(definition):
+    return tuple(value.replace("''", "'") for value in re.findall(r"'((?:[^']|'')*)'", definition))
+
+
+def collation_name(table, column):
+    return f"enum_{table.lower()}_{column.lower()}"
+
+
+@lru_cache(maxsize=None)
+def translate_schema(path=SCHEMA_FILE):
+    """把 create_tables.sql 翻译成 SQLite 建表脚本，返回 (脚本, {排序规则名: 枚举值})"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+
+    collations = {}
+    tables = []
+    for match in _CREATE_TABLE.finditer(text):
+        table, body = match.group(1), match.group(2)
+
+        def enum_column(column_match, table=table):
+            column, values = column_match.group(1), _enum_values(column_match.group(2))
+            name = collation_name(table, column)
+            collations[name] = values
+            allowed = ', '.join("'" + value.replace("'", "''") + "'" for value in values)
+            return f"{column} TEXT COLLATE {name} CHECK ({column} IN ({allowed}))"
+
+        body = _ENUM_COLUMN.sub(enum_column, body)
+        body = re.sub(r'\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b', 'INTEGER PRIMARY KEY AUTOINCREMENT', body,
+                      flags=re.IGNORECASE)
+        # YEAR 按整数保存，与 mysql.connector 返回的类型一致
+        body = re.sub(r'(\w+)\s+YEAR\b', r'\1 INTEGER', body)
+        tables.append(f"CREATE TABLE `{table}` ({body});")
+    return '\n\n'.join(tables), collations
+
+
+def _enum_collation(values):
+    """按枚举定义的顺序比较，与 MySQL 对 ENUM 列排序的结果一致；不在枚举中的值排在后面"""
+    order = {value: index for index, value in enumerate(values)}
+
+    def compare(a, b):
+        key_a = (0, order[a], '') if a in order else (1, 0, a)
+        key_b = (0, order[b], '') if b in order else (1, 0, b)
+        return (key_a > key_b) - (key_a < key_b)
+    return compare
+
+
+# ---- MySQL 函数 ----
+
+def _text(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return str(value)
+
+
+def _concat(*values):
+    """与 MySQL 相同：任一参数为 NULL 时结果为 NULL"""
+    if any(value is None for value in values):
+        return None
+    return ''.join(_text(value) for value in values)
+
+
+_DATE_FORMATS = {
+    'Y': '%Y', 'y': '%y', 'm': '%m', 'd': '%d', 'H': '%H', 'h': '%I', 'I': '%I', 'i': '%M',
+    's': '%S', 'S': '%S', 'p': '%p', 'M': '%B', 'b': '%b', 'W': '%A', 'a': '%a', 'T': '%H:%M:%S',
+    'j': '%j', '%': '%%',
+}
+
+
+def _date_format(value, fmt):
+    if value is None or fmt is None:
+        return None
+    try:
+        moment = datetime.datetime.fromisoformat(_text(value))
+    except ValueError:
+        return None
+
+    def convert(match):
+        code = match.group(1)
+        if code == 'c':
+            return str(moment.month)
+        if code == 'e':
+            return str(moment.day)
+        if code == 'k':
+            return str(moment.hour)
+        return moment.strftime(_DATE_FORMATS.get(code, code))
+    return re.sub(r'%(.)', convert, fmt)
+
+
+_BOOLEAN_TERM = re.compile(r'([+-]?)(?:"([^"]*)"|(\S+))')
+
+
+def _fulltext_match(query, *values):
+    """MATCH ... AGAINST (... IN BOOLEAN MODE) 的简化实现
+
+    带引号的短语按子串匹配（与 ngram 短语检索效果相同），其余按空格分词；+ 表示必须
+    出现，- 表示不得出现。返回匹配到的词数作为相关度。
+    """
+    if query is None:
+        return 0
+    text = ' '.join(_text(value) for value in values if value is not None).lower()
+    score = 0
+    for operator, phrase, word in _BOOLEAN_TERM.findall(query):
+        term = (phrase or word.rstrip('*')).lower()
+        if not term:
+            continue
+        found = term in text
+        if operator == '-':
+            if found:
+                return 0
+        elif found:
+            score += 1
+        elif operator == '+':
+            return 0
+    return score
+
+
+# ---- 连接 ----
+
+def _param(value):
+    if isinstance(value, datetime.datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, set):
+        return ','.join(sorted(value))
+    return value
+
+
+def _params(params):
+    return tuple(_param(value) for value in (params or ()))
+
+
+def _map_error(err, timed_out=False):
+    """把 sqlite3 的异常转换成 mysql.connector.errors 中对应的异常"""
+    message = str(err)
+    if isinstance(err, sqlite3.IntegrityError):
+        if 'UNIQUE' in message:
+            errno = ER_DUP_ENTRY
+        elif 'FOREIGN KEY' in message:
+            errno = ER_NO_REFERENCED_ROW
+        elif 'NOT NULL' in message:
+            errno = ER_BAD_NULL_ERROR
+        else:
+            # CHECK 约束只用于模拟 ENUM
+            errno = ER_DATA_TRUNCATED
+        return errors.IntegrityError(msg=message, errno=errno)
+    if isinstance(err, sqlite3.OperationalError):
+        if message == 'interrupted':
+            if timed_out:
+                return errors.DatabaseError(msg="Query execution was interrupted, maximum statement "
+                                                "execution time exceeded", errno=ER_QUERY_TIMEOUT)
+            return errors.DatabaseError(msg="Query execution was interrupted", errno=ER_QUERY_INTERRUPTED)
+        if 'locked' in message or 'busy' in message:
+            return errors.DatabaseError(msg=message, errno=ER_LOCK_WAIT_TIMEOUT)
+        if 'no such table' in message:
+            return errors.ProgrammingError(msg=message, errno=ER_NO_SUCH_TABLE)
+        return errors.ProgrammingError(msg=message, errno=ER_PARSE_ERROR)
+    if isinstance(err, sqlite3.ProgrammingError):
+        # 连接已关闭等，连接池会丢弃该连接
+        return errors.InterfaceError(msg=message)
+    return errors.DatabaseError(msg=message)
+
+
+class SqliteCursor:
+    """与 mysql.connector 游标用法相同的 SQLite 游标
+
+    buffered 为 True（默认）时执行后立即读出全部结果，超时检查覆盖整个查询；为
+    False 时由 fetchmany 逐批读取，用于流式导出。
+    """
+
+    def __init__(self, connection, dictionary=False, buffered=True):
+        self._connection = connection
+        self._cursor = connection.raw.cursor()
+        self.dictionary = dictionary
+        self.buffered = buffered
+        self._rows = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self.column_names = ()
+
+    @property
+    def with_rows(self):
+        return bool(self.column_names)
+
+    def execute(self, query, params=()):
+        kill = _KILL_QUERY.match(query)
+        if kill:
+            kill_query(int(kill.group(1)))
+            return
+        timeout = _MAX_EXECUTION_TIME.search(query)
+        with self._connection.guard(int(timeout.group(1)) if timeout else None):
+            self._cursor.execute(translate(query), _params(params))
+            self._rows = self._cursor.fetchall() if self.buffered and self._cursor.description else None
+        self._after_execute()
+
+    def executemany(self, query, rows):
+        with self._connection.guard():
+            self._cursor.executemany(translate(query), [_params(row) for row in rows])
+        self._rows = None
+        self._after_execute()
+
+    def _after_execute(self):
+        description = self._cursor.description
+        self.column_names = tuple(column[0] for column in description) if description else ()
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+
+    def _format(self, rows):
+        if self.dictionary:
+            return [dict(zip(self.column_names, row)) for row in rows]
+        return rows
+
+    def fetchall(self):
+        if self._rows is not None:
+            rows, self._rows = self._rows, []
+            return self._format(rows)
+        with self._connection.guard():
+            return self._format(self._cursor.fetchall())
+
+    def fetchmany(self, size=1):
+        if self._rows is not None:
+            rows, self._rows = self._rows[:size], self._rows[size:]
+            return self._format(rows)
+        with self._connection.guard():
+            return self._format(self._cursor.fetchmany(size))
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def close(self):
+        self._rows = None
+        try:
+            self._cursor.close()
+        except sqlite3.Error:
+            pass
+
+
+class SqliteConnection:
+    """一个 SQLite 连接；可在线程间传递，但同一时刻只能由一个线程使用（由连接池保证）"""
+
+    def __init__(self, uri, wal=True, collations=None):
+        try:
+            self.raw = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                       detect_types=sqlite3.PARSE_DECLTYPES)
+        except sqlite3.Error as err:
+            raise _map_error(err)
+        self.connection_id = next(_connection_ids)
+        self._deadline = None
+        self._timed_out = False
+        self._lock = threading.Lock()
+
+        self.raw.execute("PRAGMA foreign_keys = ON")
+        if wal:
+            self.raw.execute("PRAGMA journal_mode = WAL")
+            self.raw.execute("PRAGMA synchronous = NORMAL")
+        self.raw.create_function('CONCAT', -1, _concat, deterministic=True)
+        self.raw.create_function('DATE_FORMAT', 2, _date_format, deterministic=True)
+        self.raw.create_function('fulltext_match', -1, _fulltext_match, deterministic=True)
+        if collations is None:
+            collations = translate_schema()[1]
+        for name, values in collations.items():
+            self.raw.create_collation(name, _enum_collation(values))
+        _live_connections[self.connection_id] = self
+
+    def cursor(self, dictionary=False, prepared=False, buffered=True):
+        # sqlite3 模块自带语句缓存，prepared 不需要特殊处理
+        return SqliteCursor(self, dictionary=dictionary, buffered=buffered)
+
+    def _progress(self):
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self._timed_out = True
+            return 1
+        return 0
+
+    def guard(self, timeout_ms=None):
+        """执行语句的上下文：设置最长执行时间，并把 sqlite3 异常转换成 mysql.connector 异常"""
+        return _Guard(self, timeout_ms)
+
+    def interrupt(self):
+        """中止正在执行的语句（KILL QUERY），可在其他线程中调用"""
+        with self._lock:
+            try:
+                self.raw.interrupt()
+            except sqlite3.ProgrammingError:
+                pass
+
+    def start_transaction(self):
+        # sqlite3 模块在第一条写语句之前自动开始事务，SELECT 不开启事务
+        pass
+
+    def commit(self):
+        with self.guard():
+            self.raw.commit()
+
+    def rollback(self):
+        with self.guard():
+            self.raw.rollback()
+
+    def executescript(self, script):
+        with self.guard():
+            self.raw.executescript(script)
+
+    def table_exists(self, name):
+        row = self.raw.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+        return row is not None
+
+    def is_connected(self):
+        try:
+            self.raw.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        _live_connections.pop(self.connection_id, None)
+        try:
+            self.raw.close()
+        except sqlite3.Error:
+            pass
+
+
+class _Guard:
+    def __init__(self, connection, timeout_ms):
+        self.connection = connection
+        self.timeout_ms = timeout_ms
+
+    def __enter__(self):
+        connection = self.connection
+        connection._timed_out = False
+        if self.timeout_ms:
+            connection._deadline = time.monotonic() + self.timeout_ms / 1000
+            connection.raw.set_progress_handler(connection._progress, PROGRESS_STEPS)
+        return connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        connection = self.connection
+        if self.timeout_ms:
+            connection.raw.set_progress_handler(None, 0)
+            connection._deadline = None
+        if isinstance(exc, sqlite3.Error):
+            raise _map_error(exc, connection._timed_out) from exc
+        return False
+
+
+def kill_query(connection_id):
+    """中止 connection_id 上正在执行的语句；连接不存在时与 MySQL 一样报错"""
+    connection = _live_connections.get(connection_id)
+    if connection is None:
+        raise errors.DatabaseError(msg=f"Unknown thread id: {connection_id}", errno=1094)
+    connection.interrupt()
+
+
+# ---- 数据库 ----
+
+def create_tables(connection):
+    connection.executescript(translate_schema()[0])
+
+
+def create_schema_objects(connection):
+    """索引、比分触发器和汇总表（sql_files/sqlite_schema.sql）"""
+    with open(SQLITE_SCHEMA_FILE, encoding='utf-8') as f:
+        connection.executescript(f.read())
+
+
+def run_script(connection, path):
+    """执行 MySQL 语法的数据脚本（如 setup.sql）；其中只用于查看结果的 SELECT 被跳过"""
+    with open(path, encoding='utf-8') as f:
+        statements = split_statements(f.read())
+    cursor = connection.cursor()
+    try:
+        for statement in statements:
+            if re.match(r'(SELECT|USE)\b', statement, re.IGNORECASE):
+                continue
+            if re.match(r'SET\s+FOREIGN_KEY_CHECKS', statement, re.IGNORECASE):
+                # PRAGMA foreign_keys 在事务中不起作用，先提交
+                connection.commit()
+            cursor.execute(statement)
+        connection.commit()
+    except errors.Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+class SqliteDatabase:
+    """一个 SQLite 数据库文件；path 为 ':memory:' 时为进程内的内存数据库"""
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.memory = path == ':memory:'
+        if self.memory:
+            self.uri = f"file:table_tennis_{os.getpid()}_{next(_memory_ids)}?mode=memory&cache=shared"
+        else:
+            self.uri = 'file:' + pathname2url(os.path.abspath(path))
+        # 内存数据库在最后一个连接关闭时销毁，保留一个连接直到 close
+        self._anchor = self.connect() if self.memory else None
+
+    def connect(self):
+        """连接池使用的连接函数"""
+        return SqliteConnection(self.uri, wal=not self.memory)
+
+    def initialize(self, sample_data=False):
+        """数据库中还没有表时建表，sample_data 为 True 时导入 setup.sql；返回是否新建"""
+        connection = self.connect()
+        try:
+            if connection.table_exists('Match'):
+                return False
+            create_tables(connection)
+            create_schema_objects(connection)
+            if sample_data:
+                run_script(connection, SAMPLE_DATA_FILE)
+            return True
+        finally:
+            connection.close()
+
+    def close(self):
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
@@ -0,0 +1,192 @@
+"""赛事积分榜
+
+每个赛事的积分榜由 TournamentStanding 汇总表提供（sql_files/standings.sql，SQLite
+见 sqlite_schema.sql），触发器随每盘结果的变化增减两支球队的场次、胜负和盘数，
+读取时不需要扫描赛事的全部比赛。这里负责计算积分和排名：
+
+  - 胜一场得 WIN_POINTS 分，负一场得 LOSS_POINTS 分，盘数相同的比赛不计胜负
+  - 积分相同时，先比较这些球队相互之间的比赛（积分，再比净胜盘），
+    再比较全部比赛的净胜盘、胜盘数，最后按球队ID
+
+只有出现同分时才读取该赛事已分出胜负的比赛。--check 把汇总表与直接从 Match
+统计的结果逐行比较，--rebuild 重新计算汇总表。
+
+    python standings.py --tournament 1
+    python standings.py --check --user root --password password
+"""
+import argparse
+import sys
+from collections import Counter
+
+import queries
+
+
+WIN_POINTS = 2
+LOSS_POINTS = 1
+
+# 积分榜表格的列：(字段, 表头)
+COLUMNS = [
+    ('rank', '名次'), ('team_name', '球队'), ('played', '场次'), ('wins', '胜'),
+    ('losses', '负'), ('points', '积分'), ('games_won', '胜盘'), ('games_lost', '负盘'),
+    ('game_diff', '净胜盘'),
+]
+
+# 与计算结果逐行比较的字段
+_COUNTERS = ('matches', 'wins', 'losses', 'games_won', 'games_lost')
+
+
+def head_to_head(team_ids, results):
+    """只统计 team_ids 之间的比赛，返回 {team_id: (积分, 净胜盘)}"""
+    points = dict.fromkeys(team_ids, 0)
+    game_diff = dict.fromkeys(team_ids, 0)
+    for result in results:
+        home, away = result['home_team_id'], result['away_team_id']
+        if home not in points or away not in points:
+            continue
+        home_wins, away_wins = int(result['home_wins']), int(result['away_wins'])
+        if home_wins == away_wins:
+            continue
+        winner, loser = (home, away) if home_wins > away_wins else (away, home)
+        points[winner] += WIN_POINTS
+        points[loser] += LOSS_POINTS
+        game_diff[home] += home_wins - away_wins
+        game_diff[away] += away_wins - home_wins
+    return {team_id: (points[team_id], game_diff[team_id]) for team_id in team_ids}
+
+
+def rank(rows, results=()):
+    """计算积分并排名
+
+    rows 为 TOURNAMENT_STANDINGS 的结果，results 为 TOURNAMENT_RESULTS 的结果
+    （没有同分时可以省略）。返回新的字典列表，增加 rank、played、points、game_diff。
+    """
+    table = []
+    for row in rows:
+        entry = dict(row)
+        for name in _COUNTERS:
+            entry[name] = int(entry[name])
+        entry['played'] = entry['wins'] + entry['losses']
+        entry['points'] = entry['wins'] * WIN_POINTS + entry['losses'] * LOSS_POINTS
+        entry['game_diff'] = entry['games_won'] - entry['games_lost']
+        table.append(entry)
+
+    tied = {}
+    for entry in table:
+        tied.setdefault(entry['points'], []).append(entry['team_id'])
+    mini_league = {}
+    for team_ids in tied.values():
+        if len(team_ids) > 1:
+            mini_league.update(head_to_head(team_ids, results))
+
+    def sort_key(entry):
+        h2h_points, h2h_diff = mini_league.get(entry['team_id'], (0, 0))
+        return (-entry['points'], -h2h_points, -h2h_diff,
+                -entry['game_diff'], -entry['games_won'], entry['team_id'])
+
+    table.sort(key=sort_key)
+    for position, entry in enumerate(table, 1):
+        entry['rank'] = position
+    return table
+
+
+def has_ties(rows):
+    """是否有积分相同的球队，需要读取比赛结果比较相互间的胜负"""
+    counts = Counter(int(row['wins']) * WIN_POINTS + int(row['losses']) * LOSS_POINTS for row in rows)
+    return any(count > 1 for count in counts.values())
+
+
+def load(db_conn, tournament_id):
+    """读取并排好序的积分榜"""
+    rows = db_conn.execute_query(queries.TOURNAMENT_STANDINGS, (tournament_id,))
+    results = ()
+    if has_ties(rows):
+        results = db_conn.execute_query(queries.TOURNAMENT_RESULTS, (tournament_id,))
+    return rank(rows, results)
+
+
+def check(db_conn, tournament_id=None):
+    """比较汇总表和重新统计的结果，返回 [(tournament_id, team_id, 汇总表的行, 统计的行)]
+
+    只在一边存在的行，另一边为 None。出错时抛出 mysql.connector.Error。
+    """
+    params = (tournament_id, tournament_id)
+    stored = db_conn.execute_cancellable(queries.STORED_STANDINGS, params)
+    computed = db_conn.execute_cancellable(queries.COMPUTED_STANDINGS, params * 2)
+
+    def by_key(rows):
+        return {
+            (row['tournament_id'], row['team_id']): {name: int(row[name]) for name in _COUNTERS}
+            for row in rows
+        }
+
+    stored, computed = by_key(stored), by_key(computed)
+    differences = []
+    for key in sorted(stored.keys() | computed.keys()):
+        if stored.get(key) != computed.get(key):
+            differences.append(key + (stored.get(key), computed.get(key)))
+    return differences
+
+
+def rebuild(db_conn, tournament_id=None):
+    """在一个事务中重新计算汇总表，返回写入的行数"""
+    params = (tournament_id, tournament_id)
+    counts = db_conn.execute_transaction([
+        (queries.CLEAR_STANDINGS, params),
+        (queries.REBUILD_STANDINGS, params * 2),
+    ])
+    return counts[-1]
+
+
+def format_table(table):
+    lines = ['\t'.join(title for _name, title in COLUMNS)]
+    for entry in table:
+        lines.append('\t'.join(str(entry[name]) for name, _title in COLUMNS))
+    return '\n'.join(lines)
+
+
+def main():
+    from database import DatabaseConnection
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tournament', type=int, help="赛事ID，默认为全部赛事")
+    parser.add_argument('--check', action='store_true', help="与直接统计的结果比较，有差异时以非零状态退出")
+    parser.add_argument('--rebuild', action='store_true', help="重新计算汇总表")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--database', default='table_tennis_db')
+    parser.add_argument('--sqlite', metavar='PATH', help="使用 SQLite 数据库文件，而不是 MySQL")
+    args = parser.parse_args()
+
+    db_conn = DatabaseConnection(pool_size=1)
+    if args.sqlite:
+        connected = db_conn.connect_sqlite(args.sqlite)
+    else:
+        connected = db_conn.connect(args.host, args.user, args.password, args.database)
+    if not connected:
+        return 1
+    try:
+        if args.check:
+            differences = check(db_conn, args.tournament)
+            for tournament_id, team_id, stored, computed in differences:
+                print(f"赛事 {tournament_id} 球队 {team_id}: 汇总表 {stored}，应为 {computed}")
+            print(f"共 {len(differences)} 处不一致")
+            if differences and not args.rebuild:
+                return 1
+        if args.rebuild:
+            print(f"已重建积分榜，共 {rebuild(db_conn, args.tournament)} 行")
+        if not (args.check or args.rebuild):
+            if args.tournament is not None:
+                tournaments = [{'tournament_id': args.tournament, 'tournament_name': ''}]
+            else:
+                tournaments = db_conn.execute_query(queries.TOURNAMENTS)
+            for tournament in tournaments:
+                print(f"== {tournament['tournament_id']} {tournament['tournament_name']}")
+                print(format_table(load(db_conn, tournament['tournament_id'])))
+    finally:
+        db_conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+
+import queries
+import standings
+from query_executor import QueryExecutor, BusyIndicator
+
+
+class StandingsView(QWidget):
+    """赛事积分榜页面，管理窗口和队长页面共用
+
+    tournaments_query / tournaments_params 决定下拉框中列出的赛事；指定 team_id 时
+    该队所在的行加粗显示。积分榜在后台读取（standings.load），每次切换到本页时
+    重新读取，其他页面修改的比分随即显示。
+    """
+
+    def __init__(self, db_conn, tournaments_query=queries.TOURNAMENTS, tournaments_params=(),
+                 team_id=None, parent=None):
+        super().__init__(parent)
+        self.db_conn = db_conn
+        self.executor = QueryExecutor(db_conn, self)
+        self.tournaments_query = tournaments_query
+        self.tournaments_params = tournaments_params
+        self.team_id = team_id
+
+        self.init_ui()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.load_tournaments()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(QLabel("赛事:"))
+        self.tournamentCombo = QComboBox()
+        self.tournamentCombo.setMinimumWidth(240)
+        self.tournamentCombo.currentIndexChanged.connect(self.load_standings)
+        toolbar.addWidget(self.tournamentCombo)
+        toolbar.addStretch()
+        self.busyIndicator = BusyIndicator(self.executor, self)
+        toolbar.addWidget(self.busyIndicator)
+        self.btnRefresh = QPushButton("刷新")
+        self.btnRefresh.clicked.connect(self.load_standings)
+        toolbar.addWidget(self.btnRefresh)
+        layout.addLayout(toolbar)
+
+        self.table = QTableWidget(0, len(standings.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for _name, title in standings.COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self.emptyLabel = QLabel("该赛事暂无比赛")
+        self.emptyLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.emptyLabel.hide()
+        layout.addWidget(self.emptyLabel)
+
+    def load_tournaments(self):
+        """重新读取赛事列表，尽量保持当前选中的赛事"""
+        self.executor.query(self.tournaments_query, self.tournaments_params, key='tournaments',
+                            on_result=self._fill_tournaments)
+
+    def _fill_tournaments(self, rows):
+        current = self.tournamentCombo.currentData()
+        self.tournamentCombo.blockSignals(True)
+        self.tournamentCombo.clear()
+        for row in rows:
+            self.tournamentCombo.addItem(f"{row['tournament_name']} ({row['year']})", row['tournament_id'])
+        index = self.tournamentCombo.findData(current)
+        self.tournamentCombo.setCurrentIndex(index if index >= 0 else 0)
+        self.tournamentCombo.blockSignals(False)
+        self.load_standings()
+
+    def load_standings(self):
+        tournament_id = self.tournamentCombo.currentData()
+        if tournament_id is None:
+            self._fill_table([])
+            return
+        self.executor.submit(standings.load, self.db_conn, tournament_id, key='standings',
+                             on_result=self._fill_table)
+
+    def _fill_table(self, table):
+        self.table.setRowCount(len(table))
+        bold = QFont()
+        bold.setBold(True)
+        for row_idx, entry in enumerate(table):
+            highlight = self.team_id is not None and entry['team_id'] == self.team_id
+            for col_idx, (name, _title) in enumerate(standings.COLUMNS):
+                item = QTableWidgetItem(str(entry[name]))
+                if name != 'team_name':
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                if highlight:
+                    item.setFont(bold)
+                self.table.setItem(row_idx, col_idx, item)
+        self.emptyLabel.setVisible(not table)
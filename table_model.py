@@ -0,0 +1,238 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+
+DEFAULT_PAGE_SIZE = 200
+
+
+def build_keyset_query(base_query, page_keys, after_row=None, limit=DEFAULT_PAGE_SIZE):
+    """构建键集分页查询
+
+    page_keys 为 (SQL表达式, 结果列名, 是否降序) 的列表，所有键必须同向排序，
+    这样 MySQL 可以直接沿索引顺序扫描，而不必对整表排序。after_row 为上一页的
+    最后一行，None 表示第一页。limit 为 None 时不限制行数（如导出整个视图）。
+    """
+    directions = {descending for _expr, _name, descending in page_keys}
+    if len(directions) != 1:
+        raise ValueError("分页键必须使用相同的排序方向")
+    descending = directions.pop()
+
+    exprs = [expr for expr, _name, _desc in page_keys]
+    params = []
+    query = base_query.rstrip()
+
+    if after_row is not None:
+        # 展开成 a <= x AND (a < x OR (a = x AND b < y) ...)：MySQL 不会对行构造器
+        # 比较 (a, b) < (x, y) 做范围优化，后面的页会从索引开头扫描再过滤；单独的
+        # a <= x 让 MySQL 和 SQLite 都能在第一个键上做范围扫描
+        operator = '<' if descending else '>'
+        values = [after_row[name] for _expr, name, _desc in page_keys]
+        branches = []
+        for i, expr in enumerate(exprs):
+            terms = [f"{prefix} = %s" for prefix in exprs[:i]] + [f"{expr} {operator} %s"]
+            branches.append(' AND '.join(terms))
+            params.extend(values[:i + 1])
+        if len(branches) == 1:
+            condition = branches[0]
+        else:
+            condition = f"{exprs[0]} {operator}= %s AND (" + ' OR '.join(f"({branch})" for branch in branches) + ')'
+            params.insert(0, values[0])
+        keyword = "AND" if "WHERE" in query.upper() else "WHERE"
+        query = f"{query} {keyword} {condition}"
+
+    order = ' DESC' if descending else ''
+    order_clause = ', '.join(f"{expr}{order}" for expr in exprs)
+    query = f"{query} ORDER BY {order_clause}"
+    if limit is not None:
+        query = f"{query} LIMIT {int(limit)}"
+    return query, tuple(params)
+
+
+def build_key_query(base_query, key_exprs, keys):
+    """构建按主键（或主键前缀）取行的查询
+
+    key_exprs 为 SQL 表达式列表，keys 为与之等长的值元组的集合。用于变更后只
+    重新读取变化的行。
+    """
+    keys = list(keys)
+    if len(key_exprs) == 1:
+        condition = f"{key_exprs[0]} IN ({', '.join(['%s'] * len(keys))})"
+        params = [key[0] for key in keys]
+    else:
+        one = '(' + ' AND '.join(f"{expr} = %s" for expr in key_exprs) + ')'
+        condition = ' OR '.join([one] * len(keys))
+        params = [value for key in keys for value in key]
+    query = base_query.rstrip()
+    keyword = "AND" if "WHERE" in query.upper() else "WHERE"
+    return f"{query} {keyword} ({condition})", tuple(params)
+
+
+def _sort_value(value):
+    # NULL 与 MySQL 一样排在最前（降序时最后）
+    return (value is not None, value)
+
+
+class PagedTableModel(QAbstractTableModel):
+    """按需分页加载的表格模型
+
+    视图滚动到底部时 Qt 会调用 canFetchMore/fetchMore，模型再通过 fetch_page
+    回调异步获取下一页。fetch_page(after_row, limit, on_page, on_error) 由
+    TableManager 提供。也可以用 set_rows 直接显示一组完整结果（如搜索结果）。
+    """
+
+    page_loaded = pyqtSignal(list)
+
+    def __init__(self, columns, page_size=DEFAULT_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.page_size = page_size
+        self._rows = []
+        self._fetch_page = None
+        self._exhausted = True
+        self._fetching = False
+        # 每次重置后递增，用于丢弃旧数据源迟到的分页结果
+        self._generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        value = self._rows[index.row()].get(self.columns[index.column()]['name'], '')
+        return '' if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section]['label']
+        return str(section + 1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        generation = self._generation
+        after_row = self._rows[-1] if self._rows else None
+        self._fetch_page(
+            after_row, self.page_size,
+            lambda rows: self._append_page(generation, rows),
+            lambda _message: self._page_failed(generation)
+        )
+
+    def _append_page(self, generation, rows):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        if rows:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        self.page_loaded.emit(rows)
+
+    def _page_failed(self, generation):
+        if generation == self._generation:
+            # 允许视图下次滚动时重试
+            self._fetching = False
+
+    def set_source(self, fetch_page):
+        """切换到分页数据源并加载第一页"""
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = []
+        self._fetch_page = fetch_page
+        self._exhausted = False
+        self._fetching = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def set_rows(self, rows):
+        """直接显示一组完整的结果，不再分页"""
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = list(rows)
+        self._fetch_page = None
+        self._exhausted = True
+        self._fetching = False
+        self.endResetModel()
+
+    def merge_rows(self, generation, is_stale, rows, page_keys):
+        """用重新查询到的行更新已加载的数据，不重置模型
+
+        删除 is_stale(row) 为真的已加载行，再按 page_keys 的顺序插入 rows。分页
+        尚未加载到的位置（排在已加载的最后一行之后）的行不插入，之后翻页时自然会
+        取到。位置不变的行原地替换，视图的选中和滚动位置不受影响。generation
+        不是当前数据源（其间重新加载过）时不做任何修改，返回 False。
+        """
+        if generation != self._generation:
+            return False
+        descending = page_keys[0][2]
+
+        def sort_key(row):
+            return tuple(_sort_value(row[name]) for _expr, name, _desc in page_keys)
+
+        def before(a, b):
+            return a > b if descending else a < b
+
+        fresh = {}
+        boundary = sort_key(self._rows[-1]) if self._rows else None
+        for row in rows:
+            key = sort_key(row)
+            if self._exhausted or (boundary is not None and not before(boundary, key)):
+                fresh[key] = row
+
+        removed = []
+        for position, row in enumerate(self._rows):
+            if not is_stale(row):
+                continue
+            replacement = fresh.pop(sort_key(row), None)
+            if replacement is None:
+                removed.append(position)
+            else:
+                self._rows[position] = replacement
+                self.dataChanged.emit(self.index(position, 0),
+                                      self.index(position, len(self.columns) - 1))
+        for position in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self._rows[position]
+            self.endRemoveRows()
+
+        for key, row in fresh.items():
+            low, high = 0, len(self._rows)
+            while low < high:
+                middle = (low + high) // 2
+                if before(sort_key(self._rows[middle]), key):
+                    low = middle + 1
+                else:
+                    high = middle
+            self.beginInsertRows(QModelIndex(), low, low)
+            self._rows.insert(low, row)
+            self.endInsertRows()
+        return True
+
+    def generation(self):
+        """当前数据源的编号，每次 set_source / set_rows 后改变"""
+        return self._generation
+
+    def is_fetching(self):
+        return self._fetching
+
+    def rows(self):
+        """已加载的所有行"""
+        return self._rows
+
+    def row(self, row):
+        return self._rows[row]
+
+    def is_complete(self):
+        """数据源的所有行是否都已加载"""
+        return self._exhausted and not self._fetching
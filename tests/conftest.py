@@ -0,0 +1,24 @@
+"""测试公用的夹具
+
+测试直接导入仓库根目录下的模块；数据库测试使用 connect_sqlite(':memory:',
+sample_data=True) 建立的内存数据库（setup.sql 的示例数据），不需要 MySQL 服务器，
+但需要安装 mysql-connector-python（sqlite_backend 使用它的异常类型）。
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+@pytest.fixture
+def db_conn():
+    from database import DatabaseConnection
+
+    db_conn = DatabaseConnection(pool_size=1)
+    assert db_conn.connect_sqlite(':memory:', sample_data=True)
+    yield db_conn
+    db_conn.close()
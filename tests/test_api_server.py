@@ -0,0 +1,85 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from api_server import ApiServer, Response, ResponseCache  # noqa: E402
+from database import DatabaseConnection  # noqa: E402
+
+
+def _team_names(response):
+    return {team['team_id']: team['team_name'] for team in json.loads(response.body)}
+
+
+def test_response_cache_versions_and_expiry(monkeypatch):
+    cache = ResponseCache(ttl=10)
+    response = Response(b'[]', {'team'})
+    versions = cache.versions()
+    cache.put('/teams', response, versions)
+    assert cache.get('/teams') is response
+    cache.invalidate({'player'})
+    assert cache.get('/teams') is response
+    cache.invalidate({'team'})
+    assert cache.get('/teams') is None
+
+    cache.put('/teams', response, versions)  # 生成响应期间 Team 被写过
+    assert cache.get('/teams') is None
+
+    cache.put('/teams', response, cache.versions())
+    now = time.monotonic()
+    monkeypatch.setattr('api_server.time.monotonic', lambda: now + 11)
+    assert cache.get('/teams') is None
+
+
+def test_write_through_same_connection_invalidates(db_conn):
+    server = ApiServer(db_conn, workers=1)
+
+    async def run():
+        first = await server.respond('/teams', '')
+        assert await server.respond('/teams', '') is first
+        assert db_conn.execute_update("UPDATE Team SET team_name = %s WHERE team_id = 1", ('新名称',))
+        second = await server.respond('/teams', '')
+        assert second is not first and _team_names(second)[1] == '新名称'
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.close()
+
+
+def test_change_log_invalidates_writes_from_other_clients(tmp_path):
+    path = str(tmp_path / 'api.db')
+    server_conn = DatabaseConnection(pool_size=2)
+    assert server_conn.connect_sqlite(path, sample_data=True)
+    admin_conn = DatabaseConnection(pool_size=1)
+    assert admin_conn.connect_sqlite(path)
+    server = ApiServer(server_conn, ResponseCache(ttl=60), workers=2, poll_interval=0.05)
+
+    async def run():
+        poller = asyncio.create_task(server.poll_changes())
+        try:
+            await asyncio.sleep(0.1)  # 读取变更日志的起点
+            first = await server.respond('/teams/1/players', '')
+            stats = await server.respond('/teams/1/stats', '')
+            # 另一个客户端删除盘次，触发器同时修改了 Match 和 PlayerStats
+            assert admin_conn.execute_update("DELETE FROM Game WHERE match_id = 1 AND game_id = 1")
+            for _ in range(40):
+                if server.cache.get('/teams/1/stats') is None:
+                    break
+                await asyncio.sleep(0.05)
+            else:
+                pytest.fail("change log did not invalidate /teams/1/stats")
+            assert await server.respond('/teams/1/stats', '') is not stats
+            assert await server.respond('/teams/1/players', '') is first
+        finally:
+            poller.cancel()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.close()
+        admin_conn.close()
+        server_conn.close()
@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from changes import ChangeLogReader, ChangeSet  # noqa: E402
+
+
+def _log(db_conn, change_id, table, key):
+    db_conn.execute_update("INSERT INTO ChangeLog (change_id, table_name, key1) VALUES (%s, %s, %s)",
+                           (change_id, table, key))
+
+
+def test_triggers_record_keys(db_conn):
+    reader = ChangeLogReader(db_conn)
+    reader.start()
+    student_id = db_conn.execute_query("SELECT MIN(student_id) AS s FROM Player")[0]['s']
+    db_conn.execute_update("UPDATE Player SET phone = '1' WHERE student_id = %s", (student_id,))
+    changes = reader.read()
+    assert changes.tables == {'Player': {(student_id,)}}
+    assert not changes.reload
+    assert not reader.read()
+
+    match_id = db_conn.execute_query("SELECT MIN(match_id) AS m FROM Game")[0]['m']
+    db_conn.execute_update("DELETE FROM Game WHERE match_id = %s AND game_id = 1", (match_id,))
+    changes = reader.read()
+    assert (str(match_id), '1') in changes.keys('Game')
+    assert changes.keys('Game', 1) == {(str(match_id),)}
+    assert 'playerstats' in changes.cache_tables()
+
+
+def test_gap_is_read_when_it_commits(db_conn):
+    reader = ChangeLogReader(db_conn)
+    version = reader.start()
+    # version + 1 所在的事务尚未提交，先看到 version + 2
+    _log(db_conn, version + 2, 'Team', '1')
+    assert reader.read().tables == {'Team': {('1',)}}
+    assert set(reader.gaps) == {version + 1}
+    _log(db_conn, version + 1, 'Team', '2')
+    assert reader.read().tables == {'Team': {('2',)}}
+    assert not reader.gaps
+
+
+def test_gap_expires(db_conn):
+    reader = ChangeLogReader(db_conn, gap_timeout=-1)
+    version = reader.start()
+    _log(db_conn, version + 2, 'Team', '1')
+    reader.read()
+    assert not reader.read()
+    assert not reader.gaps
+
+
+def test_reload_when_too_many_or_pruned(db_conn):
+    reader = ChangeLogReader(db_conn, max_changes=2)
+    version = reader.start()
+    for offset in range(1, 4):
+        _log(db_conn, version + offset, 'Team', str(offset))
+    changes = reader.read()
+    assert changes.reload and changes.tables == {}
+    assert reader.version == version + 3
+
+    reader = ChangeLogReader(db_conn)
+    reader.start()
+    reader.version -= 10
+    db_conn.execute_update("DELETE FROM ChangeLog")
+    _log(db_conn, reader.version + 20, 'Team', '1')
+    assert reader.read().reload
+
+
+def test_change_set():
+    changes = ChangeSet()
+    assert not changes
+    changes.add('Player_In_Game', ('1', '2', 'S1'))
+    assert changes and 'Player_In_Game' in changes and 'Game' not in changes
+    assert changes.keys('Player_In_Game', 2) == {('1', '2')}
+    assert ChangeSet(reload=True).cache_tables() >= {'college', 'team', 'player', 'match', 'game'}
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+mysql_connector = pytest.importorskip('mysql.connector')
+
+from mysql.connector import errors  # noqa: E402
+
+from database import ConnectionPool, PoolTimeoutError  # noqa: E402
+
+
+class FakeConnection:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.pings = 0
+
+    def is_connected(self):
+        self.pings += 1
+        return self.connected
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(size=2, timeout=0.05, ping_interval=60.0):
+    created = []
+
+    def connector(**_kwargs):
+        created.append(FakeConnection())
+        return created[-1]
+
+    return ConnectionPool({}, size=size, timeout=timeout, ping_interval=ping_interval, connector=connector), created
+
+
+def test_connections_are_created_lazily_and_reused():
+    pool, created = _pool()
+    first = pool.acquire()
+    assert len(created) == 1
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(created) == 1
+
+
+def test_acquire_times_out_when_pool_is_exhausted():
+    pool, _created = _pool(size=2)
+    held = [pool.acquire(), pool.acquire()]
+    start = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert time.monotonic() - start >= 0.05
+    pool.release(held.pop())
+    assert pool.acquire(timeout=0) is not None
+
+
+def test_waiting_acquire_gets_released_connection():
+    pool, _created = _pool(size=1, timeout=5)
+    conn = pool.acquire()
+    timer = threading.Timer(0.05, pool.release, (conn,))
+    timer.start()
+    assert pool.acquire() is conn
+    timer.join()
+
+
+def test_idle_connection_is_checked_before_reuse():
+    pool, created = _pool(ping_interval=0.01)
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn and created[0].pings == 0  # 刚归还的连接不检查
+    pool.release(conn)
+    time.sleep(0.02)
+    created[0].connected = False
+    replacement = pool.acquire()
+    assert replacement is not conn and created[0].closed
+    assert len(created) == 2
+
+
+def test_session_discards_broken_connection():
+    pool, created = _pool()
+    with pytest.raises(errors.OperationalError):
+        with pool.session():
+            raise errors.OperationalError("server has gone away")
+    assert created[0].closed
+    with pool.session() as conn:
+        assert conn.raw is created[1]
+    with pytest.raises(errors.ProgrammingError):
+        with pool.session():
+            raise errors.ProgrammingError("syntax error")
+    assert not created[1].closed  # 语句错误不影响连接本身
+
+
+def test_closed_pool_rejects_acquire():
+    pool, created = _pool()
+    pool.release(pool.acquire())
+    pool.close()
+    assert created[0].closed
+    with pytest.raises(errors.PoolError):
+        pool.acquire()
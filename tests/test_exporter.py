@@ -0,0 +1,75 @@
+import csv
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from exporter import export_query  # noqa: E402
+
+PLAYERS = "SELECT student_id, name, team_id FROM Player ORDER BY student_id"
+# 学号 2021 开头的 6 名球员排在前面：第一批 rating 全为空，score 全为整数
+RATINGS = """
+    SELECT student_id,
+           CASE WHEN student_id < '2022' THEN NULL ELSE 1.5 END AS rating,
+           CASE WHEN student_id < '2022' THEN 1 ELSE 2.5 END AS score
+    FROM Player ORDER BY student_id
+"""
+
+
+def test_csv_streams_in_chunks(db_conn, tmp_path):
+    path = str(tmp_path / 'players.csv')
+    progress = []
+    total = export_query(db_conn, PLAYERS, (), path, labels={'name': '姓名'}, chunk_size=4,
+                         progress=progress.append)
+    rows = db_conn.execute_query(PLAYERS)
+    assert total == len(rows) == 15
+    assert progress == [4, 8, 12, 15]
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        written = list(csv.reader(f))
+    assert written[0] == ['student_id', '姓名', 'team_id']
+    assert written[1:] == [[row['student_id'], row['name'], str(row['team_id'])] for row in rows]
+
+
+def test_hidden_columns_are_not_exported(db_conn, tmp_path):
+    path = str(tmp_path / 'search.csv')
+    export_query(db_conn, "SELECT name, 0 AS relevance FROM Player", (), path, hidden=('relevance',))
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        written = list(csv.reader(f))
+    assert written[0] == ['name'] and all(len(row) == 1 for row in written)
+
+
+def test_failed_export_removes_file(db_conn, tmp_path):
+    path = tmp_path / 'broken.csv'
+    with pytest.raises(Exception):
+        export_query(db_conn, "SELECT * FROM NoSuchTable", (), str(path))
+    assert not path.exists()
+
+
+def test_parquet_promotes_types_across_chunks(db_conn, tmp_path):
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    path = str(tmp_path / 'ratings.parquet')
+    assert export_query(db_conn, RATINGS, (), path, chunk_size=4) == 15
+    parquet = pyarrow.parquet.ParquetFile(path)
+    assert parquet.num_row_groups == 4
+    table = parquet.read()
+    assert table.schema.field('rating').type == pyarrow.float64()
+    assert table.schema.field('score').type == pyarrow.float64()
+    rows = db_conn.execute_query(RATINGS)
+    assert table.column('rating').to_pylist() == [row['rating'] for row in rows]
+    assert table.column('score').to_pylist() == [row['score'] for row in rows]
+    assert not (tmp_path / 'ratings.parquet.part').exists()
+
+
+def test_parquet_hidden_columns_and_empty_result(db_conn, tmp_path):
+    pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    path = str(tmp_path / 'search.parquet')
+    export_query(db_conn, "SELECT name, 0 AS relevance FROM Player", (), path, hidden=('relevance',))
+    assert pyarrow.parquet.read_table(path).column_names == ['name']
+
+    path = str(tmp_path / 'empty.parquet')
+    assert export_query(db_conn, "SELECT name FROM Player WHERE 1 = 0", (), path) == 0
+    assert pyarrow.parquet.read_table(path).num_rows == 0
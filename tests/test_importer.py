@@ -0,0 +1,90 @@
+import pytest
+
+mysql_connector = pytest.importorskip('mysql.connector')
+
+from importer import Field, ImportRowError, Importer  # noqa: E402
+
+
+def _write(tmp_path, text, name='data.csv'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8-sig')
+    return str(path)
+
+
+def _count(db_conn, table):
+    return db_conn.execute_query(f"SELECT COUNT(*) AS n FROM {table}")[0]['n']
+
+
+SCHEDULE = """比赛时间,场地,赛事名称,主队,客队,裁判
+2024-12-01 14:00,1号台,第26届清华大学乒乓球联赛,计算机系代表队2024,电子系代表队2024,王裁判
+2024-12-08 14:00,2号台,第26届清华大学乒乓球联赛,电子系代表队2024,自动化系代表队2024,李裁判
+"""
+
+
+def test_int_field_rejects_fractions():
+    field = Field('game_id', '盘次ID', 'int')
+    assert field.parse('3') == 3
+    assert field.parse(' 3.0 ') == 3
+    assert field.parse(3.0) == 3
+    for value in ('3.7', '1e3', 3.7, 'abc'):
+        with pytest.raises(ImportRowError):
+            field.parse(value)
+
+
+def test_validation_errors_skip_rows(db_conn, tmp_path):
+    path = _write(tmp_path, """学号,姓名,性别,球队,角色
+S1,甲,男,计算机系代表队2024,队员
+S2,乙,未知,计算机系代表队2024,队员
+S3,丙,女,不存在的队,队员
+S4,丁,女,,队员
+""")
+    report = Importer(db_conn, 'players').run(path)
+    assert report.imported == 1 and report.skipped == 3
+    assert [line for line, _message in report.errors] == [3, 4, 5]
+    assert '找不到球队' in report.errors[1][1]
+
+
+def test_rows_are_written_in_chunks(db_conn, tmp_path):
+    lines = ["学号,姓名,性别,球队ID"] + [f"S{i},球员{i},男,1" for i in range(5)]
+    path = _write(tmp_path, '\n'.join(lines) + '\n')
+    progress = []
+    report = Importer(db_conn, 'players', chunk_size=2).run(path, progress=lambda *counts: progress.append(counts))
+    assert report.imported == 5 and not report.failure
+    assert progress == [(2, 0), (4, 0), (5, 0)]
+
+
+def test_failed_chunk_stops_import(db_conn, tmp_path):
+    lines = ["学号,姓名,性别,球队ID", "S1,甲,男,1", "S2,乙,男,1", "S3,丙,男,999", "S4,丁,男,1"]
+    path = _write(tmp_path, '\n'.join(lines) + '\n')
+    before = _count(db_conn, 'Player')
+    report = Importer(db_conn, 'players', chunk_size=2).run(path)
+    assert report.imported == 2 and report.failure
+    assert _count(db_conn, 'Player') == before + 2  # 第二批整体回滚
+
+
+def test_upsert_matches_does_not_duplicate(db_conn, tmp_path):
+    path = _write(tmp_path, SCHEDULE)
+    before = _count(db_conn, '`Match`')
+    assert Importer(db_conn, 'matches', upsert=True).run(path).imported == 2
+    assert _count(db_conn, '`Match`') == before + 2
+
+    path = _write(tmp_path, SCHEDULE.replace('1号台', '3号台'))
+    report = Importer(db_conn, 'matches', upsert=True).run(path)
+    assert report.imported == 2 and not report.failure
+    assert _count(db_conn, '`Match`') == before + 2
+    rows = db_conn.execute_query("SELECT venue, final_score FROM `Match` WHERE scheduled_time >= '2024-12-01' "
+                                 "ORDER BY scheduled_time")
+    assert rows == [{'venue': '3号台', 'final_score': '0:0'}, {'venue': '2号台', 'final_score': '0:0'}]
+
+    report = Importer(db_conn, 'matches').run(path)
+    assert report.imported == 0 and report.failure
+
+
+def test_lookup_error_stops_import(db_conn, tmp_path, monkeypatch):
+    def fail(query, params=None, token=None, timeout_ms=None):
+        raise mysql_connector.Error("lost connection")
+
+    monkeypatch.setattr(db_conn, 'execute_cancellable', fail)
+    report = Importer(db_conn, 'matches').run(_write(tmp_path, SCHEDULE))
+    assert report.imported == 0 and not report.errors
+    assert 'lost connection' in report.failure
@@ -0,0 +1,107 @@
+import json
+
+from instrumentation import BUCKETS_MS, QueryInstrumentation, call_site_context, find_call_site, result_size
+
+
+class Caller:
+    def load_data(self):
+        return find_call_site()
+
+
+def test_call_site_is_class_and_method():
+    assert Caller().load_data() == 'Caller.load_data'
+    metrics = QueryInstrumentation()
+    with call_site_context('TeamManager.search_data'):
+        metrics.record('query', "SELECT 1", 0.001)
+    assert metrics.snapshot()['series'][0]['call_site'] == 'TeamManager.search_data'
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = QueryInstrumentation(slow_query_ms=10_000)
+    with call_site_context('A.load'):
+        for elapsed_ms in (0.5, 3, 3, 40, 8000):
+            metrics.record('query', "SELECT 1", elapsed_ms / 1000, rows=2, nbytes=10)
+        metrics.record('query', "SELECT 1", 0.002, error=True)
+    (series,) = metrics.snapshot()['series']
+    assert series['count'] == 6 and series['errors'] == 1
+    assert series['rows'] == 10 and series['bytes'] == 50
+    assert series['max_ms'] == 8000
+    buckets = series['buckets']
+    assert list(buckets) == [str(bound) for bound in BUCKETS_MS] + ['+Inf']
+    assert (buckets['1'], buckets['2'], buckets['5'], buckets['50'], buckets['5000'], buckets['+Inf']) == \
+        (1, 2, 4, 5, 5, 6)
+
+
+def test_series_are_split_by_call_site_and_kind():
+    metrics = QueryInstrumentation()
+    with call_site_context('A.load'):
+        metrics.record('query', "SELECT 1", 0.001)
+        metrics.record('update', "UPDATE t SET a = 1", 0.001)
+    with call_site_context('B.load'):
+        metrics.record('query', "SELECT 1", 0.001)
+    assert [(s['call_site'], s['kind']) for s in metrics.snapshot()['series']] == \
+        [('A.load', 'query'), ('A.load', 'update'), ('B.load', 'query')]
+    metrics.reset()
+    assert metrics.snapshot()['series'] == []
+
+
+def test_slow_queries_are_logged_without_parameters(tmp_path):
+    log = tmp_path / 'logs' / 'slow.log'
+    metrics = QueryInstrumentation(slow_query_ms=100, slow_log_path=str(log))
+    with call_site_context('PlayerManager.search_data'):
+        metrics.record('query', "SELECT *\n  FROM Player WHERE phone = %s", 0.25, rows=1)
+        metrics.record('query', "SELECT 1", 0.05)
+        metrics.record('query', "SELECT 2", 0.5, cached=True)  # 结果缓存命中不算慢查询
+    (line,) = log.read_text(encoding='utf-8').splitlines()
+    entry = json.loads(line)
+    assert entry['call_site'] == 'PlayerManager.search_data'
+    assert entry['query'] == "SELECT * FROM Player WHERE phone = %s"
+    assert entry['elapsed_ms'] == 250.0 and entry['rows'] == 1
+    assert metrics.snapshot()['series'][0]['slow'] == 1
+
+
+def test_export_json_and_prometheus(tmp_path):
+    metrics = QueryInstrumentation()
+    with call_site_context('A.load'):
+        metrics.record('query', "SELECT 1", 0.003, rows=4)
+    path = tmp_path / 'metrics.json'
+    metrics.export(str(path))
+    assert json.loads(path.read_text(encoding='utf-8'))['series'][0]['rows'] == 4
+    path = tmp_path / 'metrics.prom'
+    metrics.export(str(path))
+    text = path.read_text(encoding='utf-8')
+    assert 'table_tennis_db_query_duration_seconds_bucket{call_site="A.load",kind="query",le="0.005"} 1' in text
+    assert 'table_tennis_db_query_duration_seconds_count{call_site="A.load",kind="query"} 1' in text
+    assert 'table_tennis_db_query_rows_total{call_site="A.load",kind="query"} 4' in text
+    assert sorted(tmp_path.iterdir()) == [tmp_path / 'metrics.json', tmp_path / 'metrics.prom']  # 临时文件已改名
+
+
+def test_result_size():
+    assert result_size([{'name': '张三', 'team_id': 1, 'phone': None}]) == 6 + 8
+    assert result_size([(b'ab', 'x')]) == 3
+
+
+def test_database_calls_are_recorded(db_conn):
+    metrics = QueryInstrumentation()
+    db_conn.instrumentation = metrics
+    with call_site_context('Test.run'):
+        db_conn.execute_query("SELECT * FROM Team")
+        db_conn.execute_query("SELECT * FROM Team", cached=True)
+        db_conn.execute_query("SELECT * FROM Team", cached=True)
+        db_conn.execute_update("UPDATE Team SET team_name = team_name WHERE team_id = 1")
+        db_conn.execute_query("SELECT * FROM NoSuchTable")
+    series = {s['kind']: s for s in metrics.snapshot()['series']}
+    assert series['query']['count'] == 4 and series['query']['cached'] == 1 and series['query']['errors'] == 1
+    assert series['query']['rows'] == 9
+    assert series['update']['rows'] == 1
+
+
+def test_cache_stats_are_exported(tmp_path):
+    metrics = QueryInstrumentation()
+    metrics.add_cache('statement', lambda: {'hits': 3, 'misses': 1, 'hit_rate': 0.75})
+    assert metrics.snapshot()['caches'] == {'statement': {'hits': 3, 'misses': 1, 'hit_rate': 0.75}}
+    path = tmp_path / 'metrics.prom'
+    metrics.export(str(path))
+    text = path.read_text(encoding='utf-8')
+    assert 'table_tennis_db_cache_hits_total{cache="statement"} 3' in text
+    assert 'table_tennis_db_cache_misses_total{cache="statement"} 1' in text
@@ -0,0 +1,17 @@
+import pytest
+
+pytest.importorskip('PyQt6.QtCore')
+
+from live_search import PrefixResults  # noqa: E402
+
+
+def test_prefix_results_filters_previous_rows():
+    results = PrefixResults(('name', 'grade'))
+    assert results.lookup('张') is None
+    rows = [{'name': '张三', 'grade': '2021级'}, {'name': '张三丰', 'grade': '2022级'}, {'name': '李张', 'grade': None}]
+    results.store('张', rows)
+    assert results.lookup('张三') == rows[:2]
+    assert results.lookup('三丰') is None  # 不包含上一次的搜索词，需要重新查询
+    assert results.lookup('') is None
+    results.clear()
+    assert results.lookup('张三') is None
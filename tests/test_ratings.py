@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+import ratings  # noqa: E402
+
+
+def _games(count, seed=1):
+    rng = random.Random(seed)
+    players = [f"P{i}" for i in range(20)]
+    games = []
+    for index in range(count):
+        if rng.random() < 0.3:
+            picked = rng.sample(players, 4)
+            home, away = tuple(sorted(picked[:2])), tuple(sorted(picked[2:]))
+        else:
+            home, away = rng.sample(players, 2)
+        games.append(((index // 3, index, 1), home, away, rng.random() < 0.5))
+    return games
+
+
+def test_batch_equals_incremental():
+    games = _games(500)
+    batch = ratings.RatingTable()
+    assert batch.recompute(iter(games)) == len(games)
+    incremental = ratings.RatingTable()
+    for game in games:
+        incremental.apply(*game)
+    assert batch.last_key == incremental.last_key
+    assert set(batch.sides) == set(incremental.sides)
+    for side in batch.sides:
+        assert batch.ratings[batch.index[side]] == pytest.approx(
+            incremental.ratings[incremental.index[side]], abs=1e-9)
+        assert batch.games[batch.index[side]] == incremental.games[incremental.index[side]]
+
+
+def test_ratings_are_zero_sum():
+    table = ratings.RatingTable()
+    table.recompute(iter(_games(200, seed=2)))
+    players, pairs = table.rows()
+    total = sum(rating for _side, rating, _games in players) + sum(row[2] for row in pairs)
+    assert total == pytest.approx(ratings.INITIAL_RATING * (len(players) + len(pairs)))
+
+
+def test_iter_games_groups_sides():
+    rows = [
+        ('2024-01-01', 1, 1, '男单', '主队', 10, 20, 10, 'A'),
+        ('2024-01-01', 1, 1, '男单', '主队', 10, 20, 20, 'B'),
+        ('2024-01-01', 1, 2, '男双', '客队', 10, 20, 10, 'C'),
+        ('2024-01-01', 1, 2, '男双', '客队', 10, 20, 10, 'A'),
+        ('2024-01-01', 1, 2, '男双', '客队', 10, 20, 20, 'D'),
+        ('2024-01-01', 1, 2, '男双', '客队', 10, 20, 20, 'B'),
+        ('2024-01-01', 1, 3, '男单', '主队', 10, 20, 10, 'A'),  # 缺少客队球员，跳过
+    ]
+    assert list(ratings.iter_games(rows)) == [
+        (('2024-01-01', 1, 1), 'A', 'B', True),
+        (('2024-01-01', 1, 2), ('A', 'C'), ('B', 'D'), False),
+    ]
@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+mysql_connector = pytest.importorskip('mysql.connector')
+
+from reference_store import DATASETS, ReferenceStore  # noqa: E402
+
+
+def _count_queries(db_conn, monkeypatch):
+    queries = []
+    execute = db_conn.execute_cancellable
+
+    def counting(query, *args, **kwargs):
+        queries.append(query)
+        return execute(query, *args, **kwargs)
+
+    monkeypatch.setattr(db_conn, 'execute_cancellable', counting)
+    return queries
+
+
+def test_rows_are_loaded_once(db_conn, monkeypatch):
+    queries = _count_queries(db_conn, monkeypatch)
+    store = ReferenceStore.for_connection(db_conn)
+    assert ReferenceStore.for_connection(db_conn) is store
+    assert store.options('teams') == ['1: 计算机系代表队2024', '2: 电子系代表队2024', '3: 自动化系代表队2024']
+    assert store.label('teams', 2) == '电子系代表队2024'
+    assert store.row('games', (1, 1))['game_type']
+    assert store.row('teams', 99) is None
+    assert queries == [DATASETS['teams'].query, DATASETS['games'].query]
+
+
+def test_write_invalidates_dependent_datasets(db_conn, monkeypatch):
+    queries = _count_queries(db_conn, monkeypatch)
+    store = ReferenceStore.for_connection(db_conn)
+    store.options_many(('colleges', 'teams', 'players'))
+    assert db_conn.execute_update("UPDATE Team SET team_name = %s WHERE team_id = 1", ('新名称',))
+    assert store.label('teams', 1) == '新名称'
+    assert store.row('players', '2021010101')['team_name'] == '新名称'
+    store.rows('colleges')
+    assert queries.count(DATASETS['colleges'].query) == 1
+    assert queries.count(DATASETS['teams'].query) == 2
+    assert queries.count(DATASETS['players'].query) == 2
+
+
+def test_empty_and_failed_loads_are_not_cached(db_conn, monkeypatch):
+    store = ReferenceStore.for_connection(db_conn)
+    db_conn.execute_update("DELETE FROM Tournament")
+    assert store.rows('tournaments') == []
+    db_conn.execute_transaction([("INSERT INTO Tournament (tournament_id, tournament_name, year) VALUES (%s, %s, %s)",
+                                  (5, '新赛事', 2025))])
+    assert store.label('tournaments', 5) == '新赛事'
+
+    def fail(*_args, **_kwargs):
+        raise mysql_connector.Error("lost connection")
+
+    monkeypatch.setattr(db_conn, 'execute_cancellable', fail)
+    with pytest.raises(mysql_connector.Error):
+        store.rows('colleges')
+    monkeypatch.undo()
+    assert store.rows('colleges')
+
+
+def test_load_overlapping_invalidation_is_not_cached(db_conn, monkeypatch):
+    queries = _count_queries(db_conn, monkeypatch)
+    store = ReferenceStore.for_connection(db_conn)
+    execute = db_conn.execute_cancellable
+
+    def invalidated_during_query(query, *args, **kwargs):
+        rows = execute(query, *args, **kwargs)
+        store.invalidate_tables({'team'})  # 查询期间其他线程写入了 Team
+        return rows
+
+    monkeypatch.setattr(db_conn, 'execute_cancellable', invalidated_during_query)
+    assert store.rows('teams')
+    monkeypatch.setattr(db_conn, 'execute_cancellable', execute)
+    store.rows('teams')
+    store.rows('teams')
+    assert queries.count(DATASETS['teams'].query) == 2
+
+
+def test_slow_load_does_not_block_other_datasets(db_conn, monkeypatch):
+    store = ReferenceStore.for_connection(db_conn)
+    execute = db_conn.execute_cancellable
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_players(query, *args, **kwargs):
+        if query == DATASETS['players'].query:
+            started.set()
+            assert release.wait(5)
+        return execute(query, *args, **kwargs)
+
+    monkeypatch.setattr(db_conn, 'execute_cancellable', slow_players)
+    def other_datasets():
+        store.rows('colleges')
+        store.invalidate_tables({'college'})
+        done.set()
+
+    done = threading.Event()
+    loader = threading.Thread(target=store.rows, args=('players',))
+    loader.start()
+    try:
+        assert started.wait(5)
+        # 球员列表仍在查询，其他数据组的读取和失效不需要等待
+        threading.Thread(target=other_datasets, daemon=True).start()
+        assert done.wait(2)
+    finally:
+        release.set()
+        loader.join(5)
+    assert store.row('players', '2021010101')['name'] == '张三'
@@ -0,0 +1,43 @@
+from result_cache import QueryResultCache, read_tables, written_tables
+
+
+def test_read_and_written_tables():
+    assert read_tables("SELECT * FROM `Match` m JOIN Team t ON m.home_team_id = t.team_id") == {'match', 'team'}
+    assert written_tables("DELETE FROM Team WHERE team_id = %s") >= {'team', 'player', 'match', 'game'}
+    assert written_tables("SELECT * FROM Team") == set()
+
+
+def test_get_put_invalidate():
+    cache = QueryResultCache()
+    key = cache.make_key("SELECT * FROM Team", ())
+    assert cache.get(key) is None
+    cache.put(key, {'team'}, [{'team_id': 1}], cache.versions({'team'}))
+    rows = cache.get(key)
+    assert rows == [{'team_id': 1}]
+    rows[0]['team_id'] = 2  # 修改返回的结果不影响缓存
+    assert cache.get(key) == [{'team_id': 1}]
+    cache.invalidate({'team'})
+    assert cache.get(key) is None
+
+
+def test_write_during_query_is_not_cached():
+    cache = QueryResultCache()
+    key = cache.make_key("SELECT * FROM Team", ())
+    versions = cache.versions({'team'})
+    cache.invalidate({'team'})  # 查询执行期间发生写入
+    cache.put(key, {'team'}, [{'team_id': 1}], versions)
+    assert cache.get(key) is None
+
+
+def test_expiry_and_capacity():
+    cache = QueryResultCache(ttl=-1)
+    key = cache.make_key("SELECT 1", ())
+    cache.put(key, {'team'}, [], {})
+    assert cache.get(key) is None
+
+    cache = QueryResultCache(max_entries=2)
+    keys = [cache.make_key("SELECT * FROM Team WHERE team_id = %s", (i,)) for i in range(3)]
+    for key in keys:
+        cache.put(key, {'team'}, [{'i': 1}], {})
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) == [{'i': 1}]
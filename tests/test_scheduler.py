@@ -0,0 +1,66 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+import scheduler
+
+
+def test_round_robin_pairs_each_team_once():
+    teams = list(range(1, 8))
+    rounds = scheduler.round_robin(teams)
+    assert len(rounds) == 7
+    pairs = Counter(frozenset(pair) for pairs in rounds for pair in pairs)
+    assert len(pairs) == 21 and set(pairs.values()) == {1}
+    for pairs in rounds:
+        playing = [team for pair in pairs for team in pair]
+        assert len(playing) == len(set(playing))
+    home = Counter(home for pairs in rounds for home, _away in pairs)
+    assert max(home.values()) - min(home[team] for team in teams) <= 2
+
+
+def test_double_round_robin_swaps_home():
+    rounds = scheduler.round_robin([1, 2, 3, 4], double=True)
+    assert Counter(pair for pairs in rounds for pair in pairs) == \
+        Counter({(a, b): 1 for a in range(1, 5) for b in range(1, 5) if a != b})
+
+
+def test_plan_has_no_double_booking():
+    start = datetime(2024, 9, 1, 12, 0)
+    busy = [{'scheduled_time': datetime(2024, 9, 1, 14, 30), 'venue': '1号台', 'referee': '张三',
+             'home_team_id': 1, 'away_team_id': 99}]
+    fixtures = scheduler.plan(scheduler.grouped_rounds(range(1, 13), groups=2), start,
+                              times=['09:00', '14:00', '19:00'], venues=['1号台', '2号台'],
+                              referees=['张三', '李四'], busy=busy)
+    assert len(fixtures) == 30
+    venues, referees, teams, per_day = set(), set(), set(), Counter()
+    for fixture in fixtures:
+        time = fixture['scheduled_time']
+        assert time >= start
+        for used, value in ((venues, fixture['venue']), (referees, fixture['referee'])):
+            assert (time, value) not in used
+            used.add((time, value))
+        for team_id in (fixture['home_team_id'], fixture['away_team_id']):
+            assert (time, team_id) not in teams
+            teams.add((time, team_id))
+            per_day[team_id, time.date()] += 1
+        # 与已有比赛重叠的时段不使用被占用的场地、裁判和球队
+        if abs(time - busy[0]['scheduled_time']) < timedelta(minutes=scheduler.MATCH_MINUTES):
+            assert fixture['venue'] != '1号台' and fixture['referee'] != '张三'
+            assert 1 not in (fixture['home_team_id'], fixture['away_team_id'])
+    assert max(per_day.values()) <= scheduler.MAX_PER_DAY
+    # 每队按轮次先后出场
+    last_round = {}
+    for fixture in sorted(fixtures, key=lambda fixture: fixture['scheduled_time']):
+        for team_id in (fixture['home_team_id'], fixture['away_team_id']):
+            assert fixture['round'] > last_round.get(team_id, 0)
+            last_round[team_id] = fixture['round']
+
+
+def test_invalid_options():
+    with pytest.raises(scheduler.ScheduleError):
+        scheduler.grouped_rounds([1, 2, 3], groups=2)
+    with pytest.raises(scheduler.ScheduleError):
+        scheduler.plan([[(1, 2)]], datetime(2024, 9, 1), venues=[])
+    with pytest.raises(scheduler.ScheduleError):
+        scheduler.parse_times(['9点'])
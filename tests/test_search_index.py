@@ -0,0 +1,32 @@
+import random
+
+from search_index import NgramIndex
+
+
+def _rows():
+    rng = random.Random(1)
+    names = "王李张刘陈杨黄赵吴周"
+    return [{'name': ''.join(rng.choice(names) for _ in range(rng.randint(1, 3))),
+             'grade': f"{rng.randint(2019, 2024)}级", 'id': f"A{i:03d}"} for i in range(300)]
+
+
+def test_matches_substring_search():
+    rows = _rows()
+    index = NgramIndex()
+    index.clear(('name', 'grade', 'id'))
+    index.add_rows(rows[:150])
+    index.add_rows(rows[150:])
+    for text in ('王', '李张', '2021', 'a01', '级', '不存在', '王李张刘'):
+        expected = [row for row in rows
+                    if any(text.casefold() in str(row[field]).casefold() for field in ('name', 'grade', 'id'))]
+        assert index.search(text) == expected
+
+
+def test_empty_query_and_clear():
+    index = NgramIndex()
+    index.clear(('name',))
+    index.add_rows([{'name': '张三'}, {'name': None}])
+    assert len(index.search('  ')) == 2
+    assert index.search('三') == [{'name': '张三'}]
+    index.clear()
+    assert len(index) == 0 and index.search('三') == []
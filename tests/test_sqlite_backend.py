@@ -0,0 +1,54 @@
+import pytest
+
+mysql_connector = pytest.importorskip('mysql.connector')
+
+import queries  # noqa: E402
+from sqlite_backend import split_statements, translate  # noqa: E402
+
+
+def test_translate_placeholders():
+    assert translate("SELECT * FROM Player WHERE team_id = %s AND name LIKE %s") == \
+        "SELECT * FROM Player WHERE team_id = ? AND name LIKE ?"
+
+
+def test_translate_keeps_literals():
+    # 字符串常量中的 %s 和 MySQL 语法不改写
+    assert translate("SELECT '%s ON DUPLICATE KEY' FROM College WHERE dept_id = %s") == \
+        "SELECT '%s ON DUPLICATE KEY' FROM College WHERE dept_id = ?"
+
+
+def test_translate_upsert_and_ignore():
+    sql = translate("INSERT INTO Player (student_id, name) VALUES (%s, %s) "
+                    "ON DUPLICATE KEY UPDATE name=VALUES(name)")
+    assert sql == "INSERT INTO Player (student_id, name) VALUES (?, ?) ON CONFLICT DO UPDATE SET name=excluded.name"
+    assert translate("INSERT IGNORE INTO Team (team_id) VALUES (%s)").startswith("INSERT OR IGNORE INTO Team")
+    assert translate("TRUNCATE TABLE PlayerStats") == "DELETE FROM PlayerStats"
+
+
+def test_split_statements_skips_comments():
+    script = "-- 注释\nINSERT INTO College VALUES (1, 'a;b');\n/* 块注释 */\n;\nSELECT 1;"
+    assert split_statements(script) == ["INSERT INTO College VALUES (1, 'a;b')", "SELECT 1"]
+
+
+def test_sample_data_loaded(db_conn):
+    assert db_conn.execute_query("SELECT COUNT(*) AS n FROM `Match`")[0]['n'] > 0
+    assert db_conn.execute_query("SELECT COUNT(*) AS n FROM Player")[0]['n'] > 0
+
+
+def test_enum_order_matches_mysql(db_conn):
+    # ENUM 按定义顺序排序：ORDER BY role DESC 时队员在前、队长在后
+    team_id = db_conn.execute_query("SELECT team_id FROM Player WHERE role = '队长' LIMIT 1")[0]['team_id']
+    rows = db_conn.execute_query(queries.TEAM_PLAYERS, (team_id,))
+    roles = [row['role'] for row in rows]
+    assert roles[-1] == '队长'
+    assert roles == sorted(roles, key=('队长', '队员').index, reverse=True)
+
+
+def test_transaction_rolls_back(db_conn):
+    count = db_conn.execute_query("SELECT COUNT(*) AS n FROM College")[0]['n']
+    with pytest.raises(mysql_connector.Error):
+        db_conn.execute_transaction([
+            ("INSERT INTO College (dept_id, dept_name) VALUES (%s, %s)", (900, '测试系')),
+            ("INSERT INTO College (dept_id, dept_name) VALUES (%s, %s)", (900, '重复主键')),
+        ])
+    assert db_conn.execute_query("SELECT COUNT(*) AS n FROM College")[0]['n'] == count
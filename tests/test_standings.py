@@ -0,0 +1,34 @@
+import standings
+
+
+def _row(team_id, wins, losses, games_won, games_lost):
+    return {'team_id': team_id, 'team_name': f"队{team_id}", 'matches': wins + losses, 'wins': wins,
+            'losses': losses, 'games_won': games_won, 'games_lost': games_lost}
+
+
+def test_rank_by_points_then_game_difference():
+    table = standings.rank([_row(1, 1, 1, 5, 5), _row(2, 2, 0, 6, 2), _row(3, 0, 2, 2, 6)])
+    assert [entry['team_id'] for entry in table] == [2, 1, 3]
+    assert [entry['rank'] for entry in table] == [1, 2, 3]
+    assert table[0]['points'] == 2 * standings.WIN_POINTS
+    assert table[1]['game_diff'] == 0
+
+
+def test_head_to_head_breaks_ties_before_game_difference():
+    # 1、2、3 同分；3 的净胜盘最多，但 1 在相互间的比赛中成绩最好
+    rows = [_row(1, 2, 1, 7, 6), _row(2, 2, 1, 7, 5), _row(3, 2, 1, 8, 4), _row(4, 0, 3, 3, 9)]
+    results = [
+        {'home_team_id': 1, 'away_team_id': 2, 'home_wins': 3, 'away_wins': 2},
+        {'home_team_id': 1, 'away_team_id': 3, 'home_wins': 3, 'away_wins': 2},
+        {'home_team_id': 2, 'away_team_id': 3, 'home_wins': 3, 'away_wins': 0},
+        {'home_team_id': 3, 'away_team_id': 4, 'home_wins': 3, 'away_wins': 0},
+    ]
+    assert standings.has_ties(rows)
+    assert [entry['team_id'] for entry in standings.rank(rows, results)] == [1, 2, 3, 4]
+
+
+def test_summary_table_matches_match_results(db_conn):
+    assert standings.check(db_conn) == []
+    db_conn.execute_update("UPDATE Game SET winner = '客队', home_score = 5, away_score = 11 "
+                           "WHERE match_id = (SELECT MIN(match_id) FROM Game) AND game_id = 1")
+    assert standings.check(db_conn) == []
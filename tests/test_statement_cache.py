@@ -0,0 +1,123 @@
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from mysql.connector import errors  # noqa: E402
+
+from database import ConnectionPool, DatabaseConnection, StatementCache  # noqa: E402
+
+
+class FakeCursor:
+    def __init__(self, connection, prepared):
+        self.connection = connection
+        self.prepared = prepared
+        self.statement = None
+        self.closed = False
+        self.column_names = ('value',)
+        self.rowcount = 1
+
+    def execute(self, query, params=()):
+        if self.connection.fail:
+            raise errors.ProgrammingError("table doesn't exist")
+        # 与 mysql.connector 一样，SQL 字符串对象不同就重新 PREPARE
+        if self.prepared and query is not self.statement:
+            self.statement = query
+            self.connection.prepares += 1
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursors = []
+        self.prepares = 0
+        self.fail = False
+
+    def cursor(self, prepared=False, dictionary=False):
+        self.cursors.append(FakeCursor(self, prepared))
+        return self.cursors[-1]
+
+    def start_transaction(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+def test_hit_returns_first_prepared_string():
+    raw = FakeConnection()
+    cache = StatementCache(2)
+    query = "SELECT * FROM Team WHERE team_id = %s"
+    cursor, text, hit = cache.cursor(raw, query)
+    assert not hit and text is query
+    again, text, hit = cache.cursor(raw, ''.join(["SELECT * FROM Team ", "WHERE team_id = %s"]))
+    assert hit and again is cursor and text is query
+
+
+def test_least_recently_used_statement_is_closed():
+    raw = FakeConnection()
+    cache = StatementCache(2)
+    first, _text, _hit = cache.cursor(raw, "SELECT 1")
+    second, _text, _hit = cache.cursor(raw, "SELECT 2")
+    cache.cursor(raw, "SELECT 1")  # SELECT 2 成为最久未使用的语句
+    third, _text, _hit = cache.cursor(raw, "SELECT 3")
+    assert second.closed and not first.closed
+    assert cache.cursor(raw, "SELECT 1")[2]
+    assert not cache.cursor(raw, "SELECT 2")[2]
+    assert third.closed and not first.closed
+
+
+def _connection(capacity=2):
+    raws = []
+
+    def connector(**_kwargs):
+        raws.append(FakeConnection())
+        return raws[-1]
+
+    db_conn = DatabaseConnection(pool_size=1, statement_cache_size=capacity)
+    db_conn.pool = ConnectionPool({}, size=1, connector=connector, statement_cache_size=capacity)
+    return db_conn, raws
+
+
+def test_repeated_queries_are_prepared_once():
+    db_conn, raws = _connection()
+    for team_id in range(5):
+        # 每次都是新拼接的字符串对象
+        query = ' '.join(["SELECT * FROM Team", "WHERE team_id = %s"])
+        assert db_conn.execute_query(query, (team_id,)) == [{'value': 1}]
+    assert db_conn.execute_update("UPDATE Team SET team_name = %s WHERE team_id = %s", ('a', 1))
+    assert raws[0].prepares == 2
+    assert db_conn.statement_cache_stats() == {'hits': 4, 'misses': 2, 'hit_rate': 4 / 6}
+
+
+def test_failed_statement_is_prepared_again():
+    db_conn, raws = _connection()
+    query = "SELECT * FROM Team"
+    db_conn.execute_query(query)
+    raws[0].fail = True
+    assert db_conn.execute_query(query) == []
+    assert raws[0].cursors[0].closed
+    raws[0].fail = False
+    db_conn.execute_query(query)
+    assert raws[0].prepares == 2 and len(raws[0].cursors) == 2
+    assert db_conn.statement_cache_stats()['misses'] == 2
+
+
+def test_disabled_cache_uses_plain_cursors():
+    db_conn, raws = _connection(capacity=0)
+    db_conn.execute_query("SELECT * FROM Team")
+    assert not raws[0].cursors[0].prepared and raws[0].cursors[0].closed
+    assert db_conn.statement_cache_stats()['hits'] == 0
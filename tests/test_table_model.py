@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip('PyQt6.QtCore')
+
+from table_model import PagedTableModel, build_key_query, build_keyset_query  # noqa: E402
+
+PIG_KEYS = [('pig.match_id', 'match_id', True), ('pig.game_id', 'game_id', True),
+            ('pig.student_id', 'student_id', True)]
+
+
+def test_keyset_predicate_is_expanded():
+    query, params = build_keyset_query("SELECT * FROM Player_In_Game pig", PIG_KEYS,
+                                       {'match_id': 5, 'game_id': 2, 'student_id': 'S'}, limit=10)
+    assert "(pig.match_id, " not in query
+    assert "WHERE pig.match_id <= %s AND ((pig.match_id < %s) OR (pig.match_id = %s AND pig.game_id < %s)" in query
+    assert query.endswith("ORDER BY pig.match_id DESC, pig.game_id DESC, pig.student_id DESC LIMIT 10")
+    assert params == (5, 5, 5, 2, 5, 2, 'S')
+
+    query, params = build_keyset_query("SELECT * FROM Player p WHERE p.team_id = 1",
+                                       [('p.student_id', 'student_id', False)], {'student_id': 'S'})
+    assert "WHERE p.team_id = 1 AND p.student_id > %s ORDER BY p.student_id" in query
+    assert params == ('S',)
+
+
+def test_mixed_directions_rejected():
+    with pytest.raises(ValueError):
+        build_keyset_query("SELECT 1", [('a', 'a', True), ('b', 'b', False)])
+
+
+@pytest.mark.parametrize('base, keys', [
+    ("SELECT pig.match_id, pig.game_id, pig.student_id FROM Player_In_Game pig", PIG_KEYS),
+    ("SELECT m.match_id, m.scheduled_time FROM `Match` m",
+     [('m.scheduled_time', 'scheduled_time', True), ('m.match_id', 'match_id', True)]),
+    ("SELECT p.student_id FROM Player p", [('p.student_id', 'student_id', False)]),
+])
+def test_pages_cover_full_scan(db_conn, base, keys):
+    full = db_conn.execute_query(*build_keyset_query(base, keys, limit=None))
+    pages, after = [], None
+    while True:
+        page = db_conn.execute_query(*build_keyset_query(base, keys, after, limit=3))
+        if not page:
+            break
+        pages += page
+        after = page[-1]
+    assert pages == full
+
+
+def test_key_query(db_conn):
+    rows = db_conn.execute_query("SELECT match_id, game_id FROM Game ORDER BY match_id, game_id LIMIT 2")
+    keys = [(str(row['match_id']), str(row['game_id'])) for row in rows]
+    query, params = build_key_query("SELECT g.match_id, g.game_id FROM Game g", ['g.match_id', 'g.game_id'], keys)
+    assert sorted((row['match_id'], row['game_id']) for row in db_conn.execute_query(query, params)) == \
+        [(row['match_id'], row['game_id']) for row in rows]
+    query, params = build_key_query("SELECT * FROM Team WHERE dept_id = 1", ['team_id'], [('1',), ('2',)])
+    assert query == "SELECT * FROM Team WHERE dept_id = 1 AND (team_id IN (%s, %s))"
+    assert params == ('1', '2')
+
+
+def test_merge_rows():
+    data = [{'id': i, 'v': 'a'} for i in (10, 8, 6, 4, 2)]
+
+    def fetch_page(after_row, limit, on_page, on_error):
+        rows = [row for row in data if after_row is None or row['id'] < after_row['id']]
+        on_page(rows[:limit])
+
+    model = PagedTableModel([{'name': 'id', 'label': 'ID'}, {'name': 'v', 'label': '值'}], page_size=4)
+    model.set_source(fetch_page)  # 只加载了 10、8、6、4
+    assert not model.is_complete()
+    stale = {'3', '5', '6', '8', '12'}
+    fresh = [{'id': 8, 'v': 'b'}, {'id': 5, 'v': 'new'}, {'id': 3, 'v': 'not loaded'}, {'id': 12, 'v': 'top'}]
+    keys = [('id', 'id', True)]
+    assert model.merge_rows(model.generation(), lambda row: str(row['id']) in stale, fresh, keys)
+    # 6 已删除；3 排在已加载的最后一行之后，之后翻页时再取
+    assert model.rows() == [{'id': 12, 'v': 'top'}, {'id': 10, 'v': 'a'}, {'id': 8, 'v': 'b'},
+                            {'id': 5, 'v': 'new'}, {'id': 4, 'v': 'a'}]
+    assert not model.merge_rows(model.generation() + 1, lambda row: True, [], keys)
+    assert len(model.rows()) == 5
@@ -0,0 +1,111 @@
+"""预编译 .ui 文件
+
+uic.loadUi 每次调用都要解析 XML 再逐个创建控件，统计卡片这种反复创建的小部件尤其
+明显。这里用 uic.compileUi 把 .ui 文件编译成 Python 窗体类，按文件内容的哈希值缓存
+在 ui_pages/__uicache__ 中，.ui 文件修改后自动重新编译；同一进程内编译好的窗体类
+只导入一次。
+
+load_ui(path, widget) 的效果与 uic.loadUi(path, widget) 相同：在 widget 上创建界面，
+并把其中的控件设置为 widget 的属性。
+
+    python ui_cache.py        # 预先编译 ui_pages 下的所有 .ui 文件
+"""
+import glob
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+
+from PyQt6 import uic
+
+
+UI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ui_pages')
+CACHE_DIR = os.path.join(UI_DIR, '__uicache__')
+
+# (.ui 绝对路径, 修改时间) -> 窗体类
+_form_classes = {}
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def compile_ui(path):
+    """把 .ui 文件编译到缓存目录，返回生成的 .py 文件路径；已编译过则直接返回"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    target = os.path.join(CACHE_DIR, f"{stem}_{_file_hash(path)}.py")
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    source = io.StringIO()
+    with open(path, encoding='utf-8') as f:
+        uic.compileUi(f, source)
+    # 先写临时文件再改名，避免其他进程读到写了一半的文件
+    temp = f"{target}.{os.getpid()}.tmp"
+    with open(temp, 'w', encoding='utf-8') as f:
+        f.write(source.getvalue())
+    os.replace(temp, target)
+
+    # 清理同一 .ui 文件旧版本的编译结果
+    for old in glob.glob(os.path.join(CACHE_DIR, f"{stem}_*.py")):
+        if old != target:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return target
+
+
+def form_class(path):
+    """返回 .ui 文件对应的窗体类（uic 生成的 Ui_xxx 类）"""
+    path = os.path.abspath(path)
+    key = (path, os.path.getmtime(path))
+    cls = _form_classes.get(key)
+    if cls is not None:
+        return cls
+
+    module_path = compile_ui(path)
+    module_name = '_uicache_' + os.path.splitext(os.path.basename(module_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    cls = next(value for name, value in vars(module).items()
+               if name.startswith('Ui_') and isinstance(value, type))
+    _form_classes[key] = cls
+    return cls
+
+
+def load_ui(path, widget):
+    """在 widget 上创建 .ui 文件描述的界面，等同于 uic.loadUi(path, widget)"""
+    try:
+        cls = form_class(path)
+    except FileNotFoundError:
+        # .ui 文件不存在时 loadUi 同样会失败，直接报告原始错误；FileNotFoundError
+        # 是 OSError 的子类，不先拦下会被下面当作缓存目录不可写而退回 loadUi
+        raise
+    except Exception as e:
+        # 编译失败（如缓存目录不可写）时退回运行时解析
+        print(f"UI 预编译失败，改用 loadUi: {path}: {e}")
+        return uic.loadUi(path, widget)
+
+    form = cls()
+    form.setupUi(widget)
+    # loadUi 会把控件设为 widget 的属性，这里保持一致
+    for name, value in vars(form).items():
+        setattr(widget, name, value)
+    return widget
+
+
+def main():
+    paths = sorted(glob.glob(os.path.join(UI_DIR, '*.ui')))
+    for path in paths:
+        print(f"{os.path.basename(path)} -> {os.path.relpath(compile_ui(path))}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())